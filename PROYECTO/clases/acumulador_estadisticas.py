@@ -0,0 +1,147 @@
+# clases/acumulador_estadisticas.py
+# Estadísticas de una matriz calculadas en una sola pasada
+
+from .arreglo import Arreglo
+from .diccionario import Diccionario
+
+class AcumuladorEstadisticas:
+    """
+    Acumula suma, ceros, positivos, mínimo, máximo, media, varianza y
+    totales por fila y por columna de una matriz de filas x columnas,
+    viendo cada celda una sola vez y sin guardarlas.
+
+    Las celdas pueden llegar de tres formas, que se pueden mezclar:
+    - agregar_fila: una fila densa completa (Lista, memoryview, array...)
+    - agregar_celdas: un flujo de (fila, columna, valor), por ejemplo las
+      frecuencias de ProcesadorMatrices.recorrer_frecuencias
+    - agregar: una celda suelta
+    Las celdas que nunca se agregan cuentan como ceros (matriz dispersa).
+    Cada celda debe agregarse a lo sumo una vez.
+
+    La varianza es la poblacional sobre todas las celdas; con valores enteros
+    se calcula exacta a partir de la suma y la suma de cuadrados.
+    """
+
+    __slots__ = ('__filas', '__columnas', '__celdas', '__suma', '__suma_cuadrados',
+                 '__ceros', '__positivos', '__minimo', '__maximo',
+                 '__totales_filas', '__totales_columnas')
+
+    def __init__(self, filas, columnas):
+        """
+        Args:
+            filas (int): Filas de la matriz
+            columnas (int): Columnas de la matriz
+        """
+        self.__filas = filas
+        self.__columnas = columnas
+        self.__celdas = 0
+        self.__suma = 0
+        self.__suma_cuadrados = 0
+        self.__ceros = 0
+        self.__positivos = 0
+        self.__minimo = None
+        self.__maximo = None
+        self.__totales_filas = Arreglo(filas, 0)
+        self.__totales_columnas = Arreglo(columnas, 0)
+
+    def agregar(self, fila, columna, valor):
+        """Agregar una celda"""
+        self.__celdas += 1
+        self.__suma += valor
+        self.__suma_cuadrados += valor * valor
+        if valor == 0:
+            self.__ceros += 1
+        elif valor > 0:
+            self.__positivos += 1
+        if self.__minimo is None or valor < self.__minimo:
+            self.__minimo = valor
+        if self.__maximo is None or valor > self.__maximo:
+            self.__maximo = valor
+        self.__totales_filas.asignar(fila, self.__totales_filas.obtener(fila) + valor)
+        self.__totales_columnas.asignar(columna, self.__totales_columnas.obtener(columna) + valor)
+
+    def agregar_fila(self, fila, valores):
+        """
+        Agregar una fila densa completa
+
+        Args:
+            fila (int): Número de fila
+            valores: Iterable con los valores de las columnas 0..columnas-1
+        """
+        totales_columnas = self.__totales_columnas
+        suma = suma_cuadrados = ceros = positivos = 0
+        minimo = self.__minimo
+        maximo = self.__maximo
+        j = 0
+        for valor in valores:
+            suma += valor
+            suma_cuadrados += valor * valor
+            if valor == 0:
+                ceros += 1
+            elif valor > 0:
+                positivos += 1
+            if minimo is None or valor < minimo:
+                minimo = valor
+            if maximo is None or valor > maximo:
+                maximo = valor
+            if valor != 0:
+                totales_columnas.asignar(j, totales_columnas.obtener(j) + valor)
+            j += 1
+
+        self.__celdas += j
+        self.__suma += suma
+        self.__suma_cuadrados += suma_cuadrados
+        self.__ceros += ceros
+        self.__positivos += positivos
+        self.__minimo = minimo
+        self.__maximo = maximo
+        self.__totales_filas.asignar(fila, self.__totales_filas.obtener(fila) + suma)
+
+    def agregar_celdas(self, celdas):
+        """
+        Agregar un flujo de celdas
+
+        Args:
+            celdas: Iterable de (fila, columna, valor)
+        """
+        for fila, columna, valor in celdas:
+            self.agregar(fila, columna, valor)
+
+    def obtener_estadisticas(self):
+        """
+        Returns:
+            Diccionario: filas, columnas, total_elementos, suma_total,
+                         valores_cero, valores_positivos, minimo, maximo,
+                         media, varianza, totales_filas y totales_columnas
+                         (Arreglo); minimo y maximo son None si no hay celdas
+        """
+        total = self.__filas * self.__columnas
+        ceros = self.__ceros
+        minimo = self.__minimo
+        maximo = self.__maximo
+        if total > self.__celdas:
+            # Celdas no agregadas: ceros implícitos
+            ceros += total - self.__celdas
+            minimo = 0 if minimo is None else min(minimo, 0)
+            maximo = 0 if maximo is None else max(maximo, 0)
+
+        media = 0.0
+        varianza = 0.0
+        if total > 0:
+            media = self.__suma / total
+            varianza = (total * self.__suma_cuadrados - self.__suma * self.__suma) / (total * total)
+
+        estadisticas = Diccionario()
+        estadisticas.insertar('filas', self.__filas)
+        estadisticas.insertar('columnas', self.__columnas)
+        estadisticas.insertar('total_elementos', total)
+        estadisticas.insertar('suma_total', self.__suma)
+        estadisticas.insertar('valores_cero', ceros)
+        estadisticas.insertar('valores_positivos', self.__positivos)
+        estadisticas.insertar('minimo', minimo)
+        estadisticas.insertar('maximo', maximo)
+        estadisticas.insertar('media', media)
+        estadisticas.insertar('varianza', varianza)
+        estadisticas.insertar('totales_filas', self.__totales_filas)
+        estadisticas.insertar('totales_columnas', self.__totales_columnas)
+        return estadisticas
@@ -0,0 +1,137 @@
+# clases/arreglo.py
+# Arreglo de tamaño fijo con acceso por posición en tiempo constante
+
+class Arreglo:
+    """
+    Arreglo de tamaño fijo. A diferencia de Lista, obtener y asignar por
+    posición cuestan O(1), por lo que sirve como base para tablas hash e
+    índices que se consultan por número de fila o columna.
+    """
+
+    __slots__ = ('__datos', '__tamaño')
+
+    def __init__(self, tamaño, valor_inicial=None):
+        """
+        Inicializar arreglo con todas sus posiciones en valor_inicial
+
+        Args:
+            tamaño (int): Cantidad de posiciones del arreglo
+            valor_inicial: Valor con el que se llena cada posición
+        """
+        if tamaño < 0:
+            raise ValueError("El tamaño del arreglo no puede ser negativo")
+        self.__datos = [valor_inicial] * tamaño
+        self.__tamaño = tamaño
+
+    def obtener(self, posicion):
+        """
+        Obtener elemento en una posición
+
+        Args:
+            posicion (int): Posición del elemento (0 = inicio)
+
+        Returns:
+            El elemento en la posición especificada
+        """
+        if posicion < 0 or posicion >= self.__tamaño:
+            raise IndexError("Posición fuera de rango")
+        return self.__datos[posicion]
+
+    def asignar(self, posicion, dato):
+        """
+        Asignar elemento en una posición
+
+        Args:
+            posicion (int): Posición a modificar (0 = inicio)
+            dato: Elemento a guardar
+        """
+        if posicion < 0 or posicion >= self.__tamaño:
+            raise IndexError("Posición fuera de rango")
+        self.__datos[posicion] = dato
+
+    def obtener_en_posicion(self, posicion):
+        """Alias de obtener() para poder usar el arreglo donde se espera una Lista"""
+        return self.obtener(posicion)
+
+    def obtener_tamaño(self):
+        """
+        Obtener el número de posiciones del arreglo
+
+        Returns:
+            int: Tamaño del arreglo
+        """
+        return self.__tamaño
+
+    def esta_vacia(self):
+        """
+        Verificar si el arreglo no tiene posiciones
+
+        Returns:
+            bool: True si el tamaño es cero
+        """
+        return self.__tamaño == 0
+
+    def crear_iterador(self):
+        """
+        Crear un iterador con la misma interfaz que el de Lista
+
+        Returns:
+            IteradorArreglo: Iterador sobre las posiciones del arreglo
+        """
+        return IteradorArreglo(self)
+
+    def __len__(self):
+        """Soporte para len() de Python"""
+        return self.__tamaño
+
+    def __iter__(self):
+        """Hacer el Arreglo iterable con bucles for de Python"""
+        return IteradorArreglo(self)
+
+    def __str__(self):
+        """
+        Representación en string del arreglo
+
+        Returns:
+            str: Representación del arreglo
+        """
+        resultado = "Arreglo["
+        primera_iteracion = True
+        for dato in self.__datos:
+            if not primera_iteracion:
+                resultado += ", "
+            resultado += str(dato)
+            primera_iteracion = False
+        return resultado + "]"
+
+
+class IteradorArreglo:
+    """Iterador sobre un Arreglo con la interfaz de IteradorLista"""
+
+    __slots__ = ('__arreglo', '__posicion')
+
+    def __init__(self, arreglo):
+        self.__arreglo = arreglo
+        self.__posicion = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.__posicion >= self.__arreglo.obtener_tamaño():
+            raise StopIteration
+        dato = self.__arreglo.obtener(self.__posicion)
+        self.__posicion += 1
+        return dato
+
+    def siguiente(self):
+        """Método personalizado para obtener el siguiente elemento"""
+        if self.__posicion >= self.__arreglo.obtener_tamaño():
+            return None
+        dato = self.__arreglo.obtener(self.__posicion)
+        self.__posicion += 1
+        return dato
+
+    def hay_siguiente(self):
+        """Verificar si hay más elementos"""
+        return self.__posicion < self.__arreglo.obtener_tamaño()
@@ -1,15 +1,40 @@
 # clases/campo_agricola.py
 # Clase que representa un campo agrícola con todas sus estaciones y sensores
 
+from array import array
 from clases.lista import Lista
+from clases.arreglo import Arreglo
 from clases.diccionario import Diccionario
+from clases.tabla_hash import TablaHash
+from clases.columnas_frecuencias import ColumnasFrecuencias
+from clases.distribucion_frecuencias import DistribucionFrecuencias
+from clases.indice_campo import IndiceCampo
+from clases.historial_frecuencias import HistorialFrecuencias
+from clases.metricas_sensor import MetricasSensor
+from clases.sensor_suelo import SensorSuelo
+from clases.sensor_cultivo import SensorCultivo
+from clases.frecuencia import Frecuencia
 
 class CampoAgricola:
     """
     Clase que representa un campo agrícola completo con estaciones base,
     sensores de suelo y sensores de cultivo.
+    
+    Al cargar desde XML las frecuencias se guardan en columnas de enteros
+    (ColumnasFrecuencias). Los objetos sensor y Frecuencia se crean recién
+    cuando alguien pide las listas de sensores; desde ese momento los objetos
+    son la fuente de verdad y las columnas se descartan.
+    
+    clonar() no copia nada: el clon y el original comparten sus colecciones
+    y cada lado copia una colección recién antes de modificarla (o de
+    entregar sus objetos, que el que llama puede modificar).
     """
     
+    # Colecciones que clonar() comparte entre el original y el clon
+    __COLECCIONES = ('estaciones', 'registro', 'columnas_suelo', 'columnas_cultivo',
+                     'sensores_suelo', 'sensores_cultivo', 'distribucion_suelo',
+                     'distribucion_cultivo', 'historial_suelo', 'historial_cultivo')
+    
     def __init__(self, id, nombre):
         """
         Inicializar campo agrícola con ID y nombre
@@ -23,6 +48,36 @@ class CampoAgricola:
         self.__estaciones_base = Lista()  # Lista de estaciones base
         self.__sensores_suelo = Lista()   # Lista de sensores de suelo
         self.__sensores_cultivo = Lista() # Lista de sensores de cultivo
+        self.__estaciones_por_id = TablaHash()  # ID -> EstacionBase
+        
+        # Registro de todos los IDs de estación vistos (incluye referencias a
+        # estaciones inexistentes) para que las columnas usen índices enteros
+        self.__ids_registro = Lista()
+        self.__indices_registro = TablaHash()  # ID de estación -> índice en el registro
+        
+        # Frecuencias pendientes de materializar; None cuando ya hay objetos
+        self.__columnas_suelo = ColumnasFrecuencias("suelo")
+        self.__columnas_cultivo = ColumnasFrecuencias("cultivo")
+        
+        # Histogramas de las frecuencias registradas (campo, sensor y estación)
+        self.__distribucion_suelo = DistribucionFrecuencias("suelo")
+        self.__distribucion_cultivo = DistribucionFrecuencias("cultivo")
+        # Con sensores materializados: huella (ver __huella_sensores) de los
+        # sensores con los que se armó cada distribución
+        self.__huella_suelo = None
+        self.__huella_cultivo = None
+        
+        # Mediciones con tiempo (no cambian los valores actuales de arriba)
+        self.__historial_suelo = HistorialFrecuencias("suelo")
+        self.__historial_cultivo = HistorialFrecuencias("cultivo")
+        
+        # Nombres (de __COLECCIONES) que todavía se comparten con un clon;
+        # None si el campo no participó de ningún clonar()
+        self.__compartidas = None
+        
+        # IndiceCampo de las estaciones y sensores actuales; None cuando
+        # se agregan o quitan estaciones o sensores (ver obtener_indice)
+        self.__indice = None
     
     def get_id(self):
         """
@@ -58,9 +113,13 @@ class CampoAgricola:
         Args:
             estacion (EstacionBase): Estación a agregar
         """
+        self.__separar('estaciones')
         # Verificar que no exista una estación con el mismo ID
-        if not self.__estaciones_base.buscar_por_id(estacion.get_id()):
+        if not self.__estaciones_por_id.contiene_clave(estacion.get_id()):
             self.__estaciones_base.insertar(estacion)
+            self.__estaciones_por_id.insertar(estacion.get_id(), estacion)
+            self.__indice = None
+            self.obtener_indice_registro(estacion.get_id())
         else:
             print(f"Advertencia: Estación {estacion.get_id()} ya existe en el campo")
     
@@ -71,9 +130,12 @@ class CampoAgricola:
         Args:
             sensor (SensorSuelo): Sensor de suelo a agregar
         """
+        self.__materializar_sensores()
+        self.__separar('sensores_suelo')
         # Verificar que no exista un sensor con el mismo ID
         if not self.__sensores_suelo.buscar_por_id(sensor.get_id()):
             self.__sensores_suelo.insertar(sensor)
+            self.__indice = None
         else:
             print(f"Advertencia: Sensor de suelo {sensor.get_id()} ya existe en el campo")
     
@@ -84,9 +146,12 @@ class CampoAgricola:
         Args:
             sensor (SensorCultivo): Sensor de cultivo a agregar
         """
+        self.__materializar_sensores()
+        self.__separar('sensores_cultivo')
         # Verificar que no exista un sensor con el mismo ID
         if not self.__sensores_cultivo.buscar_por_id(sensor.get_id()):
             self.__sensores_cultivo.insertar(sensor)
+            self.__indice = None
         else:
             print(f"Advertencia: Sensor de cultivo {sensor.get_id()} ya existe en el campo")
     
@@ -97,6 +162,7 @@ class CampoAgricola:
         Returns:
             Lista: Lista de estaciones base del campo
         """
+        self.__separar('estaciones')
         return self.__estaciones_base
     
     def obtener_sensores_suelo(self):
@@ -106,6 +172,8 @@ class CampoAgricola:
         Returns:
             Lista: Lista de sensores de suelo del campo
         """
+        self.__materializar_sensores()
+        self.__separar('sensores_suelo')
         return self.__sensores_suelo
     
     def obtener_sensores_cultivo(self):
@@ -115,6 +183,8 @@ class CampoAgricola:
         Returns:
             Lista: Lista de sensores de cultivo del campo
         """
+        self.__materializar_sensores()
+        self.__separar('sensores_cultivo')
         return self.__sensores_cultivo
     
     def buscar_estacion_por_id(self, id_estacion):
@@ -127,7 +197,8 @@ class CampoAgricola:
         Returns:
             EstacionBase: La estación encontrada o None si no existe
         """
-        return self.__estaciones_base.buscar_por_id(id_estacion)
+        self.__separar('estaciones')
+        return self.__estaciones_por_id.obtener(id_estacion)
     
     def buscar_sensor_suelo_por_id(self, id_sensor):
         """
@@ -139,7 +210,7 @@ class CampoAgricola:
         Returns:
             SensorSuelo: El sensor encontrado o None si no existe
         """
-        return self.__sensores_suelo.buscar_por_id(id_sensor)
+        return self.obtener_sensores_suelo().buscar_por_id(id_sensor)
     
     def buscar_sensor_cultivo_por_id(self, id_sensor):
         """
@@ -151,7 +222,7 @@ class CampoAgricola:
         Returns:
             SensorCultivo: El sensor encontrado o None si no existe
         """
-        return self.__sensores_cultivo.buscar_por_id(id_sensor)
+        return self.obtener_sensores_cultivo().buscar_por_id(id_sensor)
     
     def obtener_cantidad_estaciones(self):
         """
@@ -169,6 +240,8 @@ class CampoAgricola:
         Returns:
             int: Cantidad de sensores de suelo
         """
+        if self.__columnas_suelo is not None:
+            return self.__columnas_suelo.obtener_cantidad_sensores()
         return self.__sensores_suelo.obtener_tamaño()
     
     def obtener_cantidad_sensores_cultivo(self):
@@ -178,6 +251,8 @@ class CampoAgricola:
         Returns:
             int: Cantidad de sensores de cultivo
         """
+        if self.__columnas_cultivo is not None:
+            return self.__columnas_cultivo.obtener_cantidad_sensores()
         return self.__sensores_cultivo.obtener_tamaño()
     
     def eliminar_estacion(self, id_estacion):
@@ -192,9 +267,395 @@ class CampoAgricola:
         """
         estacion = self.buscar_estacion_por_id(id_estacion)
         if estacion:
+            self.__estaciones_por_id.eliminar(id_estacion)
+            self.__indice = None
             return self.__estaciones_base.eliminar(estacion)
         return False
     
+    def obtener_indice_registro(self, id_estacion):
+        """
+        Obtener el índice de un ID de estación en el registro del campo,
+        registrándolo si es la primera vez que aparece
+        
+        Args:
+            id_estacion (str): ID de la estación
+            
+        Returns:
+            int: Índice del ID en el registro
+        """
+        indice = self.__indices_registro.obtener(id_estacion)
+        if indice is None:
+            self.__separar('registro')
+            indice = self.__ids_registro.obtener_tamaño()
+            self.__ids_registro.insertar(id_estacion)
+            self.__indices_registro.insertar(id_estacion, indice)
+        return indice
+    
+    def obtener_indice(self):
+        """
+        Obtener el índice de ordinales de estaciones y sensores (ID <-> fila
+        o columna y etiquetas). Se arma la primera vez, sin materializar los
+        sensores, y se reutiliza hasta que se agregan o quitan estaciones o
+        sensores.
+        
+        Returns:
+            IndiceCampo: Índice inmutable del campo actual
+        """
+        if self.__indice is None:
+            ids_estaciones = self.__estaciones_base.mapear(lambda estacion: estacion.get_id())
+            ids_suelo, nombres_suelo = self.__ids_y_nombres_sensores(self.__columnas_suelo, self.__sensores_suelo)
+            ids_cultivo, nombres_cultivo = self.__ids_y_nombres_sensores(self.__columnas_cultivo,
+                                                                         self.__sensores_cultivo)
+            self.__indice = IndiceCampo(ids_estaciones, ids_suelo, nombres_suelo, ids_cultivo, nombres_cultivo)
+        return self.__indice
+    
+    def __ids_y_nombres_sensores(self, columnas, sensores):
+        """IDs y nombres de los sensores desde las columnas si siguen pendientes, o desde los objetos"""
+        if columnas is not None:
+            return columnas.obtener_ids_sensores(), columnas.obtener_nombres_sensores()
+        return sensores.mapear(lambda sensor: sensor.get_id()), sensores.mapear(lambda sensor: sensor.get_nombre())
+    
+    def obtener_filas_registro(self):
+        """
+        Obtener, para cada índice del registro, la fila de la estación en
+        obtener_estaciones() o -1 si el ID no corresponde a ninguna estación
+        
+        Returns:
+            array: Arreglo de enteros del tamaño del registro
+        """
+        filas = array('l', [-1]) * self.__ids_registro.obtener_tamaño()
+        fila = 0
+        iterador = self.__estaciones_base.crear_iterador()
+        while iterador.hay_siguiente():
+            estacion = iterador.siguiente()
+            filas[self.__indices_registro.obtener(estacion.get_id())] = fila
+            fila += 1
+        return filas
+    
+    def registrar_sensor_suelo(self, id_sensor, nombre):
+        """
+        Registrar un sensor de suelo sin crear el objeto (carga desde XML)
+        
+        Args:
+            id_sensor (str): ID del sensor
+            nombre (str): Nombre del sensor
+            
+        Returns:
+            int: Índice del sensor para registrar_frecuencia_suelo(), o -1 si ya existía
+        """
+        self.__preparar_escritura("suelo")
+        return self.__registrar_sensor(self.__columnas_suelo, self.__distribucion_suelo, id_sensor, nombre, "suelo")
+    
+    def registrar_sensor_cultivo(self, id_sensor, nombre):
+        """
+        Registrar un sensor de cultivo sin crear el objeto (carga desde XML)
+        
+        Returns:
+            int: Índice del sensor para registrar_frecuencia_cultivo(), o -1 si ya existía
+        """
+        self.__preparar_escritura("cultivo")
+        return self.__registrar_sensor(self.__columnas_cultivo, self.__distribucion_cultivo, id_sensor, nombre, "cultivo")
+    
+    def registrar_frecuencia_suelo(self, indice_sensor, id_estacion, valor):
+        """
+        Registrar una frecuencia de un sensor de suelo
+        
+        Args:
+            indice_sensor (int): Índice retornado por registrar_sensor_suelo()
+            id_estacion (str): ID de la estación receptora
+            valor (int): Valor de la frecuencia
+        """
+        self.__preparar_escritura("suelo")
+        if self.__columnas_suelo is None:
+            self.__registrar_frecuencia_sensor(self.__sensores_suelo, indice_sensor, id_estacion, valor)
+            return
+        self.__registrar_frecuencia(self.__columnas_suelo, self.__distribucion_suelo,
+                                    indice_sensor, id_estacion, valor)
+    
+    def registrar_frecuencia_cultivo(self, indice_sensor, id_estacion, valor):
+        """
+        Registrar una frecuencia de un sensor de cultivo
+        
+        Args:
+            indice_sensor (int): Índice retornado por registrar_sensor_cultivo()
+            id_estacion (str): ID de la estación receptora
+            valor (int): Valor de la frecuencia
+        """
+        self.__preparar_escritura("cultivo")
+        if self.__columnas_cultivo is None:
+            self.__registrar_frecuencia_sensor(self.__sensores_cultivo, indice_sensor, id_estacion, valor)
+            return
+        self.__registrar_frecuencia(self.__columnas_cultivo, self.__distribucion_cultivo,
+                                    indice_sensor, id_estacion, valor)
+    
+    def registrar_frecuencias_suelo(self, indice_sensor, ids_estaciones, valores):
+        """
+        Registrar en bloque las frecuencias de un sensor de suelo hacia
+        estaciones distintas entre sí (por ejemplo al armar un campo
+        optimizado desde una matriz)
+        
+        Args:
+            indice_sensor (int): Índice retornado por registrar_sensor_suelo()
+            ids_estaciones (Lista): IDs de las estaciones receptoras
+            valores (Lista): Valor de cada frecuencia, en el mismo orden
+        """
+        self.__preparar_escritura("suelo")
+        self.__registrar_frecuencias(self.__columnas_suelo, self.__sensores_suelo, self.__distribucion_suelo,
+                                     indice_sensor, ids_estaciones, valores)
+    
+    def registrar_frecuencias_cultivo(self, indice_sensor, ids_estaciones, valores):
+        """
+        Registrar en bloque las frecuencias de un sensor de cultivo hacia
+        estaciones distintas entre sí
+        """
+        self.__preparar_escritura("cultivo")
+        self.__registrar_frecuencias(self.__columnas_cultivo, self.__sensores_cultivo, self.__distribucion_cultivo,
+                                     indice_sensor, ids_estaciones, valores)
+    
+    def actualizar_frecuencia_suelo(self, indice_sensor, id_estacion, valor):
+        """
+        Cambiar el valor actual de una frecuencia de suelo (o agregarla) sin
+        avisar: pensado para actualizaciones continuas de telemetría
+        
+        Args:
+            indice_sensor (int): Columna del sensor (posición en obtener_sensores_suelo())
+            id_estacion (str): ID de la estación receptora
+            valor (int): Valor nuevo de la frecuencia
+            
+        Returns:
+            int: Valor anterior, o None si la frecuencia no existía
+        """
+        self.__preparar_escritura("suelo")
+        return self.__actualizar_frecuencia(self.__columnas_suelo, self.__sensores_suelo,
+                                            self.__distribucion_suelo, indice_sensor, id_estacion, valor)
+    
+    def actualizar_frecuencia_cultivo(self, indice_sensor, id_estacion, valor):
+        """
+        Cambiar el valor actual de una frecuencia de cultivo (o agregarla) sin avisar
+        
+        Returns:
+            int: Valor anterior, o None si la frecuencia no existía
+        """
+        self.__preparar_escritura("cultivo")
+        return self.__actualizar_frecuencia(self.__columnas_cultivo, self.__sensores_cultivo,
+                                            self.__distribucion_cultivo, indice_sensor, id_estacion, valor)
+    
+    def obtener_columnas_suelo(self):
+        """
+        Obtener las frecuencias de suelo en forma columnar
+        
+        Returns:
+            ColumnasFrecuencias: Columnas, o None si los sensores ya se materializaron
+                                 (de solo lectura: pueden compartirse con un clon)
+        """
+        return self.__columnas_suelo
+    
+    def obtener_columnas_cultivo(self):
+        """
+        Obtener las frecuencias de cultivo en forma columnar
+        
+        Returns:
+            ColumnasFrecuencias: Columnas, o None si los sensores ya se materializaron
+                                 (de solo lectura: pueden compartirse con un clon)
+        """
+        return self.__columnas_cultivo
+    
+    def obtener_distribucion_suelo(self):
+        """
+        Obtener los histogramas de las frecuencias de suelo actuales. Mientras
+        las frecuencias están en columnas se mantienen al registrar; con los
+        sensores materializados (que se pueden modificar directamente, por
+        ejemplo con agregar_frecuencia o eliminar_frecuencia) se rearman si
+        algún sensor cambió desde la última vez.
+        Las frecuencias hacia estaciones inexistentes o eliminadas con
+        eliminar_estacion siguen en los sensores y se cuentan igual.
+        
+        Returns:
+            DistribucionFrecuencias: Histogramas por campo, sensor y estación (de solo lectura)
+        """
+        return self.__distribucion_vigente("suelo")
+    
+    def obtener_distribucion_cultivo(self):
+        """
+        Obtener los histogramas de las frecuencias de cultivo actuales (ver
+        obtener_distribucion_suelo)
+        
+        Returns:
+            DistribucionFrecuencias: Histogramas por campo, sensor y estación (de solo lectura)
+        """
+        return self.__distribucion_vigente("cultivo")
+    
+    def __distribucion_vigente(self, tipo):
+        """Distribución de un tipo, rearmada desde los sensores si cambiaron"""
+        if tipo == "suelo":
+            columnas, sensores, huella = self.__columnas_suelo, self.__sensores_suelo, self.__huella_suelo
+            distribucion = self.__distribucion_suelo
+        else:
+            columnas, sensores, huella = self.__columnas_cultivo, self.__sensores_cultivo, self.__huella_cultivo
+            distribucion = self.__distribucion_cultivo
+        if columnas is not None:
+            return distribucion
+        
+        huella_actual = self.__huella_sensores(sensores)
+        if huella_actual != huella:
+            distribucion = DistribucionFrecuencias.desde_sensores(tipo, sensores, distribucion.get_error_relativo())
+            self.__dejar_de_compartir('distribucion_' + tipo)
+            if tipo == "suelo":
+                self.__distribucion_suelo, self.__huella_suelo = distribucion, huella_actual
+            else:
+                self.__distribucion_cultivo, self.__huella_cultivo = distribucion, huella_actual
+        return distribucion
+    
+    @staticmethod
+    def __huella_sensores(sensores):
+        """
+        Resumen de la Lista de sensores que cambia si se agrega o quita un
+        sensor o si cambian las frecuencias de alguno (las versiones solo crecen)
+        """
+        version_total = 0
+        for sensor in sensores:
+            version_total += sensor.obtener_version()
+        return (id(sensores), sensores.obtener_tamaño(), version_total)
+    
+    def obtener_historial_suelo(self):
+        """
+        Obtener el historial de mediciones de los sensores de suelo
+        
+        Returns:
+            HistorialFrecuencias: Mediciones por (sensor, estación)
+        """
+        return self.__historial_suelo
+    
+    def obtener_historial_cultivo(self):
+        """
+        Obtener el historial de mediciones de los sensores de cultivo
+        
+        Returns:
+            HistorialFrecuencias: Mediciones por (sensor, estación)
+        """
+        return self.__historial_cultivo
+    
+    def registrar_medicion_suelo(self, id_sensor, id_estacion, valor, tiempo):
+        """
+        Agregar al historial una medición de un sensor de suelo
+        
+        Args:
+            id_sensor (str): ID del sensor
+            id_estacion (str): ID de la estación receptora
+            valor (int): Valor de la frecuencia
+            tiempo: Momento de la medición (entero o datetime)
+        """
+        self.__separar('historial_suelo')
+        self.__historial_suelo.registrar(id_sensor, id_estacion, valor, tiempo)
+    
+    def registrar_medicion_cultivo(self, id_sensor, id_estacion, valor, tiempo):
+        """
+        Agregar al historial una medición de un sensor de cultivo
+        
+        Args:
+            id_sensor (str): ID del sensor
+            id_estacion (str): ID de la estación receptora
+            valor (int): Valor de la frecuencia
+            tiempo: Momento de la medición (entero o datetime)
+        """
+        self.__separar('historial_cultivo')
+        self.__historial_cultivo.registrar(id_sensor, id_estacion, valor, tiempo)
+    
+    def __registrar_sensor(self, columnas, distribucion, id_sensor, nombre, tipo):
+        """Registrar sensor en columnas, o como objeto si ya se materializó"""
+        if columnas is None:
+            lista = self.__sensores_suelo if tipo == "suelo" else self.__sensores_cultivo
+            if lista.buscar_por_id(id_sensor):
+                print(f"Advertencia: Sensor de {tipo} {id_sensor} ya existe en el campo")
+                return -1
+            sensor = SensorSuelo(id_sensor, nombre) if tipo == "suelo" else SensorCultivo(id_sensor, nombre)
+            lista.insertar(sensor)
+            self.__indice = None
+            # La distribución se rearma desde los objetos (ver __distribucion_vigente)
+            return lista.obtener_tamaño() - 1
+        
+        indice = columnas.registrar_sensor(id_sensor, nombre)
+        if indice == -1:
+            print(f"Advertencia: Sensor de {tipo} {id_sensor} ya existe en el campo")
+        else:
+            self.__indice = None
+            distribucion.registrar_sensor(indice, id_sensor)
+        return indice
+    
+    def __registrar_frecuencia(self, columnas, distribucion, indice_sensor, id_estacion, valor):
+        """Agregar frecuencia a las columnas, avisando si sobrescribe otra"""
+        indice_estacion = self.obtener_indice_registro(id_estacion)
+        if not columnas.agregar(indice_sensor, indice_estacion, valor):
+            print(f"Advertencia: Ya existe frecuencia para estación {id_estacion}")
+            distribucion.quitar(indice_sensor, id_estacion, columnas.obtener_valor_reemplazado())
+        distribucion.agregar(indice_sensor, id_estacion, valor)
+    
+    def __registrar_frecuencias(self, columnas, sensores, distribucion, indice_sensor, ids_estaciones, valores):
+        """
+        Agregar las frecuencias de un sensor de una vez a las columnas; si
+        el sensor ya tenía frecuencias (o ya se materializó) van una por una
+        """
+        if columnas is not None:
+            indices_estaciones = array('l', (self.obtener_indice_registro(id_estacion)
+                                             for id_estacion in ids_estaciones))
+            if columnas.agregar_bloque(indice_sensor, indices_estaciones, valores):
+                for id_estacion, valor in zip(ids_estaciones, valores):
+                    distribucion.agregar(indice_sensor, id_estacion, valor)
+                return
+        for id_estacion, valor in zip(ids_estaciones, valores):
+            if columnas is None:
+                self.__registrar_frecuencia_sensor(sensores, indice_sensor, id_estacion, valor)
+            else:
+                self.__registrar_frecuencia(columnas, distribucion, indice_sensor, id_estacion, valor)
+    
+    def __registrar_frecuencia_sensor(self, sensores, indice_sensor, id_estacion, valor):
+        """Agregar frecuencia a un sensor ya materializado (la distribución se rearma al pedirla)"""
+        sensores.obtener_en_posicion(indice_sensor).agregar_frecuencia(Frecuencia(id_estacion, valor))
+    
+    def __actualizar_frecuencia(self, columnas, sensores, distribucion, indice_sensor, id_estacion, valor):
+        """Cambiar una frecuencia en columnas o en el sensor ya materializado"""
+        anterior = None
+        if columnas is not None:
+            if not columnas.actualizar(indice_sensor, self.obtener_indice_registro(id_estacion), valor):
+                anterior = columnas.obtener_valor_reemplazado()
+        else:
+            # Con objetos la distribución se rearma al pedirla
+            return sensores.obtener_en_posicion(indice_sensor).actualizar_frecuencia(id_estacion, valor)
+        if anterior is not None:
+            distribucion.quitar(indice_sensor, id_estacion, anterior)
+        distribucion.agregar(indice_sensor, id_estacion, valor)
+        return anterior
+    
+    def __materializar_sensores(self):
+        """Crear los objetos sensor y Frecuencia a partir de las columnas pendientes"""
+        if self.__columnas_suelo is None and self.__columnas_cultivo is None:
+            return
+        
+        ids_estaciones = Arreglo(self.__ids_registro.obtener_tamaño())
+        posicion = 0
+        iterador = self.__ids_registro.crear_iterador()
+        while iterador.hay_siguiente():
+            ids_estaciones.asignar(posicion, iterador.siguiente())
+            posicion += 1
+        
+        if self.__columnas_suelo is not None:
+            self.__sensores_suelo = self.__columnas_suelo.materializar_sensores(
+                SensorSuelo, ids_estaciones, Frecuencia)
+            # La distribución se armó desde las mismas columnas
+            self.__huella_suelo = self.__huella_sensores(self.__sensores_suelo)
+            self.__columnas_suelo = None
+            self.__dejar_de_compartir('columnas_suelo')
+            self.__dejar_de_compartir('sensores_suelo')
+        
+        if self.__columnas_cultivo is not None:
+            self.__sensores_cultivo = self.__columnas_cultivo.materializar_sensores(
+                SensorCultivo, ids_estaciones, Frecuencia)
+            # La distribución se armó desde las mismas columnas
+            self.__huella_cultivo = self.__huella_sensores(self.__sensores_cultivo)
+            self.__columnas_cultivo = None
+            self.__dejar_de_compartir('columnas_cultivo')
+            self.__dejar_de_compartir('sensores_cultivo')
+    
     def obtener_resumen(self):
         """
         Obtener resumen estadístico del campo usando Diccionario personalizado
@@ -212,28 +673,110 @@ class CampoAgricola:
         resumen.insertar('total_sensores_cultivo', self.obtener_cantidad_sensores_cultivo())
         
         # Calcular total de frecuencias por tipo de sensor
-        total_freq_suelo = 0
-        sensores_suelo = self.__sensores_suelo.recorrer()
+        resumen.insertar('total_frecuencias_suelo',
+                         self.__contar_frecuencias(self.__columnas_suelo, self.__sensores_suelo))
+        resumen.insertar('total_frecuencias_cultivo',
+                         self.__contar_frecuencias(self.__columnas_cultivo, self.__sensores_cultivo))
         
-        # Usar iterador personalizado para recorrer
-        iterador_suelo = sensores_suelo.crear_iterador()
-        while iterador_suelo.hay_siguiente():
-            sensor = iterador_suelo.siguiente()
-            total_freq_suelo += sensor.obtener_frecuencias().obtener_tamaño()
+        # Distribución de las frecuencias registradas (cantidad, extremos, media y percentiles)
+        resumen.insertar('distribucion_frecuencias_suelo', self.__distribucion_vigente("suelo").obtener_resumen())
+        resumen.insertar('distribucion_frecuencias_cultivo', self.__distribucion_vigente("cultivo").obtener_resumen())
         
-        total_freq_cultivo = 0
-        sensores_cultivo = self.__sensores_cultivo.recorrer()
+        return resumen
+    
+    def obtener_metricas_sensores_suelo(self):
+        """
+        Obtener las métricas de cada sensor de suelo (ver MetricasSensor)
         
-        # Usar iterador personalizado para recorrer
-        iterador_cultivo = sensores_cultivo.crear_iterador()
-        while iterador_cultivo.hay_siguiente():
-            sensor = iterador_cultivo.siguiente()
-            total_freq_cultivo += sensor.obtener_frecuencias().obtener_tamaño()
+        Returns:
+            Arreglo: MetricasSensor por sensor, en el orden de obtener_sensores_suelo()
+        """
+        return self.__obtener_metricas_sensores(self.__columnas_suelo, self.__sensores_suelo)
+    
+    def obtener_metricas_sensores_cultivo(self):
+        """
+        Obtener las métricas de cada sensor de cultivo (ver MetricasSensor)
         
-        resumen.insertar('total_frecuencias_suelo', total_freq_suelo)
-        resumen.insertar('total_frecuencias_cultivo', total_freq_cultivo)
+        Returns:
+            Arreglo: MetricasSensor por sensor, en el orden de obtener_sensores_cultivo()
+        """
+        return self.__obtener_metricas_sensores(self.__columnas_cultivo, self.__sensores_cultivo)
+    
+    def obtener_analisis_sensores(self, tipo):
+        """
+        Resumir en una pasada las métricas de todos los sensores de un tipo
         
-        return resumen
+        Args:
+            tipo (str): "suelo" o "cultivo"
+            
+        Returns:
+            Diccionario: cantidad_sensores, frecuencia_total, eficiencia_promedio,
+                         eficiencia_minima, desviacion_media_promedio,
+                         sensores_con_problemas y la cantidad de sensores con
+                         cada problema (baja_actividad, alta_actividad, pocas_estaciones)
+        """
+        if tipo == "suelo":
+            metricas = self.obtener_metricas_sensores_suelo()
+        else:
+            metricas = self.obtener_metricas_sensores_cultivo()
+        
+        cantidad = metricas.obtener_tamaño()
+        frecuencia_total = 0
+        suma_eficiencia = 0.0
+        eficiencia_minima = None
+        suma_desviacion = 0.0
+        con_problemas = 0
+        baja = alta = pocas = 0
+        for metrica in metricas:
+            frecuencia_total += metrica.get_total()
+            suma_eficiencia += metrica.get_eficiencia()
+            if eficiencia_minima is None or metrica.get_eficiencia() < eficiencia_minima:
+                eficiencia_minima = metrica.get_eficiencia()
+            suma_desviacion += metrica.get_desviacion_media()
+            problemas = metrica.get_problemas()
+            if problemas:
+                con_problemas += 1
+                baja += 1 if problemas & MetricasSensor.PROBLEMA_BAJA_ACTIVIDAD else 0
+                alta += 1 if problemas & MetricasSensor.PROBLEMA_ALTA_ACTIVIDAD else 0
+                pocas += 1 if problemas & MetricasSensor.PROBLEMA_POCAS_ESTACIONES else 0
+        
+        analisis = Diccionario()
+        analisis.insertar('cantidad_sensores', cantidad)
+        analisis.insertar('frecuencia_total', frecuencia_total)
+        analisis.insertar('eficiencia_promedio', suma_eficiencia / cantidad if cantidad > 0 else 0.0)
+        analisis.insertar('eficiencia_minima', eficiencia_minima if eficiencia_minima is not None else 0.0)
+        analisis.insertar('desviacion_media_promedio', suma_desviacion / cantidad if cantidad > 0 else 0.0)
+        analisis.insertar('sensores_con_problemas', con_problemas)
+        analisis.insertar('baja_actividad', baja)
+        analisis.insertar('alta_actividad', alta)
+        analisis.insertar('pocas_estaciones', pocas)
+        return analisis
+    
+    def __obtener_metricas_sensores(self, columnas, sensores):
+        """Métricas desde las columnas si siguen pendientes, o las guardadas en cada sensor"""
+        if columnas is not None:
+            return columnas.obtener_metricas()
+        
+        metricas = Arreglo(sensores.obtener_tamaño())
+        j = 0
+        iterador = sensores.crear_iterador()
+        while iterador.hay_siguiente():
+            metricas.asignar(j, iterador.siguiente().obtener_metricas())
+            j += 1
+        return metricas
+    
+    def __contar_frecuencias(self, columnas, sensores):
+        """Contar frecuencias desde las columnas si siguen pendientes, o desde los sensores"""
+        if columnas is not None:
+            return columnas.obtener_cantidad_frecuencias()
+        
+        total = 0
+        # Usar iterador personalizado para recorrer
+        iterador = sensores.crear_iterador()
+        while iterador.hay_siguiente():
+            sensor = iterador.siguiente()
+            total += sensor.obtener_frecuencias().obtener_tamaño()
+        return total
     
     def validar_integridad(self):
         """
@@ -254,7 +797,7 @@ class CampoAgricola:
                 estaciones_ids.insertar(estacion.get_id())
             
             # Verificar sensores de suelo
-            sensores_suelo = self.__sensores_suelo.recorrer()
+            sensores_suelo = self.obtener_sensores_suelo().recorrer()
             iterador_suelo = sensores_suelo.crear_iterador()
             while iterador_suelo.hay_siguiente():
                 sensor = iterador_suelo.siguiente()
@@ -267,7 +810,7 @@ class CampoAgricola:
                         return False
             
             # Verificar sensores de cultivo
-            sensores_cultivo = self.__sensores_cultivo.recorrer()
+            sensores_cultivo = self.obtener_sensores_cultivo().recorrer()
             iterador_cultivo = sensores_cultivo.crear_iterador()
             while iterador_cultivo.hay_siguiente():
                 sensor = iterador_cultivo.siguiente()
@@ -287,36 +830,108 @@ class CampoAgricola:
     
     def clonar(self):
         """
-        Crear una copia completa del campo agrícola
+        Crear una copia del campo agrícola en O(1): el clon comparte todas las
+        colecciones del original y cada lado copia solo la colección que va a
+        modificar, recién en ese momento. Los sensores de una lista copiada
+        son clones que a su vez comparten sus frecuencias, así que cambiar una
+        frecuencia copia únicamente las de ese sensor.
         
         Returns:
             CampoAgricola: Copia del campo actual
         """
         nuevo_campo = CampoAgricola(self.__id, self.__nombre)
-        
-        # Copiar estaciones
-        estaciones = self.__estaciones_base.recorrer()
-        iterador_est = estaciones.crear_iterador()
-        while iterador_est.hay_siguiente():
-            estacion = iterador_est.siguiente()
-            nuevo_campo.agregar_estacion(estacion)
-        
-        # Copiar sensores de suelo
-        sensores_suelo = self.__sensores_suelo.recorrer()
-        iterador_suelo = sensores_suelo.crear_iterador()
-        while iterador_suelo.hay_siguiente():
-            sensor = iterador_suelo.siguiente()
-            nuevo_campo.agregar_sensor_suelo(sensor)
-        
-        # Copiar sensores de cultivo
-        sensores_cultivo = self.__sensores_cultivo.recorrer()
-        iterador_cultivo = sensores_cultivo.crear_iterador()
-        while iterador_cultivo.hay_siguiente():
-            sensor = iterador_cultivo.siguiente()
-            nuevo_campo.agregar_sensor_cultivo(sensor)
-        
+        nuevo_campo.__estaciones_base = self.__estaciones_base
+        nuevo_campo.__estaciones_por_id = self.__estaciones_por_id
+        nuevo_campo.__ids_registro = self.__ids_registro
+        nuevo_campo.__indices_registro = self.__indices_registro
+        nuevo_campo.__columnas_suelo = self.__columnas_suelo
+        nuevo_campo.__columnas_cultivo = self.__columnas_cultivo
+        nuevo_campo.__sensores_suelo = self.__sensores_suelo
+        nuevo_campo.__sensores_cultivo = self.__sensores_cultivo
+        nuevo_campo.__distribucion_suelo = self.__distribucion_suelo
+        nuevo_campo.__distribucion_cultivo = self.__distribucion_cultivo
+        nuevo_campo.__huella_suelo = self.__huella_suelo
+        nuevo_campo.__huella_cultivo = self.__huella_cultivo
+        nuevo_campo.__historial_suelo = self.__historial_suelo
+        nuevo_campo.__historial_cultivo = self.__historial_cultivo
+        nuevo_campo.__indice = self.__indice
+        
+        self.__compartidas = CampoAgricola.__crear_compartidas()
+        nuevo_campo.__compartidas = CampoAgricola.__crear_compartidas()
         return nuevo_campo
     
+    @staticmethod
+    def __crear_compartidas():
+        """Tabla con todas las colecciones marcadas como compartidas"""
+        compartidas = TablaHash()
+        for nombre in CampoAgricola.__COLECCIONES:
+            compartidas.insertar(nombre, True)
+        return compartidas
+    
+    def __dejar_de_compartir(self, nombre):
+        """Marcar una colección como propia (se reemplazó por una nueva)"""
+        if self.__compartidas is not None:
+            self.__compartidas.eliminar(nombre)
+    
+    def __preparar_escritura(self, tipo):
+        """Separar las frecuencias y la distribución de un tipo antes de modificarlas"""
+        if self.__compartidas is None:
+            return
+        columnas = self.__columnas_suelo if tipo == "suelo" else self.__columnas_cultivo
+        self.__separar(("columnas_" if columnas is not None else "sensores_") + tipo)
+        self.__separar("distribucion_" + tipo)
+    
+    def __separar(self, nombre):
+        """Copiar la colección 'nombre' si todavía se comparte con un clon"""
+        if self.__compartidas is None or not self.__compartidas.contiene_clave(nombre):
+            return
+        self.__compartidas.eliminar(nombre)
+        
+        if nombre == 'estaciones':
+            estaciones = Lista()
+            por_id = TablaHash()
+            iterador = self.__estaciones_base.crear_iterador()
+            while iterador.hay_siguiente():
+                estacion = iterador.siguiente().clonar()
+                estaciones.insertar(estacion)
+                por_id.insertar(estacion.get_id(), estacion)
+            self.__estaciones_base = estaciones
+            self.__estaciones_por_id = por_id
+        elif nombre == 'registro':
+            ids = Lista()
+            indices = TablaHash()
+            iterador = self.__ids_registro.crear_iterador()
+            while iterador.hay_siguiente():
+                id_estacion = iterador.siguiente()
+                indices.insertar(id_estacion, ids.obtener_tamaño())
+                ids.insertar(id_estacion)
+            self.__ids_registro = ids
+            self.__indices_registro = indices
+        elif nombre == 'columnas_suelo' and self.__columnas_suelo is not None:
+            self.__columnas_suelo = self.__columnas_suelo.clonar()
+        elif nombre == 'columnas_cultivo' and self.__columnas_cultivo is not None:
+            self.__columnas_cultivo = self.__columnas_cultivo.clonar()
+        elif nombre == 'sensores_suelo':
+            self.__sensores_suelo = self.__clonar_sensores(self.__sensores_suelo)
+        elif nombre == 'sensores_cultivo':
+            self.__sensores_cultivo = self.__clonar_sensores(self.__sensores_cultivo)
+        elif nombre == 'distribucion_suelo':
+            self.__distribucion_suelo = self.__distribucion_suelo.clonar()
+        elif nombre == 'distribucion_cultivo':
+            self.__distribucion_cultivo = self.__distribucion_cultivo.clonar()
+        elif nombre == 'historial_suelo':
+            self.__historial_suelo = self.__historial_suelo.clonar()
+        elif nombre == 'historial_cultivo':
+            self.__historial_cultivo = self.__historial_cultivo.clonar()
+    
+    def __clonar_sensores(self, sensores):
+        """Lista de clones de los sensores (comparten frecuencias hasta modificarlas)"""
+        copia = Lista()
+        iterador = sensores.crear_iterador()
+        while iterador.hay_siguiente():
+            copia.insertar(iterador.siguiente().clonar())
+        return copia
+    
     def __str__(self):
         """
         Representación en string del campo
@@ -0,0 +1,305 @@
+# clases/columnas_frecuencias.py
+# Representación columnar de las frecuencias de un tipo de sensor
+
+from array import array
+from clases.lista import Lista
+from clases.arreglo import Arreglo
+from clases.tabla_hash import TablaHash
+from clases.metricas_sensor import calcular_metricas_columnas
+
+class ColumnasFrecuencias:
+    """
+    Guarda las frecuencias de un tipo de sensor (suelo o cultivo) como tres
+    arreglos de enteros paralelos: índice de sensor, índice de estación y valor.
+    Cada fila k representa un <frecuencia> del XML. Los índices de estación
+    apuntan al registro de IDs de estación del CampoAgricola dueño.
+    No crea objetos Frecuencia: el campo los materializa solo si se piden.
+    """
+
+    def __init__(self, tipo):
+        """
+        Inicializar columnas vacías
+
+        Args:
+            tipo (str): Tipo de sensor ("suelo" o "cultivo")
+        """
+        self.__tipo = tipo
+        self.__ids_sensores = Lista()
+        self.__nombres_sensores = Lista()
+        self.__indices_sensores = TablaHash()  # ID de sensor -> índice
+
+        self.__sensores = array('l')    # Índice del sensor de cada frecuencia
+        self.__estaciones = array('l')  # Índice (en el registro del campo) de la estación
+        self.__valores = array('q')     # Valor de la frecuencia
+
+        # Posiciones ya usadas por el último sensor, para resolver duplicados
+        self.__sensor_actual = -1
+        self.__sensor_maximo = -1  # Mayor índice de sensor con frecuencias
+        self.__posiciones_actual = TablaHash()
+        self.__valor_reemplazado = None
+
+        # Posición de cada par (sensor, estación); solo se arma si se usa actualizar()
+        self.__posiciones_pares = None
+
+        # MetricasSensor por índice de sensor (ver obtener_metricas); None
+        # si hay que recalcular porque cambió alguna frecuencia o sensor
+        self.__metricas = None
+
+    def get_tipo(self):
+        """Obtener el tipo de sensor de las columnas"""
+        return self.__tipo
+
+    def registrar_sensor(self, id_sensor, nombre):
+        """
+        Registrar un sensor nuevo
+
+        Args:
+            id_sensor (str): ID del sensor
+            nombre (str): Nombre del sensor
+
+        Returns:
+            int: Índice asignado al sensor, o -1 si el ID ya estaba registrado
+        """
+        if self.__indices_sensores.contiene_clave(id_sensor):
+            return -1
+        indice = self.__ids_sensores.obtener_tamaño()
+        self.__metricas = None
+        self.__ids_sensores.insertar(id_sensor)
+        self.__nombres_sensores.insertar(nombre)
+        self.__indices_sensores.insertar(id_sensor, indice)
+        return indice
+
+    def agregar(self, indice_sensor, indice_estacion, valor):
+        """
+        Agregar una frecuencia. Si el sensor ya tenía frecuencia para esa
+        estación se sobrescribe el valor, igual que agregar_frecuencia().
+
+        Args:
+            indice_sensor (int): Índice retornado por registrar_sensor()
+            indice_estacion (int): Índice de la estación en el registro del campo
+            valor (int): Valor de la frecuencia
+
+        Returns:
+            bool: True si era nueva, False si sobrescribió una existente
+        """
+        if indice_sensor != self.__sensor_actual:
+            self.__cambiar_sensor_actual(indice_sensor)
+        self.__metricas = None
+
+        posicion = self.__posiciones_actual.obtener(indice_estacion)
+        if posicion is not None:
+            self.__valor_reemplazado = self.__valores[posicion]
+            self.__valores[posicion] = int(valor)
+            return False
+
+        self.__anexar(indice_sensor, indice_estacion, valor)
+        return True
+
+    def __anexar(self, indice_sensor, indice_estacion, valor):
+        """Anexar una frecuencia que se sabe nueva y registrar su posición"""
+        posicion = len(self.__valores)
+        if indice_sensor == self.__sensor_actual:
+            self.__posiciones_actual.insertar(indice_estacion, posicion)
+        if self.__posiciones_pares is not None:
+            self.__posiciones_pares.insertar((indice_sensor, indice_estacion), posicion)
+        if indice_sensor > self.__sensor_maximo:
+            self.__sensor_maximo = indice_sensor
+        self.__sensores.append(indice_sensor)
+        self.__estaciones.append(indice_estacion)
+        self.__valores.append(int(valor))
+
+    def agregar_bloque(self, indice_sensor, indices_estaciones, valores):
+        """
+        Agregar de una vez las frecuencias de un sensor hacia estaciones
+        distintas entre sí, anexándolas directo a las columnas sin la tabla
+        de duplicados de agregar(). Solo para un sensor que todavía no tiene
+        frecuencias (registrado después del último que las tiene).
+
+        Args:
+            indice_sensor (int): Índice retornado por registrar_sensor()
+            indices_estaciones: Secuencia de índices de estación en el registro del campo
+            valores: Secuencia de valores, en el mismo orden
+
+        Returns:
+            bool: True si se agregaron; False si el sensor podría tener
+                  frecuencias y no se agregó nada (usar agregar())
+        """
+        if indice_sensor <= self.__sensor_maximo:
+            return False
+
+        inicio = len(self.__valores)
+        self.__estaciones.extend(indices_estaciones)
+        self.__valores.extend(int(valor) for valor in valores)
+        agregadas = len(self.__valores) - inicio
+        if agregadas == 0:
+            return True
+        self.__sensores.extend(array('l', [indice_sensor]) * agregadas)
+        self.__sensor_maximo = indice_sensor
+        self.__metricas = None
+        # La tabla de duplicados se rearma si se vuelve a usar este sensor
+        self.__sensor_actual = -1
+        if self.__posiciones_pares is not None:
+            posicion = inicio
+            while posicion < inicio + agregadas:
+                self.__posiciones_pares.insertar((indice_sensor, self.__estaciones[posicion]), posicion)
+                posicion += 1
+        return True
+
+    def actualizar(self, indice_sensor, indice_estacion, valor):
+        """
+        Cambiar el valor de una frecuencia de cualquier sensor (o agregarla).
+        A diferencia de agregar(), que espera las frecuencias de cada sensor
+        juntas como en el XML, acá las actualizaciones llegan mezcladas: la
+        primera llamada arma un índice de todos los pares y las siguientes
+        cuestan O(1).
+
+        Returns:
+            bool: True si era nueva, False si cambió una existente
+        """
+        if self.__posiciones_pares is None:
+            self.__posiciones_pares = TablaHash(len(self.__valores))
+            k = 0
+            total = len(self.__valores)
+            while k < total:
+                self.__posiciones_pares.insertar((self.__sensores[k], self.__estaciones[k]), k)
+                k += 1
+
+        posicion = self.__posiciones_pares.obtener((indice_sensor, indice_estacion))
+        self.__metricas = None
+        if posicion is not None:
+            self.__valor_reemplazado = self.__valores[posicion]
+            self.__valores[posicion] = int(valor)
+            return False
+        # El par es nuevo: se anexa sin pasar por agregar(), que al cambiar
+        # de sensor recorrería todas las columnas
+        self.__anexar(indice_sensor, indice_estacion, valor)
+        return True
+
+    def obtener_metricas(self):
+        """
+        Métricas de todos los sensores en dos pasadas lineales por las
+        columnas, sin materializar sensores. Se guardan hasta que cambia
+        alguna frecuencia: un resumen de miles de sensores no vuelve a
+        recorrer nada.
+
+        Returns:
+            Arreglo: MetricasSensor por índice de sensor
+        """
+        if self.__metricas is None:
+            self.__metricas = calcular_metricas_columnas(self.__sensores, self.__valores,
+                                                         self.obtener_cantidad_sensores())
+        return self.__metricas
+
+    def obtener_valor_reemplazado(self):
+        """Valor que tenía la última frecuencia sobrescrita por agregar()"""
+        return self.__valor_reemplazado
+
+    def __cambiar_sensor_actual(self, indice_sensor):
+        """
+        Preparar la tabla de duplicados para otro sensor. En la carga desde XML
+        las frecuencias de un sensor llegan juntas y esto no recorre nada; si se
+        vuelve a un sensor anterior se reconstruye su tabla recorriendo columnas.
+        """
+        self.__posiciones_actual = TablaHash()
+        if indice_sensor <= self.__sensor_maximo:
+            posicion = 0
+            for sensor in self.__sensores:
+                if sensor == indice_sensor:
+                    self.__posiciones_actual.insertar(self.__estaciones[posicion], posicion)
+                posicion += 1
+        self.__sensor_actual = indice_sensor
+
+    def obtener_cantidad_sensores(self):
+        """Obtener número de sensores registrados"""
+        return self.__ids_sensores.obtener_tamaño()
+
+    def obtener_cantidad_frecuencias(self):
+        """Obtener número de frecuencias guardadas"""
+        return len(self.__valores)
+
+    def obtener_ids_sensores(self):
+        """Obtener Lista de IDs de sensores en orden de registro"""
+        return self.__ids_sensores
+
+    def obtener_nombres_sensores(self):
+        """Obtener Lista de nombres de sensores en orden de registro"""
+        return self.__nombres_sensores
+
+    def obtener_columna_sensores(self):
+        """Obtener arreglo de índices de sensor (una entrada por frecuencia)"""
+        return self.__sensores
+
+    def obtener_columna_estaciones(self):
+        """Obtener arreglo de índices de estación (una entrada por frecuencia)"""
+        return self.__estaciones
+
+    def obtener_columna_valores(self):
+        """Obtener arreglo de valores (una entrada por frecuencia)"""
+        return self.__valores
+
+    def materializar_sensores(self, clase_sensor, ids_estaciones, clase_frecuencia):
+        """
+        Crear los objetos sensor con sus frecuencias
+
+        Args:
+            clase_sensor: SensorSuelo o SensorCultivo
+            ids_estaciones (Arreglo): ID de estación para cada índice del registro
+            clase_frecuencia: Clase Frecuencia
+
+        Returns:
+            Lista: Sensores creados en orden de registro
+        """
+        cantidad = self.obtener_cantidad_sensores()
+        frecuencias_por_sensor = Arreglo(cantidad)
+        j = 0
+        while j < cantidad:
+            frecuencias_por_sensor.asignar(j, Lista())
+            j += 1
+
+        # Los pares (sensor, estación) no se repiten: cada sensor recibe sus
+        # frecuencias en bloque, sin la búsqueda de agregar_frecuencia
+        k = 0
+        total = len(self.__valores)
+        while k < total:
+            id_estacion = ids_estaciones.obtener(self.__estaciones[k])
+            frecuencias_por_sensor.obtener(self.__sensores[k]).insertar(
+                clase_frecuencia(id_estacion, self.__valores[k]))
+            k += 1
+
+        lista_sensores = Lista()
+        j = 0
+        iterador_ids = self.__ids_sensores.crear_iterador()
+        iterador_nombres = self.__nombres_sensores.crear_iterador()
+        while iterador_ids.hay_siguiente():
+            sensor = clase_sensor(iterador_ids.siguiente(), iterador_nombres.siguiente())
+            sensor.cargar_frecuencias(frecuencias_por_sensor.obtener(j))
+            lista_sensores.insertar(sensor)
+            j += 1
+
+        return lista_sensores
+
+    def clonar(self):
+        """
+        Crear una copia independiente de las columnas. Los arreglos se copian
+        de una vez, sin recorrerlos; las tablas de duplicados se reconstruyen
+        recién si se usan.
+
+        Returns:
+            ColumnasFrecuencias: Copia de las columnas actuales
+        """
+        copia = ColumnasFrecuencias(self.__tipo)
+        iterador_ids = self.__ids_sensores.crear_iterador()
+        iterador_nombres = self.__nombres_sensores.crear_iterador()
+        while iterador_ids.hay_siguiente():
+            copia.__ids_sensores.insertar(iterador_ids.siguiente())
+            copia.__nombres_sensores.insertar(iterador_nombres.siguiente())
+        for par in self.__indices_sensores.obtener_pares():
+            copia.__indices_sensores.insertar(par.get_clave(), par.get_valor())
+
+        copia.__sensores = array('l', self.__sensores)
+        copia.__estaciones = array('l', self.__estaciones)
+        copia.__valores = array('q', self.__valores)
+        copia.__sensor_maximo = self.__sensor_maximo
+        # Las métricas no se modifican: se reemplazan enteras al recalcular
+        copia.__metricas = self.__metricas
+        return copia
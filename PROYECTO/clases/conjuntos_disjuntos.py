@@ -0,0 +1,119 @@
+# clases/conjuntos_disjuntos.py
+# Conjuntos disjuntos (union-find) sobre arreglos compactos de enteros
+
+from array import array
+from clases.lista import Lista
+from clases.arreglo import Arreglo
+
+class ConjuntosDisjuntos:
+    """
+    Partición de los elementos 0..n-1 en conjuntos disjuntos, con unión por
+    rango y compresión de caminos: buscar y unir cuestan casi O(1)
+    amortizado. El padre de cada elemento se guarda en un array('l') y el
+    rango en un array('B'), así que un millón de elementos ocupa ~5 MB.
+    Se pueden agregar elementos en cualquier momento (entrada incremental).
+    """
+
+    __slots__ = ('__padres', '__rangos', '__componentes')
+
+    def __init__(self, cantidad=0):
+        """
+        Args:
+            cantidad (int): Elementos iniciales, cada uno en su propio conjunto
+        """
+        if cantidad < 0:
+            raise ValueError("La cantidad de elementos no puede ser negativa")
+        self.__padres = array('l', range(cantidad))
+        self.__rangos = array('B', bytes(cantidad))
+        self.__componentes = cantidad
+
+    def agregar_elemento(self):
+        """
+        Agregar un elemento nuevo en su propio conjunto
+
+        Returns:
+            int: Índice del elemento agregado
+        """
+        indice = len(self.__padres)
+        self.__padres.append(indice)
+        self.__rangos.append(0)
+        self.__componentes += 1
+        return indice
+
+    def buscar(self, elemento):
+        """
+        Representante del conjunto de un elemento. Deja a todos los
+        elementos del camino apuntando directo al representante.
+        """
+        padres = self.__padres
+        raiz = elemento
+        while padres[raiz] != raiz:
+            raiz = padres[raiz]
+        while padres[elemento] != raiz:
+            siguiente = padres[elemento]
+            padres[elemento] = raiz
+            elemento = siguiente
+        return raiz
+
+    def unir(self, elemento1, elemento2):
+        """
+        Unir los conjuntos de dos elementos
+
+        Returns:
+            bool: True si estaban separados, False si ya eran del mismo conjunto
+        """
+        raiz1 = self.buscar(elemento1)
+        raiz2 = self.buscar(elemento2)
+        if raiz1 == raiz2:
+            return False
+        rangos = self.__rangos
+        if rangos[raiz1] < rangos[raiz2]:
+            raiz1, raiz2 = raiz2, raiz1
+        self.__padres[raiz2] = raiz1
+        if rangos[raiz1] == rangos[raiz2]:
+            rangos[raiz1] += 1
+        self.__componentes -= 1
+        return True
+
+    def estan_unidos(self, elemento1, elemento2):
+        """Verificar si dos elementos pertenecen al mismo conjunto"""
+        return self.buscar(elemento1) == self.buscar(elemento2)
+
+    def obtener_tamaño(self):
+        """Obtener la cantidad de elementos"""
+        return len(self.__padres)
+
+    def obtener_cantidad_componentes(self):
+        """Obtener la cantidad de conjuntos disjuntos"""
+        return self.__componentes
+
+    def obtener_componentes(self):
+        """
+        Conjuntos como Lista de Listas de elementos, en una pasada: cada
+        conjunto en orden de su menor elemento y sus elementos de menor a
+        mayor (el orden de Optimizador.identificar_grupos_estaciones)
+
+        Returns:
+            Lista: Lista de componentes (Lista de índices)
+        """
+        cantidad = len(self.__padres)
+        componente_por_raiz = Arreglo(cantidad)
+        componentes = Lista()
+        elemento = 0
+        while elemento < cantidad:
+            raiz = self.buscar(elemento)
+            componente = componente_por_raiz.obtener(raiz)
+            if componente is None:
+                componente = Lista()
+                componente_por_raiz.asignar(raiz, componente)
+                componentes.insertar(componente)
+            componente.insertar(elemento)
+            elemento += 1
+        return componentes
+
+    def __len__(self):
+        return len(self.__padres)
+
+    def __str__(self):
+        return "ConjuntosDisjuntos(elementos={}, componentes={})".format(
+            len(self.__padres), self.__componentes)
@@ -8,6 +8,8 @@ class ParClave:
     Clase que representa un par clave-valor para el diccionario
     """
     
+    __slots__ = ('__clave', '__valor')
+    
     def __init__(self, clave, valor):
         """
         Inicializar par clave-valor
@@ -0,0 +1,447 @@
+# clases/distribucion_frecuencias.py
+# Histogramas logarítmicos combinables de las frecuencias de transmisión
+
+import math
+from array import array
+from .lista import Lista
+from .diccionario import Diccionario
+from .tabla_hash import TablaHash
+
+class _Cubetas:
+    """
+    Cubetas con datos de un histograma: dos arreglos paralelos (número de
+    cubeta, cantidad). Un histograma tiene pocas cubetas, así que buscarlas
+    con array.index es rápido y ocupa mucho menos que una tabla por histograma.
+    """
+
+    __slots__ = ('claves', 'conteos')
+
+    def __init__(self):
+        self.claves = array('l')
+        self.conteos = array('q')
+
+    def sumar(self, cubeta, cantidad):
+        try:
+            posicion = self.claves.index(cubeta)
+        except ValueError:
+            self.claves.append(cubeta)
+            self.conteos.append(cantidad)
+            return
+        self.conteos[posicion] += cantidad
+
+    def pares_ordenados(self):
+        """Pares (cubeta, cantidad) con cantidad > 0, en orden de cubeta"""
+        pares = [par for par in zip(self.claves, self.conteos) if par[1] > 0]
+        pares.sort()
+        return pares
+
+
+class HistogramaLogaritmico:
+    """
+    Resumen de una distribución de valores con cubetas de ancho logarítmico.
+    La cubeta i de los valores positivos cubre (gamma^(i-1), gamma^i], con
+    gamma = (1 + error_relativo) / (1 - error_relativo), así que cualquier
+    cuantil se estima con error relativo de a lo sumo error_relativo sin
+    guardar los valores. Solo se guardan las cubetas con datos.
+
+    Dos histogramas con el mismo error_relativo se combinan sumando sus
+    cubetas; el resultado es el mismo que si todos los valores se hubieran
+    agregado a uno solo. Cantidad y suma son exactas; mínimo y máximo también,
+    salvo después de quitar uno de ellos: entonces se estiman desde las
+    cubetas, con el mismo error relativo que los cuantiles.
+    """
+
+    __slots__ = ('__error_relativo', '__gamma', '__log_gamma', '__positivos', '__negativos',
+                 '__ceros', '__cantidad', '__suma', '__minimo', '__maximo')
+
+    def __init__(self, error_relativo=0.01):
+        """
+        Args:
+            error_relativo (float): Error relativo máximo de los cuantiles (0 < e < 1)
+        """
+        if not 0 < error_relativo < 1:
+            raise ValueError("El error relativo debe estar entre 0 y 1")
+        self.__error_relativo = error_relativo
+        self.__gamma = (1 + error_relativo) / (1 - error_relativo)
+        self.__log_gamma = math.log(self.__gamma)
+        self.__positivos = _Cubetas()
+        self.__negativos = None  # Cubetas de -valor; casi nunca hay negativos
+        self.__ceros = 0
+        self.__cantidad = 0
+        self.__suma = 0
+        self.__minimo = None
+        self.__maximo = None
+
+    def get_error_relativo(self):
+        return self.__error_relativo
+
+    def calcular_cubeta(self, valor):
+        """
+        Cubeta de un valor distinto de cero (la de |valor| si es negativo).
+        Histogramas con el mismo error relativo usan las mismas cubetas, así
+        que se puede calcular una vez y pasarla a varios con agregar().
+        """
+        return math.ceil(math.log(abs(valor)) / self.__log_gamma)
+
+    def __sumar_en_cubeta(self, valor, cantidad, cubeta):
+        if valor == 0:
+            self.__ceros += cantidad
+            return
+        if cubeta is None:
+            cubeta = self.calcular_cubeta(valor)
+        if valor > 0:
+            self.__positivos.sumar(cubeta, cantidad)
+        else:
+            if self.__negativos is None:
+                self.__negativos = _Cubetas()
+            self.__negativos.sumar(cubeta, cantidad)
+
+    def agregar(self, valor, cubeta=None):
+        """
+        Agregar un valor
+
+        Args:
+            valor (int): Valor a agregar
+            cubeta (int): calcular_cubeta(valor) si ya se conoce
+        """
+        self.__sumar_en_cubeta(valor, 1, cubeta)
+        self.__cantidad += 1
+        self.__suma += valor
+        if self.__minimo is None or valor < self.__minimo:
+            self.__minimo = valor
+        if self.__maximo is None or valor > self.__maximo:
+            self.__maximo = valor
+
+    def quitar(self, valor, cubeta=None):
+        """
+        Quitar un valor agregado antes (por ejemplo, una frecuencia que se
+        sobrescribió). Si era el mínimo o el máximo, los extremos se
+        recalculan desde las cubetas que quedan.
+        """
+        self.__sumar_en_cubeta(valor, -1, cubeta)
+        self.__cantidad -= 1
+        self.__suma -= valor
+        if self.__cantidad == 0:
+            self.__minimo = None
+            self.__maximo = None
+        elif valor == self.__minimo or valor == self.__maximo:
+            self.__recalcular_extremos()
+
+    def __recalcular_extremos(self):
+        """
+        Estimar mínimo y máximo con las cubetas extremas que tienen datos;
+        quitar valores no puede ampliar el rango, así que se acotan a los
+        extremos anteriores
+        """
+        minimo_anterior, maximo_anterior = self.__minimo, self.__maximo
+        self.__minimo = None
+        for representativo, cantidad in self.__recorrer_cubetas():
+            if self.__minimo is None:
+                self.__minimo = max(representativo, minimo_anterior)
+            self.__maximo = min(representativo, maximo_anterior)
+
+    def combinar(self, otro):
+        """
+        Sumar a este histograma los valores de otro
+
+        Args:
+            otro (HistogramaLogaritmico): Histograma con el mismo error relativo
+        """
+        if otro.get_error_relativo() != self.__error_relativo:
+            raise ValueError("Solo se combinan histogramas con el mismo error relativo")
+        for cubeta, cantidad in otro.__positivos.pares_ordenados():
+            self.__positivos.sumar(cubeta, cantidad)
+        if otro.__negativos is not None:
+            if self.__negativos is None:
+                self.__negativos = _Cubetas()
+            for cubeta, cantidad in otro.__negativos.pares_ordenados():
+                self.__negativos.sumar(cubeta, cantidad)
+        self.__ceros += otro.__ceros
+        self.__cantidad += otro.__cantidad
+        self.__suma += otro.__suma
+        if otro.__minimo is not None and (self.__minimo is None or otro.__minimo < self.__minimo):
+            self.__minimo = otro.__minimo
+        if otro.__maximo is not None and (self.__maximo is None or otro.__maximo > self.__maximo):
+            self.__maximo = otro.__maximo
+
+    def clonar(self):
+        """Copia independiente del histograma"""
+        copia = HistogramaLogaritmico(self.__error_relativo)
+        copia.combinar(self)
+        return copia
+
+    def __valor_representativo(self, cubeta):
+        """Valor dentro de la cubeta con error relativo mínimo respecto de sus extremos"""
+        return 2 * self.__gamma ** cubeta / (self.__gamma + 1)
+
+    def __recorrer_cubetas(self):
+        """(valor representativo, cantidad) de todas las cubetas, de menor a mayor valor"""
+        if self.__negativos is not None:
+            for cubeta, cantidad in reversed(self.__negativos.pares_ordenados()):
+                yield -self.__valor_representativo(cubeta), cantidad
+        if self.__ceros > 0:
+            yield 0, self.__ceros
+        for cubeta, cantidad in self.__positivos.pares_ordenados():
+            yield self.__valor_representativo(cubeta), cantidad
+
+    def obtener_cantidad(self):
+        return self.__cantidad
+
+    def obtener_suma(self):
+        return self.__suma
+
+    def obtener_minimo(self):
+        return self.__minimo
+
+    def obtener_maximo(self):
+        return self.__maximo
+
+    def obtener_media(self):
+        return self.__suma / self.__cantidad if self.__cantidad > 0 else 0.0
+
+    def obtener_cuantil(self, q):
+        """
+        Estimar el cuantil q (0 <= q <= 1)
+
+        Returns:
+            float: Valor estimado, o None si el histograma está vacío
+        """
+        if self.__cantidad <= 0:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError("El cuantil debe estar entre 0 y 1")
+        rango = q * (self.__cantidad - 1)
+        acumulado = 0
+        for valor, cantidad in self.__recorrer_cubetas():
+            acumulado += cantidad
+            if acumulado > rango:
+                # Los extremos se conocen mejor que el valor de la cubeta
+                return min(max(valor, self.__minimo), self.__maximo)
+        return self.__maximo
+
+    def obtener_histograma(self):
+        """
+        Returns:
+            Lista: Diccionarios con 'desde', 'hasta' y 'cantidad' de cada
+                   cubeta con datos, de menor a mayor valor
+        """
+        histograma = Lista()
+        for valor, cantidad in self.__recorrer_cubetas():
+            cubeta = Diccionario()
+            if valor == 0:
+                cubeta.insertar('desde', 0)
+                cubeta.insertar('hasta', 0)
+            else:
+                # valor = 2 g^i / (g + 1): la cubeta es (g^(i-1), g^i]
+                hasta = abs(valor) * (self.__gamma + 1) / 2
+                desde = hasta / self.__gamma
+                if valor < 0:
+                    desde, hasta = -hasta, -desde
+                cubeta.insertar('desde', desde)
+                cubeta.insertar('hasta', hasta)
+            cubeta.insertar('cantidad', cantidad)
+            histograma.insertar(cubeta)
+        return histograma
+
+    def obtener_resumen(self):
+        """
+        Returns:
+            Diccionario: cantidad, suma, minimo, maximo, media, p50, p90 y p99
+        """
+        resumen = Diccionario()
+        resumen.insertar('cantidad', self.__cantidad)
+        resumen.insertar('suma', self.__suma)
+        resumen.insertar('minimo', self.__minimo)
+        resumen.insertar('maximo', self.__maximo)
+        resumen.insertar('media', self.obtener_media())
+        resumen.insertar('p50', self.obtener_cuantil(0.5))
+        resumen.insertar('p90', self.obtener_cuantil(0.9))
+        resumen.insertar('p99', self.obtener_cuantil(0.99))
+        return resumen
+
+    def __getstate__(self):
+        """Estado plano para pickle: las cubetas viajan como tuplas"""
+        negativos = None
+        if self.__negativos is not None:
+            negativos = tuple(self.__negativos.pares_ordenados())
+        return (self.__error_relativo, tuple(self.__positivos.pares_ordenados()), negativos,
+                self.__ceros, self.__cantidad, self.__suma, self.__minimo, self.__maximo)
+
+    def __setstate__(self, estado):
+        error_relativo, positivos, negativos, ceros, cantidad, suma, minimo, maximo = estado
+        self.__init__(error_relativo)
+        for cubeta, conteo in positivos:
+            self.__positivos.sumar(cubeta, conteo)
+        if negativos is not None:
+            self.__negativos = _Cubetas()
+            for cubeta, conteo in negativos:
+                self.__negativos.sumar(cubeta, conteo)
+        self.__ceros = ceros
+        self.__cantidad = cantidad
+        self.__suma = suma
+        self.__minimo = minimo
+        self.__maximo = maximo
+
+    def __str__(self):
+        return "HistogramaLogaritmico(cantidad={}, p50={})".format(self.__cantidad, self.obtener_cuantil(0.5))
+
+
+class DistribucionFrecuencias:
+    """
+    Histogramas de las frecuencias de un tipo de sensor de un campo, a tres
+    niveles: todo el campo, cada sensor y cada estación receptora. Se llenan
+    mientras se cargan las frecuencias (CampoAgricola.registrar_frecuencia_*)
+    y se combinan entre campos por ID de sensor y de estación, por ejemplo
+    al juntar campos procesados en paralelo. Con los sensores ya
+    materializados se rearman desde sus frecuencias (desde_sensores).
+    """
+
+    __slots__ = ('__tipo', '__error_relativo', '__campo', '__por_indice_sensor',
+                 '__por_sensor', '__por_estacion')
+
+    def __init__(self, tipo, error_relativo=0.01):
+        """
+        Args:
+            tipo (str): "suelo" o "cultivo"
+            error_relativo (float): Error relativo de los cuantiles
+        """
+        self.__tipo = tipo
+        self.__error_relativo = error_relativo
+        self.__campo = HistogramaLogaritmico(error_relativo)
+        self.__por_indice_sensor = TablaHash()  # Índice de carga del sensor -> histograma
+        self.__por_sensor = TablaHash()         # ID de sensor -> histograma
+        self.__por_estacion = TablaHash()       # ID de estación -> histograma
+
+    @staticmethod
+    def desde_sensores(tipo, sensores, error_relativo=0.01):
+        """
+        Armar la distribución de las frecuencias que tienen ahora los
+        sensores; el índice de carga de cada sensor es su posición
+
+        Args:
+            tipo (str): "suelo" o "cultivo"
+            sensores (Lista): SensorSuelo o SensorCultivo
+            error_relativo (float): Error relativo de los cuantiles
+        """
+        distribucion = DistribucionFrecuencias(tipo, error_relativo)
+        indice_sensor = 0
+        for sensor in sensores:
+            distribucion.registrar_sensor(indice_sensor, sensor.get_id())
+            for frecuencia in sensor.obtener_frecuencias():
+                distribucion.agregar(indice_sensor, frecuencia.get_id_estacion(), frecuencia.get_valor())
+            indice_sensor += 1
+        return distribucion
+
+    def get_tipo(self):
+        return self.__tipo
+
+    def get_error_relativo(self):
+        return self.__error_relativo
+
+    def __histograma_sensor(self, id_sensor):
+        histograma = self.__por_sensor.obtener(id_sensor)
+        if histograma is None:
+            histograma = HistogramaLogaritmico(self.__error_relativo)
+            self.__por_sensor.insertar(id_sensor, histograma)
+        return histograma
+
+    def __histograma_estacion(self, id_estacion):
+        histograma = self.__por_estacion.obtener(id_estacion)
+        if histograma is None:
+            histograma = HistogramaLogaritmico(self.__error_relativo)
+            self.__por_estacion.insertar(id_estacion, histograma)
+        return histograma
+
+    def registrar_sensor(self, indice_sensor, id_sensor):
+        """Asociar el índice de carga de un sensor con su ID"""
+        self.__por_indice_sensor.insertar(indice_sensor, self.__histograma_sensor(id_sensor))
+
+    def agregar(self, indice_sensor, id_estacion, valor):
+        """Agregar una frecuencia del sensor indice_sensor hacia id_estacion"""
+        cubeta = self.__campo.calcular_cubeta(valor) if valor != 0 else None
+        self.__campo.agregar(valor, cubeta)
+        self.__por_indice_sensor.obtener(indice_sensor).agregar(valor, cubeta)
+        self.__histograma_estacion(id_estacion).agregar(valor, cubeta)
+
+    def quitar(self, indice_sensor, id_estacion, valor):
+        """Quitar una frecuencia agregada antes (se sobrescribió)"""
+        cubeta = self.__campo.calcular_cubeta(valor) if valor != 0 else None
+        self.__campo.quitar(valor, cubeta)
+        self.__por_indice_sensor.obtener(indice_sensor).quitar(valor, cubeta)
+        self.__histograma_estacion(id_estacion).quitar(valor, cubeta)
+
+    def obtener_campo(self):
+        """Histograma de todas las frecuencias del campo"""
+        return self.__campo
+
+    def obtener_por_sensor(self, id_sensor):
+        """Histograma de un sensor, o None si no tiene frecuencias registradas"""
+        return self.__por_sensor.obtener(id_sensor)
+
+    def obtener_por_estacion(self, id_estacion):
+        """Histograma de las frecuencias recibidas por una estación, o None"""
+        return self.__por_estacion.obtener(id_estacion)
+
+    def obtener_ids_sensores(self):
+        return self.__por_sensor.obtener_claves()
+
+    def obtener_ids_estaciones(self):
+        return self.__por_estacion.obtener_claves()
+
+    def combinar(self, otra):
+        """
+        Sumar a esta distribución la de otro campo. Los sensores y estaciones
+        con el mismo ID se combinan en un solo histograma.
+        """
+        self.__campo.combinar(otra.obtener_campo())
+        for par in otra.__por_sensor.obtener_pares():
+            self.__histograma_sensor(par.get_clave()).combinar(par.get_valor())
+        for par in otra.__por_estacion.obtener_pares():
+            self.__histograma_estacion(par.get_clave()).combinar(par.get_valor())
+
+    def __ids_por_indice_sensor(self):
+        """Pares (índice de carga, ID de sensor) de los sensores registrados"""
+        ids_por_histograma = TablaHash()
+        for par in self.__por_sensor.obtener_pares():
+            ids_por_histograma.insertar(id(par.get_valor()), par.get_clave())
+        pares = Lista()
+        for par in self.__por_indice_sensor.obtener_pares():
+            pares.insertar((par.get_clave(), ids_por_histograma.obtener(id(par.get_valor()))))
+        return pares
+
+    def clonar(self):
+        """
+        Copia independiente, con los mismos índices de carga para que el
+        campo clonado pueda seguir registrando y cambiando frecuencias
+        """
+        copia = DistribucionFrecuencias(self.__tipo, self.__error_relativo)
+        copia.combinar(self)
+        for indice_sensor, id_sensor in self.__ids_por_indice_sensor():
+            copia.__por_indice_sensor.insertar(indice_sensor, copia.__por_sensor.obtener(id_sensor))
+        return copia
+
+    def __getstate__(self):
+        """
+        Estado plano para pickle (para combinar campos procesados en otros
+        procesos); lleva los índices de carga para que el campo recibido
+        pueda seguir cambiando frecuencias
+        """
+        return (self.__tipo, self.__error_relativo, self.__campo,
+                tuple((par.get_clave(), par.get_valor()) for par in self.__por_sensor.obtener_pares()),
+                tuple((par.get_clave(), par.get_valor()) for par in self.__por_estacion.obtener_pares()),
+                tuple(self.__ids_por_indice_sensor()))
+
+    def __setstate__(self, estado):
+        tipo, error_relativo, campo, por_sensor, por_estacion, ids_por_indice = estado
+        self.__init__(tipo, error_relativo)
+        self.__campo = campo
+        for id_sensor, histograma in por_sensor:
+            self.__por_sensor.insertar(id_sensor, histograma)
+        for id_estacion, histograma in por_estacion:
+            self.__por_estacion.insertar(id_estacion, histograma)
+        for indice_sensor, id_sensor in ids_por_indice:
+            self.__por_indice_sensor.insertar(indice_sensor, self.__histograma_sensor(id_sensor))
+
+    def obtener_resumen(self):
+        """Resumen del histograma del campo (ver HistogramaLogaritmico.obtener_resumen)"""
+        return self.__campo.obtener_resumen()
@@ -7,6 +7,8 @@ class EstacionBase:
     y los transmite a la plataforma en la nube.
     """
     
+    __slots__ = ('__id', '__nombre', '__activa', '__ubicacion')
+    
     def __init__(self, id, nombre):
         """
         Inicializar estación base con ID y nombre
@@ -7,6 +7,9 @@ class Frecuencia:
     entre un sensor específico y una estación base.
     """
     
+    # Sin __dict__ por instancia: un campo grande puede tener millones de frecuencias
+    __slots__ = ('__id_estacion', '__valor', '__timestamp')
+    
     def __init__(self, id_estacion, valor):
         """
         Inicializar frecuencia con ID de estación y valor
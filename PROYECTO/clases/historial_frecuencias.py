@@ -0,0 +1,288 @@
+# clases/historial_frecuencias.py
+# Historial de mediciones de frecuencia por (sensor, estación) con consultas por ventana de tiempo
+
+from array import array
+from .tabla_hash import TablaHash
+
+def convertir_tiempo(tiempo):
+    """
+    Tiempo de una medición como entero (la unidad la elige quien registra,
+    por ejemplo segundos desde epoch). Acepta enteros, flotantes y datetime.
+    """
+    if hasattr(tiempo, 'timestamp'):
+        return int(tiempo.timestamp())
+    return int(tiempo)
+
+
+class VentanaTiempo:
+    """
+    Intervalo cerrado [desde, hasta] y la agregación con la que cada serie
+    se resume a un valor dentro de él. desde/hasta en None no acotan.
+
+    Agregaciones: "ultimo", "promedio", "maximo", "minimo", "suma", "cantidad"
+    """
+
+    __slots__ = ('__desde', '__hasta', '__agregacion')
+
+    AGREGACIONES = ('ultimo', 'promedio', 'maximo', 'minimo', 'suma', 'cantidad')
+
+    def __init__(self, desde=None, hasta=None, agregacion="ultimo"):
+        if agregacion not in self.AGREGACIONES:
+            raise ValueError("Agregación desconocida: {}".format(agregacion))
+        self.__desde = convertir_tiempo(desde) if desde is not None else None
+        self.__hasta = convertir_tiempo(hasta) if hasta is not None else None
+        self.__agregacion = agregacion
+
+    @classmethod
+    def ultimos(cls, duracion, hasta, agregacion="ultimo"):
+        """Ventana móvil: las mediciones de los últimos 'duracion' tiempos hasta 'hasta' inclusive"""
+        hasta = convertir_tiempo(hasta)
+        return cls(hasta - duracion + 1, hasta, agregacion)
+
+    def get_desde(self):
+        return self.__desde
+
+    def get_hasta(self):
+        return self.__hasta
+
+    def get_agregacion(self):
+        return self.__agregacion
+
+    def __str__(self):
+        return "VentanaTiempo([{}, {}], {})".format(self.__desde, self.__hasta, self.__agregacion)
+
+
+class SerieFrecuencias:
+    """
+    Mediciones (tiempo, valor) de un sensor hacia una estación, en orden de
+    tiempo, en dos arreglos de enteros de 64 bits. Los arreglos crecen a
+    medida que llegan mediciones hasta 'capacidad'; desde ahí funcionan como
+    buffer circular y cada medición nueva reemplaza a la más antigua.
+    """
+
+    __slots__ = ('__tiempos', '__valores', '__capacidad', '__inicio', '__descartadas')
+
+    def __init__(self, capacidad):
+        if capacidad < 1:
+            raise ValueError("La capacidad debe ser al menos 1")
+        self.__tiempos = array('q')
+        self.__valores = array('q')
+        self.__capacidad = capacidad
+        self.__inicio = 0  # Posición física de la medición más antigua
+        self.__descartadas = 0
+
+    def agregar(self, tiempo, valor):
+        """
+        Agregar una medición; el tiempo no puede ser anterior al de la última
+
+        Raises:
+            ValueError: Si la medición llega fuera de orden
+        """
+        cantidad = len(self.__tiempos)
+        if cantidad > 0 and tiempo < self.__tiempos[self.__posicion(cantidad - 1)]:
+            raise ValueError("Medición fuera de orden: {} es anterior a la última registrada".format(tiempo))
+        if cantidad < self.__capacidad:
+            self.__tiempos.append(tiempo)
+            self.__valores.append(valor)
+            return
+        self.__tiempos[self.__inicio] = tiempo
+        self.__valores[self.__inicio] = valor
+        self.__inicio = (self.__inicio + 1) % self.__capacidad
+        self.__descartadas += 1
+
+    def __posicion(self, k):
+        """Posición física de la k-ésima medición en orden de tiempo"""
+        return (self.__inicio + k) % len(self.__tiempos)
+
+    def __buscar(self, tiempo, incluir_iguales):
+        """
+        Primera k cuyo tiempo es >= tiempo (o > tiempo si incluir_iguales),
+        por búsqueda binaria sobre el orden lógico
+        """
+        izquierda = 0
+        derecha = len(self.__tiempos)
+        while izquierda < derecha:
+            medio = (izquierda + derecha) // 2
+            actual = self.__tiempos[self.__posicion(medio)]
+            if actual < tiempo or (incluir_iguales and actual == tiempo):
+                izquierda = medio + 1
+            else:
+                derecha = medio
+        return izquierda
+
+    def rango(self, desde=None, hasta=None):
+        """Rango [k_inicio, k_fin) de las mediciones con desde <= tiempo <= hasta"""
+        k_inicio = self.__buscar(desde, False) if desde is not None else 0
+        k_fin = self.__buscar(hasta, True) if hasta is not None else len(self.__tiempos)
+        return k_inicio, max(k_inicio, k_fin)
+
+    def obtener_mediciones(self, desde=None, hasta=None):
+        """Generador de (tiempo, valor) dentro de [desde, hasta], en orden de tiempo"""
+        k, k_fin = self.rango(desde, hasta)
+        while k < k_fin:
+            posicion = self.__posicion(k)
+            yield self.__tiempos[posicion], self.__valores[posicion]
+            k += 1
+
+    def obtener_ultima(self):
+        """(tiempo, valor) de la medición más reciente, o None si no hay"""
+        if not self.__tiempos:
+            return None
+        posicion = self.__posicion(len(self.__tiempos) - 1)
+        return self.__tiempos[posicion], self.__valores[posicion]
+
+    def agregar_ventana(self, desde=None, hasta=None, agregacion="ultimo"):
+        """
+        Resumir las mediciones de [desde, hasta]
+
+        Returns:
+            Valor agregado (float para "promedio"), o None si no hay mediciones
+            en la ventana (0 para "cantidad")
+        """
+        k, k_fin = self.rango(desde, hasta)
+        if agregacion == "cantidad":
+            return k_fin - k
+        if k == k_fin:
+            return None
+        if agregacion == "ultimo":
+            return self.__valores[self.__posicion(k_fin - 1)]
+
+        cantidad = k_fin - k
+        suma = 0
+        minimo = maximo = self.__valores[self.__posicion(k)]
+        while k < k_fin:
+            valor = self.__valores[self.__posicion(k)]
+            suma += valor
+            if valor < minimo:
+                minimo = valor
+            elif valor > maximo:
+                maximo = valor
+            k += 1
+        if agregacion == "suma":
+            return suma
+        if agregacion == "maximo":
+            return maximo
+        if agregacion == "minimo":
+            return minimo
+        if agregacion == "promedio":
+            return suma / cantidad
+        raise ValueError("Agregación desconocida: {}".format(agregacion))
+
+    def obtener_cantidad(self):
+        return len(self.__tiempos)
+
+    def obtener_descartadas(self):
+        """Mediciones reemplazadas por llegar otras con el buffer lleno"""
+        return self.__descartadas
+
+    def obtener_tiempo_inicial(self):
+        return self.__tiempos[self.__posicion(0)] if self.__tiempos else None
+
+    def clonar(self):
+        copia = SerieFrecuencias(self.__capacidad)
+        copia.__tiempos = array('q', self.__tiempos)
+        copia.__valores = array('q', self.__valores)
+        copia.__inicio = self.__inicio
+        copia.__descartadas = self.__descartadas
+        return copia
+
+    def __len__(self):
+        return len(self.__tiempos)
+
+
+class HistorialFrecuencias:
+    """
+    Historial de mediciones de un tipo de sensor: una SerieFrecuencias por
+    cada par (ID de sensor, ID de estación) que recibió mediciones. Solo se
+    agregan mediciones; los valores actuales del campo no cambian.
+
+    recorrer_ventana() resume cada serie en una ventana de tiempo, y es lo
+    que usa ProcesadorMatrices para construir matrices de frecuencias sobre
+    una ventana móvil sin volver a cargar el XML.
+    """
+
+    CAPACIDAD_SERIE = 1024
+
+    def __init__(self, tipo, capacidad_serie=CAPACIDAD_SERIE):
+        """
+        Args:
+            tipo (str): "suelo" o "cultivo"
+            capacidad_serie (int): Mediciones que se conservan por serie
+        """
+        self.__tipo = tipo
+        self.__capacidad_serie = capacidad_serie
+        self.__series = TablaHash()  # (id_sensor, id_estacion) -> SerieFrecuencias
+        self.__mediciones = 0
+        self.__tiempo_maximo = None
+
+    def get_tipo(self):
+        return self.__tipo
+
+    def registrar(self, id_sensor, id_estacion, valor, tiempo):
+        """
+        Agregar una medición del sensor hacia la estación
+
+        Raises:
+            ValueError: Si es anterior a la última medición del mismo par
+        """
+        tiempo = convertir_tiempo(tiempo)
+        clave = (id_sensor, id_estacion)
+        serie = self.__series.obtener(clave)
+        if serie is None:
+            serie = SerieFrecuencias(self.__capacidad_serie)
+            self.__series.insertar(clave, serie)
+        serie.agregar(tiempo, int(valor))
+        self.__mediciones += 1
+        if self.__tiempo_maximo is None or tiempo > self.__tiempo_maximo:
+            self.__tiempo_maximo = tiempo
+
+    def registrar_frecuencia(self, id_sensor, frecuencia):
+        """Agregar una Frecuencia usando su timestamp como tiempo de la medición"""
+        if frecuencia.get_timestamp() is None:
+            raise ValueError("La frecuencia hacia {} no tiene timestamp".format(frecuencia.get_id_estacion()))
+        self.registrar(id_sensor, frecuencia.get_id_estacion(), frecuencia.get_valor(), frecuencia.get_timestamp())
+
+    def obtener_serie(self, id_sensor, id_estacion):
+        """SerieFrecuencias del par, o None si no tiene mediciones"""
+        return self.__series.obtener((id_sensor, id_estacion))
+
+    def recorrer_ventana(self, ventana):
+        """
+        Generador de (id_sensor, id_estacion, valor) por cada serie con
+        mediciones en la ventana. El valor es entero, como en las matrices:
+        el promedio se redondea.
+
+        Args:
+            ventana (VentanaTiempo): Intervalo y agregación
+        """
+        desde = ventana.get_desde()
+        hasta = ventana.get_hasta()
+        agregacion = ventana.get_agregacion()
+        for par in self.__series.obtener_pares():
+            valor = par.get_valor().agregar_ventana(desde, hasta, agregacion)
+            if valor is None or (agregacion == "cantidad" and valor == 0):
+                continue
+            id_sensor, id_estacion = par.get_clave()
+            yield id_sensor, id_estacion, int(round(valor)) if agregacion == "promedio" else valor
+
+    def obtener_cantidad_series(self):
+        return self.__series.obtener_tamaño()
+
+    def obtener_cantidad_mediciones(self):
+        """Mediciones registradas (incluye las que ya se descartaron por capacidad)"""
+        return self.__mediciones
+
+    def obtener_tiempo_maximo(self):
+        """Tiempo de la medición más reciente, o None si no hay mediciones"""
+        return self.__tiempo_maximo
+
+    def esta_vacio(self):
+        return self.__mediciones == 0
+
+    def clonar(self):
+        copia = HistorialFrecuencias(self.__tipo, self.__capacidad_serie)
+        for par in self.__series.obtener_pares():
+            copia.__series.insertar(par.get_clave(), par.get_valor().clonar())
+        copia.__mediciones = self.__mediciones
+        copia.__tiempo_maximo = self.__tiempo_maximo
+        return copia
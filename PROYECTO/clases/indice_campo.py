@@ -0,0 +1,130 @@
+# clases/indice_campo.py
+# Índice inmutable de un campo: ID <-> ordinal de estaciones y sensores, con sus etiquetas
+
+from clases.arreglo import Arreglo
+from clases.tabla_hash import TablaHash
+
+class IndiceCampo:
+    """
+    Ordinales de las estaciones (filas de las matrices) y de los sensores de
+    suelo y de cultivo (columnas), resueltos una vez para todo el proceso:
+    de ID a ordinal con una TablaHash y de ordinal a ID o nombre con un
+    Arreglo, ambos en O(1). Lo construye CampoAgricola.obtener_indice() y
+    no cambia: si el campo agrega o quita estaciones o sensores, el campo
+    arma un índice nuevo. Los Arreglo y TablaHash que entrega son de solo
+    lectura.
+    """
+
+    __slots__ = ('__ids_estaciones', '__ordinales_estaciones', '__ids_suelo', '__nombres_suelo',
+                 '__ordinales_suelo', '__ids_cultivo', '__nombres_cultivo', '__ordinales_cultivo')
+
+    def __init__(self, ids_estaciones, ids_suelo, nombres_suelo, ids_cultivo, nombres_cultivo):
+        """
+        Args:
+            ids_estaciones (Lista): IDs de estación en orden de fila
+            ids_suelo (Lista): IDs de los sensores de suelo en orden de columna
+            nombres_suelo (Lista): Nombres de los sensores de suelo, en el mismo orden
+            ids_cultivo (Lista): IDs de los sensores de cultivo en orden de columna
+            nombres_cultivo (Lista): Nombres de los sensores de cultivo, en el mismo orden
+        """
+        self.__ids_estaciones, self.__ordinales_estaciones = self.__indexar(ids_estaciones)
+        self.__ids_suelo, self.__ordinales_suelo = self.__indexar(ids_suelo)
+        self.__ids_cultivo, self.__ordinales_cultivo = self.__indexar(ids_cultivo)
+        self.__nombres_suelo = self.__copiar(nombres_suelo)
+        self.__nombres_cultivo = self.__copiar(nombres_cultivo)
+
+    @staticmethod
+    def __copiar(elementos):
+        """Arreglo con los elementos de una Lista, en orden"""
+        arreglo = Arreglo(elementos.obtener_tamaño())
+        posicion = 0
+        for elemento in elementos:
+            arreglo.asignar(posicion, elemento)
+            posicion += 1
+        return arreglo
+
+    @staticmethod
+    def __indexar(ids):
+        """Arreglo ordinal -> ID y TablaHash ID -> ordinal (gana el primero si se repite)"""
+        arreglo = IndiceCampo.__copiar(ids)
+        ordinales = TablaHash(arreglo.obtener_tamaño())
+        posicion = 0
+        for id_elemento in arreglo:
+            if not ordinales.contiene_clave(id_elemento):
+                ordinales.insertar(id_elemento, posicion)
+            posicion += 1
+        return arreglo, ordinales
+
+    def __por_tipo(self, tipo):
+        if tipo == "suelo":
+            return self.__ids_suelo, self.__nombres_suelo, self.__ordinales_suelo
+        if tipo == "cultivo":
+            return self.__ids_cultivo, self.__nombres_cultivo, self.__ordinales_cultivo
+        raise ValueError("Tipo de sensor desconocido: {}".format(tipo))
+
+    def obtener_cantidad_estaciones(self):
+        return self.__ids_estaciones.obtener_tamaño()
+
+    def obtener_cantidad_sensores(self, tipo):
+        """Sensores de un tipo ("suelo" o "cultivo")"""
+        return self.__por_tipo(tipo)[0].obtener_tamaño()
+
+    def obtener_ordinal_estacion(self, id_estacion):
+        """Fila de una estación, o -1 si el ID no es de ninguna estación"""
+        return self.__ordinales_estaciones.obtener(id_estacion, -1)
+
+    def obtener_id_estacion(self, ordinal):
+        """ID de la estación de una fila"""
+        return self.__ids_estaciones.obtener(ordinal)
+
+    def obtener_ordinal_sensor(self, tipo, id_sensor):
+        """Columna de un sensor de un tipo, o -1 si no existe"""
+        return self.__por_tipo(tipo)[2].obtener(id_sensor, -1)
+
+    def obtener_id_sensor(self, tipo, ordinal):
+        """ID del sensor de una columna"""
+        return self.__por_tipo(tipo)[0].obtener(ordinal)
+
+    def obtener_nombre_sensor(self, tipo, ordinal):
+        """Nombre del sensor de una columna"""
+        return self.__por_tipo(tipo)[1].obtener(ordinal)
+
+    def obtener_etiquetas_estaciones(self):
+        """
+        Returns:
+            Arreglo: ID de cada estación en orden de fila (etiquetas de filas)
+        """
+        return self.__ids_estaciones
+
+    def obtener_etiquetas_sensores(self, tipo):
+        """
+        Returns:
+            Arreglo: ID de cada sensor del tipo en orden de columna (etiquetas de columnas)
+        """
+        return self.__por_tipo(tipo)[0]
+
+    def obtener_nombres_sensores(self, tipo):
+        """
+        Returns:
+            Arreglo: Nombre de cada sensor del tipo en orden de columna
+        """
+        return self.__por_tipo(tipo)[1]
+
+    def obtener_mapa_estaciones(self):
+        """
+        Returns:
+            TablaHash: ID de estación -> fila
+        """
+        return self.__ordinales_estaciones
+
+    def obtener_mapa_sensores(self, tipo):
+        """
+        Returns:
+            TablaHash: ID de sensor del tipo -> columna
+        """
+        return self.__por_tipo(tipo)[2]
+
+    def __str__(self):
+        return "IndiceCampo(estaciones={}, sensores_suelo={}, sensores_cultivo={})".format(
+            self.__ids_estaciones.obtener_tamaño(), self.__ids_suelo.obtener_tamaño(),
+            self.__ids_cultivo.obtener_tamaño())
@@ -2,8 +2,11 @@
 # Implementación de lista enlazada personalizada
 # Esta clase reemplaza las listas nativas de Python según las restricciones del proyecto
 
+import heapq
 from clases.nodo import Nodo
+from clases.arreglo import Arreglo
 from clases.contador import Contador
+
 class Lista:
     """
     Implementación de lista enlazada simple personalizada.
@@ -13,6 +16,7 @@ class Lista:
     def __init__(self):
         """Inicializar lista vacía"""
         self.__primero = None  # Referencia al primer nodo
+        self.__ultimo = None  # Referencia al último nodo (inserción al final en O(1))
         self.__tamaño = 0  # Contador de elementos en la lista
     
     def insertar(self, dato):
@@ -28,12 +32,10 @@ class Lista:
             # Lista vacía - el nuevo nodo es el primero
             self.__primero = nuevo_nodo
         else:
-            # Buscar el último nodo y agregar el nuevo
-            actual = self.__primero
-            while actual.get_siguiente() is not None:
-                actual = actual.get_siguiente()
-            actual.set_siguiente(nuevo_nodo)
+            # Enlazar después del último nodo
+            self.__ultimo.set_siguiente(nuevo_nodo)
         
+        self.__ultimo = nuevo_nodo
         self.__tamaño += 1
     
     def insertar_al_inicio(self, dato):
@@ -46,6 +48,8 @@ class Lista:
         nuevo_nodo = Nodo(dato)
         nuevo_nodo.set_siguiente(self.__primero)
         self.__primero = nuevo_nodo
+        if self.__ultimo is None:
+            self.__ultimo = nuevo_nodo
         self.__tamaño += 1
     
     def insertar_en_posicion(self, dato, posicion):
@@ -134,6 +138,8 @@ class Lista:
         # Si el elemento a eliminar es el primero
         if self.__primero.get_dato() == dato:
             self.__primero = self.__primero.get_siguiente()
+            if self.__primero is None:
+                self.__ultimo = None
             self.__tamaño -= 1
             return True
         
@@ -142,6 +148,8 @@ class Lista:
         while actual.get_siguiente() is not None:
             if actual.get_siguiente().get_dato() == dato:
                 actual.set_siguiente(actual.get_siguiente().get_siguiente())
+                if actual.get_siguiente() is None:
+                    self.__ultimo = actual
                 self.__tamaño -= 1
                 return True
             actual = actual.get_siguiente()
@@ -164,6 +172,8 @@ class Lista:
         if posicion == 0:
             dato = self.__primero.get_dato()
             self.__primero = self.__primero.get_siguiente()
+            if self.__primero is None:
+                self.__ultimo = None
             self.__tamaño -= 1
             return dato
         
@@ -177,6 +187,8 @@ class Lista:
                 
         dato = actual.get_siguiente().get_dato()
         actual.set_siguiente(actual.get_siguiente().get_siguiente())
+        if actual.get_siguiente() is None:
+            self.__ultimo = actual
         self.__tamaño -= 1
         
         return dato
@@ -265,6 +277,7 @@ class Lista:
     def limpiar(self):
         """Vaciar completamente la lista"""
         self.__primero = None
+        self.__ultimo = None
         self.__tamaño = 0
     
     def contiene(self, dato):
@@ -293,14 +306,10 @@ class Lista:
         Returns:
             El último elemento o None si la lista está vacía
         """
-        if self.__primero is None:
+        if self.__ultimo is None:
             return None
         
-        actual = self.__primero
-        while actual.get_siguiente() is not None:
-            actual = actual.get_siguiente()
-        
-        return actual.get_dato()
+        return self.__ultimo.get_dato()
     
     def filtrar(self, criterio):
         """
@@ -342,6 +351,186 @@ class Lista:
         
         return lista_mapeada
     
+    def ordenar(self, clave=None, inverso=False):
+        """
+        Ordenar la lista en el lugar con merge sort de abajo hacia arriba:
+        O(n log n), estable (los iguales conservan su orden) y sin recursión,
+        re-enlazando los nodos existentes. La clave se calcula una vez por
+        elemento y solo se compara con <. Si la clave o una comparación
+        lanzan una excepción, la lista queda como estaba.
+        
+        Args:
+            clave: Función que recibe un elemento y retorna el valor a comparar
+                   (None: se comparan los elementos)
+            inverso (bool): True para ordenar de mayor a menor
+        """
+        if self.__tamaño < 2:
+            return
+        
+        # Nodos en el orden original, para dejar la lista como estaba si la
+        # clave o una comparación lanzan una excepción
+        nodos = Arreglo(self.__tamaño)
+        posicion = 0
+        actual = self.__primero
+        while actual is not None:
+            nodos.asignar(posicion, actual)
+            posicion += 1
+            actual = actual.get_siguiente()
+        
+        try:
+            # Guardar clave y dato en cada nodo mientras dura el ordenamiento
+            posicion = 0
+            while posicion < self.__tamaño:
+                nodo = nodos.obtener(posicion)
+                dato = nodo.get_dato()
+                nodo.set_dato(_ClaveOrden(clave(dato) if clave is not None else dato, dato))
+                posicion += 1
+            
+            cabecera = Nodo(None)
+            cabecera.set_siguiente(self.__primero)
+            ancho = 1
+            while ancho < self.__tamaño:
+                anterior = cabecera
+                actual = cabecera.get_siguiente()
+                while actual is not None:
+                    izquierda = actual
+                    derecha = Lista.__cortar(izquierda, ancho)
+                    actual = Lista.__cortar(derecha, ancho)
+                    anterior = Lista.__fusionar_nodos(izquierda, derecha, anterior, inverso)
+                ancho *= 2
+            self.__primero = cabecera.get_siguiente()
+        except Exception:
+            posicion = 0
+            while posicion < self.__tamaño:
+                nodo = nodos.obtener(posicion)
+                if posicion < self.__tamaño - 1:
+                    nodo.set_siguiente(nodos.obtener(posicion + 1))
+                else:
+                    nodo.set_siguiente(None)
+                if isinstance(nodo.get_dato(), _ClaveOrden):
+                    nodo.set_dato(nodo.get_dato().dato)
+                posicion += 1
+            self.__primero = nodos.obtener(0)
+            raise
+        
+        actual = self.__primero
+        while actual is not None:
+            actual.set_dato(actual.get_dato().dato)
+            self.__ultimo = actual
+            actual = actual.get_siguiente()
+    
+    @staticmethod
+    def __cortar(nodo, cantidad):
+        """Separar la cadena después de 'cantidad' nodos; retorna el resto"""
+        while nodo is not None and cantidad > 1:
+            nodo = nodo.get_siguiente()
+            cantidad -= 1
+        if nodo is None:
+            return None
+        resto = nodo.get_siguiente()
+        nodo.set_siguiente(None)
+        return resto
+    
+    @staticmethod
+    def __fusionar_nodos(izquierda, derecha, anterior, inverso):
+        """Enlazar tras 'anterior' la mezcla de dos cadenas ordenadas; retorna el último nodo"""
+        while izquierda is not None and derecha is not None:
+            # Ante claves iguales gana la izquierda (estabilidad)
+            if inverso:
+                tomar_izquierda = not (izquierda.get_dato().clave < derecha.get_dato().clave)
+            else:
+                tomar_izquierda = not (derecha.get_dato().clave < izquierda.get_dato().clave)
+            if tomar_izquierda:
+                anterior.set_siguiente(izquierda)
+                izquierda = izquierda.get_siguiente()
+            else:
+                anterior.set_siguiente(derecha)
+                derecha = derecha.get_siguiente()
+            anterior = anterior.get_siguiente()
+        anterior.set_siguiente(izquierda if izquierda is not None else derecha)
+        while anterior.get_siguiente() is not None:
+            anterior = anterior.get_siguiente()
+        return anterior
+    
+    @staticmethod
+    def fusionar_ordenadas(listas, clave=None, inverso=False):
+        """
+        Mezcla de k vías de listas ya ordenadas (con la misma clave y
+        sentido) usando un heap: O(n log k). Ante claves iguales van primero
+        los elementos de la lista que aparece antes en 'listas'.
+        
+        Args:
+            listas: Lista (o iterable) de Listas ordenadas
+            clave: Función de clave (None: se comparan los elementos)
+            inverso (bool): True si las listas están de mayor a menor
+            
+        Returns:
+            Lista: Nueva lista con todos los elementos ordenados
+        """
+        heap = []
+        indice = 0
+        for lista in listas:
+            iterador = lista.crear_iterador()
+            if iterador.hay_siguiente():
+                dato = iterador.siguiente()
+                heap.append((Lista.__clave_orden(dato, clave, inverso), indice, dato, iterador))
+            indice += 1
+        heapq.heapify(heap)
+        
+        resultado = Lista()
+        while heap:
+            _, indice, dato, iterador = heap[0]
+            resultado.insertar(dato)
+            if iterador.hay_siguiente():
+                dato = iterador.siguiente()
+                heapq.heapreplace(heap, (Lista.__clave_orden(dato, clave, inverso), indice, dato, iterador))
+            else:
+                heapq.heappop(heap)
+        return resultado
+    
+    def seleccionar_primeros(self, k, clave=None, inverso=False):
+        """
+        Los k primeros elementos según el orden de ordenar(clave, inverso),
+        sin ordenar la lista: un heap de tamaño k en O(n log k). El resultado
+        coincide con los k primeros de la lista ordenada (también en empates).
+        
+        Args:
+            k (int): Cantidad de elementos a seleccionar
+            clave: Función de clave (None: se comparan los elementos)
+            inverso (bool): True para los k mayores
+            
+        Returns:
+            Lista: Nueva lista con hasta k elementos, ya ordenados
+        """
+        seleccion = Lista()
+        if k <= 0:
+            return seleccion
+        
+        # El tope del heap es el peor seleccionado: rango (clave, posición) mayor
+        heap = []
+        posicion = 0
+        actual = self.__primero
+        while actual is not None:
+            dato = actual.get_dato()
+            rango = (Lista.__clave_orden(dato, clave, inverso), posicion)
+            if len(heap) < k:
+                heapq.heappush(heap, (_Invertido(rango), dato))
+            elif rango < heap[0][0].valor:
+                heapq.heapreplace(heap, (_Invertido(rango), dato))
+            posicion += 1
+            actual = actual.get_siguiente()
+        
+        # Se extraen del peor al mejor
+        while heap:
+            seleccion.insertar_al_inicio(heapq.heappop(heap)[1])
+        return seleccion
+    
+    @staticmethod
+    def __clave_orden(dato, clave, inverso):
+        """Valor que ordenado de menor a mayor respeta clave e inverso"""
+        valor = clave(dato) if clave is not None else dato
+        return _Invertido(valor) if inverso else valor
+    
     def __str__(self):
         """
         Representación en string de la lista
@@ -374,10 +563,51 @@ class Lista:
         """Hacer la Lista iterable con bucles for de Python"""
         return IteradorLista(self.__primero)
 
+    def __getstate__(self):
+        """
+        Estado para pickle como tupla plana de los elementos. Serializar los
+        nodos enlazados anidaría una llamada por nodo y las listas largas
+        superarían el límite de recursión al enviarse a otros procesos.
+        """
+        return tuple(self)
+
+    def __setstate__(self, estado):
+        """Reconstruir la lista desde la tupla de elementos"""
+        self.__init__()
+        for dato in estado:
+            self.insertar(dato)
+
+
+class _ClaveOrden:
+    """Clave y dato de un nodo mientras Lista.ordenar() lo re-enlaza"""
+    
+    __slots__ = ('clave', 'dato')
+    
+    def __init__(self, clave, dato):
+        self.clave = clave
+        self.dato = dato
+
+
+class _Invertido:
+    """Envoltorio que invierte la comparación de un valor (orden descendente en heaps)"""
+    
+    __slots__ = ('valor',)
+    
+    def __init__(self, valor):
+        self.valor = valor
+    
+    def __lt__(self, otro):
+        return otro.valor < self.valor
+    
+    def __eq__(self, otro):
+        return self.valor == otro.valor
+
 
 class IteradorLista:
     """Iterador personalizado para la lista enlazada"""
     
+    __slots__ = ('__actual',)
+    
     def __init__(self, primer_nodo):
         self.__actual = primer_nodo
     
@@ -1,13 +1,20 @@
 # clases/matriz.py (corregido)
 from .lista import Lista
 from .contador import Contador
+from .arreglo import Arreglo
 
 class Matriz:
-    def __init__(self, filas, columnas):
+    def __init__(self, filas, columnas, valores=None):
+        """
+        Crear matriz de filas x columnas.
+        Si se da 'valores' (secuencia plana en orden fila por fila, de tamaño
+        filas*columnas) la matriz se llena con ellos; si no, con ceros.
+        """
         self.filas = filas
         self.columnas = columnas
         self.datos = Lista()
         
+        posicion = 0
         contador_filas = Contador(0, filas)
         while contador_filas.hay_siguiente():
             i = contador_filas.siguiente()
@@ -16,7 +23,8 @@ class Matriz:
             contador_columnas = Contador(0, columnas)
             while contador_columnas.hay_siguiente():
                 j = contador_columnas.siguiente()
-                fila.insertar(0)
+                fila.insertar(valores[posicion] if valores is not None else 0)
+                posicion += 1
             
             self.datos.insertar(fila)
 
@@ -61,6 +69,18 @@ class Matriz:
         else:
             raise IndexError("Número de fila fuera de rango")
 
+    def recorrer_filas(self):
+        """
+        Recorrer las filas en orden, una sola vez y sin copiarlas (a
+        diferencia de obtener_fila, que busca la fila desde el principio)
+
+        Yields:
+            Lista: Valores de cada fila, de solo lectura
+        """
+        iterador_filas = self.datos.crear_iterador()
+        while iterador_filas.hay_siguiente():
+            yield iterador_filas.siguiente()
+
     def obtener_columna(self, numero_columna):
         """Obtener columna completa como Lista personalizada"""
         if 0 <= numero_columna < self.columnas:
@@ -92,6 +112,34 @@ class Matriz:
         
         return matriz_patron
 
+    def obtener_firmas_filas(self):
+        """
+        Recorrer la matriz una vez y resumir cada fila como un entero:
+        el bit j está encendido si el valor de la columna j es mayor que 0.
+        Dos filas tienen el mismo patrón si y solo si sus firmas son iguales,
+        y la distancia de Hamming entre patrones es la cantidad de bits
+        encendidos en firma1 ^ firma2.
+
+        Returns:
+            Arreglo: Firma (int) de cada fila
+        """
+        firmas = Arreglo(self.filas, 0)
+
+        i = 0
+        iterador_filas = self.datos.crear_iterador()
+        while iterador_filas.hay_siguiente():
+            firma = 0
+            bit = 1
+            iterador_valores = iterador_filas.siguiente().crear_iterador()
+            while iterador_valores.hay_siguiente():
+                if iterador_valores.siguiente() > 0:
+                    firma |= bit
+                bit <<= 1
+            firmas.asignar(i, firma)
+            i += 1
+
+        return firmas
+
     def _comparar_listas(self, lista1, lista2):
         if lista1.obtener_tamaño() != lista2.obtener_tamaño():
             return False
@@ -0,0 +1,158 @@
+# clases/matriz_buffer.py
+# Matriz guardada como bloque plano de enteros de 64 bits sobre cualquier buffer
+
+from .lista import Lista
+from .arreglo import Arreglo
+from .contador import Contador
+from .matriz import Matriz
+
+class MatrizBuffer(Matriz):
+    """
+    Matriz con la misma interfaz que Matriz, pero cuyas celdas viven en un
+    buffer plano (bytearray, mmap, memoria compartida...) con enteros de
+    64 bits en orden fila por fila. get_valor/set_valor cuestan O(1) y las
+    filas pueden leerse sin copiar mediante memoryview.
+    """
+
+    TAMAÑO_CELDA = 8
+
+    def __init__(self, filas, columnas, buffer=None):
+        """
+        Crear matriz sobre un buffer existente o sobre uno nuevo lleno de ceros
+
+        Args:
+            filas (int): Cantidad de filas
+            columnas (int): Cantidad de columnas
+            buffer: Objeto con protocolo de buffer, escribible, de al menos
+                    filas*columnas*8 bytes (None: se crea un bytearray)
+        """
+        self.filas = filas
+        self.columnas = columnas
+        self.datos = None  # Las celdas no están en Listas
+
+        tamaño = filas * columnas * self.TAMAÑO_CELDA
+        if buffer is None:
+            buffer = bytearray(tamaño)
+        vista = memoryview(buffer)
+        if vista.format != 'B':
+            # Buffers tipados (por ejemplo array('q')) se ven como bytes para poder convertirlos
+            tipada = vista
+            vista = tipada.cast('B')
+            tipada.release()
+        if vista.nbytes < tamaño:
+            vista.release()
+            raise ValueError("El buffer tiene {} bytes, se necesitan {}".format(vista.nbytes, tamaño))
+        self._vista_bytes = vista
+        self.valores = vista[:tamaño].cast('q')
+
+    def _posicion(self, fila, columna):
+        if not (0 <= fila < self.filas and 0 <= columna < self.columnas):
+            raise IndexError("Índices fuera de rango")
+        return fila * self.columnas + columna
+
+    def set_valor(self, fila, columna, valor):
+        """Establecer valor de una celda en O(1)"""
+        self.valores[self._posicion(fila, columna)] = valor
+
+    def get_valor(self, fila, columna):
+        """Obtener valor de una celda en O(1)"""
+        return self.valores[self._posicion(fila, columna)]
+
+    def obtener_memoria(self):
+        """Obtener memoryview plano (formato 'q') de todas las celdas, sin copiar"""
+        return self.valores
+
+    def obtener_vista_fila(self, numero_fila):
+        """Obtener memoryview de una fila sin copiar; los cambios se ven en la matriz"""
+        if not 0 <= numero_fila < self.filas:
+            raise IndexError("Número de fila fuera de rango")
+        inicio = numero_fila * self.columnas
+        return self.valores[inicio:inicio + self.columnas]
+
+    def recorrer_filas(self):
+        """Recorrer las filas en orden como memoryview, sin copiar"""
+        inicio = 0
+        contador = Contador(0, self.filas)
+        while contador.hay_siguiente():
+            contador.siguiente()
+            yield self.valores[inicio:inicio + self.columnas]
+            inicio += self.columnas
+
+    def obtener_fila(self, numero_fila):
+        """Obtener fila completa como Lista personalizada (copia)"""
+        fila = Lista()
+        for valor in self.obtener_vista_fila(numero_fila):
+            fila.insertar(valor)
+        return fila
+
+    def obtener_columna(self, numero_columna):
+        """Obtener columna completa como Lista personalizada"""
+        if not 0 <= numero_columna < self.columnas:
+            raise IndexError("Número de columna fuera de rango")
+        columna = Lista()
+        posicion = numero_columna
+        contador = Contador(0, self.filas)
+        while contador.hay_siguiente():
+            contador.siguiente()
+            columna.insertar(self.valores[posicion])
+            posicion += self.columnas
+        return columna
+
+    def crear_similar(self, filas, columnas):
+        """Crear una matriz vacía con el mismo tipo de almacenamiento"""
+        return MatrizBuffer(filas, columnas)
+
+    def convertir_a_patron(self):
+        """Matriz de patrones (1 si el valor es > 0) con el mismo almacenamiento"""
+        matriz_patron = self.crear_similar(self.filas, self.columnas)
+        origen = self.valores
+        destino = matriz_patron.obtener_memoria()
+        posicion = 0
+        total = self.filas * self.columnas
+        while posicion < total:
+            destino[posicion] = 1 if origen[posicion] > 0 else 0
+            posicion += 1
+        return matriz_patron
+
+    def comparar_fila(self, fila1, fila2):
+        if not (0 <= fila1 < self.filas and 0 <= fila2 < self.filas):
+            return False
+        return self.obtener_vista_fila(fila1) == self.obtener_vista_fila(fila2)
+
+    def obtener_firmas_filas(self):
+        """Igual que Matriz.obtener_firmas_filas, leyendo el buffer directamente"""
+        firmas = Arreglo(self.filas, 0)
+        contador_filas = Contador(0, self.filas)
+        while contador_filas.hay_siguiente():
+            i = contador_filas.siguiente()
+            firma = 0
+            bit = 1
+            for valor in self.obtener_vista_fila(i):
+                if valor > 0:
+                    firma |= bit
+                bit <<= 1
+            firmas.asignar(i, firma)
+        return firmas
+
+    def liberar(self):
+        """Soltar las vistas sobre el buffer (necesario antes de cerrar un mmap)"""
+        if self.valores is not None:
+            self.valores.release()
+            self._vista_bytes.release()
+            self.valores = None
+            self._vista_bytes = None
+
+    def imprimir_matriz(self):
+        print("Matriz [{}x{}]:".format(self.filas, self.columnas))
+        contador = Contador(0, self.filas)
+        while contador.hay_siguiente():
+            i = contador.siguiente()
+            print("[{}] {}".format(i, self._lista_a_string(self.obtener_fila(i))))
+        print()
+
+    def __str__(self):
+        resultado = "Matriz [{}x{}]:\n".format(self.filas, self.columnas)
+        contador = Contador(0, self.filas)
+        while contador.hay_siguiente():
+            resultado += "{}\n".format(self._lista_a_string(self.obtener_fila(contador.siguiente())))
+        return resultado
@@ -0,0 +1,176 @@
+# clases/matriz_compartida.py
+# Matrices en memoria compartida entre procesos (multiprocessing.shared_memory)
+
+import sys
+import weakref
+from multiprocessing import shared_memory, resource_tracker
+from .lista import Lista
+from .matriz_buffer import MatrizBuffer
+
+def _adjuntar_segmento(nombre):
+    """
+    Abrir un segmento existente sin que este proceso lo registre como propio.
+    Desde Python 3.13 alcanza con track=False. Antes, abrir un segmento lo
+    registra en el resource_tracker y, si ese tracker es solo de este
+    proceso, lo borraría al terminar: en ese caso el registro se deshace
+    apenas se abre. Los procesos hijos del creador heredan su tracker, donde
+    el segmento ya figura; ahí no se deshace nada porque se borraría también
+    el registro del creador. Así, si el creador muere, el tracker igual
+    libera el segmento.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    tracker_heredado = getattr(resource_tracker._resource_tracker, '_fd', None) is not None
+    segmento = shared_memory.SharedMemory(name=nombre)
+    if not tracker_heredado:
+        resource_tracker.unregister(segmento._name, "shared_memory")
+    return segmento
+
+def _destruir_segmento(segmento):
+    """Cerrar y borrar un segmento (usado por weakref.finalize)"""
+    try:
+        segmento.close()
+    except BufferError:
+        pass
+    try:
+        segmento.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class DescriptorMatriz:
+    """Datos mínimos para que otro proceso se conecte a una MatrizCompartida"""
+
+    __slots__ = ('__nombre', '__filas', '__columnas')
+
+    def __init__(self, nombre, filas, columnas):
+        self.__nombre = nombre
+        self.__filas = filas
+        self.__columnas = columnas
+
+    def get_nombre(self):
+        return self.__nombre
+
+    def get_filas(self):
+        return self.__filas
+
+    def get_columnas(self):
+        return self.__columnas
+
+    def __reduce__(self):
+        return (DescriptorMatriz, (self.__nombre, self.__filas, self.__columnas))
+
+    def __repr__(self):
+        return f"DescriptorMatriz({self.__nombre}, {self.__filas}x{self.__columnas})"
+
+
+class MatrizCompartida(MatrizBuffer):
+    """
+    MatrizBuffer sobre un bloque de multiprocessing.shared_memory. Varios
+    procesos ven y modifican las mismas celdas sin copiarlas; entre ellos
+    solo viaja un DescriptorMatriz (al hacer pickle de la matriz también).
+    El proceso que la crea es el dueño y el único que la borra.
+    """
+
+    def __init__(self, segmento, filas, columnas, propietaria):
+        """No usar directamente: ver crear() y adjuntar()"""
+        self.segmento = segmento
+        self.propietaria = propietaria
+        super().__init__(filas, columnas, segmento.buf)
+        # Si la dueña se pierde sin destruir(), el segmento igual se borra
+        self._finalizador = weakref.finalize(self, _destruir_segmento, segmento) if propietaria else None
+
+    @classmethod
+    def crear(cls, filas, columnas):
+        """Crear un segmento nuevo lleno de ceros; esta matriz es su dueña"""
+        tamaño = max(1, filas * columnas * cls.TAMAÑO_CELDA)
+        segmento = shared_memory.SharedMemory(create=True, size=tamaño)
+        return cls(segmento, filas, columnas, True)
+
+    @classmethod
+    def adjuntar(cls, descriptor):
+        """Conectarse a una matriz creada por otro proceso"""
+        segmento = _adjuntar_segmento(descriptor.get_nombre())
+        return cls(segmento, descriptor.get_filas(), descriptor.get_columnas(), False)
+
+    def obtener_descriptor(self):
+        """Descriptor pequeño para enviar a otros procesos"""
+        return DescriptorMatriz(self.segmento.name, self.filas, self.columnas)
+
+    def cerrar(self):
+        """Soltar la conexión de este proceso; el segmento sigue existiendo"""
+        if self.segmento is None:
+            return
+        self.liberar()
+        self.segmento.close()
+        self.segmento = None
+
+    def destruir(self):
+        """Cerrar y, si esta matriz es la dueña, borrar el segmento"""
+        self.cerrar()
+        if self._finalizador is not None:
+            self._finalizador()
+
+    def __reduce__(self):
+        """Al serializar solo viaja el descriptor"""
+        return (MatrizCompartida.adjuntar, (self.obtener_descriptor(),))
+
+
+class PublicadorMatrices:
+    """
+    Publica matrices en memoria compartida y garantiza que se borren:
+    al salir del bloque with (termine bien o con excepción), al ser recolectado
+    o, si el proceso muere, por el resource_tracker de multiprocessing.
+
+        with PublicadorMatrices() as publicador:
+            descriptor = publicador.publicar(matriz)
+            ejecutor.submit(trabajo, descriptor)
+    """
+
+    def __init__(self):
+        self.matrices = Lista()
+
+    def publicar(self, matriz):
+        """
+        Copiar una Matriz (de cualquier almacenamiento) a memoria compartida
+
+        Returns:
+            DescriptorMatriz: Descriptor para los procesos trabajadores
+        """
+        return self.publicar_compartida(matriz).obtener_descriptor()
+
+    def publicar_compartida(self, matriz):
+        """Igual que publicar() pero retorna la MatrizCompartida del dueño"""
+        compartida = self.reservar(matriz.get_filas(), matriz.get_columnas())
+        destino = compartida.obtener_memoria()
+
+        if isinstance(matriz, MatrizBuffer):
+            destino[:] = matriz.obtener_memoria()
+        else:
+            posicion = 0
+            iterador_filas = matriz.datos.crear_iterador()
+            while iterador_filas.hay_siguiente():
+                iterador_valores = iterador_filas.siguiente().crear_iterador()
+                while iterador_valores.hay_siguiente():
+                    destino[posicion] = iterador_valores.siguiente()
+                    posicion += 1
+        return compartida
+
+    def reservar(self, filas, columnas):
+        """Crear una matriz compartida en cero (por ejemplo, para resultados de trabajadores)"""
+        compartida = MatrizCompartida.crear(filas, columnas)
+        self.matrices.insertar(compartida)
+        return compartida
+
+    def cerrar(self):
+        """Borrar todos los segmentos publicados"""
+        for matriz in self.matrices:
+            matriz.destruir()
+        self.matrices = Lista()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return False
@@ -0,0 +1,135 @@
+# clases/matriz_mapeada.py
+# Matriz sobre un archivo mapeado en memoria (mmap)
+
+import os
+import mmap
+import struct
+import tempfile
+import weakref
+from .matriz_buffer import MatrizBuffer
+
+def _borrar_archivo(ruta):
+    """Borrar un archivo temporal si todavía existe"""
+    try:
+        os.remove(ruta)
+    except OSError:
+        pass
+
+class MatrizMapeada(MatrizBuffer):
+    """
+    MatrizBuffer cuyas celdas están en un archivo mapeado con mmap: la matriz
+    vive en la caché de páginas del sistema y no en el heap de Python, así que
+    puede ser mucho más grande que la memoria disponible para objetos.
+
+    Formato del archivo: encabezado de 24 bytes ('MATQ', versión, filas,
+    columnas; little-endian) seguido de filas*columnas enteros de 64 bits
+    en orden fila por fila.
+
+    Otros procesos pueden abrir el mismo archivo con MatrizMapeada.abrir() y
+    ven las mismas páginas sin copiarlas. Al enviar una MatrizMapeada a otro
+    proceso (pickle) solo viaja la ruta.
+    """
+
+    MAGICO = b'MATQ'
+    VERSION = 1
+    ENCABEZADO = struct.Struct('<4sIQQ')
+
+    def __init__(self, filas, columnas, ruta=None, directorio=None):
+        """
+        Crear un archivo nuevo lleno de ceros y mapearlo
+
+        Args:
+            filas (int): Cantidad de filas
+            columnas (int): Cantidad de columnas
+            ruta (str): Archivo a crear (se sobrescribe); None crea uno temporal
+                        que se borra al cerrar la matriz
+            directorio (str): Directorio del archivo temporal (None: el del sistema)
+        """
+        self.temporal = ruta is None
+        if self.temporal:
+            descriptor, ruta = tempfile.mkstemp(suffix='.matq', dir=directorio)
+            os.close(descriptor)
+
+        tamaño = self.ENCABEZADO.size + filas * columnas * self.TAMAÑO_CELDA
+        archivo = open(ruta, 'w+b')
+        try:
+            archivo.write(self.ENCABEZADO.pack(self.MAGICO, self.VERSION, filas, columnas))
+            archivo.truncate(tamaño)  # El resto queda en cero sin escribirlo
+            self._abrir_mapa(archivo, ruta, filas, columnas, mmap.ACCESS_WRITE)
+        finally:
+            archivo.close()
+
+    @classmethod
+    def abrir(cls, ruta, solo_lectura=False):
+        """
+        Mapear una matriz ya guardada en disco (por ejemplo, desde otro proceso)
+
+        Args:
+            ruta (str): Archivo creado por MatrizMapeada
+            solo_lectura (bool): Mapear sin permiso de escritura
+
+        Returns:
+            MatrizMapeada: Matriz sobre el mismo archivo (no se borra al cerrar)
+        """
+        matriz = cls.__new__(cls)
+        matriz.temporal = False
+        archivo = open(ruta, 'rb' if solo_lectura else 'r+b')
+        try:
+            encabezado = archivo.read(cls.ENCABEZADO.size)
+            if len(encabezado) < cls.ENCABEZADO.size:
+                raise ValueError("Archivo de matriz incompleto: {}".format(ruta))
+            magico, version, filas, columnas = cls.ENCABEZADO.unpack(encabezado)
+            if magico != cls.MAGICO or version != cls.VERSION:
+                raise ValueError("El archivo no es una matriz mapeada válida: {}".format(ruta))
+            if os.fstat(archivo.fileno()).st_size < cls.ENCABEZADO.size + filas * columnas * cls.TAMAÑO_CELDA:
+                raise ValueError("Archivo de matriz truncado: {}".format(ruta))
+            acceso = mmap.ACCESS_READ if solo_lectura else mmap.ACCESS_WRITE
+            matriz._abrir_mapa(archivo, ruta, filas, columnas, acceso)
+        finally:
+            archivo.close()
+        return matriz
+
+    def _abrir_mapa(self, archivo, ruta, filas, columnas, acceso):
+        """Mapear el archivo y preparar las vistas sobre la zona de celdas"""
+        self.ruta = ruta
+        self.mapa = mmap.mmap(archivo.fileno(), 0, access=acceso)
+        vista = memoryview(self.mapa)
+        try:
+            super().__init__(filas, columnas, vista[self.ENCABEZADO.size:])
+        finally:
+            vista.release()
+        # Si el objeto se pierde sin cerrar, el temporal igual se borra
+        self._finalizador = weakref.finalize(self, _borrar_archivo, ruta) if self.temporal else None
+
+    def get_ruta(self):
+        """Obtener la ruta del archivo mapeado"""
+        return self.ruta
+
+    def crear_similar(self, filas, columnas):
+        """Las matrices derivadas (patrones) también se mapean, en el mismo directorio"""
+        return MatrizMapeada(filas, columnas, directorio=os.path.dirname(self.ruta))
+
+    def sincronizar(self):
+        """Forzar la escritura de las páginas modificadas al archivo"""
+        self.mapa.flush()
+
+    def cerrar(self):
+        """Desmapear; si el archivo era temporal, borrarlo"""
+        if self.mapa is None:
+            return
+        self.liberar()
+        self.mapa.close()
+        self.mapa = None
+        if self._finalizador is not None:
+            self._finalizador()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return False
+
+    def __reduce__(self):
+        """Al serializar solo se envía la ruta; el receptor vuelve a mapear el archivo"""
+        return (MatrizMapeada.abrir, (self.ruta,))
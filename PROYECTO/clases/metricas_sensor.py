@@ -0,0 +1,154 @@
+# clases/metricas_sensor.py
+# Métricas de las frecuencias de un sensor (total, promedio, desviación, eficiencia y problemas)
+
+from array import array
+from .lista import Lista
+from .arreglo import Arreglo
+
+class MetricasSensor:
+    """
+    Resumen de las frecuencias de un sensor, calculado una vez y guardado
+    por el sensor (o por las columnas del campo) hasta que sus frecuencias
+    cambian. Los problemas se guardan como banderas de bits.
+    """
+
+    __slots__ = ('__cantidad', '__total', '__desviacion_total', '__eficiencia', '__problemas')
+
+    PROBLEMA_BAJA_ACTIVIDAD = 1
+    PROBLEMA_ALTA_ACTIVIDAD = 2
+    PROBLEMA_POCAS_ESTACIONES = 4
+
+    UMBRAL_BAJA_ACTIVIDAD = 1000
+    UMBRAL_ALTA_ACTIVIDAD = 10000
+    MINIMO_ESTACIONES = 2
+
+    def __init__(self, cantidad, total, desviacion_total):
+        """
+        Args:
+            cantidad (int): Frecuencias del sensor
+            total (int): Suma de sus valores
+            desviacion_total (float): Suma de |valor - promedio|
+        """
+        self.__cantidad = cantidad
+        self.__total = total
+        self.__desviacion_total = desviacion_total
+        self.__eficiencia = self.__calcular_eficiencia()
+        self.__problemas = self.__calcular_problemas()
+
+    @classmethod
+    def desde_valores(cls, valores):
+        """Calcular las métricas de una secuencia de valores (se recorre dos veces)"""
+        cantidad = 0
+        total = 0
+        for valor in valores:
+            total += valor
+            cantidad += 1
+        desviacion_total = 0
+        if cantidad > 0:
+            promedio = total / cantidad
+            for valor in valores:
+                desviacion_total += abs(valor - promedio)
+        return cls(cantidad, total, desviacion_total)
+
+    def __calcular_eficiencia(self):
+        """
+        Eficiencia del monitoreo: 20 puntos por estación (hasta 80) más un
+        bono de hasta 20 por frecuencias parejas entre estaciones
+        """
+        if self.__cantidad == 0:
+            return 0.0
+        eficiencia = min(self.__cantidad * 20, 80)
+        promedio = self.get_promedio()
+        desviacion_promedio = self.get_desviacion_media()
+        bono_balance = max(20 - (desviacion_promedio / promedio) * 10, 0) if promedio > 0 else 0
+        eficiencia += bono_balance
+        return min(eficiencia, 100.0)
+
+    def __calcular_problemas(self):
+        problemas = 0
+        if self.__total < self.UMBRAL_BAJA_ACTIVIDAD:
+            problemas |= self.PROBLEMA_BAJA_ACTIVIDAD
+        elif self.__total > self.UMBRAL_ALTA_ACTIVIDAD:
+            problemas |= self.PROBLEMA_ALTA_ACTIVIDAD
+        if self.__cantidad < self.MINIMO_ESTACIONES:
+            problemas |= self.PROBLEMA_POCAS_ESTACIONES
+        return problemas
+
+    def get_cantidad(self):
+        return self.__cantidad
+
+    def get_total(self):
+        return self.__total
+
+    def get_promedio(self):
+        return self.__total / self.__cantidad if self.__cantidad > 0 else 0.0
+
+    def get_desviacion_media(self):
+        """Desviación media absoluta de los valores respecto de su promedio"""
+        return self.__desviacion_total / self.__cantidad if self.__cantidad > 0 else 0.0
+
+    def get_eficiencia(self):
+        return self.__eficiencia
+
+    def get_problemas(self):
+        """Banderas PROBLEMA_* combinadas con |"""
+        return self.__problemas
+
+    def tiene_problema(self, problema):
+        return (self.__problemas & problema) != 0
+
+    def __str__(self):
+        return "MetricasSensor(cantidad={}, total={}, eficiencia={:.1f}%, problemas={})".format(
+            self.__cantidad, self.__total, self.__eficiencia, self.__problemas)
+
+
+def calcular_metricas_columnas(columna_sensores, columna_valores, cantidad_sensores):
+    """
+    Métricas de todos los sensores de un tipo a partir de las columnas de
+    frecuencias (índice de sensor y valor por frecuencia), con dos pasadas
+    lineales: una para totales y cantidades y otra para las desviaciones.
+
+    Returns:
+        Arreglo: MetricasSensor por índice de sensor
+    """
+    cantidades = array('q', bytes(8 * cantidad_sensores))
+    totales = array('q', bytes(8 * cantidad_sensores))
+    total_frecuencias = len(columna_valores)
+    k = 0
+    while k < total_frecuencias:
+        sensor = columna_sensores[k]
+        cantidades[sensor] += 1
+        totales[sensor] += columna_valores[k]
+        k += 1
+
+    promedios = array('d', bytes(8 * cantidad_sensores))
+    j = 0
+    while j < cantidad_sensores:
+        if cantidades[j] > 0:
+            promedios[j] = totales[j] / cantidades[j]
+        j += 1
+    desviaciones = array('d', bytes(8 * cantidad_sensores))
+    k = 0
+    while k < total_frecuencias:
+        sensor = columna_sensores[k]
+        desviaciones[sensor] += abs(columna_valores[k] - promedios[sensor])
+        k += 1
+
+    metricas = Arreglo(cantidad_sensores)
+    j = 0
+    while j < cantidad_sensores:
+        metricas.asignar(j, MetricasSensor(cantidades[j], totales[j], desviaciones[j]))
+        j += 1
+    return metricas
+
+
+def describir_problemas_cultivo(metricas):
+    """Lista de descripciones de los problemas de un sensor de cultivo"""
+    problemas = Lista()
+    if metricas.tiene_problema(MetricasSensor.PROBLEMA_BAJA_ACTIVIDAD):
+        problemas.insertar("Baja actividad de monitoreo")
+    elif metricas.tiene_problema(MetricasSensor.PROBLEMA_ALTA_ACTIVIDAD):
+        problemas.insertar("Alta actividad - posible estrés del cultivo")
+    if metricas.tiene_problema(MetricasSensor.PROBLEMA_POCAS_ESTACIONES):
+        problemas.insertar("Pocas estaciones de monitoreo")
+    return problemas
@@ -7,6 +7,9 @@ class Nodo:
     Cada nodo contiene un dato y una referencia al siguiente nodo.
     """
     
+    # Sin __dict__ por instancia: las listas grandes crean millones de nodos
+    __slots__ = ('__dato', '__siguiente')
+    
     def __init__(self, dato):
         """
         Inicializar nodo con un dato
@@ -0,0 +1,143 @@
+# clases/ordenador_externo.py
+# Ordenamiento externo de registros de ancho fijo con un presupuesto de memoria
+
+import heapq
+import tempfile
+from clases.lista import Lista
+
+class OrdenadorExterno:
+    """
+    Ordena más registros de los que caben en memoria. Los registros se
+    acumulan hasta llenar el presupuesto, se ordenan y se escriben a disco
+    como una corrida; al final las corridas se combinan con una mezcla de
+    k vías (heapq.merge) leyéndolas de forma secuencial.
+
+    Cada registro es un bytes de largo fijo y se ordena comparando bytes,
+    así que las claves deben codificarse en big-endian (ver struct '>').
+    Los archivos temporales se borran solos al cerrarse.
+    """
+
+    # Costo aproximado en memoria de cada bytes guardado en la lista de Python
+    SOBRECARGA_REGISTRO = 41
+    BUFFER_MINIMO = 4096
+
+    def __init__(self, tamaño_registro, presupuesto_memoria, directorio=None):
+        """
+        Inicializar ordenador
+
+        Args:
+            tamaño_registro (int): Bytes de cada registro
+            presupuesto_memoria (int): Bytes máximos para el buffer de corridas y de mezcla
+            directorio (str): Dónde crear los archivos temporales (None: el del sistema)
+        """
+        if tamaño_registro <= 0:
+            raise ValueError("El tamaño de registro debe ser mayor a 0")
+        self.tamaño_registro = tamaño_registro
+        self.presupuesto_memoria = presupuesto_memoria
+        self.directorio = directorio
+        self.registros_por_corrida = max(1, presupuesto_memoria // (tamaño_registro + self.SOBRECARGA_REGISTRO))
+        # Cuántas corridas pueden mezclarse a la vez dando a cada una un buffer mínimo
+        self.vias_maximas = max(2, presupuesto_memoria // self.BUFFER_MINIMO)
+
+        self.buffer = []
+        self.corridas = Lista()
+        self.cantidad_registros = 0
+
+    def agregar(self, registro):
+        """Agregar un registro; si el buffer se llena se vuelca una corrida ordenada"""
+        if len(registro) != self.tamaño_registro:
+            raise ValueError("Registro de {} bytes, se esperaban {}".format(len(registro), self.tamaño_registro))
+        self.buffer.append(registro)
+        self.cantidad_registros += 1
+        if len(self.buffer) >= self.registros_por_corrida:
+            self._volcar_corrida()
+
+    def _volcar_corrida(self):
+        """Ordenar el buffer y escribirlo como una corrida nueva"""
+        if not self.buffer:
+            return
+        self.buffer.sort()
+        archivo = tempfile.TemporaryFile(dir=self.directorio)
+        archivo.write(b"".join(self.buffer))
+        archivo.seek(0)
+        self.corridas.insertar(archivo)
+        self.buffer = []
+
+    def _leer_corrida(self, archivo, tamaño_buffer):
+        """Generador de los registros de una corrida, leídos en bloques"""
+        tamaño = self.tamaño_registro
+        bloque_registros = max(1, tamaño_buffer // tamaño)
+        while True:
+            bloque = archivo.read(bloque_registros * tamaño)
+            if not bloque:
+                break
+            posicion = 0
+            while posicion < len(bloque):
+                yield bloque[posicion:posicion + tamaño]
+                posicion += tamaño
+
+    def _mezclar(self, archivos):
+        """Mezcla de k vías de varias corridas; cada una recibe su parte del presupuesto"""
+        tamaño_buffer = max(self.BUFFER_MINIMO, self.presupuesto_memoria // (archivos.obtener_tamaño() + 1))
+        lectores = []
+        for archivo in archivos:
+            lectores.append(self._leer_corrida(archivo, tamaño_buffer))
+        return heapq.merge(*lectores)
+
+    def iterar_ordenado(self):
+        """
+        Generador de todos los registros en orden ascendente.
+        Si hay más corridas que vías_maximas se mezclan por tandas primero.
+        """
+        if self.corridas.esta_vacia():
+            # Todo cupo en memoria: no hace falta tocar disco
+            self.buffer.sort()
+            for registro in self.buffer:
+                yield registro
+            return
+
+        self._volcar_corrida()
+        while self.corridas.obtener_tamaño() > self.vias_maximas:
+            self._mezclar_tanda()
+
+        for registro in self._mezclar(self.corridas):
+            yield registro
+
+    def _mezclar_tanda(self):
+        """Mezclar las primeras vías_maximas corridas en una sola corrida nueva"""
+        tanda = Lista()
+        while tanda.obtener_tamaño() < self.vias_maximas:
+            archivo = self.corridas.obtener_en_posicion(0)
+            self.corridas.eliminar(archivo)
+            tanda.insertar(archivo)
+
+        destino = tempfile.TemporaryFile(dir=self.directorio)
+        pendientes = []
+        for registro in self._mezclar(tanda):
+            pendientes.append(registro)
+            if len(pendientes) >= self.registros_por_corrida:
+                destino.write(b"".join(pendientes))
+                pendientes = []
+        destino.write(b"".join(pendientes))
+        destino.seek(0)
+        for archivo in tanda:
+            archivo.close()
+        self.corridas.insertar(destino)
+
+    def obtener_cantidad_corridas(self):
+        """Obtener cuántas corridas hay en disco"""
+        return self.corridas.obtener_tamaño()
+
+    def cerrar(self):
+        """Cerrar (y así borrar) los archivos temporales"""
+        for archivo in self.corridas:
+            archivo.close()
+        self.corridas = Lista()
+        self.buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return False
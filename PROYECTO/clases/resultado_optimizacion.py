@@ -0,0 +1,75 @@
+# clases/resultado_optimizacion.py
+# Resultado de optimización con valores intermedios calculados a pedido
+
+from .diccionario import Diccionario
+
+class CalculoPendiente:
+    """Marca un valor del resultado que todavía no se calculó"""
+
+    __slots__ = ('__funcion',)
+
+    def __init__(self, funcion):
+        self.__funcion = funcion
+
+    def calcular(self):
+        return self.__funcion()
+
+    def __str__(self):
+        return "<pendiente>"
+
+
+class ResultadoOptimizacion(Diccionario):
+    """
+    Diccionario de resultados de Optimizador.optimizar_estaciones. Las
+    matrices intermedias (frecuencias, patrones, reducidas) se registran con
+    insertar_diferido y solo se construyen la primera vez que se piden con
+    obtener(); después quedan guardadas. Si nadie las pide (por ejemplo, un
+    procesamiento por lotes sin gráficas) nunca ocupan memoria.
+    """
+
+    def insertar_diferido(self, clave, funcion):
+        """
+        Registrar una clave cuyo valor se calcula al pedirlo
+
+        Args:
+            clave: Clave del resultado
+            funcion (function): Función sin argumentos que produce el valor
+        """
+        self.insertar(clave, CalculoPendiente(funcion))
+
+    def obtener(self, clave):
+        """Obtener el valor de una clave, calculándolo si estaba pendiente"""
+        valor = super().obtener(clave)
+        if isinstance(valor, CalculoPendiente):
+            valor = valor.calcular()
+            self.insertar(clave, valor)
+        return valor
+
+    def esta_calculado(self, clave):
+        """Verificar si una clave existe y ya tiene su valor calculado"""
+        return self.contiene_clave(clave) and not isinstance(super().obtener(clave), CalculoPendiente)
+
+    def calcular_pendientes(self):
+        """Calcular todos los valores que aún estén pendientes"""
+        claves = self.obtener_claves()
+        iterador = claves.crear_iterador()
+        while iterador.hay_siguiente():
+            self.obtener(iterador.siguiente())
+
+    def obtener_valores(self):
+        self.calcular_pendientes()
+        return super().obtener_valores()
+
+    def obtener_pares(self):
+        self.calcular_pendientes()
+        return super().obtener_pares()
+
+    def clonar(self):
+        """Copia que comparte los valores calculados y conserva los pendientes"""
+        copia = ResultadoOptimizacion()
+        claves = self.obtener_claves()
+        iterador = claves.crear_iterador()
+        while iterador.hay_siguiente():
+            clave = iterador.siguiente()
+            copia.insertar(clave, super().obtener(clave))
+        return copia
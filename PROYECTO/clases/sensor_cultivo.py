@@ -1,9 +1,12 @@
 # clases/sensor_cultivo.py
 # Clase que representa un sensor de cultivo en el sistema de agricultura de precisión
 
+from array import array
 from clases.lista import Lista
 from clases.diccionario import Diccionario
 from clases.contador import Contador
+from clases.frecuencia import Frecuencia
+from clases.metricas_sensor import MetricasSensor, describir_problemas_cultivo
 
 class SensorCultivo:
     """
@@ -12,6 +15,9 @@ class SensorCultivo:
     y detección temprana de enfermedades.
     """
 
+    __slots__ = ('__id', '__nombre', '__frecuencias', '__tipo', '__activo',
+                 '__parametros_medidos', '__metricas', '__compartida', '__version')
+
     def __init__(self, id, nombre):
         """
         Inicializar sensor de cultivo con ID y nombre
@@ -25,13 +31,18 @@ class SensorCultivo:
         self.__frecuencias = Lista()  # Lista de frecuencias de transmisión
         self.__tipo = "cultivo"  # Tipo de sensor
         self.__activo = True  # Estado del sensor
-        self.__parametros_medidos = Lista()  # Parámetros que puede medir este sensor
-
-        # Inicializar parámetros típicos de sensores de cultivo
-        self.__inicializar_parametros_cultivo()
+        # Parámetros que puede medir este sensor; se crean al primer acceso
+        self.__parametros_medidos = None
+        # MetricasSensor de las frecuencias actuales; None cuando cambian
+        self.__metricas = None
+        # True mientras la Lista de frecuencias se comparte con un clon
+        self.__compartida = False
+        # Aumenta con cada cambio de frecuencias (ver obtener_version)
+        self.__version = 0
 
     def __inicializar_parametros_cultivo(self):
         """Inicializar lista de parámetros que mide un sensor de cultivo"""
+        self.__parametros_medidos = Lista()
         self.__parametros_medidos.insertar("indices_vegetales")
         self.__parametros_medidos.insertar("estres_hidrico")
         self.__parametros_medidos.insertar("estres_termico")
@@ -59,19 +70,66 @@ class SensorCultivo:
 
     def agregar_frecuencia(self, frecuencia):
         """Agregar frecuencia de transmisión a una estación"""
+        self.__separar_frecuencias()
         freq_existente = self.buscar_frecuencia_por_estacion(frecuencia.get_id_estacion())
         if freq_existente:
             print(f"Advertencia: Ya existe frecuencia para estación {frecuencia.get_id_estacion()}")
             freq_existente.set_valor(frecuencia.get_valor())
         else:
             self.__frecuencias.insertar(frecuencia)
+        self.__metricas = None
+        self.__version += 1
+
+    def cargar_frecuencias(self, frecuencias):
+        """
+        Agregar en bloque frecuencias hacia estaciones distintas entre sí y
+        sin frecuencia previa en este sensor (por ejemplo al materializar
+        columnas, que ya no tienen pares repetidos). No busca duplicados
+        como agregar_frecuencia: cuesta O(1) por frecuencia.
+        
+        Args:
+            frecuencias: Iterable de Frecuencia
+        """
+        self.__separar_frecuencias()
+        for frecuencia in frecuencias:
+            self.__frecuencias.insertar(frecuencia)
+        self.__metricas = None
+        self.__version += 1
+    
+    def actualizar_frecuencia(self, id_estacion, valor):
+        """
+        Cambiar el valor de la frecuencia hacia una estación, o agregarla
+        sin aviso si no existe. Los valores deben cambiarse por acá (y no
+        con Frecuencia.set_valor) para que las métricas se recalculen.
+
+        Returns:
+            int: Valor anterior, o None si la frecuencia no existía
+        """
+        self.__separar_frecuencias()
+        freq_existente = self.buscar_frecuencia_por_estacion(id_estacion)
+        self.__metricas = None
+        self.__version += 1
+        if freq_existente:
+            anterior = freq_existente.get_valor()
+            freq_existente.set_valor(valor)
+            return anterior
+        self.__frecuencias.insertar(Frecuencia(id_estacion, valor))
+        return None
 
     def obtener_frecuencias(self):
-        """Obtener lista de frecuencias del sensor"""
+        """Obtener lista de frecuencias del sensor (de solo lectura: puede compartirse con un clon)"""
         return self.__frecuencias
 
+    def obtener_version(self):
+        """Contador de cambios de las frecuencias (si no cambió, son las mismas)"""
+        return self.__version
+
     def buscar_frecuencia_por_estacion(self, id_estacion):
-        """Buscar frecuencia específica por ID de estación"""
+        """
+        Buscar frecuencia específica por ID de estación. La Frecuencia
+        puede compartirse con un clon: tratarla como de solo lectura, los
+        valores se cambian con actualizar_frecuencia (recalcula métricas).
+        """
         def criterio(frecuencia):
             return frecuencia.get_id_estacion() == id_estacion
         return self.__frecuencias.buscar(criterio)
@@ -104,44 +162,46 @@ class SensorCultivo:
 
     def obtener_frecuencia_total(self):
         """Calcular la frecuencia total de transmisión del sensor"""
-        total = 0
-        iterador = self.__frecuencias.crear_iterador()
-        while iterador.hay_siguiente():
-            freq = iterador.siguiente()
-            total += freq.get_valor()
-        return total
+        return self.obtener_metricas().get_total()
+
+    def obtener_metricas(self):
+        """
+        Obtener total, promedio, desviación, eficiencia y problemas de las
+        frecuencias; se calculan una vez y se guardan hasta que cambian
+        """
+        if self.__metricas is None:
+            valores = array('q')
+            iterador = self.__frecuencias.crear_iterador()
+            while iterador.hay_siguiente():
+                valores.append(iterador.siguiente().get_valor())
+            self.__metricas = MetricasSensor.desde_valores(valores)
+        return self.__metricas
 
     def obtener_parametros_medidos(self):
         """Obtener lista de parámetros que mide este sensor"""
+        if self.__parametros_medidos is None:
+            self.__inicializar_parametros_cultivo()
         return self.__parametros_medidos
 
     def puede_medir_parametro(self, parametro):
         """Verificar si el sensor puede medir un parámetro específico"""
         def criterio(param):
             return param == parametro
-        return self.__parametros_medidos.buscar(criterio) is not None
+        return self.obtener_parametros_medidos().buscar(criterio) is not None
 
     def eliminar_frecuencia(self, id_estacion):
         """Eliminar frecuencia para una estación específica"""
+        self.__separar_frecuencias()
         freq = self.buscar_frecuencia_por_estacion(id_estacion)
         if freq:
+            self.__metricas = None
+            self.__version += 1
             return self.__frecuencias.eliminar(freq)
         return False
 
     def detectar_problemas_cultivo(self):
         """Simular detección de problemas en el cultivo basado en frecuencias"""
-        problemas = Lista()
-        frecuencia_total = self.obtener_frecuencia_total()
-
-        if frecuencia_total < 1000:
-            problemas.insertar("Baja actividad de monitoreo")
-        elif frecuencia_total > 10000:
-            problemas.insertar("Alta actividad - posible estrés del cultivo")
-
-        if self.obtener_cantidad_frecuencias() < 2:
-            problemas.insertar("Pocas estaciones de monitoreo")
-
-        return problemas
+        return describir_problemas_cultivo(self.obtener_metricas())
 
     def obtener_informacion_completa(self):
         """Obtener información completa del sensor"""
@@ -153,21 +213,31 @@ class SensorCultivo:
         info.insertar('cantidad_frecuencias', self.obtener_cantidad_frecuencias())
         info.insertar('frecuencia_total', self.obtener_frecuencia_total())
         info.insertar('estaciones_conectadas', self.obtener_estaciones_conectadas())
-        info.insertar('parametros_medidos', self.__parametros_medidos)
+        info.insertar('parametros_medidos', self.obtener_parametros_medidos())
         info.insertar('problemas_detectados', self.detectar_problemas_cultivo())
         return info
 
     def clonar(self):
-        """Crear una copia del sensor"""
+        """Crear una copia del sensor que comparte las frecuencias hasta que alguno las modifica"""
         nuevo_sensor = SensorCultivo(self.__id, self.__nombre)
         nuevo_sensor.__activo = self.__activo
+        nuevo_sensor.__frecuencias = self.__frecuencias
+        nuevo_sensor.__metricas = self.__metricas
+        nuevo_sensor.__version = self.__version
+        nuevo_sensor.__compartida = True
+        self.__compartida = True
+        return nuevo_sensor
 
+    def __separar_frecuencias(self):
+        """Copiar las frecuencias compartidas con un clon antes de modificarlas"""
+        if not self.__compartida:
+            return
+        copia = Lista()
         iterador = self.__frecuencias.crear_iterador()
         while iterador.hay_siguiente():
-            freq = iterador.siguiente()
-            nuevo_sensor.agregar_frecuencia(freq.clonar())
-
-        return nuevo_sensor
+            copia.insertar(iterador.siguiente().clonar())
+        self.__frecuencias = copia
+        self.__compartida = False
 
     def validar_configuracion(self):
         """Validar que el sensor esté correctamente configurado"""
@@ -183,37 +253,7 @@ class SensorCultivo:
 
     def obtener_eficiencia_monitoreo(self):
         """Calcular eficiencia del monitoreo basado en distribución de frecuencias"""
-        cantidad_estaciones = self.obtener_cantidad_frecuencias()
-        if cantidad_estaciones == 0:
-            return 0.0
-
-        eficiencia_base = min(cantidad_estaciones * 20, 80)
-
-        if cantidad_estaciones > 0:
-            total = 0
-            contador = 0
-            iterador = self.__frecuencias.crear_iterador()
-            while iterador.hay_siguiente():
-                freq = iterador.siguiente()
-                total += freq.get_valor()
-                contador += 1
-            promedio = total / contador
-
-            total_desviaciones = 0
-            contador_valores = 0
-            iterador_desv = self.__frecuencias.crear_iterador()
-            while iterador_desv.hay_siguiente():
-                valor = iterador_desv.siguiente().get_valor()
-                desviacion = abs(valor - promedio)
-                total_desviaciones += desviacion
-                contador_valores += 1
-
-            desviacion_promedio = total_desviaciones / contador_valores if contador_valores > 0 else 0
-
-            balance_bonus = max(20 - (desviacion_promedio / promedio) * 10, 0) if promedio > 0 else 0
-            eficiencia_base += balance_bonus
-
-        return min(eficiencia_base, 100.0)
+        return self.obtener_metricas().get_eficiencia()
 
     def __str__(self):
         """Representación en string del sensor"""
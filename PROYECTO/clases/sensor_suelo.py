@@ -1,8 +1,11 @@
 # clases/sensor_suelo.py
 # Clase que representa un sensor de suelo en el sistema de agricultura de precisión
 
+from array import array
 from clases.lista import Lista
 from clases.diccionario import Diccionario
+from clases.frecuencia import Frecuencia
+from clases.metricas_sensor import MetricasSensor
 
 class SensorSuelo:
     """
@@ -10,6 +13,9 @@ class SensorSuelo:
     humedad, temperatura, salinidad, conductividad, nutrientes y pH del suelo.
     """
     
+    __slots__ = ('__id', '__nombre', '__frecuencias', '__tipo', '__activo',
+                 '__parametros_medidos', '__metricas', '__compartida', '__version')
+    
     def __init__(self, id, nombre):
         """
         Inicializar sensor de suelo con ID y nombre
@@ -23,13 +29,19 @@ class SensorSuelo:
         self.__frecuencias = Lista()  # Lista de frecuencias de transmisión
         self.__tipo = "suelo"  # Tipo de sensor
         self.__activo = True  # Estado del sensor
-        self.__parametros_medidos = Lista()  # Parámetros que puede medir este sensor
-        
-        # Inicializar parámetros típicos de sensores de suelo
-        self.__inicializar_parametros_suelo()
+        # Parámetros que puede medir este sensor; se crean al primer acceso
+        # para no cargar una Lista de seis nodos en cada sensor
+        self.__parametros_medidos = None
+        # MetricasSensor de las frecuencias actuales; None cuando cambian
+        self.__metricas = None
+        # True mientras la Lista de frecuencias se comparte con un clon
+        self.__compartida = False
+        # Aumenta con cada cambio de frecuencias (ver obtener_version)
+        self.__version = 0
     
     def __inicializar_parametros_suelo(self):
         """Inicializar lista de parámetros que mide un sensor de suelo"""
+        self.__parametros_medidos = Lista()
         self.__parametros_medidos.insertar("humedad_suelo")
         self.__parametros_medidos.insertar("temperatura_suelo")
         self.__parametros_medidos.insertar("salinidad")
@@ -80,6 +92,7 @@ class SensorSuelo:
         Args:
             frecuencia (Frecuencia): Frecuencia de transmisión a agregar
         """
+        self.__separar_frecuencias()
         # Verificar si ya existe frecuencia para esa estación
         freq_existente = self.buscar_frecuencia_por_estacion(frecuencia.get_id_estacion())
         if freq_existente:
@@ -88,16 +101,66 @@ class SensorSuelo:
             freq_existente.set_valor(frecuencia.get_valor())
         else:
             self.__frecuencias.insertar(frecuencia)
+        self.__metricas = None
+        self.__version += 1
+    
+    def cargar_frecuencias(self, frecuencias):
+        """
+        Agregar en bloque frecuencias hacia estaciones distintas entre sí y
+        sin frecuencia previa en este sensor (por ejemplo al materializar
+        columnas, que ya no tienen pares repetidos). No busca duplicados
+        como agregar_frecuencia: cuesta O(1) por frecuencia.
+        
+        Args:
+            frecuencias: Iterable de Frecuencia
+        """
+        self.__separar_frecuencias()
+        for frecuencia in frecuencias:
+            self.__frecuencias.insertar(frecuencia)
+        self.__metricas = None
+        self.__version += 1
+    
+    def actualizar_frecuencia(self, id_estacion, valor):
+        """
+        Cambiar el valor de la frecuencia hacia una estación, o agregarla
+        sin aviso si no existe. Los valores deben cambiarse por acá (y no
+        con Frecuencia.set_valor) para que las métricas se recalculen.
+        
+        Args:
+            id_estacion (str): ID de la estación
+            valor (int): Valor nuevo
+            
+        Returns:
+            int: Valor anterior, o None si la frecuencia no existía
+        """
+        self.__separar_frecuencias()
+        freq_existente = self.buscar_frecuencia_por_estacion(id_estacion)
+        self.__metricas = None
+        self.__version += 1
+        if freq_existente:
+            anterior = freq_existente.get_valor()
+            freq_existente.set_valor(valor)
+            return anterior
+        self.__frecuencias.insertar(Frecuencia(id_estacion, valor))
+        return None
     
     def obtener_frecuencias(self):
         """
-        Obtener lista de frecuencias del sensor
+        Obtener lista de frecuencias del sensor (de solo lectura: puede
+        compartirse con un clon; para cambiarla usar los métodos del sensor)
         
         Returns:
             Lista: Lista de frecuencias de transmisión
         """
         return self.__frecuencias
     
+    def obtener_version(self):
+        """
+        Contador de cambios de las frecuencias: si no cambió, las
+        frecuencias son las mismas que la última vez que se leyó
+        """
+        return self.__version
+    
     def buscar_frecuencia_por_estacion(self, id_estacion):
         """
         Buscar frecuencia específica por ID de estación
@@ -106,7 +169,10 @@ class SensorSuelo:
             id_estacion (str): ID de la estación a buscar
             
         Returns:
-            Frecuencia: La frecuencia encontrada o None si no existe
+            Frecuencia: La frecuencia encontrada o None si no existe. Puede
+                        compartirse con un clon: tratarla como de solo lectura,
+                        los valores se cambian con actualizar_frecuencia
+                        (recalcula métricas).
         """
         def criterio(frecuencia):
             return frecuencia.get_id_estacion() == id_estacion
@@ -163,14 +229,23 @@ class SensorSuelo:
         Returns:
             int: Suma de todas las frecuencias
         """
-        total = 0
-        iterador = self.__frecuencias.crear_iterador()
+        return self.obtener_metricas().get_total()
+    
+    def obtener_metricas(self):
+        """
+        Obtener total, promedio, desviación, eficiencia y problemas de las
+        frecuencias; se calculan una vez y se guardan hasta que cambian
         
-        while iterador.hay_siguiente():
-            freq = iterador.siguiente()
-            total += freq.get_valor()
-            
-        return total
+        Returns:
+            MetricasSensor: Métricas de las frecuencias actuales
+        """
+        if self.__metricas is None:
+            valores = array('q')
+            iterador = self.__frecuencias.crear_iterador()
+            while iterador.hay_siguiente():
+                valores.append(iterador.siguiente().get_valor())
+            self.__metricas = MetricasSensor.desde_valores(valores)
+        return self.__metricas
     
     def obtener_parametros_medidos(self):
         """
@@ -179,6 +254,8 @@ class SensorSuelo:
         Returns:
             Lista: Lista de parámetros medidos
         """
+        if self.__parametros_medidos is None:
+            self.__inicializar_parametros_suelo()
         return self.__parametros_medidos
     
     def puede_medir_parametro(self, parametro):
@@ -194,7 +271,7 @@ class SensorSuelo:
         def criterio(param):
             return param == parametro
         
-        return self.__parametros_medidos.buscar(criterio) is not None
+        return self.obtener_parametros_medidos().buscar(criterio) is not None
     
     def eliminar_frecuencia(self, id_estacion):
         """
@@ -206,8 +283,11 @@ class SensorSuelo:
         Returns:
             bool: True si se eliminó, False si no se encontró
         """
+        self.__separar_frecuencias()
         freq = self.buscar_frecuencia_por_estacion(id_estacion)
         if freq:
+            self.__metricas = None
+            self.__version += 1
             return self.__frecuencias.eliminar(freq)
         return False
     
@@ -227,27 +307,38 @@ class SensorSuelo:
         info.insertar('cantidad_frecuencias', self.obtener_cantidad_frecuencias())
         info.insertar('frecuencia_total', self.obtener_frecuencia_total())
         info.insertar('estaciones_conectadas', self.obtener_estaciones_conectadas())
-        info.insertar('parametros_medidos', self.__parametros_medidos)
+        info.insertar('parametros_medidos', self.obtener_parametros_medidos())
         
         return info
     
     def clonar(self):
         """
-        Crear una copia del sensor
+        Crear una copia del sensor. Las frecuencias (y sus métricas) se
+        comparten con el original hasta que alguno de los dos las modifica;
+        recién ahí ese sensor copia su Lista (copy-on-write)
         
         Returns:
             SensorSuelo: Copia del sensor actual
         """
         nuevo_sensor = SensorSuelo(self.__id, self.__nombre)
         nuevo_sensor.__activo = self.__activo
-        
-        # Copiar frecuencias usando iterador
+        nuevo_sensor.__frecuencias = self.__frecuencias
+        nuevo_sensor.__metricas = self.__metricas
+        nuevo_sensor.__version = self.__version
+        nuevo_sensor.__compartida = True
+        self.__compartida = True
+        return nuevo_sensor
+    
+    def __separar_frecuencias(self):
+        """Copiar las frecuencias compartidas con un clon antes de modificarlas"""
+        if not self.__compartida:
+            return
+        copia = Lista()
         iterador = self.__frecuencias.crear_iterador()
         while iterador.hay_siguiente():
-            freq = iterador.siguiente()
-            nuevo_sensor.agregar_frecuencia(freq.clonar())
-        
-        return nuevo_sensor
+            copia.insertar(iterador.siguiente().clonar())
+        self.__frecuencias = copia
+        self.__compartida = False
     
     def validar_configuracion(self):
         """
@@ -0,0 +1,199 @@
+# clases/tabla_hash.py
+# Tabla hash con encadenamiento: misma interfaz que Diccionario, búsquedas en O(1) promedio
+
+from clases.lista import Lista
+from clases.arreglo import Arreglo
+from clases.diccionario import ParClave
+
+class TablaHash:
+    """
+    Tabla hash con la misma interfaz que Diccionario.
+    Diccionario busca recorriendo todos sus pares; esta tabla reparte los pares
+    en cubetas según el hash de la clave, así que insertar y obtener cuestan
+    O(1) en promedio. Se usa para los índices ID -> posición de campos grandes.
+    Las claves se recorren en orden de inserción.
+    """
+
+    __slots__ = ('__cubetas', '__pares', '__tamaño')
+
+    CAPACIDAD_INICIAL = 16
+
+    def __init__(self, capacidad=CAPACIDAD_INICIAL):
+        """
+        Inicializar tabla vacía
+
+        Args:
+            capacidad (int): Cantidad inicial de cubetas (se redondea a potencia de dos)
+        """
+        cubetas = TablaHash.CAPACIDAD_INICIAL
+        while cubetas < capacidad:
+            cubetas *= 2
+        self.__cubetas = Arreglo(cubetas)
+        self.__pares = Lista()  # Pares en orden de inserción
+        self.__tamaño = 0
+
+    def __cubeta_de(self, clave):
+        """Posición de la cubeta que corresponde a una clave"""
+        return hash(clave) & (self.__cubetas.obtener_tamaño() - 1)
+
+    def __buscar_par(self, clave):
+        """
+        Método privado para buscar un par por clave
+
+        Returns:
+            ParClave: El par encontrado o None si no existe
+        """
+        cubeta = self.__cubetas.obtener(self.__cubeta_de(clave))
+        if cubeta is None:
+            return None
+        iterador = cubeta.crear_iterador()
+        while iterador.hay_siguiente():
+            par = iterador.siguiente()
+            if par.get_clave() == clave:
+                return par
+        return None
+
+    def __redimensionar(self):
+        """Duplicar la cantidad de cubetas y redistribuir los pares"""
+        self.__cubetas = Arreglo(self.__cubetas.obtener_tamaño() * 2)
+        iterador = self.__pares.crear_iterador()
+        while iterador.hay_siguiente():
+            self.__colocar(iterador.siguiente())
+
+    def __colocar(self, par):
+        """Guardar un par en la cubeta que le corresponde"""
+        posicion = self.__cubeta_de(par.get_clave())
+        cubeta = self.__cubetas.obtener(posicion)
+        if cubeta is None:
+            cubeta = Lista()
+            self.__cubetas.asignar(posicion, cubeta)
+        cubeta.insertar(par)
+
+    def insertar(self, clave, valor):
+        """
+        Insertar o actualizar un par clave-valor
+
+        Args:
+            clave: La clave a insertar/actualizar (debe ser hashable)
+            valor: El valor a asociar con la clave
+        """
+        par_existente = self.__buscar_par(clave)
+        if par_existente:
+            par_existente.set_valor(valor)
+            return
+
+        nuevo_par = ParClave(clave, valor)
+        self.__pares.insertar(nuevo_par)
+        self.__tamaño += 1
+        if self.__tamaño * 4 > self.__cubetas.obtener_tamaño() * 3:
+            self.__redimensionar()
+        else:
+            self.__colocar(nuevo_par)
+
+    def obtener(self, clave, valor_defecto=None):
+        """
+        Obtener valor asociado a una clave
+
+        Args:
+            clave: La clave a buscar
+            valor_defecto: Valor a retornar si la clave no existe
+
+        Returns:
+            El valor asociado a la clave o valor_defecto si no existe
+        """
+        par = self.__buscar_par(clave)
+        return par.get_valor() if par else valor_defecto
+
+    def contiene_clave(self, clave):
+        """
+        Verificar si existe una clave en la tabla
+
+        Returns:
+            bool: True si la clave existe, False si no
+        """
+        return self.__buscar_par(clave) is not None
+
+    def eliminar(self, clave):
+        """
+        Eliminar un par clave-valor de la tabla
+
+        Returns:
+            bool: True si se eliminó, False si no existía
+        """
+        par = self.__buscar_par(clave)
+        if not par:
+            return False
+        self.__cubetas.obtener(self.__cubeta_de(clave)).eliminar(par)
+        self.__pares.eliminar(par)
+        self.__tamaño -= 1
+        return True
+
+    def obtener_claves(self):
+        """
+        Obtener todas las claves en orden de inserción
+
+        Returns:
+            Lista: Lista con todas las claves
+        """
+        claves = Lista()
+        iterador = self.__pares.crear_iterador()
+        while iterador.hay_siguiente():
+            claves.insertar(iterador.siguiente().get_clave())
+        return claves
+
+    def obtener_valores(self):
+        """
+        Obtener todos los valores en orden de inserción
+
+        Returns:
+            Lista: Lista con todos los valores
+        """
+        valores = Lista()
+        iterador = self.__pares.crear_iterador()
+        while iterador.hay_siguiente():
+            valores.insertar(iterador.siguiente().get_valor())
+        return valores
+
+    def obtener_pares(self):
+        """
+        Obtener todos los pares clave-valor
+
+        Returns:
+            Lista: Lista con todos los pares ParClave
+        """
+        return self.__pares
+
+    def esta_vacio(self):
+        """Verificar si la tabla está vacía"""
+        return self.__tamaño == 0
+
+    def obtener_tamaño(self):
+        """Obtener el número de pares clave-valor"""
+        return self.__tamaño
+
+    def limpiar(self):
+        """Eliminar todos los pares de la tabla"""
+        self.__cubetas = Arreglo(TablaHash.CAPACIDAD_INICIAL)
+        self.__pares = Lista()
+        self.__tamaño = 0
+
+    def __len__(self):
+        """Soporte para len() de Python"""
+        return self.__tamaño
+
+    def __str__(self):
+        """Representación en string de la tabla"""
+        if self.esta_vacio():
+            return "TablaHash{}"
+        resultado = "TablaHash{"
+        primera_iteracion = True
+        for par in self.__pares:
+            if not primera_iteracion:
+                resultado += ", "
+            resultado += str(par)
+            primera_iteracion = False
+        return resultado + "}"
+
+    def __repr__(self):
+        """Representación técnica de la tabla"""
+        return f"TablaHash(tamaño={self.__tamaño})"
@@ -91,11 +91,23 @@ class SistemaOptimizacionAgricola:
             self.menu_helper.mostrar_progreso_carga("Cargando archivo XML...")
             tiempo_inicio = time.time()
             
-            self.campos_cargados = self.xml_handler.cargar_archivo(ruta_archivo)
+            # Validación y carga en una sola lectura del archivo
+            self.campos_cargados, reporte = self.xml_handler.validar_y_cargar(ruta_archivo)
             
             tiempo_fin = time.time()
             print(" Completado")
             
+            if reporte.obtener_entradas().obtener_tamaño() > 0:
+                print(reporte)
+            if not reporte.es_valido():
+                # Los campos con errores se cargan igual que en cargar_archivo(); aquí se descartan
+                campos_validos = self.campos_cargados.filtrar(lambda campo: not reporte.campo_tiene_errores(campo.get_id()))
+                self.menu_helper.mostrar_mensaje_advertencia(
+                    "El archivo tiene {} errores; se descartaron {} campos con errores".format(
+                        reporte.obtener_cantidad_errores(),
+                        self.campos_cargados.obtener_tamaño() - campos_validos.obtener_tamaño()))
+                self.campos_cargados = campos_validos
+            
             if self.campos_cargados.esta_vacia():
                 self.menu_helper.mostrar_mensaje_error("No se cargaron campos del archivo")
                 return
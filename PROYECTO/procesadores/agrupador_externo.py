@@ -0,0 +1,152 @@
+# procesadores/agrupador_externo.py
+# Agrupación de estaciones en memoria externa para campos que no caben en RAM
+
+import struct
+from array import array
+from clases.lista import Lista
+from clases.matriz import Matriz
+from clases.diccionario import Diccionario
+from clases.ordenador_externo import OrdenadorExterno
+from .procesador_matrices import ProcesadorMatrices
+
+class AgrupadorExterno:
+    """
+    Agrupa estaciones con patrones idénticos sin construir las matrices de
+    frecuencias ni de patrones. Solo usa ordenamientos externos:
+
+    1. Las firmas (fila, patrón combinado) salen de ProcesadorMatrices por
+       bloques tras una sola pasada por las frecuencias y se ordenan por
+       (firma, fila): las estaciones iguales quedan contiguas y la primera
+       de cada tramo es la de menor fila.
+    2. Cada miembro se re-ordena por (menor fila del grupo, fila), lo que da
+       los grupos en el mismo orden y con los mismos miembros que
+       Optimizador.identificar_grupos_estaciones.
+    3. Para las matrices reducidas se ordenan las frecuencias por fila y se
+       cruzan con la asignación fila -> grupo, sumando cada valor en la fila
+       reducida de su grupo.
+
+    La memoria de trabajo queda acotada por presupuesto_memoria; lo único que
+    crece con el campo es el resultado (grupos y matrices reducidas).
+    """
+
+    MIEMBRO = struct.Struct('>QQ')          # (menor fila del grupo | fila, fila | grupo)
+    FRECUENCIA = struct.Struct('>QBQq')     # (fila, tipo, columna, valor)
+    TIPO_SUELO = 0
+    TIPO_CULTIVO = 1
+
+    def __init__(self, presupuesto_memoria=64 * 1024 * 1024, directorio=None):
+        """
+        Inicializar agrupador
+
+        Args:
+            presupuesto_memoria (int): Bytes para buffers de ordenamiento y bloques de firmas
+            directorio (str): Dónde crear los archivos temporales (None: el del sistema)
+        """
+        self.presupuesto_memoria = presupuesto_memoria
+        self.directorio = directorio
+        self.procesador_matrices = ProcesadorMatrices()
+
+    def _crear_ordenador(self, tamaño_registro):
+        return OrdenadorExterno(tamaño_registro, self.presupuesto_memoria, self.directorio)
+
+    def agrupar(self, campo):
+        """
+        Agrupar las estaciones del campo con patrones idénticos
+
+        Returns:
+            tuple: (Lista de grupos de índices igual a la agrupación en memoria,
+                    Diccionario con estadísticas del ordenamiento)
+        """
+        bits = campo.obtener_cantidad_sensores_suelo() + campo.obtener_cantidad_sensores_cultivo()
+        ancho_firma = max(1, (bits + 7) // 8)
+        registro_firma = struct.Struct('>{}sQ'.format(ancho_firma))
+        # Cada firma del bloque cuesta su entero más la posición en el arreglo
+        estaciones_por_bloque = max(1, self.presupuesto_memoria // (ancho_firma + 36))
+
+        reporte = Diccionario()
+        reporte.insertar('presupuesto_memoria', self.presupuesto_memoria)
+
+        grupos = Lista()
+        with self._crear_ordenador(registro_firma.size) as por_firma, \
+                self._crear_ordenador(self.MIEMBRO.size) as por_grupo:
+
+            # Fase 1: firmas a corridas ordenadas por (firma, fila)
+            for fila, firma in self.procesador_matrices.generar_firmas_estaciones(
+                    campo, estaciones_por_bloque, self.presupuesto_memoria, self.directorio):
+                por_firma.agregar(registro_firma.pack(firma.to_bytes(ancho_firma, 'big'), fila))
+            reporte.insertar('corridas_firmas', por_firma.obtener_cantidad_corridas())
+
+            # Fase 2: cada tramo de firmas iguales es un grupo; su primera fila es la menor
+            firma_actual = None
+            fila_menor = 0
+            for registro in por_firma.iterar_ordenado():
+                firma, fila = registro_firma.unpack(registro)
+                if firma != firma_actual:
+                    firma_actual = firma
+                    fila_menor = fila
+                por_grupo.agregar(self.MIEMBRO.pack(fila_menor, fila))
+            reporte.insertar('corridas_grupos', por_grupo.obtener_cantidad_corridas())
+
+            # Fase 3: grupos en orden de su menor fila, miembros en orden de fila
+            grupo_actual = None
+            fila_menor_actual = -1
+            for registro in por_grupo.iterar_ordenado():
+                fila_menor, fila = self.MIEMBRO.unpack(registro)
+                if fila_menor != fila_menor_actual:
+                    fila_menor_actual = fila_menor
+                    grupo_actual = Lista()
+                    grupos.insertar(grupo_actual)
+                grupo_actual.insertar(fila)
+
+        reporte.insertar('grupos', grupos.obtener_tamaño())
+        return grupos, reporte
+
+    def crear_matrices_reducidas(self, campo, grupos_estaciones):
+        """
+        Crear las matrices reducidas de suelo y cultivo recorriendo de nuevo
+        las frecuencias, sin matrices completas
+
+        Returns:
+            Diccionario: 'suelo' y 'cultivo' con la misma forma que
+                         Optimizador.crear_matrices_reducidas
+        """
+        columnas_suelo = campo.obtener_cantidad_sensores_suelo()
+        columnas_cultivo = campo.obtener_cantidad_sensores_cultivo()
+        cantidad_grupos = grupos_estaciones.obtener_tamaño()
+
+        valores_suelo = array('q', bytes(8 * cantidad_grupos * columnas_suelo))
+        valores_cultivo = array('q', bytes(8 * cantidad_grupos * columnas_cultivo))
+
+        with self._crear_ordenador(self.MIEMBRO.size) as grupo_por_fila, \
+                self._crear_ordenador(self.FRECUENCIA.size) as frecuencias:
+
+            numero_grupo = 0
+            iterador_grupos = grupos_estaciones.crear_iterador()
+            while iterador_grupos.hay_siguiente():
+                iterador_miembros = iterador_grupos.siguiente().crear_iterador()
+                while iterador_miembros.hay_siguiente():
+                    grupo_por_fila.agregar(self.MIEMBRO.pack(iterador_miembros.siguiente(), numero_grupo))
+                numero_grupo += 1
+
+            for fila, j, valor in self.procesador_matrices.recorrer_frecuencias(campo, "suelo"):
+                frecuencias.agregar(self.FRECUENCIA.pack(fila, self.TIPO_SUELO, j, valor))
+            for fila, j, valor in self.procesador_matrices.recorrer_frecuencias(campo, "cultivo"):
+                frecuencias.agregar(self.FRECUENCIA.pack(fila, self.TIPO_CULTIVO, j, valor))
+
+            # Cruce por fila: ambos flujos vienen ordenados por fila
+            asignaciones = grupo_por_fila.iterar_ordenado()
+            fila_asignada = -1
+            grupo = 0
+            for registro in frecuencias.iterar_ordenado():
+                fila, tipo, j, valor = self.FRECUENCIA.unpack(registro)
+                while fila_asignada < fila:
+                    fila_asignada, grupo = self.MIEMBRO.unpack(next(asignaciones))
+                if tipo == self.TIPO_SUELO:
+                    valores_suelo[grupo * columnas_suelo + j] += valor
+                else:
+                    valores_cultivo[grupo * columnas_cultivo + j] += valor
+
+        matrices = Diccionario()
+        matrices.insertar('suelo', Matriz(cantidad_grupos, columnas_suelo, valores_suelo))
+        matrices.insertar('cultivo', Matriz(cantidad_grupos, columnas_cultivo, valores_cultivo))
+        return matrices
@@ -0,0 +1,175 @@
+# procesadores/agrupador_incremental.py
+# Agrupación de estaciones por evidencia de equivalencia que llega de a poco (union-find)
+
+from clases.lista import Lista
+from clases.diccionario import Diccionario
+from clases.tabla_hash import TablaHash
+from clases.conjuntos_disjuntos import ConjuntosDisjuntos
+from .agrupador_lsh import AgrupadorLSH
+
+class AgrupadorIncremental:
+    """
+    Agrupa estaciones uniendo las que alguna evidencia declara equivalentes,
+    sin comparar todos los pares. La evidencia puede llegar en cualquier
+    orden y en tandas:
+
+    - Claves (agregar_clave/agregar_claves): estaciones con la misma clave
+      se unen; con la firma combinada como clave el resultado es el del
+      modo "exacto". Cada clave guarda solo su primera estación.
+    - Pares (unir/agregar_pares): por ejemplo pares candidatos de una
+      búsqueda aproximada ya verificados por quien los envía.
+    - Candidatos LSH (agregar_candidatos_lsh): firmas que comparten una
+      banda de AgrupadorLSH y están a distancia <= distancia_maxima.
+
+    Los grupos son las componentes conexas de toda la evidencia recibida,
+    en el mismo orden que identificar_grupos_estaciones: cada grupo en orden
+    de su menor estación y sus miembros en orden de estación.
+    """
+
+    def __init__(self, cantidad_estaciones=0):
+        """
+        Args:
+            cantidad_estaciones (int): Estaciones iniciales (se pueden agregar más)
+        """
+        self.__conjuntos = ConjuntosDisjuntos(cantidad_estaciones)
+        self.__primera_por_clave = TablaHash()  # clave -> primera estación con esa clave
+        self.__evidencias = 0
+        self.__uniones = 0
+
+    def agregar_estacion(self):
+        """
+        Agregar una estación sin evidencia (queda sola en su grupo)
+
+        Returns:
+            int: Índice de la estación
+        """
+        return self.__conjuntos.agregar_elemento()
+
+    def obtener_cantidad_estaciones(self):
+        return self.__conjuntos.obtener_tamaño()
+
+    def unir(self, estacion1, estacion2):
+        """
+        Registrar que dos estaciones son equivalentes
+
+        Returns:
+            bool: True si la evidencia unió dos grupos distintos
+        """
+        cantidad = self.__conjuntos.obtener_tamaño()
+        if estacion1 < 0 or estacion1 >= cantidad or estacion2 < 0 or estacion2 >= cantidad:
+            raise IndexError("Estación fuera de rango: ({}, {})".format(estacion1, estacion2))
+        self.__evidencias += 1
+        if self.__conjuntos.unir(estacion1, estacion2):
+            self.__uniones += 1
+            return True
+        return False
+
+    def agregar_pares(self, pares):
+        """
+        Registrar pares (estación, estación) equivalentes de cualquier iterable
+
+        Returns:
+            int: Cantidad de pares que unieron grupos distintos
+        """
+        uniones = 0
+        for estacion1, estacion2 in pares:
+            if self.unir(estacion1, estacion2):
+                uniones += 1
+        return uniones
+
+    def agregar_clave(self, estacion, clave):
+        """
+        Registrar la clave de una estación: se une con la primera estación
+        que llegó con la misma clave
+
+        Returns:
+            bool: True si la evidencia unió dos grupos distintos
+        """
+        if estacion < 0 or estacion >= self.__conjuntos.obtener_tamaño():
+            raise IndexError("Estación fuera de rango: {}".format(estacion))
+        primera = self.__primera_por_clave.obtener(clave)
+        if primera is None:
+            self.__primera_por_clave.insertar(clave, estacion)
+            return False
+        return self.unir(primera, estacion)
+
+    def agregar_claves(self, claves, desde=0):
+        """
+        Registrar la clave de estaciones consecutivas
+
+        Args:
+            claves: Iterable con la clave de cada estación (por ejemplo un Arreglo de firmas)
+            desde (int): Índice de la estación de la primera clave
+        """
+        estacion = desde
+        for clave in claves:
+            self.agregar_clave(estacion, clave)
+            estacion += 1
+
+    def agregar_candidatos_lsh(self, firmas, bits, distancia_maxima):
+        """
+        Unir estaciones cuyas firmas comparten alguna banda LSH y difieren
+        en a lo sumo distancia_maxima bits. A diferencia de AgrupadorLSH (que
+        une cada estación a un líder) la unión es transitiva: dos estaciones
+        lejanas terminan juntas si hay una cadena de firmas cercanas.
+        Las firmas repetidas se unen por clave y entran a las bandas una vez.
+
+        Args:
+            firmas (Arreglo): Firma combinada de cada estación
+            bits (int): Posiciones de las firmas
+            distancia_maxima (int): Distancia de Hamming máxima por par
+
+        Returns:
+            int: Pares candidatos comparados
+        """
+        lsh = AgrupadorLSH(distancia_maxima)
+        mascaras = lsh.crear_mascaras_bandas(bits)
+        representantes = TablaHash()  # firma -> primera estación con esa firma
+        estacion = 0
+        for firma in firmas:
+            if representantes.contiene_clave(firma):
+                self.unir(representantes.obtener(firma), estacion)
+            else:
+                representantes.insertar(firma, estacion)
+            estacion += 1
+
+        comparados = 0
+        for mascara in mascaras:
+            cubetas = TablaHash()  # valor enmascarado -> Lista de (firma, estación)
+            for par in representantes.obtener_pares():
+                firma = par.get_clave()
+                cubeta = cubetas.obtener(firma & mascara)
+                if cubeta is None:
+                    cubeta = Lista()
+                    cubetas.insertar(firma & mascara, cubeta)
+                else:
+                    for firma_previa, estacion_previa in cubeta:
+                        comparados += 1
+                        if bin(firma ^ firma_previa).count("1") <= distancia_maxima:
+                            self.unir(estacion_previa, par.get_valor())
+                cubeta.insertar((firma, par.get_valor()))
+        return comparados
+
+    def obtener_grupos(self):
+        """
+        Grupos actuales
+
+        Returns:
+            Lista: Grupos (Lista de índices de estación) en el formato de
+                   identificar_grupos_estaciones
+        """
+        return self.__conjuntos.obtener_componentes()
+
+    def obtener_reporte(self):
+        """
+        Returns:
+            Diccionario: estaciones, evidencias, uniones (evidencias que unieron
+                         grupos distintos), claves_distintas y grupos
+        """
+        reporte = Diccionario()
+        reporte.insertar('estaciones', self.__conjuntos.obtener_tamaño())
+        reporte.insertar('evidencias', self.__evidencias)
+        reporte.insertar('uniones', self.__uniones)
+        reporte.insertar('claves_distintas', self.__primera_por_clave.obtener_tamaño())
+        reporte.insertar('grupos', self.__conjuntos.obtener_cantidad_componentes())
+        return reporte
@@ -0,0 +1,235 @@
+# procesadores/agrupador_lsh.py
+# Agrupación aproximada de estaciones: patrones a distancia de Hamming acotada, vía LSH
+
+import random
+from clases.lista import Lista
+from clases.arreglo import Arreglo
+from clases.diccionario import Diccionario
+from clases.tabla_hash import TablaHash
+
+class AgrupadorLSH:
+    """
+    Agrupa estaciones cuyos patrones (suelo + cultivo) difieren en a lo sumo
+    distancia_maxima posiciones, sin comparar todos los pares.
+
+    Cada patrón se representa como un entero (ver Matriz.obtener_firmas_filas).
+    Las posiciones de bit se barajan con una semilla fija y se reparten en
+    distancia_maxima + 1 bandas disjuntas. Dos patrones a distancia <= d
+    difieren en a lo sumo d bits, así que coinciden por completo en al menos
+    una banda: buscar candidatos solo entre quienes comparten alguna banda no
+    pierde ningún par válido, y los pares lejanos casi nunca se comparan.
+
+    La asignación es determinista: las estaciones se recorren en orden; cada
+    una se une al líder más cercano dentro de la tolerancia (empate: el de
+    menor índice) o pasa a ser líder de un grupo nuevo. Todo miembro queda a
+    distancia <= distancia_maxima de su líder. Con distancia_maxima = 0 el
+    resultado es idéntico a la agrupación exacta.
+    """
+
+    def __init__(self, distancia_maxima=1, semilla=2019):
+        """
+        Inicializar agrupador
+
+        Args:
+            distancia_maxima (int): Máximo de posiciones distintas para agrupar
+            semilla (int): Semilla para barajar las posiciones de las bandas
+        """
+        if distancia_maxima < 0:
+            raise ValueError("La distancia máxima no puede ser negativa")
+        self.distancia_maxima = distancia_maxima
+        self.semilla = semilla
+
+    def combinar_firmas(self, firmas_suelo, firmas_cultivo, columnas_suelo):
+        """
+        Unir las firmas de suelo y cultivo de cada estación en una sola:
+        los bits de cultivo van a continuación de los columnas_suelo de suelo.
+
+        Returns:
+            Arreglo: Firma combinada de cada estación
+        """
+        cantidad = firmas_suelo.obtener_tamaño()
+        firmas = Arreglo(cantidad, 0)
+        i = 0
+        while i < cantidad:
+            firmas.asignar(i, firmas_suelo.obtener(i) | (firmas_cultivo.obtener(i) << columnas_suelo))
+            i += 1
+        return firmas
+
+    def crear_mascaras_bandas(self, bits):
+        """
+        Repartir las posiciones 0..bits-1, barajadas, en distancia_maxima + 1 bandas
+
+        Returns:
+            Lista: Máscara (int) de cada banda; una banda sin posiciones tiene máscara 0
+        """
+        posiciones = list(range(bits))
+        random.Random(self.semilla).shuffle(posiciones)
+
+        cantidad_bandas = self.distancia_maxima + 1
+        mascaras = Arreglo(cantidad_bandas, 0)
+        k = 0
+        for posicion in posiciones:
+            banda = k % cantidad_bandas
+            mascaras.asignar(banda, mascaras.obtener(banda) | (1 << posicion))
+            k += 1
+
+        bandas = Lista()
+        for mascara in mascaras:
+            bandas.insertar(mascara)
+        return bandas
+
+    def _distancia(self, firma1, firma2):
+        """Distancia de Hamming entre dos firmas"""
+        return bin(firma1 ^ firma2).count("1")
+
+    def agrupar_firmas(self, firmas, bits):
+        """
+        Agrupar estaciones a partir de sus firmas combinadas
+
+        Args:
+            firmas (Arreglo): Firma de cada estación, en orden de estación
+            bits (int): Cantidad de posiciones de las firmas (sensores de suelo + cultivo)
+
+        Returns:
+            tuple: (Lista de grupos de índices en el formato de
+                    identificar_grupos_estaciones, Diccionario de reporte)
+        """
+        mascaras = self.crear_mascaras_bandas(bits)
+        cantidad_bandas = mascaras.obtener_tamaño()
+        cubetas = Arreglo(cantidad_bandas)
+        b = 0
+        while b < cantidad_bandas:
+            cubetas.asignar(b, TablaHash())  # valor enmascarado -> Lista de grupos líderes
+            b += 1
+
+        grupos = Lista()
+        firmas_lideres = TablaHash()   # número de grupo -> firma del líder
+        grupo_por_firma = TablaHash()  # firma exacta -> número de grupo
+        grupo_de_estacion = Arreglo(firmas.obtener_tamaño(), -1)
+        comparaciones = 0
+
+        i = 0
+        for firma in firmas:
+            numero_grupo = grupo_por_firma.obtener(firma)
+
+            if numero_grupo is None:
+                numero_grupo, revisados = self._buscar_lider(firma, mascaras, cubetas, firmas_lideres)
+                comparaciones += revisados
+                if numero_grupo == -1:
+                    numero_grupo = grupos.obtener_tamaño()
+                    grupos.insertar(Lista())
+                    firmas_lideres.insertar(numero_grupo, firma)
+                    self._registrar_lider(numero_grupo, firma, mascaras, cubetas)
+                grupo_por_firma.insertar(firma, numero_grupo)
+
+            grupo_de_estacion.asignar(i, numero_grupo)
+            i += 1
+
+        # Llenar los grupos en orden de estación (Lista no tiene acceso O(1) por posición)
+        arreglo_grupos = Arreglo(grupos.obtener_tamaño())
+        g = 0
+        for grupo in grupos:
+            arreglo_grupos.asignar(g, grupo)
+            g += 1
+        i = 0
+        for numero_grupo in grupo_de_estacion:
+            arreglo_grupos.obtener(numero_grupo).insertar(i)
+            i += 1
+
+        reporte = self._crear_reporte(firmas, grupo_de_estacion, firmas_lideres,
+                                      grupo_por_firma.obtener_tamaño(), grupos.obtener_tamaño())
+        reporte.insertar('comparaciones', comparaciones)
+        return grupos, reporte
+
+    def _buscar_lider(self, firma, mascaras, cubetas, firmas_lideres):
+        """
+        Buscar entre los líderes que comparten alguna banda el más cercano
+        dentro de la tolerancia
+
+        Returns:
+            tuple: (número de grupo o -1, cantidad de líderes comparados)
+        """
+        mejor_grupo = -1
+        mejor_distancia = self.distancia_maxima + 1
+        revisados = TablaHash()
+
+        b = 0
+        for mascara in mascaras:
+            candidatos = cubetas.obtener(b).obtener(firma & mascara)
+            b += 1
+            if candidatos is None:
+                continue
+            for numero_grupo in candidatos:
+                if revisados.contiene_clave(numero_grupo):
+                    continue
+                revisados.insertar(numero_grupo, True)
+                distancia = self._distancia(firma, firmas_lideres.obtener(numero_grupo))
+                if distancia < mejor_distancia or (distancia == mejor_distancia and numero_grupo < mejor_grupo):
+                    mejor_grupo = numero_grupo
+                    mejor_distancia = distancia
+
+        return mejor_grupo, revisados.obtener_tamaño()
+
+    def _registrar_lider(self, numero_grupo, firma, mascaras, cubetas):
+        """Agregar un líder nuevo a la cubeta de cada banda"""
+        b = 0
+        for mascara in mascaras:
+            tabla = cubetas.obtener(b)
+            clave = firma & mascara
+            lista = tabla.obtener(clave)
+            if lista is None:
+                lista = Lista()
+                tabla.insertar(clave, lista)
+            lista.insertar(numero_grupo)
+            b += 1
+
+    def _crear_reporte(self, firmas, grupo_de_estacion, firmas_lideres, grupos_exactos, grupos_aproximados):
+        """
+        Medir la cobertura perdida frente a la agrupación exacta, que no
+        pierde nada porque todos los miembros tienen el patrón del grupo.
+        Un enlace es un par (estación, sensor) con frecuencia. El patrón que
+        se emite para un grupo es el OR de las firmas de sus miembros, porque
+        reducir_celdas suma las filas de todos ellos: un enlace se pierde si
+        ese patrón no incluye el sensor y se agrega si lo incluye sin que la
+        estación lo tenga. La distancia observada sí se mide contra el líder,
+        que es la que acota distancia_maxima.
+        """
+        patrones_grupo = Arreglo(grupos_aproximados, 0)
+        i = 0
+        for firma in firmas:
+            numero_grupo = grupo_de_estacion.obtener(i)
+            patrones_grupo.asignar(numero_grupo, patrones_grupo.obtener(numero_grupo) | firma)
+            i += 1
+
+        enlaces_totales = 0
+        enlaces_perdidos = 0
+        enlaces_agregados = 0
+        estaciones_aproximadas = 0
+        distancia_observada = 0
+
+        i = 0
+        for firma in firmas:
+            numero_grupo = grupo_de_estacion.obtener(i)
+            patron = patrones_grupo.obtener(numero_grupo)
+            enlaces_totales += bin(firma).count("1")
+            if firma != patron:
+                estaciones_aproximadas += 1
+                enlaces_perdidos += bin(firma & ~patron).count("1")
+                enlaces_agregados += bin(patron & ~firma).count("1")
+            distancia = self._distancia(firma, firmas_lideres.obtener(numero_grupo))
+            if distancia > distancia_observada:
+                distancia_observada = distancia
+            i += 1
+
+        reporte = Diccionario()
+        reporte.insertar('distancia_maxima', self.distancia_maxima)
+        reporte.insertar('grupos_exactos', grupos_exactos)
+        reporte.insertar('grupos_aproximados', grupos_aproximados)
+        reporte.insertar('estaciones_aproximadas', estaciones_aproximadas)
+        reporte.insertar('distancia_maxima_observada', distancia_observada)
+        reporte.insertar('enlaces_totales', enlaces_totales)
+        reporte.insertar('enlaces_perdidos', enlaces_perdidos)
+        reporte.insertar('enlaces_agregados', enlaces_agregados)
+        reporte.insertar('porcentaje_cobertura_perdida',
+                         enlaces_perdidos * 100.0 / enlaces_totales if enlaces_totales > 0 else 0.0)
+        return reporte
@@ -0,0 +1,276 @@
+# procesadores/agrupador_restringido.py
+# Agrupación de estaciones respetando actividad y particiones (por ejemplo, ubicación)
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from clases.lista import Lista
+from clases.arreglo import Arreglo
+from clases.diccionario import Diccionario
+from clases.tabla_hash import TablaHash
+from .agrupador_lsh import AgrupadorLSH
+
+def agrupar_particiones(tareas, modo, distancia_maxima, bits):
+    """
+    Agrupar varias particiones por separado. Es de nivel de módulo para que
+    el ejecutor de procesos pueda enviarla; recibe solo firmas.
+
+    Args:
+        tareas (tuple): Por partición, una tupla con la firma de cada estación
+        modo (str): "exacto" o "aproximado"
+        distancia_maxima (int): Distancia de Hamming máxima en modo "aproximado"
+        bits (int): Posiciones de las firmas
+
+    Returns:
+        tuple: Por partición, (grupos como tuplas de posiciones dentro de la
+               partición, Diccionario de reporte de AgrupadorLSH o None)
+    """
+    resultados = []
+    for firmas in tareas:
+        if modo == "aproximado":
+            arreglo_firmas = Arreglo(len(firmas))
+            posicion = 0
+            for firma in firmas:
+                arreglo_firmas.asignar(posicion, firma)
+                posicion += 1
+            grupos, reporte = AgrupadorLSH(distancia_maxima).agrupar_firmas(arreglo_firmas, bits)
+            resultados.append((tuple(tuple(grupo) for grupo in grupos), reporte))
+            continue
+
+        grupos = Lista()
+        grupo_por_firma = TablaHash()
+        posicion = 0
+        for firma in firmas:
+            grupo = grupo_por_firma.obtener(firma)
+            if grupo is None:
+                grupo = Lista()
+                grupo_por_firma.insertar(firma, grupo)
+                grupos.insertar(grupo)
+            grupo.insertar(posicion)
+            posicion += 1
+        resultados.append((tuple(tuple(grupo) for grupo in grupos), None))
+    return tuple(resultados)
+
+
+class AgrupadorRestringido:
+    """
+    Agrupa estaciones respetando restricciones de operación:
+
+    - Estaciones inactivas: "aislar" las deja cada una en su propio grupo
+      (EstacionBase.es_compatible_con no las une con nadie) y "excluir" las
+      saca del campo optimizado.
+    - Sensores inactivos: "ignorar" no los tiene en cuenta al comparar
+      patrones (sus frecuencias se siguen sumando en las matrices reducidas)
+      e "incluir" los compara como a los activos.
+    - Particiones: solo se unen estaciones con la misma clave de partición
+      (por defecto, la ubicación; las estaciones sin ubicación forman una
+      partición). Primero se particiona y después cada partición se agrupa
+      por separado, en procesos trabajadores si procesos > 1, así que cada
+      búsqueda de patrones solo ve su partición.
+
+    Dentro de cada partición se agrupa como en modo "exacto" o, con
+    modo="aproximado", con AgrupadorLSH. Los grupos resultantes quedan en
+    orden de su menor estación y los miembros en orden de estación, igual
+    que en los demás modos.
+    """
+
+    def __init__(self, modo="exacto", distancia_maxima=1, estaciones_inactivas="aislar",
+                 sensores_inactivos="ignorar", clave_particion=None, procesos=1):
+        """
+        Args:
+            modo (str): "exacto" o "aproximado" dentro de cada partición
+            distancia_maxima (int): Distancia de Hamming máxima en modo "aproximado"
+            estaciones_inactivas (str): "aislar" o "excluir"
+            sensores_inactivos (str): "ignorar" o "incluir"
+            clave_particion: Función EstacionBase -> clave (None: por ubicación)
+            procesos (int): Procesos trabajadores (1: en este proceso; None: uno por CPU)
+        """
+        if modo not in ("exacto", "aproximado"):
+            raise ValueError("Modo de agrupación desconocido: {}".format(modo))
+        if estaciones_inactivas not in ("aislar", "excluir"):
+            raise ValueError("Opción para estaciones inactivas desconocida: {}".format(estaciones_inactivas))
+        if sensores_inactivos not in ("ignorar", "incluir"):
+            raise ValueError("Opción para sensores inactivos desconocida: {}".format(sensores_inactivos))
+        self.modo = modo
+        self.distancia_maxima = distancia_maxima
+        self.estaciones_inactivas = estaciones_inactivas
+        self.sensores_inactivos = sensores_inactivos
+        self.clave_particion = clave_particion or self.clave_por_ubicacion
+        self.procesos = procesos
+
+    @staticmethod
+    def clave_por_ubicacion(estacion):
+        """Clave de partición por defecto: la ubicación de la estación"""
+        return estacion.get_ubicacion()
+
+    def crear_mascara_sensores(self, campo):
+        """
+        Máscara de las posiciones de firma que se comparan: bit j por el
+        sensor de suelo j y bit columnas_suelo + j por el de cultivo j
+
+        Returns:
+            tuple: (máscara, cantidad de sensores ignorados)
+        """
+        columnas_suelo = campo.obtener_cantidad_sensores_suelo()
+        bits = columnas_suelo + campo.obtener_cantidad_sensores_cultivo()
+        mascara = (1 << bits) - 1
+        ignorados = 0
+        if self.sensores_inactivos == "incluir":
+            return mascara, ignorados
+
+        desplazamiento = 0
+        for sensores in (campo.obtener_sensores_suelo(), campo.obtener_sensores_cultivo()):
+            j = 0
+            for sensor in sensores:
+                if not sensor.esta_activo():
+                    mascara &= ~(1 << (desplazamiento + j))
+                    ignorados += 1
+                j += 1
+            desplazamiento = columnas_suelo
+        return mascara, ignorados
+
+    def particionar(self, campo):
+        """
+        Repartir las estaciones activas por clave de partición
+
+        Returns:
+            tuple: (Lista de particiones, cada una una Lista de índices de
+                    estación en orden, Lista de estaciones inactivas)
+        """
+        particiones = Lista()
+        particion_por_clave = TablaHash()
+        inactivas = Lista()
+        i = 0
+        for estacion in campo.obtener_estaciones():
+            if not estacion.esta_activa():
+                inactivas.insertar(i)
+            else:
+                clave = self.clave_particion(estacion)
+                particion = particion_por_clave.obtener(clave)
+                if particion is None:
+                    particion = Lista()
+                    particion_por_clave.insertar(clave, particion)
+                    particiones.insertar(particion)
+                particion.insertar(i)
+            i += 1
+        return particiones, inactivas
+
+    def agrupar(self, campo, firmas, bits):
+        """
+        Agrupar las estaciones de un campo
+
+        Args:
+            campo (CampoAgricola): Campo con las estaciones y sensores
+            firmas (Arreglo): Firma combinada de cada estación (ver
+                              ProcesadorMatrices.calcular_firmas_celdas)
+            bits (int): Sensores de suelo + cultivo
+
+        Returns:
+            tuple: (Lista de grupos de índices, Diccionario de reporte)
+        """
+        mascara, sensores_ignorados = self.crear_mascara_sensores(campo)
+        particiones, inactivas = self.particionar(campo)
+
+        tareas = Lista()
+        for particion in particiones:
+            tareas.insertar(tuple(firmas.obtener(i) & mascara for i in particion))
+        resultados = self.__agrupar_tareas(tareas, bits)
+
+        # Pasar las posiciones de cada partición a índices de estación y
+        # ordenar los grupos por su menor estación (la primera del grupo)
+        cantidad_estaciones = firmas.obtener_tamaño()
+        grupo_por_primera = Arreglo(cantidad_estaciones)
+        reportes = Lista()
+        pares_particionados = 0
+        particion_mayor = 0
+        iterador_resultados = iter(resultados)
+        for particion in particiones:
+            grupos_locales, reporte = next(iterador_resultados)
+            if reporte is not None:
+                reportes.insertar(reporte)
+            indices = Arreglo(particion.obtener_tamaño())
+            posicion = 0
+            for i in particion:
+                indices.asignar(posicion, i)
+                posicion += 1
+            for grupo_local in grupos_locales:
+                grupo = Lista()
+                for posicion in grupo_local:
+                    grupo.insertar(indices.obtener(posicion))
+                grupo_por_primera.asignar(grupo.obtener_en_posicion(0), grupo)
+            tamaño = particion.obtener_tamaño()
+            pares_particionados += tamaño * (tamaño - 1) // 2
+            particion_mayor = max(particion_mayor, tamaño)
+
+        if self.estaciones_inactivas == "aislar":
+            for i in inactivas:
+                grupo = Lista()
+                grupo.insertar(i)
+                grupo_por_primera.asignar(i, grupo)
+
+        grupos = Lista()
+        for grupo in grupo_por_primera:
+            if grupo is not None:
+                grupos.insertar(grupo)
+
+        reporte = Diccionario()
+        reporte.insertar('modo', self.modo)
+        reporte.insertar('particiones', particiones.obtener_tamaño())
+        reporte.insertar('particion_mayor', particion_mayor)
+        reporte.insertar('estaciones_inactivas', inactivas.obtener_tamaño())
+        reporte.insertar('estaciones_excluidas',
+                         inactivas.obtener_tamaño() if self.estaciones_inactivas == "excluir" else 0)
+        reporte.insertar('sensores_ignorados', sensores_ignorados)
+        reporte.insertar('grupos', grupos.obtener_tamaño())
+        pares_totales = cantidad_estaciones * (cantidad_estaciones - 1) // 2
+        reporte.insertar('pares_posibles', pares_totales)
+        reporte.insertar('pares_dentro_de_particiones', pares_particionados)
+        reporte.insertar('reduccion_espacio', pares_totales / pares_particionados if pares_particionados > 0 else 0.0)
+        if self.modo == "aproximado":
+            self._combinar_reportes_lsh(reportes, reporte)
+        return grupos, reporte
+
+    def __agrupar_tareas(self, tareas, bits):
+        """Agrupar las particiones en este proceso o repartidas en procesos trabajadores"""
+        procesos = self.procesos or os.cpu_count() or 1
+        cantidad = tareas.obtener_tamaño()
+        if procesos == 1 or cantidad <= 1:
+            return agrupar_particiones(tuple(tareas), self.modo, self.distancia_maxima, bits)
+
+        # Tandas contiguas de particiones: pocas tareas por trabajador
+        tandas = Lista()
+        tamaño_tanda = max(1, -(-cantidad // (procesos * 4)))
+        tanda = Lista()
+        for firmas in tareas:
+            tanda.insertar(firmas)
+            if tanda.obtener_tamaño() == tamaño_tanda:
+                tandas.insertar(tuple(tanda))
+                tanda = Lista()
+        if not tanda.esta_vacia():
+            tandas.insertar(tuple(tanda))
+
+        resultados = Lista()
+        cantidad_tandas = tandas.obtener_tamaño()
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            # map entrega los resultados en el orden de las tandas
+            for resultados_tanda in ejecutor.map(agrupar_particiones, tandas, [self.modo] * cantidad_tandas,
+                                                 [self.distancia_maxima] * cantidad_tandas, [bits] * cantidad_tandas):
+                for resultado in resultados_tanda:
+                    resultados.insertar(resultado)
+        return resultados
+
+    def _combinar_reportes_lsh(self, reportes, reporte):
+        """Sumar en el reporte general la cobertura perdida de cada partición"""
+        for clave in ('grupos_exactos', 'estaciones_aproximadas', 'enlaces_totales',
+                      'enlaces_perdidos', 'enlaces_agregados', 'comparaciones'):
+            total = 0
+            for reporte_particion in reportes:
+                total += reporte_particion.obtener(clave)
+            reporte.insertar(clave, total)
+        distancia_observada = 0
+        for reporte_particion in reportes:
+            distancia_observada = max(distancia_observada, reporte_particion.obtener('distancia_maxima_observada'))
+        reporte.insertar('distancia_maxima', self.distancia_maxima)
+        reporte.insertar('distancia_maxima_observada', distancia_observada)
+        enlaces_totales = reporte.obtener('enlaces_totales')
+        reporte.insertar('porcentaje_cobertura_perdida',
+                         reporte.obtener('enlaces_perdidos') * 100.0 / enlaces_totales if enlaces_totales > 0 else 0.0)
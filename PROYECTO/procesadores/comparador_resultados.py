@@ -0,0 +1,484 @@
+# procesadores/comparador_resultados.py
+# Diferencias entre dos resultados de optimización y cambios para actualizar el XML de salida
+
+import json
+import xml.etree.ElementTree as ET
+from clases.lista import Lista
+from clases.diccionario import Diccionario
+from clases.tabla_hash import TablaHash
+
+# Contenedor y etiqueta de los sensores de cada tipo en el XML
+ETIQUETAS_SENSORES = TablaHash()
+ETIQUETAS_SENSORES.insertar("suelo", ("sensoresSuelo", "sensorS"))
+ETIQUETAS_SENSORES.insertar("cultivo", ("sensoresCultivo", "sensorT"))
+
+
+class ConjuntoCambios:
+    """
+    Operaciones que convierten el <campo> optimizado de un resultado en el
+    de otro dentro del XML de salida, sin regenerar el resto del archivo.
+    Cada operación es una tupla cuyo primer elemento es su nombre:
+
+        ("renombrar_campo", nombre)
+        ("agregar_estacion", id_estacion, nombre)
+        ("eliminar_sensor", tipo, id_sensor)
+        ("agregar_sensor", tipo, id_sensor, nombre, posicion)
+        ("asignar_frecuencia", tipo, id_sensor, id_estacion, valor)
+        ("eliminar_frecuencia", tipo, id_sensor, id_estacion)
+        ("eliminar_estacion", id_estacion)
+
+    crear_cambios() las genera en ese orden: cada frecuencia encuentra su
+    sensor y su estación, la posición de un sensor agregado ya no cuenta a
+    los eliminados, y las estaciones se eliminan al final, cuando ya no
+    tienen frecuencias.
+    """
+
+    __slots__ = ('__id_campo', '__operaciones')
+
+    VERSION = 1
+
+    def __init__(self, id_campo):
+        self.__id_campo = id_campo
+        self.__operaciones = Lista()
+
+    def get_id_campo(self):
+        return self.__id_campo
+
+    def agregar(self, *operacion):
+        """Agregar una operación al final del conjunto"""
+        self.__operaciones.insertar(tuple(operacion))
+
+    def obtener_operaciones(self):
+        """Lista de operaciones en orden de aplicación"""
+        return self.__operaciones
+
+    def esta_vacio(self):
+        return self.__operaciones.esta_vacia()
+
+    def __len__(self):
+        return self.__operaciones.obtener_tamaño()
+
+    def aplicar(self, elemento_campo):
+        """
+        Aplicar las operaciones sobre el elemento <campo> de un XML de
+        salida. Las frecuencias nuevas se insertan en el orden de sus
+        estaciones, igual que las escribe XMLHandler.
+
+        Raises:
+            ValueError: Si una operación no encuentra su sensor o estación
+        """
+        estaciones = elemento_campo.find('estacionesBase')
+        sensores = TablaHash()     # (tipo, id) -> elemento <sensorS>/<sensorT>
+        frecuencias = TablaHash()  # (tipo, id_sensor, id_estacion) -> <frecuencia>
+        for tipo in ("suelo", "cultivo"):
+            contenedor, etiqueta = ETIQUETAS_SENSORES.obtener(tipo)
+            for sensor in elemento_campo.find(contenedor).findall(etiqueta):
+                sensores.insertar((tipo, sensor.get('id')), sensor)
+                for frecuencia in sensor.findall('frecuencia'):
+                    frecuencias.insertar((tipo, sensor.get('id'), frecuencia.get('idEstacion')), frecuencia)
+        posiciones = None  # ID de estación -> posición; se arma al insertar la primera frecuencia
+
+        for operacion in self.__operaciones:
+            nombre = operacion[0]
+            if nombre == "renombrar_campo":
+                elemento_campo.set('nombre', operacion[1])
+
+            elif nombre == "agregar_estacion":
+                estacion = ET.SubElement(estaciones, 'estacion')
+                estacion.set('id', operacion[1])
+                estacion.set('nombre', operacion[2])
+                posiciones = None
+
+            elif nombre == "eliminar_estacion":
+                for estacion in estaciones.findall('estacion'):
+                    if estacion.get('id') == operacion[1]:
+                        estaciones.remove(estacion)
+                        break
+                else:
+                    raise ValueError("Estación inexistente: {}".format(operacion[1]))
+                posiciones = None
+
+            elif nombre == "agregar_sensor":
+                _, tipo, id_sensor, nombre_sensor, posicion = operacion
+                contenedor, etiqueta = ETIQUETAS_SENSORES.obtener(tipo)
+                sensor = ET.Element(etiqueta)
+                sensor.set('id', id_sensor)
+                sensor.set('nombre', nombre_sensor)
+                elemento_campo.find(contenedor).insert(posicion, sensor)
+                sensores.insertar((tipo, id_sensor), sensor)
+
+            elif nombre == "eliminar_sensor":
+                _, tipo, id_sensor = operacion
+                sensor = self.__buscar(sensores, (tipo, id_sensor), "Sensor")
+                elemento_campo.find(ETIQUETAS_SENSORES.obtener(tipo)[0]).remove(sensor)
+                sensores.eliminar((tipo, id_sensor))
+
+            elif nombre == "asignar_frecuencia":
+                _, tipo, id_sensor, id_estacion, valor = operacion
+                frecuencia = frecuencias.obtener((tipo, id_sensor, id_estacion))
+                if frecuencia is None:
+                    if posiciones is None:
+                        posiciones = self.__posiciones_estaciones(estaciones)
+                    sensor = self.__buscar(sensores, (tipo, id_sensor), "Sensor")
+                    frecuencia = self.__insertar_frecuencia(sensor, id_estacion, posiciones)
+                    frecuencias.insertar((tipo, id_sensor, id_estacion), frecuencia)
+                frecuencia.text = str(valor)
+
+            elif nombre == "eliminar_frecuencia":
+                _, tipo, id_sensor, id_estacion = operacion
+                frecuencia = self.__buscar(frecuencias, (tipo, id_sensor, id_estacion), "Frecuencia")
+                self.__buscar(sensores, (tipo, id_sensor), "Sensor").remove(frecuencia)
+                frecuencias.eliminar((tipo, id_sensor, id_estacion))
+
+            else:
+                raise ValueError("Operación desconocida: {}".format(nombre))
+
+        # Un elemento que quedó sin hijos conserva la indentación que tenía
+        # adentro; sin texto se escribe vacío (<sensorS ... />) como en XMLHandler
+        for elemento in elemento_campo.iter():
+            if len(elemento) == 0 and elemento.text is not None and not elemento.text.strip():
+                elemento.text = None
+
+    def __buscar(self, tabla, clave, descripcion):
+        elemento = tabla.obtener(clave)
+        if elemento is None:
+            raise ValueError("{} inexistente: {}".format(descripcion, " ".join(clave)))
+        return elemento
+
+    def __posiciones_estaciones(self, estaciones):
+        posiciones = TablaHash()
+        posicion = 0
+        for estacion in estaciones.findall('estacion'):
+            posiciones.insertar(estacion.get('id'), posicion)
+            posicion += 1
+        return posiciones
+
+    def __insertar_frecuencia(self, sensor, id_estacion, posiciones):
+        """Crear <frecuencia> antes de la primera de una estación posterior"""
+        frecuencia = ET.Element('frecuencia')
+        frecuencia.set('idEstacion', id_estacion)
+        posicion = posiciones.obtener(id_estacion)
+        indice = 0
+        for existente in sensor:
+            posicion_existente = posiciones.obtener(existente.get('idEstacion'))
+            if posicion is not None and posicion_existente is not None and posicion_existente > posicion:
+                break
+            indice += 1
+        sensor.insert(indice, frecuencia)
+        return frecuencia
+
+    @classmethod
+    def guardar(cls, ruta_archivo, conjuntos):
+        """Guardar una Lista de conjuntos de cambios como JSON"""
+        campos = []
+        for conjunto in conjuntos:
+            campos.append({
+                'id': conjunto.get_id_campo(),
+                'operaciones': [list(operacion) for operacion in conjunto.obtener_operaciones()],
+            })
+        with open(ruta_archivo, 'w', encoding='utf-8') as archivo:
+            json.dump({'version': cls.VERSION, 'campos': campos}, archivo, ensure_ascii=False)
+
+    @classmethod
+    def cargar(cls, ruta_archivo):
+        """
+        Leer conjuntos de cambios guardados con guardar()
+
+        Returns:
+            Lista: Conjuntos de cambios en el orden en que se guardaron
+        """
+        with open(ruta_archivo, 'r', encoding='utf-8') as archivo:
+            datos = json.load(archivo)
+        if datos.get('version') != cls.VERSION:
+            raise ValueError("Versión de cambios no soportada: {}".format(datos.get('version')))
+        conjuntos = Lista()
+        for campo in datos['campos']:
+            conjunto = cls(campo['id'])
+            for operacion in campo['operaciones']:
+                conjunto.agregar(*operacion)
+            conjuntos.insertar(conjunto)
+        return conjuntos
+
+    def __str__(self):
+        return "ConjuntoCambios(campo={}, operaciones={})".format(self.__id_campo, len(self))
+
+
+class ComparadorResultados:
+    """
+    Compara dos resultados de Optimizador.optimizar_estaciones del mismo
+    campo (por ejemplo, el de ayer y el de hoy).
+
+    Los grupos se identifican por su firma de miembros: la tupla de IDs de
+    las estaciones originales que reúne ('miembros_grupos' del resultado).
+    Todo se cruza con tablas hash sobre esas firmas y sobre los IDs de
+    estación y sensor, en tiempo lineal en el tamaño de los resultados, sin
+    comparar cada grupo de un resultado contra todos los del otro.
+    """
+
+    def comparar(self, anterior, nuevo):
+        """
+        Calcular qué cambió entre dos resultados
+
+        Args:
+            anterior (ResultadoOptimizacion): Resultado de referencia
+            nuevo (ResultadoOptimizacion): Resultado a comparar
+
+        Returns:
+            Diccionario: Con las claves
+                grupos_conservados: (id anterior, id nuevo, miembros) de los
+                    grupos con los mismos miembros (el ID de la estación
+                    optimizada puede cambiar si cambió su posición)
+                grupos_creados: (id nuevo, miembros, IDs anteriores de sus miembros)
+                grupos_eliminados: (id anterior, miembros, IDs nuevos de sus miembros)
+                fusiones: (id nuevo, IDs anteriores) de grupos creados que
+                    unen miembros de dos o más grupos anteriores
+                divisiones: (id anterior, IDs nuevos) de grupos eliminados
+                    cuyos miembros quedaron en dos o más grupos nuevos
+                estaciones_movidas: (id de estación, grupo anterior, grupo nuevo)
+                    de las estaciones cuyo grupo cambió de miembros
+                estaciones_agregadas / estaciones_eliminadas: (id de estación, grupo)
+                deltas_frecuencias: (tipo, id de sensor, grupo anterior,
+                    grupo nuevo, valor anterior, valor nuevo) de las
+                    frecuencias reducidas que cambiaron en grupos conservados
+                totales_sensores: (tipo, id de sensor, total anterior, total
+                    nuevo) de los sensores cuya suma de frecuencias cambió
+                y los contadores grupos_anteriores y grupos_nuevos
+        """
+        miembros_anteriores = self.__obtener_miembros(anterior)
+        miembros_nuevos = self.__obtener_miembros(nuevo)
+        ids_anteriores, grupo_por_firma_anterior, grupo_por_estacion_anterior = self.__indexar(anterior, miembros_anteriores)
+        ids_nuevos, grupo_por_firma_nuevo, grupo_por_estacion_nuevo = self.__indexar(nuevo, miembros_nuevos)
+
+        conservados = Lista()
+        creados = Lista()
+        fusiones = Lista()
+        conservado_de = TablaHash()  # Posición anterior -> posición nueva de los grupos conservados
+        k = 0
+        for miembros in miembros_nuevos:
+            k_anterior = grupo_por_firma_anterior.obtener(miembros)
+            if k_anterior is not None:
+                conservado_de.insertar(k_anterior, k)
+                conservados.insertar((ids_anteriores.obtener(k_anterior), ids_nuevos.obtener(k), miembros))
+            else:
+                origenes = self.__grupos_de(miembros, grupo_por_estacion_anterior, ids_anteriores)
+                creados.insertar((ids_nuevos.obtener(k), miembros, origenes))
+                if len(origenes) >= 2:
+                    fusiones.insertar((ids_nuevos.obtener(k), origenes))
+            k += 1
+
+        eliminados = Lista()
+        divisiones = Lista()
+        k = 0
+        for miembros in miembros_anteriores:
+            if not conservado_de.contiene_clave(k):
+                destinos = self.__grupos_de(miembros, grupo_por_estacion_nuevo, ids_nuevos)
+                eliminados.insertar((ids_anteriores.obtener(k), miembros, destinos))
+                if len(destinos) >= 2:
+                    divisiones.insertar((ids_anteriores.obtener(k), destinos))
+            k += 1
+
+        movidas = Lista()
+        agregadas = Lista()
+        for miembros in miembros_nuevos:
+            for id_estacion in miembros:
+                k = grupo_por_estacion_nuevo.obtener(id_estacion)
+                k_anterior = grupo_por_estacion_anterior.obtener(id_estacion)
+                if k_anterior is None:
+                    agregadas.insertar((id_estacion, ids_nuevos.obtener(k)))
+                elif conservado_de.obtener(k_anterior) != k:
+                    movidas.insertar((id_estacion, ids_anteriores.obtener(k_anterior), ids_nuevos.obtener(k)))
+        eliminadas = Lista()
+        for miembros in miembros_anteriores:
+            for id_estacion in miembros:
+                if not grupo_por_estacion_nuevo.contiene_clave(id_estacion):
+                    eliminadas.insertar((id_estacion, ids_anteriores.obtener(grupo_por_estacion_anterior.obtener(id_estacion))))
+
+        frecuencias_anteriores, sensores_anteriores = self.__tabla_frecuencias(anterior.obtener('campo_optimizado'))
+        frecuencias_nuevas, sensores_nuevos = self.__tabla_frecuencias(nuevo.obtener('campo_optimizado'))
+        sensores = self.__unir_sensores(sensores_anteriores, sensores_nuevos)
+
+        deltas = Lista()
+        for id_anterior, id_nuevo, _ in conservados:
+            for tipo, id_sensor, _ in sensores:
+                valor_anterior = frecuencias_anteriores.obtener((tipo, id_sensor, id_anterior), 0)
+                valor_nuevo = frecuencias_nuevas.obtener((tipo, id_sensor, id_nuevo), 0)
+                if valor_anterior != valor_nuevo:
+                    deltas.insertar((tipo, id_sensor, id_anterior, id_nuevo, valor_anterior, valor_nuevo))
+
+        totales_anteriores = self.__sumar_por_sensor(frecuencias_anteriores)
+        totales_nuevos = self.__sumar_por_sensor(frecuencias_nuevas)
+        totales = Lista()
+        for tipo, id_sensor, _ in sensores:
+            total_anterior = totales_anteriores.obtener((tipo, id_sensor), 0)
+            total_nuevo = totales_nuevos.obtener((tipo, id_sensor), 0)
+            if total_anterior != total_nuevo:
+                totales.insertar((tipo, id_sensor, total_anterior, total_nuevo))
+
+        diferencia = Diccionario()
+        diferencia.insertar('campo', nuevo.obtener('campo_optimizado').get_id())
+        diferencia.insertar('grupos_anteriores', miembros_anteriores.obtener_tamaño())
+        diferencia.insertar('grupos_nuevos', miembros_nuevos.obtener_tamaño())
+        diferencia.insertar('grupos_conservados', conservados)
+        diferencia.insertar('grupos_creados', creados)
+        diferencia.insertar('grupos_eliminados', eliminados)
+        diferencia.insertar('fusiones', fusiones)
+        diferencia.insertar('divisiones', divisiones)
+        diferencia.insertar('estaciones_movidas', movidas)
+        diferencia.insertar('estaciones_agregadas', agregadas)
+        diferencia.insertar('estaciones_eliminadas', eliminadas)
+        diferencia.insertar('deltas_frecuencias', deltas)
+        diferencia.insertar('totales_sensores', totales)
+        return diferencia
+
+    def crear_cambios(self, anterior, nuevo):
+        """
+        Crear las operaciones que convierten el campo optimizado anterior en
+        el nuevo dentro del XML de salida (ver XMLHandler.aplicar_cambios_salida)
+
+        Returns:
+            ConjuntoCambios: Vacío si ambos campos escriben el mismo XML
+        """
+        campo_anterior = anterior.obtener('campo_optimizado')
+        campo_nuevo = nuevo.obtener('campo_optimizado')
+        cambios = ConjuntoCambios(campo_anterior.get_id())
+        if campo_anterior.get_nombre() != campo_nuevo.get_nombre():
+            cambios.agregar("renombrar_campo", campo_nuevo.get_nombre())
+
+        estaciones_anteriores = TablaHash()
+        for estacion in campo_anterior.obtener_estaciones():
+            estaciones_anteriores.insertar(estacion.get_id(), estacion)
+        estaciones_nuevas = TablaHash()
+        for estacion in campo_nuevo.obtener_estaciones():
+            estaciones_nuevas.insertar(estacion.get_id(), estacion)
+            if not estaciones_anteriores.contiene_clave(estacion.get_id()):
+                cambios.agregar("agregar_estacion", estacion.get_id(), estacion.get_nombre())
+
+        frecuencias_anteriores, sensores_anteriores = self.__tabla_frecuencias(campo_anterior)
+        frecuencias_nuevas, sensores_nuevos = self.__tabla_frecuencias(campo_nuevo)
+        claves_anteriores = TablaHash()
+        for tipo, id_sensor, _ in sensores_anteriores:
+            claves_anteriores.insertar((tipo, id_sensor), True)
+        claves_nuevas = TablaHash()
+        for tipo, id_sensor, _ in sensores_nuevos:
+            claves_nuevas.insertar((tipo, id_sensor), True)
+
+        for tipo, id_sensor, _ in sensores_anteriores:
+            if not claves_nuevas.contiene_clave((tipo, id_sensor)):
+                cambios.agregar("eliminar_sensor", tipo, id_sensor)
+        posiciones = TablaHash()
+        for tipo in ("suelo", "cultivo"):
+            posiciones.insertar(tipo, 0)
+        for tipo, id_sensor, nombre in sensores_nuevos:
+            if not claves_anteriores.contiene_clave((tipo, id_sensor)):
+                cambios.agregar("agregar_sensor", tipo, id_sensor, nombre, posiciones.obtener(tipo))
+            posiciones.insertar(tipo, posiciones.obtener(tipo) + 1)
+
+        # Frecuencias: un cruce por clave (tipo, sensor, estación) en cada sentido
+        for par in frecuencias_nuevas.obtener_pares():
+            if frecuencias_anteriores.obtener(par.get_clave()) != par.get_valor():
+                cambios.agregar("asignar_frecuencia", *par.get_clave(), par.get_valor())
+        for par in frecuencias_anteriores.obtener_pares():
+            tipo, id_sensor, _ = par.get_clave()
+            # Las de un sensor que se elimina se van con él
+            if not frecuencias_nuevas.contiene_clave(par.get_clave()) and claves_nuevas.contiene_clave((tipo, id_sensor)):
+                cambios.agregar("eliminar_frecuencia", *par.get_clave())
+
+        for estacion in campo_anterior.obtener_estaciones():
+            if not estaciones_nuevas.contiene_clave(estacion.get_id()):
+                cambios.agregar("eliminar_estacion", estacion.get_id())
+        return cambios
+
+    def mostrar_diferencia(self, diferencia):
+        """Mostrar en consola un resumen de comparar()"""
+        print("Campo {}: {} -> {} grupos".format(diferencia.obtener('campo'),
+                                                diferencia.obtener('grupos_anteriores'),
+                                                diferencia.obtener('grupos_nuevos')))
+        print("  Grupos conservados: {}, creados: {}, eliminados: {}".format(
+            diferencia.obtener('grupos_conservados').obtener_tamaño(),
+            diferencia.obtener('grupos_creados').obtener_tamaño(),
+            diferencia.obtener('grupos_eliminados').obtener_tamaño()))
+        for id_nuevo, origenes in diferencia.obtener('fusiones'):
+            print("  Fusión: {} -> {}".format(", ".join(origenes), id_nuevo))
+        for id_anterior, destinos in diferencia.obtener('divisiones'):
+            print("  División: {} -> {}".format(id_anterior, ", ".join(destinos)))
+        for id_estacion, id_anterior, id_nuevo in diferencia.obtener('estaciones_movidas'):
+            print("  Estación {}: {} -> {}".format(id_estacion, id_anterior, id_nuevo))
+        for id_estacion, id_nuevo in diferencia.obtener('estaciones_agregadas'):
+            print("  Estación nueva {} en {}".format(id_estacion, id_nuevo))
+        for id_estacion, id_anterior in diferencia.obtener('estaciones_eliminadas'):
+            print("  Estación eliminada {} (estaba en {})".format(id_estacion, id_anterior))
+        for tipo, id_sensor, id_anterior, id_nuevo, valor_anterior, valor_nuevo in diferencia.obtener('deltas_frecuencias'):
+            print("  Sensor de {} {} en {}: {} -> {} ({:+d})".format(
+                tipo, id_sensor, id_nuevo, valor_anterior, valor_nuevo, valor_nuevo - valor_anterior))
+
+    def __obtener_miembros(self, resultado):
+        miembros = resultado.obtener('miembros_grupos')
+        if miembros is None:
+            raise ValueError("El resultado no tiene miembros_grupos (se generó con una versión anterior)")
+        return miembros
+
+    def __indexar(self, resultado, miembros_grupos):
+        """
+        Tablas de un resultado: ID de estación optimizada por posición de
+        grupo, posición por firma de miembros y posición por ID de estación
+        """
+        campo_optimizado = resultado.obtener('campo_optimizado')
+        ids = TablaHash(miembros_grupos.obtener_tamaño())
+        k = 0
+        for estacion in campo_optimizado.obtener_estaciones():
+            ids.insertar(k, estacion.get_id())
+            k += 1
+        grupo_por_firma = TablaHash(miembros_grupos.obtener_tamaño())
+        grupo_por_estacion = TablaHash()
+        k = 0
+        for miembros in miembros_grupos:
+            grupo_por_firma.insertar(miembros, k)
+            for id_estacion in miembros:
+                grupo_por_estacion.insertar(id_estacion, k)
+            k += 1
+        return ids, grupo_por_firma, grupo_por_estacion
+
+    def __grupos_de(self, miembros, grupo_por_estacion, ids):
+        """IDs distintos de los grupos (del otro resultado) donde están los miembros, en orden"""
+        vistos = TablaHash()
+        grupos = Lista()
+        for id_estacion in miembros:
+            k = grupo_por_estacion.obtener(id_estacion)
+            if k is not None and not vistos.contiene_clave(k):
+                vistos.insertar(k, True)
+                grupos.insertar(ids.obtener(k))
+        return tuple(grupos)
+
+    def __tabla_frecuencias(self, campo_optimizado):
+        """
+        Returns:
+            tuple: (TablaHash (tipo, id de sensor, id de estación) -> valor,
+                    Lista de (tipo, id de sensor, nombre) en orden del campo)
+        """
+        frecuencias = TablaHash()
+        sensores = Lista()
+        for tipo, lista_sensores in (("suelo", campo_optimizado.obtener_sensores_suelo()),
+                                     ("cultivo", campo_optimizado.obtener_sensores_cultivo())):
+            for sensor in lista_sensores:
+                sensores.insertar((tipo, sensor.get_id(), sensor.get_nombre()))
+                for frecuencia in sensor.obtener_frecuencias():
+                    frecuencias.insertar((tipo, sensor.get_id(), frecuencia.get_id_estacion()), frecuencia.get_valor())
+        return frecuencias, sensores
+
+    def __unir_sensores(self, sensores_anteriores, sensores_nuevos):
+        """Sensores de ambos resultados: los nuevos en su orden y después los que ya no están"""
+        sensores = Lista()
+        vistos = TablaHash()
+        for lista in (sensores_nuevos, sensores_anteriores):
+            for tipo, id_sensor, nombre in lista:
+                if not vistos.contiene_clave((tipo, id_sensor)):
+                    vistos.insertar((tipo, id_sensor), True)
+                    sensores.insertar((tipo, id_sensor, nombre))
+        return sensores
+
+    def __sumar_por_sensor(self, frecuencias):
+        totales = TablaHash()
+        for par in frecuencias.obtener_pares():
+            tipo, id_sensor, _ = par.get_clave()
+            totales.insertar((tipo, id_sensor), totales.obtener((tipo, id_sensor), 0) + par.get_valor())
+        return totales
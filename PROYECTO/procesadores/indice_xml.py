@@ -0,0 +1,214 @@
+# procesadores/indice_xml.py
+# Índice de posiciones (en bytes) de los <campo> de un archivo XML
+
+import os
+import json
+from xml.parsers import expat
+from clases.lista import Lista
+from clases.arreglo import Arreglo
+from clases.tabla_hash import TablaHash
+
+class IndiceCamposXML:
+    """
+    Posición en bytes [inicio, fin) de cada <campo> hijo de la raíz de un
+    archivo XML, en orden de documento. Con el índice un campo se puede
+    parsear solo, leyendo únicamente sus bytes, y varios campos se pueden
+    parsear en paralelo.
+
+    El índice se guarda junto al archivo (ruta + SUFIJO) con el tamaño y la
+    fecha de modificación del XML; si el XML cambia, el índice guardado se
+    descarta y se vuelve a construir.
+    """
+
+    VERSION = 1
+    SUFIJO = '.indice'
+
+    def __init__(self, ruta_archivo, tamaño, modificado, codificacion, entradas):
+        """
+        No usar directamente: ver construir(), cargar() y obtener()
+
+        Args:
+            entradas (Lista): Tuplas (id, inicio, fin) en orden de documento
+        """
+        self.__ruta = ruta_archivo
+        self.__tamaño = tamaño
+        self.__modificado = modificado
+        self.__codificacion = codificacion
+        self.__entradas = Arreglo(entradas.obtener_tamaño())
+        self.__posiciones = TablaHash(entradas.obtener_tamaño())  # ID -> posición de su primera aparición
+        posicion = 0
+        for entrada in entradas:
+            self.__entradas.asignar(posicion, entrada)
+            if entrada[0] is not None and not self.__posiciones.contiene_clave(entrada[0]):
+                self.__posiciones.insertar(entrada[0], posicion)
+            posicion += 1
+
+    @classmethod
+    def construir(cls, ruta_archivo):
+        """
+        Recorrer el archivo con expat (sin construir elementos) y anotar
+        dónde empieza y termina cada <campo> de profundidad 1
+        """
+        estado = os.stat(ruta_archivo)
+        parser = expat.ParserCreate()
+        entradas = Lista()
+        profundidad = 0
+        id_campo = None
+        inicio = 0
+        pendiente = False
+        codificacion = None
+
+        def cerrar_pendiente(*args):
+            # El primer evento después de </campo> marca el byte siguiente a la etiqueta
+            nonlocal pendiente
+            if pendiente:
+                entradas.insertar((id_campo, inicio, parser.CurrentByteIndex))
+                pendiente = False
+                parser.CharacterDataHandler = None
+
+        def inicio_elemento(nombre, atributos):
+            nonlocal profundidad, id_campo, inicio
+            cerrar_pendiente()
+            profundidad += 1
+            if profundidad == 2 and nombre == 'campo':
+                id_campo = atributos.get('id')
+                inicio = parser.CurrentByteIndex
+
+        def fin_elemento(nombre):
+            nonlocal profundidad, pendiente
+            cerrar_pendiente()
+            if profundidad == 2 and nombre == 'campo':
+                pendiente = True
+                parser.CharacterDataHandler = cerrar_pendiente
+            profundidad -= 1
+
+        def declaracion(version, codificacion_declarada, independiente):
+            nonlocal codificacion
+            codificacion = codificacion_declarada
+
+        parser.StartElementHandler = inicio_elemento
+        parser.EndElementHandler = fin_elemento
+        parser.CommentHandler = cerrar_pendiente
+        parser.ProcessingInstructionHandler = cerrar_pendiente
+        parser.XmlDeclHandler = declaracion
+
+        with open(ruta_archivo, 'rb') as archivo:
+            parser.ParseFile(archivo)
+
+        return cls(ruta_archivo, estado.st_size, estado.st_mtime_ns, codificacion, entradas)
+
+    @classmethod
+    def ruta_indice(cls, ruta_archivo):
+        """Ruta del archivo donde se guarda el índice de un XML"""
+        return ruta_archivo + cls.SUFIJO
+
+    @classmethod
+    def cargar(cls, ruta_archivo):
+        """
+        Leer el índice guardado de un XML
+
+        Returns:
+            IndiceCamposXML: El índice, o None si no existe, está dañado o el XML cambió
+        """
+        try:
+            with open(cls.ruta_indice(ruta_archivo), 'r', encoding='utf-8') as archivo:
+                datos = json.load(archivo)
+            estado = os.stat(ruta_archivo)
+            if (datos.get('version') != cls.VERSION or datos.get('tamaño') != estado.st_size
+                    or datos.get('modificado') != estado.st_mtime_ns):
+                return None
+            entradas = Lista()
+            for id_campo, inicio, fin in datos['campos']:
+                entradas.insertar((id_campo, inicio, fin))
+            return cls(ruta_archivo, datos['tamaño'], datos['modificado'], datos.get('codificacion'), entradas)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @classmethod
+    def obtener(cls, ruta_archivo, guardar=True):
+        """
+        Índice vigente de un XML: el guardado si sigue valiendo, o uno nuevo
+        (que se guarda si guardar es True)
+        """
+        indice = cls.cargar(ruta_archivo)
+        if indice is None:
+            indice = cls.construir(ruta_archivo)
+            if guardar:
+                indice.guardar()
+        return indice
+
+    def guardar(self):
+        """
+        Guardar el índice junto al XML. Si no se puede escribir (por ejemplo,
+        un directorio de solo lectura) se sigue sin índice guardado.
+
+        Returns:
+            bool: True si se guardó
+        """
+        campos = []
+        for entrada in self.__entradas:
+            campos.append(list(entrada))
+        datos = {
+            'version': self.VERSION,
+            'tamaño': self.__tamaño,
+            'modificado': self.__modificado,
+            'codificacion': self.__codificacion,
+            'campos': campos,
+        }
+        ruta = self.ruta_indice(self.__ruta)
+        temporal = ruta + '.tmp'
+        try:
+            with open(temporal, 'w', encoding='utf-8') as archivo:
+                json.dump(datos, archivo, ensure_ascii=False)
+            os.replace(temporal, ruta)  # Quien lea el índice nunca ve uno a medio escribir
+            return True
+        except OSError:
+            try:
+                os.remove(temporal)
+            except OSError:
+                pass
+            return False
+
+    def es_vigente(self):
+        """Verificar que el XML no cambió desde que se construyó el índice"""
+        try:
+            estado = os.stat(self.__ruta)
+        except OSError:
+            return False
+        return estado.st_size == self.__tamaño and estado.st_mtime_ns == self.__modificado
+
+    def get_ruta(self):
+        return self.__ruta
+
+    def get_codificacion(self):
+        return self.__codificacion
+
+    def obtener_cantidad_campos(self):
+        return self.__entradas.obtener_tamaño()
+
+    def obtener_entrada(self, posicion):
+        """Tupla (id, inicio, fin) del campo en una posición del documento"""
+        return self.__entradas.obtener(posicion)
+
+    def obtener_entradas(self):
+        """Arreglo de tuplas (id, inicio, fin) en orden de documento"""
+        return self.__entradas
+
+    def buscar(self, id_campo):
+        """
+        Buscar un campo por ID (si el ID se repite, su primera aparición)
+
+        Returns:
+            tuple: (id, inicio, fin) o None si no está
+        """
+        posicion = self.__posiciones.obtener(id_campo)
+        return self.__entradas.obtener(posicion) if posicion is not None else None
+
+    def declaracion_fragmento(self):
+        """Declaración XML a anteponer a cada fragmento (vacía si el archivo es UTF-8)"""
+        codificacion = self.__codificacion
+        if codificacion is None or codificacion.lower().replace('-', '') == 'utf8':
+            return b''
+        if codificacion.lower().replace('-', '').startswith(('utf16', 'utf32')):
+            raise ValueError("Codificación no soportada para leer por fragmentos: {}".format(codificacion))
+        return '<?xml version="1.0" encoding="{}"?>'.format(codificacion).encode('ascii')
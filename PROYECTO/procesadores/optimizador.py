@@ -1,11 +1,17 @@
 from clases.lista import Lista
+from clases.arreglo import Arreglo
 from clases.diccionario import Diccionario
+from clases.tabla_hash import TablaHash
+from clases.matriz import Matriz
+from clases.matriz_buffer import MatrizBuffer
+from clases.resultado_optimizacion import ResultadoOptimizacion
 from clases.campo_agricola import CampoAgricola
 from clases.estacion_base import EstacionBase
-from clases.sensor_suelo import SensorSuelo
-from clases.sensor_cultivo import SensorCultivo
-from clases.frecuencia import Frecuencia
 from .procesador_matrices import ProcesadorMatrices
+from .agrupador_lsh import AgrupadorLSH
+from .agrupador_externo import AgrupadorExterno
+from .agrupador_restringido import AgrupadorRestringido
+from .agrupador_incremental import AgrupadorIncremental
 
 class Optimizador:
     def __init__(self):
@@ -21,42 +27,99 @@ class Optimizador:
             i += 1
         return numeros
 
-    def optimizar_estaciones(self, campo):
-        """Proceso principal de optimización"""
+    def optimizar_estaciones(self, campo, modo_agrupacion="exacto", distancia_maxima=1,
+                             presupuesto_memoria=64 * 1024 * 1024, restricciones=None, ventana=None,
+                             evidencias=None):
+        """
+        Proceso principal de optimización
+
+        Args:
+            campo (CampoAgricola): Campo a optimizar
+            modo_agrupacion (str): "exacto" agrupa solo patrones idénticos;
+                                   "aproximado" tolera distancia_maxima diferencias;
+                                   "externo" agrupa como "exacto" sin matrices en memoria;
+                                   "restringido" respeta actividad y particiones;
+                                   "incremental" une por conjuntos disjuntos las
+                                   estaciones con la misma firma y las de evidencias
+            distancia_maxima (int): Distancia de Hamming máxima en modo "aproximado"
+            presupuesto_memoria (int): Bytes de trabajo en modo "externo"
+            restricciones (AgrupadorRestringido): Configuración del modo
+                                   "restringido" (None: la configuración por defecto)
+            ventana (VentanaTiempo): Optimizar con el historial de mediciones
+                                   agregado en esa ventana en lugar de los
+                                   valores actuales (no disponible en modo "externo")
+            evidencias: Pares (fila, fila) de estaciones equivalentes que el modo
+                                   "incremental" une además de las firmas iguales
+                                   (por ejemplo candidatos aproximados ya verificados)
+        """
         try:
             print("Iniciando proceso de optimización para campo: {}".format(campo.get_nombre()))
             
-            # Paso 1: Crear matrices de frecuencias
-            print("Paso 1: Creando matrices de frecuencias...")
-            matriz_freq_suelo = self.procesador_matrices.crear_matriz_frecuencias_suelo(campo)
-            matriz_freq_cultivo = self.procesador_matrices.crear_matriz_frecuencias_cultivo(campo)
-            
-            if not matriz_freq_suelo or not matriz_freq_cultivo:
-                raise Exception("Error creando matrices de frecuencias")
-            
-            # Paso 2: Convertir a matrices de patrones
-            print("Paso 2: Convirtiendo a matrices de patrones...")
-            matriz_patron_suelo = self.procesador_matrices.convertir_a_patrones(matriz_freq_suelo)
-            matriz_patron_cultivo = self.procesador_matrices.convertir_a_patrones(matriz_freq_cultivo)
-            
-            if not matriz_patron_suelo or not matriz_patron_cultivo:
-                raise Exception("Error convirtiendo a matrices de patrones")
-            
-            # Paso 3: Identificar grupos de estaciones con patrones idénticos
-            print("Paso 3: Identificando grupos de estaciones...")
-            estaciones = campo.obtener_estaciones()
-            grupos_estaciones = self.identificar_grupos_estaciones(
-                matriz_patron_suelo, matriz_patron_cultivo, estaciones
-            )
-            
-            if grupos_estaciones.esta_vacia():
-                raise Exception("No se pudieron identificar grupos de estaciones")
-            
-            # Paso 4: Crear matrices reducidas
-            print("Paso 4: Creando matrices reducidas...")
-            matrices_reducidas = self.crear_matrices_reducidas(
-                matriz_freq_suelo, matriz_freq_cultivo, grupos_estaciones
-            )
+            resultado = ResultadoOptimizacion()
+            if modo_agrupacion == "externo":
+                if ventana is not None:
+                    raise Exception("El modo externo no admite ventana de tiempo")
+                # Pasos 1 a 4 sin matrices completas, con ordenamientos en disco
+                grupos_estaciones, reporte_agrupacion, matrices_reducidas = self.agrupar_en_memoria_externa(
+                    campo, presupuesto_memoria
+                )
+                for clave in ('matriz_freq_suelo_original', 'matriz_freq_cultivo_original',
+                              'matriz_patron_suelo', 'matriz_patron_cultivo'):
+                    resultado.insertar(clave, None)
+                resultado.insertar('matrices_reducidas', matrices_reducidas)
+            else:
+                # Paso 1: Solo las celdas de frecuencias, sin objetos Matriz
+                print("Paso 1: Leyendo frecuencias por estación...")
+                celdas_suelo = self.procesador_matrices.crear_celdas_frecuencias(campo, "suelo", ventana)
+                celdas_cultivo = self.procesador_matrices.crear_celdas_frecuencias(campo, "cultivo", ventana)
+            
+                if celdas_suelo is None or celdas_cultivo is None:
+                    raise Exception("Error creando matrices de frecuencias")
+            
+                # Paso 2: Los patrones se resumen en una firma por estación
+                print("Paso 2: Calculando firmas de patrones...")
+                columnas_suelo = campo.obtener_cantidad_sensores_suelo()
+                columnas_cultivo = campo.obtener_cantidad_sensores_cultivo()
+                firmas = self.procesador_matrices.calcular_firmas_celdas(
+                    celdas_suelo, columnas_suelo, celdas_cultivo, columnas_cultivo
+                )
+            
+                # Paso 3: Identificar grupos de estaciones con patrones idénticos (o cercanos)
+                print("Paso 3: Identificando grupos de estaciones...")
+                reporte_agrupacion = None
+                if modo_agrupacion == "exacto":
+                    grupos_estaciones = self.agrupar_por_firmas(firmas)
+                elif modo_agrupacion == "aproximado":
+                    grupos_estaciones, reporte_agrupacion = AgrupadorLSH(distancia_maxima).agrupar_firmas(
+                        firmas, columnas_suelo + columnas_cultivo
+                    )
+                elif modo_agrupacion == "restringido":
+                    agrupador = restricciones if restricciones is not None else AgrupadorRestringido()
+                    grupos_estaciones, reporte_agrupacion = agrupador.agrupar(
+                        campo, firmas, columnas_suelo + columnas_cultivo
+                    )
+                elif modo_agrupacion == "incremental":
+                    grupos_estaciones, reporte_agrupacion = self.agrupar_incremental(firmas, evidencias)
+                else:
+                    raise Exception("Modo de agrupación desconocido: {}".format(modo_agrupacion))
+            
+                if grupos_estaciones.esta_vacia():
+                    raise Exception("No se pudieron identificar grupos de estaciones")
+            
+                # Paso 4: Crear matrices reducidas (como vistas planas; las Matriz se crean a pedido)
+                print("Paso 4: Creando matrices reducidas...")
+                cantidad_grupos = grupos_estaciones.obtener_tamaño()
+                reducidas_suelo = self.procesador_matrices.reducir_celdas(
+                    celdas_suelo, columnas_suelo, grupos_estaciones
+                )
+                reducidas_cultivo = self.procesador_matrices.reducir_celdas(
+                    celdas_cultivo, columnas_cultivo, grupos_estaciones
+                )
+                matrices_reducidas = Diccionario()
+                matrices_reducidas.insertar('suelo', MatrizBuffer(cantidad_grupos, columnas_suelo, reducidas_suelo))
+                matrices_reducidas.insertar('cultivo', MatrizBuffer(cantidad_grupos, columnas_cultivo, reducidas_cultivo))
+                self._registrar_matrices_diferidas(resultado, celdas_suelo, columnas_suelo,
+                                                   celdas_cultivo, columnas_cultivo, matrices_reducidas)
             
             # Paso 5: Crear campo optimizado
             print("Paso 5: Creando campo optimizado...")
@@ -67,25 +130,45 @@ class Optimizador:
             # Calcular estadísticas de optimización
             cantidad_original = campo.obtener_cantidad_estaciones()
             cantidad_optimada = campo_optimizado.obtener_cantidad_estaciones()
-            porcentaje_ahorro = self.calcular_ahorro_estaciones(cantidad_original, cantidad_optimada)
+            # Las estaciones excluidas (inactivas) no son ahorro de la agrupación
+            cantidad_excluida = 0
+            if modo_agrupacion == "restringido":
+                cantidad_excluida = reporte_agrupacion.obtener('estaciones_excluidas')
+            porcentaje_ahorro = self.calcular_ahorro_estaciones(cantidad_original - cantidad_excluida, cantidad_optimada)
             
-            # Usar Diccionario personalizado en lugar de dict nativo
-            resultado = Diccionario()
             resultado.insertar('campo_optimizado', campo_optimizado)
-            resultado.insertar('matriz_freq_suelo_original', matriz_freq_suelo)
-            resultado.insertar('matriz_freq_cultivo_original', matriz_freq_cultivo)
-            resultado.insertar('matriz_patron_suelo', matriz_patron_suelo)
-            resultado.insertar('matriz_patron_cultivo', matriz_patron_cultivo)
-            resultado.insertar('matrices_reducidas', matrices_reducidas)
             resultado.insertar('grupos_estaciones', grupos_estaciones)
+            resultado.insertar('miembros_grupos', self.obtener_miembros_grupos(campo, grupos_estaciones))
             resultado.insertar('estaciones_original', cantidad_original)
             resultado.insertar('estaciones_optimizada', cantidad_optimada)
+            resultado.insertar('estaciones_excluidas', cantidad_excluida)
             resultado.insertar('porcentaje_ahorro', porcentaje_ahorro)
+            resultado.insertar('modo_agrupacion', modo_agrupacion)
+            resultado.insertar('reporte_agrupacion', reporte_agrupacion)
+            resultado.insertar('ventana', ventana)
             
             print("Optimización completada exitosamente!")
             print("Estaciones originales: {}".format(cantidad_original))
             print("Estaciones optimizadas: {}".format(cantidad_optimada))
+            if cantidad_excluida > 0:
+                print("Estaciones excluidas: {} (fuera del ahorro)".format(cantidad_excluida))
             print("Ahorro: {:.2f}%".format(porcentaje_ahorro))
+            if modo_agrupacion == "aproximado":
+                print("Cobertura perdida frente a agrupación exacta: {:.2f}%; enlaces agregados: {} ({} estaciones aproximadas)".format(
+                    reporte_agrupacion.obtener('porcentaje_cobertura_perdida'),
+                    reporte_agrupacion.obtener('enlaces_agregados'),
+                    reporte_agrupacion.obtener('estaciones_aproximadas')))
+            elif modo_agrupacion == "restringido":
+                print("Particiones: {} (mayor: {} estaciones); inactivas: {} ({} excluidas)".format(
+                    reporte_agrupacion.obtener('particiones'),
+                    reporte_agrupacion.obtener('particion_mayor'),
+                    reporte_agrupacion.obtener('estaciones_inactivas'),
+                    reporte_agrupacion.obtener('estaciones_excluidas')))
+            elif modo_agrupacion == "incremental":
+                print("Evidencias: {} ({} uniones); grupos: {}".format(
+                    reporte_agrupacion.obtener('evidencias'),
+                    reporte_agrupacion.obtener('uniones'),
+                    reporte_agrupacion.obtener('grupos')))
             
             return resultado
             
@@ -93,6 +176,77 @@ class Optimizador:
             print("Error en proceso de optimización: {}".format(str(e)))
             return None
 
+    def _registrar_matrices_diferidas(self, resultado, celdas_suelo, columnas_suelo,
+                                      celdas_cultivo, columnas_cultivo, vistas_reducidas):
+        """
+        Registrar en el resultado las matrices que solo hacen falta para
+        mostrar o graficar: se construyen la primera vez que se piden, desde
+        las celdas leídas en el paso 1 (con ventana, si la hubo). No se
+        vuelve a leer el campo, que pudo cambiar después de optimizar.
+        """
+        procesador = self.procesador_matrices
+        resultado.insertar_diferido('matriz_freq_suelo_original',
+                                    lambda: procesador.crear_matriz_desde_celdas(celdas_suelo, columnas_suelo))
+        resultado.insertar_diferido('matriz_freq_cultivo_original',
+                                    lambda: procesador.crear_matriz_desde_celdas(celdas_cultivo, columnas_cultivo))
+        resultado.insertar_diferido('matriz_patron_suelo',
+                                    lambda: procesador.convertir_a_patrones(resultado.obtener('matriz_freq_suelo_original')))
+        resultado.insertar_diferido('matriz_patron_cultivo',
+                                    lambda: procesador.convertir_a_patrones(resultado.obtener('matriz_freq_cultivo_original')))
+
+        def crear_reducidas():
+            matrices = Diccionario()
+            for tipo in ('suelo', 'cultivo'):
+                vista = vistas_reducidas.obtener(tipo)
+                matrices.insertar(tipo, Matriz(vista.get_filas(), vista.get_columnas(), vista.obtener_memoria()))
+            return matrices
+        resultado.insertar_diferido('matrices_reducidas', crear_reducidas)
+
+    def agrupar_por_firmas(self, firmas):
+        """
+        Agrupar estaciones con la misma firma de patrones en una pasada.
+        Los grupos quedan en orden de su menor fila y los miembros en orden
+        de fila, igual que identificar_grupos_estaciones.
+
+        Args:
+            firmas (Arreglo): Firma combinada de cada estación
+
+        Returns:
+            Lista: Grupos (Lista de índices de fila)
+        """
+        grupos = Lista()
+        grupo_por_firma = TablaHash()
+        i = 0
+        while i < firmas.obtener_tamaño():
+            firma = firmas.obtener(i)
+            grupo = grupo_por_firma.obtener(firma)
+            if grupo is None:
+                grupo = Lista()
+                grupo_por_firma.insertar(firma, grupo)
+                grupos.insertar(grupo)
+            grupo.insertar(i)
+            i += 1
+        return grupos
+
+    def agrupar_incremental(self, firmas, evidencias=None):
+        """
+        Agrupar con AgrupadorIncremental: las firmas iguales se unen por
+        clave y después se suman los pares de evidencias. Sin evidencias los
+        grupos son los del modo "exacto".
+
+        Args:
+            firmas (Arreglo): Firma combinada de cada estación
+            evidencias: Iterable de pares (fila, fila) equivalentes, o None
+
+        Returns:
+            tuple: (Lista de grupos de índices, Diccionario de reporte)
+        """
+        agrupador = AgrupadorIncremental(firmas.obtener_tamaño())
+        agrupador.agregar_claves(firmas)
+        if evidencias is not None:
+            agrupador.agregar_pares(evidencias)
+        return agrupador.obtener_grupos(), agrupador.obtener_reporte()
+
     def identificar_grupos_estaciones(self, matriz_patrones_suelo, matriz_patrones_cultivo, estaciones):
         """Identificar grupos de estaciones con patrones idénticos"""
         try:
@@ -131,6 +285,42 @@ class Optimizador:
             print("Error identificando grupos de estaciones: {}".format(str(e)))
             return Lista()
 
+    def agrupar_en_memoria_externa(self, campo, presupuesto_memoria):
+        """
+        Agrupar y reducir con AgrupadorExterno, para campos cuyas matrices no
+        caben en memoria. Los grupos son los mismos que en modo "exacto".
+
+        Returns:
+            tuple: (Lista de grupos, Diccionario de estadísticas, Diccionario de matrices reducidas)
+        """
+        if (campo.obtener_cantidad_estaciones() == 0 or campo.obtener_cantidad_sensores_suelo() == 0
+                or campo.obtener_cantidad_sensores_cultivo() == 0):
+            raise Exception("Error creando matrices de frecuencias")
+
+        agrupador = AgrupadorExterno(presupuesto_memoria)
+        print("Paso 3: Identificando grupos de estaciones (memoria externa)...")
+        grupos_estaciones, reporte = agrupador.agrupar(campo)
+        print("Paso 4: Creando matrices reducidas (memoria externa)...")
+        matrices_reducidas = agrupador.crear_matrices_reducidas(campo, grupos_estaciones)
+        return grupos_estaciones, reporte, matrices_reducidas
+
+    def identificar_grupos_aproximados(self, matriz_patrones_suelo, matriz_patrones_cultivo, distancia_maxima):
+        """
+        Agrupar estaciones cuyos patrones combinados difieren en a lo sumo
+        distancia_maxima posiciones (ver AgrupadorLSH)
+
+        Returns:
+            tuple: (Lista de grupos de índices, Diccionario con la cobertura perdida)
+        """
+        agrupador = AgrupadorLSH(distancia_maxima)
+        columnas_suelo = matriz_patrones_suelo.get_columnas()
+        firmas = agrupador.combinar_firmas(
+            matriz_patrones_suelo.obtener_firmas_filas(),
+            matriz_patrones_cultivo.obtener_firmas_filas(),
+            columnas_suelo
+        )
+        return agrupador.agrupar_firmas(firmas, columnas_suelo + matriz_patrones_cultivo.get_columnas())
+
     def crear_matrices_reducidas(self, matriz_freq_suelo, matriz_freq_cultivo, grupos_estaciones):
         """Crear matrices Fr[n,s] y Fr[n,t] reducidas"""
         try:
@@ -154,6 +344,24 @@ class Optimizador:
             print("Error creando matrices reducidas: {}".format(str(e)))
             return None
 
+    def obtener_id_estacion_optimizada(self, posicion_grupo):
+        """ID de la estación optimizada que representa al grupo en esa posición"""
+        return "e{:02d}_opt".format(posicion_grupo + 1)
+
+    def obtener_miembros_grupos(self, campo, grupos_estaciones):
+        """
+        IDs de las estaciones originales de cada grupo, para que el resultado
+        se pueda comparar sin el campo original (ver ComparadorResultados)
+
+        Returns:
+            Lista: Una tupla de IDs por grupo, en el orden de los grupos
+        """
+        indice = campo.obtener_indice()
+        miembros = Lista()
+        for grupo in grupos_estaciones:
+            miembros.insertar(tuple(indice.obtener_id_estacion(fila) for fila in grupo))
+        return miembros
+
     def crear_campo_optimizado(self, campo_original, grupos_estaciones, matrices_reducidas):
         """Crear nuevo campo agrícola optimizado"""
         try:
@@ -165,7 +373,7 @@ class Optimizador:
             
             # Crear estaciones optimizadas (una por grupo)
             grupos_iterador = grupos_estaciones.crear_iterador()
-            estaciones_originales = campo_original.obtener_estaciones()
+            cantidad_originales = campo_original.obtener_indice().obtener_cantidad_estaciones()
             
             contador = 0
             while grupos_iterador.hay_siguiente():
@@ -173,11 +381,10 @@ class Optimizador:
                 primer_indice = grupo.obtener_en_posicion(0)
                 
                 if primer_indice is not None:
-                    estacion_representante = estaciones_originales.obtener_en_posicion(primer_indice)
-                    
-                    if estacion_representante:
+                    # El representante solo tiene que existir en el campo original
+                    if 0 <= primer_indice < cantidad_originales:
                         nueva_estacion = EstacionBase(
-                            "e{:02d}_opt".format(contador + 1),
+                            self.obtener_id_estacion_optimizada(contador),
                             "Estacion Optimizada {:02d}".format(contador + 1)
                         )
                         campo_optimizado.agregar_estacion(nueva_estacion)
@@ -185,13 +392,13 @@ class Optimizador:
                 contador += 1
             
             # Crear sensores de suelo optimizados
-            self._crear_sensores_optimizados_suelo(
-                campo_original, campo_optimizado, matrices_reducidas.obtener('suelo')
+            self._crear_sensores_optimizados(
+                campo_original, campo_optimizado, matrices_reducidas.obtener('suelo'), "suelo"
             )
             
             # Crear sensores de cultivo optimizados
-            self._crear_sensores_optimizados_cultivo(
-                campo_original, campo_optimizado, matrices_reducidas.obtener('cultivo')
+            self._crear_sensores_optimizados(
+                campo_original, campo_optimizado, matrices_reducidas.obtener('cultivo'), "cultivo"
             )
             
             return campo_optimizado
@@ -206,58 +413,60 @@ class Optimizador:
             return elemento == indice
         return estaciones_procesadas.buscar(criterio) is not None
 
-    def _crear_sensores_optimizados_suelo(self, campo_original, campo_optimizado, matriz_reducida):
-        """Crear sensores de suelo optimizados"""
-        sensores_originales = campo_original.obtener_sensores_suelo()
-        estaciones_optimizadas = campo_optimizado.obtener_estaciones()
-
-        iterador_sensores = sensores_originales.crear_iterador()
+    def _crear_sensores_optimizados(self, campo_original, campo_optimizado, matriz_reducida, tipo):
+        """
+        Registrar los sensores de un tipo en el campo optimizado. La matriz
+        reducida se recorre una vez por filas y las frecuencias no nulas se
+        juntan por sensor, para registrarlas en bloque en las columnas del
+        campo: O(celdas) en total, sin get_valor por celda ni la búsqueda
+        de duplicados de agregar_frecuencia.
+        
+        Args:
+            campo_original (CampoAgricola): Campo con los IDs y nombres de los sensores
+            campo_optimizado (CampoAgricola): Campo con una estación por grupo
+            matriz_reducida (Matriz): Frecuencias grupo x sensor
+            tipo (str): "suelo" o "cultivo"
+        """
+        indice = campo_original.obtener_indice()
+        cantidad_sensores = indice.obtener_cantidad_sensores(tipo)
+        ids_estaciones = campo_optimizado.obtener_indice().obtener_etiquetas_estaciones()
+        
+        # Por sensor: IDs de las estaciones optimizadas y valores no nulos
+        estaciones_por_sensor = Arreglo(cantidad_sensores)
+        valores_por_sensor = Arreglo(cantidad_sensores)
         j = 0
-        while iterador_sensores.hay_siguiente():
-            sensor_original = iterador_sensores.siguiente()
-            sensor_optimizado = SensorSuelo(
-                sensor_original.get_id(),
-                sensor_original.get_nombre()
-            )
-            
-            iterador_estaciones = estaciones_optimizadas.crear_iterador()
-            i = 0
-            while iterador_estaciones.hay_siguiente():
-                estacion = iterador_estaciones.siguiente()
-                valor_frecuencia = matriz_reducida.get_valor(i, j)
-                if valor_frecuencia > 0:
-                    frecuencia = Frecuencia(estacion.get_id(), valor_frecuencia)
-                    sensor_optimizado.agregar_frecuencia(frecuencia)
-                i += 1
-            
-            campo_optimizado.agregar_sensor_suelo(sensor_optimizado)
+        while j < cantidad_sensores:
+            estaciones_por_sensor.asignar(j, Lista())
+            valores_por_sensor.asignar(j, Lista())
             j += 1
-
-    def _crear_sensores_optimizados_cultivo(self, campo_original, campo_optimizado, matriz_reducida):
-        """Crear sensores de cultivo optimizados"""
-        sensores_originales = campo_original.obtener_sensores_cultivo()
-        estaciones_optimizadas = campo_optimizado.obtener_estaciones()
         
-        iterador_sensores = sensores_originales.crear_iterador()
-        j = 0
-        while iterador_sensores.hay_siguiente():
-            sensor_original = iterador_sensores.siguiente()
-            sensor_optimizado = SensorCultivo(
-                sensor_original.get_id(),
-                sensor_original.get_nombre()
-            )
-            
-            iterador_estaciones = estaciones_optimizadas.crear_iterador()
-            i = 0
-            while iterador_estaciones.hay_siguiente():
-                estacion = iterador_estaciones.siguiente()
-                valor_frecuencia = matriz_reducida.get_valor(i, j)
+        i = 0
+        for valores in matriz_reducida.recorrer_filas():
+            if i >= ids_estaciones.obtener_tamaño():
+                break
+            id_estacion = ids_estaciones.obtener(i)
+            j = 0
+            for valor_frecuencia in valores:
                 if valor_frecuencia > 0:
-                    frecuencia = Frecuencia(estacion.get_id(), valor_frecuencia)
-                    sensor_optimizado.agregar_frecuencia(frecuencia)
-                i += 1
-            
-            campo_optimizado.agregar_sensor_cultivo(sensor_optimizado)
+                    estaciones_por_sensor.obtener(j).insertar(id_estacion)
+                    valores_por_sensor.obtener(j).insertar(valor_frecuencia)
+                j += 1
+            i += 1
+        
+        if tipo == "suelo":
+            registrar_sensor = campo_optimizado.registrar_sensor_suelo
+            registrar_frecuencias = campo_optimizado.registrar_frecuencias_suelo
+        else:
+            registrar_sensor = campo_optimizado.registrar_sensor_cultivo
+            registrar_frecuencias = campo_optimizado.registrar_frecuencias_cultivo
+        
+        j = 0
+        while j < cantidad_sensores:
+            indice_sensor = registrar_sensor(indice.obtener_id_sensor(tipo, j),
+                                             indice.obtener_nombre_sensor(tipo, j))
+            if indice_sensor != -1:
+                registrar_frecuencias(indice_sensor, estaciones_por_sensor.obtener(j),
+                                      valores_por_sensor.obtener(j))
             j += 1
 
     def calcular_ahorro_estaciones(self, cantidad_original, cantidad_optimizada):
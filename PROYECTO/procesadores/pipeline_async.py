@@ -0,0 +1,216 @@
+# procesadores/pipeline_async.py
+# Pipeline asyncio: lectura, optimización, escritura y gráficas de varios campos en paralelo
+
+import os
+import sys
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from clases.diccionario import Diccionario
+from .xml_handler import XMLHandler
+from .optimizador import Optimizador
+from utils.graphviz_generator import GraphvizGenerator
+
+class PipelineOptimizacion:
+    """
+    Procesa un XML con varios campos como una línea de producción:
+
+        lectura -> optimización -> escritura XML -> gráficas
+
+    Cada etapa es una tarea asyncio unida a la siguiente por una cola acotada.
+    Mientras un campo se optimiza, el anterior se escribe y el previo a ese se
+    grafica, así que el tiempo total tiende al de la etapa más lenta en vez de
+    la suma de todas. Si una etapa se atrasa, las colas se llenan y las etapas
+    anteriores esperan (contrapresión): nunca hay más de unos pocos campos en
+    memoria. El XML de salida queda en el mismo orden que el de entrada.
+    """
+
+    def __init__(self, tamaño_cola=4, trabajadores=4, generar_graficas=True, trabajadores_graficas=2):
+        """
+        Inicializar pipeline
+
+        Args:
+            tamaño_cola (int): Capacidad de cada cola entre etapas
+            trabajadores (int): Campos que se optimizan a la vez
+            generar_graficas (bool): Si se generan las gráficas con Graphviz
+            trabajadores_graficas (int): Campos que se grafican a la vez
+        """
+        self.xml_handler = XMLHandler()
+        self.optimizador = Optimizador()
+        self.graphviz_generator = GraphvizGenerator()
+        self.tamaño_cola = tamaño_cola
+        self.trabajadores = trabajadores
+        self.generar_graficas = generar_graficas
+        self.trabajadores_graficas = trabajadores_graficas
+
+    def procesar(self, ruta_entrada, ruta_salida):
+        """
+        Ejecutar el pipeline completo de forma síncrona
+
+        Returns:
+            Diccionario: Estadísticas de la ejecución (ver ejecutar())
+        """
+        return asyncio.run(self.ejecutar(ruta_entrada, ruta_salida))
+
+    async def ejecutar(self, ruta_entrada, ruta_salida):
+        """
+        Ejecutar el pipeline dentro de un loop asyncio existente
+
+        Returns:
+            Diccionario: campos_leidos, campos_optimizados, campos_fallidos,
+                         tiempo_total y tiempo ocupado de cada etapa (segundos)
+        """
+        loop = asyncio.get_running_loop()
+        estadisticas = Diccionario()
+        estadisticas.insertar('campos_leidos', 0)
+        estadisticas.insertar('campos_optimizados', 0)
+        estadisticas.insertar('campos_fallidos', 0)
+        estadisticas.insertar('tiempo_lectura', 0.0)
+        estadisticas.insertar('tiempo_optimizacion', 0.0)
+        estadisticas.insertar('tiempo_escritura', 0.0)
+        estadisticas.insertar('tiempo_graficas', 0.0)
+
+        # Ejecutores separados: una etapa lenta no roba hilos a las demás
+        ejecutor_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline_io")
+        ejecutor_optimizacion = ThreadPoolExecutor(max_workers=self.trabajadores,
+                                                   thread_name_prefix="pipeline_opt")
+        ejecutor_graficas = ThreadPoolExecutor(max_workers=self.trabajadores_graficas,
+                                               thread_name_prefix="pipeline_graf")
+
+        cola_campos = asyncio.Queue(self.tamaño_cola)
+        cola_resultados = asyncio.Queue(self.tamaño_cola)
+        cola_graficas = asyncio.Queue(self.tamaño_cola)
+
+        inicio = time.perf_counter()
+        tareas = [
+            asyncio.ensure_future(self._etapa_lectura(loop, ejecutor_io, ruta_entrada, cola_campos, estadisticas)),
+            asyncio.ensure_future(self._etapa_optimizacion(loop, ejecutor_optimizacion, cola_campos,
+                                                           cola_resultados, estadisticas)),
+            asyncio.ensure_future(self._etapa_escritura(loop, ejecutor_io, ruta_salida, cola_resultados,
+                                                        cola_graficas, estadisticas)),
+        ]
+        for _ in range(self.trabajadores_graficas):
+            tareas.append(asyncio.ensure_future(
+                self._etapa_graficas(loop, ejecutor_graficas, cola_graficas, estadisticas)))
+
+        # Los None al final de cada cola marcan el fin normal; si una etapa
+        # falla se cancelan todas en lugar de esperar marcas que no llegarán
+        try:
+            await asyncio.gather(*tareas)
+        finally:
+            for tarea in tareas:
+                tarea.cancel()
+            await asyncio.gather(*tareas, return_exceptions=True)
+            # Esperar los hilos sin bloquear el loop
+            for ejecutor in (ejecutor_io, ejecutor_optimizacion, ejecutor_graficas):
+                await loop.run_in_executor(None, ejecutor.shutdown)
+
+        estadisticas.insertar('tiempo_total', time.perf_counter() - inicio)
+        return estadisticas
+
+    def _sumar(self, estadisticas, clave, cantidad):
+        estadisticas.insertar(clave, estadisticas.obtener(clave) + cantidad)
+
+    async def _etapa_lectura(self, loop, ejecutor, ruta_entrada, cola_campos, estadisticas):
+        """Leer campos del XML uno a uno y encolarlos; termina con None"""
+        generador = self.xml_handler.iterar_campos(ruta_entrada)
+        while True:
+            inicio = time.perf_counter()
+            campo = await loop.run_in_executor(ejecutor, next, generador, None)
+            self._sumar(estadisticas, 'tiempo_lectura', time.perf_counter() - inicio)
+            if campo is None:
+                break
+            self._sumar(estadisticas, 'campos_leidos', 1)
+            # Si la cola está llena se espera aquí y el XML no se sigue leyendo
+            await cola_campos.put(campo)
+        await cola_campos.put(None)
+
+    async def _etapa_optimizacion(self, loop, ejecutor, cola_campos, cola_resultados, estadisticas):
+        """
+        Lanzar la optimización de cada campo en el ejecutor y encolar el futuro.
+        Los futuros se encolan en orden de lectura, así la escritura respeta el
+        orden del documento aunque los campos terminen en otro orden.
+        """
+        while True:
+            campo = await cola_campos.get()
+            if campo is None:
+                break
+            futuro = loop.run_in_executor(ejecutor, self._optimizar, campo)
+            await cola_resultados.put(futuro)
+        await cola_resultados.put(None)
+
+    def _optimizar(self, campo):
+        """Optimizar un campo (corre en un hilo del ejecutor); retorna (resultado, segundos)"""
+        inicio = time.perf_counter()
+        resultado = self.optimizador.optimizar_estaciones(campo)
+        return resultado, time.perf_counter() - inicio
+
+    async def _etapa_escritura(self, loop, ejecutor, ruta_salida, cola_resultados, cola_graficas, estadisticas):
+        """
+        Escribir cada campo optimizado al XML de salida en cuanto está listo.
+        Se escribe en un temporal que reemplaza a ruta_salida solo si todo
+        el pipeline termina bien: si alguna etapa falla no queda un XML
+        cortado en la salida.
+        """
+        temporal = ruta_salida + '.tmp'
+        escritor = self.xml_handler.crear_escritor_salida(temporal)
+        try:
+            await loop.run_in_executor(ejecutor, escritor.abrir)
+            while True:
+                futuro = await cola_resultados.get()
+                if futuro is None:
+                    break
+                resultado, segundos = await futuro
+                self._sumar(estadisticas, 'tiempo_optimizacion', segundos)
+                if resultado is None:
+                    self._sumar(estadisticas, 'campos_fallidos', 1)
+                    continue
+                self._sumar(estadisticas, 'campos_optimizados', 1)
+
+                inicio = time.perf_counter()
+                await loop.run_in_executor(ejecutor, escritor.escribir_campo,
+                                           resultado.obtener('campo_optimizado'))
+                self._sumar(estadisticas, 'tiempo_escritura', time.perf_counter() - inicio)
+
+                if self.generar_graficas:
+                    await cola_graficas.put(resultado)
+        except BaseException:
+            # También si se cancela porque falló otra etapa. El ejecutor de
+            # E/S tiene un solo hilo: el descarte corre después de la
+            # escritura que esté en curso, y ejecutar() espera a que termine
+            ejecutor.submit(self._descartar_salida, escritor, temporal)
+            raise
+        await loop.run_in_executor(ejecutor, escritor.cerrar)
+        os.replace(temporal, ruta_salida)
+        for _ in range(self.trabajadores_graficas):
+            await cola_graficas.put(None)
+
+    def _descartar_salida(self, escritor, temporal):
+        """Cerrar y borrar el XML temporal de una ejecución que falló"""
+        escritor.cerrar()
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+    async def _etapa_graficas(self, loop, ejecutor, cola_graficas, estadisticas):
+        """Generar las gráficas de cada resultado; Graphviz corre como subproceso"""
+        while True:
+            resultado = await cola_graficas.get()
+            if resultado is None:
+                break
+            inicio = time.perf_counter()
+            await loop.run_in_executor(ejecutor, self.graphviz_generator.generar_graficas_completas, resultado)
+            self._sumar(estadisticas, 'tiempo_graficas', time.perf_counter() - inicio)
+
+
+if __name__ == "__main__":
+    # Uso: python -m procesadores.pipeline_async entrada.xml salida.xml [sin_graficas]
+    if len(sys.argv) < 3:
+        print("Uso: python -m procesadores.pipeline_async entrada.xml salida.xml [sin_graficas]")
+        sys.exit(1)
+
+    pipeline = PipelineOptimizacion(generar_graficas=len(sys.argv) < 4)
+    estadisticas = pipeline.procesar(sys.argv[1], sys.argv[2])
+    print("\n" + "=" * 50)
+    for par in estadisticas.obtener_pares():
+        valor = par.get_valor()
+        print("{}: {}".format(par.get_clave(), "{:.3f}".format(valor) if isinstance(valor, float) else valor))
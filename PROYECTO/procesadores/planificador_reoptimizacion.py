@@ -0,0 +1,497 @@
+# procesadores/planificador_reoptimizacion.py
+# Re-optimización continua de un campo a partir de un flujo de frecuencias (archivo, tubería o socket)
+
+import sys
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from clases.arreglo import Arreglo
+from clases.diccionario import Diccionario
+from clases.tabla_hash import TablaHash
+from .xml_handler import XMLHandler
+from .optimizador import Optimizador
+
+class PlanificadorReoptimizacion:
+    """
+    Mantiene al día un campo con un flujo continuo de frecuencias y vuelve a
+    optimizarlo solo cuando cambia alguna firma de patrones (el conjunto de
+    sensores con frecuencia > 0 de una estación). Un cambio de valor que no
+    enciende ni apaga un bit actualiza el campo pero no dispara nada, porque
+    los grupos de estaciones no pueden cambiar.
+
+    Cada línea del flujo es una actualización:
+
+        tipo id_sensor id_estacion valor [tiempo]
+
+    con tipo "suelo" o "cultivo" (los campos pueden separarse con espacios
+    o comas; las líneas vacías y las que empiezan con # se ignoran). Si trae
+    tiempo, la medición también se agrega al historial del campo.
+
+    Las actualizaciones se juntan en ráfagas: la ráfaga se cierra cuando el
+    flujo queda quieto espera_ms, o a los espera_maxima_ms de su primera
+    actualización aunque sigan llegando. Al cerrar, si alguna firma quedó
+    distinta a la de la última optimización emitida (una firma que cambia y
+    vuelve dentro de la misma ráfaga no cuenta) se optimiza una sola vez y
+    se emite el resultado con sus métricas de latencia.
+
+    Las estaciones y sensores del campo son fijos: las actualizaciones hacia
+    IDs que no están en el campo se rechazan.
+    """
+
+    def __init__(self, campo, optimizador=None, modo_agrupacion="exacto", distancia_maxima=1,
+                 restricciones=None, espera_ms=200, espera_maxima_ms=2000, al_emitir=None,
+                 tamaño_cola=10000):
+        """
+        Inicializar planificador
+
+        Args:
+            campo (CampoAgricola): Campo que se mantiene al día
+            optimizador (Optimizador): Optimizador a usar (None: uno nuevo)
+            modo_agrupacion (str): Modo para Optimizador.optimizar_estaciones
+            distancia_maxima (int): Distancia de Hamming máxima en modo "aproximado"
+            restricciones (AgrupadorRestringido): Configuración del modo "restringido"
+            espera_ms (float): Silencio que cierra una ráfaga
+            espera_maxima_ms (float): Duración máxima de una ráfaga
+            al_emitir: Función que recibe cada emisión (ver vaciar()); con
+                       ejecutar() se llama desde el hilo de optimización
+            tamaño_cola (int): Líneas recibidas que pueden esperar a ser aplicadas
+        """
+        self.campo = campo
+        self.optimizador = optimizador if optimizador is not None else Optimizador()
+        self.procesador_matrices = self.optimizador.procesador_matrices
+        self.modo_agrupacion = modo_agrupacion
+        self.distancia_maxima = distancia_maxima
+        self.restricciones = restricciones
+        self.espera = espera_ms / 1000.0
+        self.espera_maxima = espera_maxima_ms / 1000.0
+        self.al_emitir = al_emitir
+        self.tamaño_cola = tamaño_cola
+
+        self.__preparar_firmas()
+
+        # Ráfaga en curso
+        self.__pendientes = 0
+        self.__primera_pendiente = None
+        self.__ultima_pendiente = None
+        self.__filas_tocadas = TablaHash()  # Filas cuya firma cambió en la ráfaga
+
+        self.__secuencia = 0
+        self.__ultima_emision = None
+        self.__estadisticas = Diccionario()
+        for clave in ('actualizaciones', 'rechazadas', 'rafagas', 'rafagas_sin_cambios',
+                      'reoptimizaciones', 'reoptimizaciones_fallidas'):
+            self.__estadisticas.insertar(clave, 0)
+        self.__estadisticas.insertar('latencia_maxima_ms', 0.0)
+        self.__latencia_total = 0.0
+
+    def __preparar_firmas(self):
+        """Celdas actuales y firma de cada estación, como en el paso 2 del Optimizador"""
+        procesador = self.procesador_matrices
+        self.__columnas_suelo = self.campo.obtener_cantidad_sensores_suelo()
+        self.__columnas_cultivo = self.campo.obtener_cantidad_sensores_cultivo()
+        self.__celdas_suelo = procesador.crear_celdas_frecuencias(self.campo, "suelo")
+        self.__celdas_cultivo = procesador.crear_celdas_frecuencias(self.campo, "cultivo")
+        if self.__celdas_suelo is None or self.__celdas_cultivo is None:
+            raise ValueError("El campo {} no tiene estaciones o sensores".format(self.campo.get_id()))
+
+        indice = self.campo.obtener_indice()
+        self.__mapa_estaciones = indice.obtener_mapa_estaciones()
+        self.__mapa_suelo = indice.obtener_mapa_sensores("suelo")
+        self.__mapa_cultivo = indice.obtener_mapa_sensores("cultivo")
+        self.__firmas = procesador.calcular_firmas_celdas(
+            self.__celdas_suelo, self.__columnas_suelo, self.__celdas_cultivo, self.__columnas_cultivo
+        )
+        # Firmas con las que se hizo la última optimización emitida (None: ninguna)
+        self.__firmas_emitidas = None
+
+    def _milisegundos(self, inicio, fin):
+        """Diferencia entre dos marcas de perf_counter en milisegundos"""
+        return round((fin - inicio) * 1000, 3)
+
+    def _sumar(self, clave, cantidad):
+        self.__estadisticas.insertar(clave, self.__estadisticas.obtener(clave) + cantidad)
+
+    def aplicar_actualizacion(self, tipo, id_sensor, id_estacion, valor, tiempo=None):
+        """
+        Aplicar una actualización al campo y a la firma de su estación
+
+        Args:
+            tipo (str): "suelo" o "cultivo"
+            id_sensor (str): ID del sensor
+            id_estacion (str): ID de la estación receptora
+            valor (int): Valor nuevo de la frecuencia
+            tiempo: Momento de la medición; si se da, también va al historial
+
+        Returns:
+            bool: True si cambió la firma de la estación
+
+        Raises:
+            ValueError: Si el tipo, el sensor o la estación no existen, o la
+                        medición llega fuera de orden al historial
+        """
+        if tipo == "suelo":
+            mapa, celdas, columnas, desplazamiento = self.__mapa_suelo, self.__celdas_suelo, self.__columnas_suelo, 0
+        elif tipo == "cultivo":
+            mapa, celdas, columnas = self.__mapa_cultivo, self.__celdas_cultivo, self.__columnas_cultivo
+            desplazamiento = self.__columnas_suelo
+        else:
+            raise ValueError("Tipo de sensor desconocido: {}".format(tipo))
+
+        j = mapa.obtener(id_sensor)
+        if j is None:
+            raise ValueError("Sensor de {} desconocido: {}".format(tipo, id_sensor))
+        fila = self.__mapa_estaciones.obtener(id_estacion)
+        if fila is None:
+            raise ValueError("Estación desconocida: {}".format(id_estacion))
+        valor = int(valor)
+
+        # El historial es lo único que puede rechazar la medición: va primero
+        if tiempo is not None:
+            if tipo == "suelo":
+                self.campo.registrar_medicion_suelo(id_sensor, id_estacion, valor, tiempo)
+            else:
+                self.campo.registrar_medicion_cultivo(id_sensor, id_estacion, valor, tiempo)
+        if tipo == "suelo":
+            self.campo.actualizar_frecuencia_suelo(j, id_estacion, valor)
+        else:
+            self.campo.actualizar_frecuencia_cultivo(j, id_estacion, valor)
+        celdas[fila * columnas + j] = valor
+
+        firma = self.__firmas.obtener(fila)
+        bit = 1 << (desplazamiento + j)
+        nueva = firma | bit if valor > 0 else firma & ~bit
+        if nueva != firma:
+            self.__firmas.asignar(fila, nueva)
+            self.__filas_tocadas.insertar(fila, True)
+
+        ahora = time.perf_counter()
+        if self.__pendientes == 0:
+            self.__primera_pendiente = ahora
+        self.__ultima_pendiente = ahora
+        self.__pendientes += 1
+        self._sumar('actualizaciones', 1)
+        return nueva != firma
+
+    def procesar_linea(self, linea):
+        """
+        Aplicar una línea del flujo
+
+        Returns:
+            bool: True si se aplicó, False si se ignoró o se rechazó (se
+                  cuenta en 'rechazadas' y se avisa por consola)
+        """
+        if isinstance(linea, bytes):
+            linea = linea.decode('utf-8', errors='replace')
+        linea = linea.strip()
+        if not linea or linea.startswith('#'):
+            return False
+        partes = linea.replace(',', ' ').split()
+        try:
+            if len(partes) not in (4, 5):
+                raise ValueError("se esperaban 4 o 5 campos")
+            tiempo = int(partes[4]) if len(partes) == 5 else None
+            self.aplicar_actualizacion(partes[0], partes[1], partes[2], int(partes[3]), tiempo)
+            return True
+        except ValueError as e:
+            print("Error al procesar actualización '{}': {}".format(linea, e))
+            self._sumar('rechazadas', 1)
+            return False
+
+    def hay_pendientes(self):
+        """Verificar si hay una ráfaga abierta"""
+        return self.__pendientes > 0
+
+    def tiempo_restante(self, ahora):
+        """
+        Segundos hasta que la ráfaga abierta deba cerrarse si no llega nada
+        más (0 si ya debe cerrarse), o None si no hay ráfaga
+        """
+        if self.__pendientes == 0:
+            return None
+        limite = min(self.__ultima_pendiente + self.espera, self.__primera_pendiente + self.espera_maxima)
+        return max(0.0, limite - ahora)
+
+    def contar_firmas_cambiadas(self):
+        """Estaciones cuya firma difiere de la última optimización emitida"""
+        if self.__firmas_emitidas is None:
+            return self.__firmas.obtener_tamaño()
+        cambiadas = 0
+        for par in self.__filas_tocadas.obtener_pares():
+            fila = par.get_clave()
+            if self.__firmas.obtener(fila) != self.__firmas_emitidas.obtener(fila):
+                cambiadas += 1
+        return cambiadas
+
+    def vaciar(self, forzar=False):
+        """
+        Cerrar la ráfaga abierta y optimizar si alguna firma cambió
+
+        Args:
+            forzar (bool): Optimizar aunque no haya cambios
+
+        Returns:
+            Diccionario: La emisión, o None si no hubo optimización. Claves:
+                secuencia, motivo ("inicial", "firmas" o "forzada"),
+                resultado (ResultadoOptimizacion), actualizaciones (de la
+                ráfaga), estaciones_cambiadas y latencia (Diccionario con
+                espera_ms, optimizacion_ms, total_ms y desde_ultima_ms,
+                medidos desde la recepción de la primera y la última
+                actualización de la ráfaga)
+        """
+        cambiadas = self.contar_firmas_cambiadas()
+        actualizaciones = self.__pendientes
+        primera = self.__primera_pendiente
+        ultima = self.__ultima_pendiente
+        if actualizaciones > 0:
+            self._sumar('rafagas', 1)
+        self.__pendientes = 0
+        self.__primera_pendiente = self.__ultima_pendiente = None
+
+        if cambiadas == 0 and not forzar:
+            self.__filas_tocadas = TablaHash()
+            if actualizaciones > 0:
+                self._sumar('rafagas_sin_cambios', 1)
+            return None
+
+        if self.__firmas_emitidas is None:
+            motivo = "inicial"
+        else:
+            motivo = "firmas" if cambiadas > 0 else "forzada"
+
+        inicio = time.perf_counter()
+        resultado = self.optimizador.optimizar_estaciones(
+            self.campo, self.modo_agrupacion, self.distancia_maxima, restricciones=self.restricciones
+        )
+        fin = time.perf_counter()
+        if resultado is None:
+            # Las firmas emitidas y las filas tocadas se conservan: la próxima
+            # ráfaga vuelve a contar estas filas junto con las suyas
+            self._sumar('reoptimizaciones_fallidas', 1)
+            return None
+        self.__filas_tocadas = TablaHash()
+
+        firmas_emitidas = Arreglo(self.__firmas.obtener_tamaño())
+        i = 0
+        for firma in self.__firmas:
+            firmas_emitidas.asignar(i, firma)
+            i += 1
+        self.__firmas_emitidas = firmas_emitidas
+
+        if primera is None:
+            primera = ultima = inicio
+        latencia = Diccionario()
+        latencia.insertar('espera_ms', self._milisegundos(primera, inicio))
+        latencia.insertar('optimizacion_ms', self._milisegundos(inicio, fin))
+        latencia.insertar('total_ms', self._milisegundos(primera, fin))
+        latencia.insertar('desde_ultima_ms', self._milisegundos(ultima, fin))
+
+        self.__secuencia += 1
+        emision = Diccionario()
+        emision.insertar('secuencia', self.__secuencia)
+        emision.insertar('motivo', motivo)
+        emision.insertar('resultado', resultado)
+        emision.insertar('actualizaciones', actualizaciones)
+        emision.insertar('estaciones_cambiadas', cambiadas)
+        emision.insertar('latencia', latencia)
+
+        self._sumar('reoptimizaciones', 1)
+        self.__latencia_total += latencia.obtener('total_ms')
+        if latencia.obtener('total_ms') > self.__estadisticas.obtener('latencia_maxima_ms'):
+            self.__estadisticas.insertar('latencia_maxima_ms', latencia.obtener('total_ms'))
+        self.__ultima_emision = emision
+        if self.al_emitir is not None:
+            self.al_emitir(emision)
+        return emision
+
+    def obtener_ultima_emision(self):
+        """Última emisión (el diseño optimizado vigente), o None"""
+        return self.__ultima_emision
+
+    def obtener_firmas(self):
+        """Arreglo con la firma actual de cada estación"""
+        return self.__firmas
+
+    def obtener_estadisticas(self):
+        """
+        Returns:
+            Diccionario: Contadores de actualizaciones, ráfagas y
+                         reoptimizaciones, y latencia promedio y máxima (ms)
+        """
+        estadisticas = Diccionario()
+        for par in self.__estadisticas.obtener_pares():
+            estadisticas.insertar(par.get_clave(), par.get_valor())
+        reoptimizaciones = self.__estadisticas.obtener('reoptimizaciones')
+        estadisticas.insertar('latencia_promedio_ms',
+                              round(self.__latencia_total / reoptimizaciones, 3) if reoptimizaciones > 0 else 0.0)
+        return estadisticas
+
+    # --- Ejecución con asyncio ---
+
+    def procesar_archivo(self, ruta, seguir=False):
+        """
+        Consumir un archivo o tubería de forma síncrona (ver ejecutar_archivo)
+
+        Returns:
+            Diccionario: Estadísticas (ver obtener_estadisticas)
+        """
+        return asyncio.run(self.ejecutar_archivo(ruta, seguir))
+
+    async def ejecutar_archivo(self, ruta, seguir=False, intervalo=0.1):
+        """
+        Consumir las actualizaciones de un archivo, una tubería con nombre o
+        la entrada estándar ("-"), hasta el final del flujo
+
+        Args:
+            ruta (str): Ruta del archivo o FIFO, o "-"
+            seguir (bool): Al llegar al final, seguir esperando líneas nuevas
+                           (como tail -f) en lugar de terminar
+            intervalo (float): Segundos entre lecturas al seguir el archivo
+        """
+        async def producir(loop, ejecutor, cola):
+            archivo = sys.stdin if ruta == "-" else await loop.run_in_executor(
+                ejecutor, lambda: open(ruta, 'r', encoding='utf-8'))
+            try:
+                while True:
+                    linea = await loop.run_in_executor(ejecutor, archivo.readline)
+                    if linea:
+                        await cola.put(linea)
+                    elif seguir:
+                        await asyncio.sleep(intervalo)
+                    else:
+                        break
+            finally:
+                if archivo is not sys.stdin:
+                    archivo.close()
+
+        return await self.ejecutar(producir)
+
+    async def ejecutar_socket(self, host, puerto, al_escuchar=None):
+        """
+        Escuchar conexiones TCP y consumir las líneas que envíe cada una.
+        Corre hasta que se cancela la tarea.
+
+        Args:
+            al_escuchar: Función que recibe el servidor asyncio ya escuchando
+                         (por ejemplo, para conocer el puerto si se pidió el 0)
+        """
+        async def producir(loop, ejecutor, cola):
+            async def atender(lector, escritor):
+                try:
+                    while True:
+                        linea = await lector.readline()
+                        if not linea:
+                            break
+                        await cola.put(linea)
+                finally:
+                    escritor.close()
+
+            servidor = await asyncio.start_server(atender, host, puerto)
+            if al_escuchar is not None:
+                al_escuchar(servidor)
+            async with servidor:
+                await servidor.serve_forever()
+
+        return await self.ejecutar(producir)
+
+    async def ejecutar(self, producir):
+        """
+        Consumir un flujo de líneas. producir(loop, ejecutor, cola) es una
+        corrutina que pone las líneas en la cola; cuando termina se cierra la
+        última ráfaga. La optimización corre en un hilo aparte y mientras
+        tanto las líneas que llegan esperan en la cola (acotada: si se llena,
+        la lectura del flujo espera), así que se juntan en la siguiente ráfaga.
+
+        Returns:
+            Diccionario: Estadísticas (ver obtener_estadisticas)
+        """
+        loop = asyncio.get_running_loop()
+        ejecutor_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="planificador_io")
+        ejecutor_optimizacion = ThreadPoolExecutor(max_workers=1, thread_name_prefix="planificador_opt")
+        cola = asyncio.Queue(self.tamaño_cola)
+
+        async def producir_y_terminar():
+            try:
+                await producir(loop, ejecutor_io, cola)
+            finally:
+                await cola.put(None)
+
+        productor = asyncio.ensure_future(producir_y_terminar())
+        # La lectura pendiente se conserva entre vueltas: cancelarla por
+        # tiempo podría perder una línea ya sacada de la cola
+        lectura = None
+        try:
+            if self.__ultima_emision is None:
+                await loop.run_in_executor(ejecutor_optimizacion, self.vaciar, True)
+            while True:
+                if lectura is None:
+                    lectura = asyncio.ensure_future(cola.get())
+                espera = self.tiempo_restante(time.perf_counter())
+                listas, _ = await asyncio.wait({lectura}, timeout=espera)
+                if not listas:
+                    await loop.run_in_executor(ejecutor_optimizacion, self.vaciar)
+                    continue
+                linea = lectura.result()
+                lectura = None
+                if linea is None:
+                    break
+                self.procesar_linea(linea)
+                if self.tiempo_restante(time.perf_counter()) == 0:
+                    await loop.run_in_executor(ejecutor_optimizacion, self.vaciar)
+            if self.hay_pendientes():
+                await loop.run_in_executor(ejecutor_optimizacion, self.vaciar)
+            await productor
+        finally:
+            productor.cancel()
+            if lectura is not None:
+                lectura.cancel()
+            ejecutor_io.shutdown(wait=False)
+            ejecutor_optimizacion.shutdown(wait=True)
+
+        return self.obtener_estadisticas()
+
+
+if __name__ == "__main__":
+    # Uso: python -m procesadores.planificador_reoptimizacion entrada.xml id_campo (archivo|-|tcp:host:puerto) [salida.xml]
+    if len(sys.argv) < 4:
+        print("Uso: python -m procesadores.planificador_reoptimizacion entrada.xml id_campo "
+              "(archivo|-|tcp:host:puerto) [salida.xml]")
+        sys.exit(1)
+
+    xml_handler = XMLHandler()
+    campo = xml_handler.cargar_campo(sys.argv[1], sys.argv[2])
+    if campo is None:
+        print("No se encontró el campo {} en {}".format(sys.argv[2], sys.argv[1]))
+        sys.exit(1)
+    ruta_salida = sys.argv[4] if len(sys.argv) > 4 else None
+
+    def mostrar(emision):
+        resultado = emision.obtener('resultado')
+        latencia = emision.obtener('latencia')
+        print("[{}] {}: {} actualizaciones, {} estaciones cambiadas -> {} estaciones; "
+              "latencia {:.3f} ms (optimización {:.3f} ms)".format(
+                  emision.obtener('secuencia'), emision.obtener('motivo'),
+                  emision.obtener('actualizaciones'), emision.obtener('estaciones_cambiadas'),
+                  resultado.obtener('estaciones_optimizada'),
+                  latencia.obtener('total_ms'), latencia.obtener('optimizacion_ms')))
+        if ruta_salida is not None:
+            escritor = xml_handler.crear_escritor_salida(ruta_salida)
+            escritor.abrir()
+            try:
+                escritor.escribir_campo(resultado.obtener('campo_optimizado'))
+            finally:
+                escritor.cerrar()
+
+    planificador = PlanificadorReoptimizacion(campo, al_emitir=mostrar)
+    fuente = sys.argv[3]
+    try:
+        if fuente.startswith("tcp:"):
+            host, _, puerto = fuente[4:].rpartition(":")
+            estadisticas = asyncio.run(planificador.ejecutar_socket(host or "127.0.0.1", int(puerto)))
+        else:
+            estadisticas = planificador.procesar_archivo(fuente)
+    except KeyboardInterrupt:
+        estadisticas = planificador.obtener_estadisticas()
+
+    print("\n" + "=" * 50)
+    for par in estadisticas.obtener_pares():
+        print("{}: {}".format(par.get_clave(), par.get_valor()))
@@ -1,14 +1,52 @@
 # clases/procesador_matrices.py
 # Clase para crear y manipular matrices del sistema
 
+import struct
+from array import array
 from clases.matriz import Matriz
+from clases.matriz_buffer import MatrizBuffer
+from clases.matriz_mapeada import MatrizMapeada
+from clases.acumulador_estadisticas import AcumuladorEstadisticas
 from clases.lista import Lista
-from clases.diccionario import Diccionario
+from clases.tabla_hash import TablaHash
+from clases.arreglo import Arreglo
+from clases.indice_campo import IndiceCampo
+from clases.ordenador_externo import OrdenadorExterno
 
 class ProcesadorMatrices:
-    def __init__(self):
-        """Inicializar procesador de matrices"""
-        pass
+    # (fila, bit de la firma) de cada frecuencia positiva, en big-endian para ordenar por fila
+    PAR_FIRMA = struct.Struct('>QQ')
+
+    def __init__(self, almacenamiento="memoria", directorio=None):
+        """
+        Inicializar procesador de matrices
+
+        Args:
+            almacenamiento (str): "memoria" crea Matriz normales; "mapeada" crea
+                                  las matrices de frecuencias como MatrizMapeada
+            directorio (str): Directorio para los archivos de las matrices
+                              mapeadas (None: el temporal del sistema)
+        """
+        self.almacenamiento = almacenamiento
+        self.directorio = directorio
+
+    def _reservar_celdas(self, n_filas, m_columnas):
+        """
+        Reservar las celdas de una matriz de frecuencias nueva, en cero
+
+        Returns:
+            tuple: (MatrizMapeada o None, secuencia plana de celdas escribible)
+        """
+        if self.almacenamiento == "mapeada":
+            matriz = MatrizMapeada(n_filas, m_columnas, directorio=self.directorio)
+            return matriz, matriz.obtener_memoria()
+        return None, array('q', bytes(8 * n_filas * m_columnas))
+
+    def _crear_matriz(self, n_filas, m_columnas, matriz, valores):
+        """Entregar la matriz ya llena: la mapeada tal cual o una Matriz con los valores"""
+        if matriz is not None:
+            return matriz
+        return Matriz(n_filas, m_columnas, valores)
 
     def crear_rango(self, inicio, fin):
         """Crear rango de números sin usar range() nativo"""
@@ -22,33 +60,14 @@ class ProcesadorMatrices:
     def crear_matriz_frecuencias_suelo(self, campo):
         """Crear matriz F[n,s] para sensores de suelo"""
         try:
-            estaciones = campo.obtener_estaciones()
-            sensores_suelo = campo.obtener_sensores_suelo()
-            
-            n_estaciones = estaciones.obtener_tamaño()
-            s_sensores = sensores_suelo.obtener_tamaño()
-            
-            if n_estaciones == 0 or s_sensores == 0:
-                return None
-            
-            matriz_freq = Matriz(n_estaciones, s_sensores)
-            
-            i = 0
-            iterador_estaciones = estaciones.crear_iterador()
-            while iterador_estaciones.hay_siguiente():
-                estacion = iterador_estaciones.siguiente()
-                
-                j = 0
-                iterador_sensores = sensores_suelo.crear_iterador()
-                while iterador_sensores.hay_siguiente():
-                    sensor = iterador_sensores.siguiente()
-                    frecuencia = sensor.buscar_frecuencia_por_estacion(estacion.get_id())
-                    valor = frecuencia.get_valor() if frecuencia else 0
-                    matriz_freq.set_valor(i, j, valor)
-                    j += 1
-                i += 1
+            columnas = campo.obtener_columnas_suelo()
+            if columnas is not None:
+                return self.crear_matriz_desde_columnas(campo, columnas)
             
-            return matriz_freq
+            return self.crear_matriz_desde_sensores(
+                campo.obtener_estaciones(), campo.obtener_sensores_suelo(),
+                campo.obtener_indice().obtener_mapa_estaciones()
+            )
             
         except Exception as e:
             print("Error creando matriz de frecuencias de suelo: {}".format(str(e)))
@@ -57,38 +76,351 @@ class ProcesadorMatrices:
     def crear_matriz_frecuencias_cultivo(self, campo):
         """Crear matriz F[n,t] para sensores de cultivo"""
         try:
-            estaciones = campo.obtener_estaciones()
-            sensores_cultivo = campo.obtener_sensores_cultivo()
-            
-            n_estaciones = estaciones.obtener_tamaño()
-            t_sensores = sensores_cultivo.obtener_tamaño()
+            columnas = campo.obtener_columnas_cultivo()
+            if columnas is not None:
+                return self.crear_matriz_desde_columnas(campo, columnas)
             
-            if n_estaciones == 0 or t_sensores == 0:
-                return None
-            
-            matriz_freq = Matriz(n_estaciones, t_sensores)
-            
-            i = 0
-            iterador_estaciones = estaciones.crear_iterador()
-            while iterador_estaciones.hay_siguiente():
-                estacion = iterador_estaciones.siguiente()
-                
-                j = 0
-                iterador_sensores = sensores_cultivo.crear_iterador()
-                while iterador_sensores.hay_siguiente():
-                    sensor = iterador_sensores.siguiente()
-                    frecuencia = sensor.buscar_frecuencia_por_estacion(estacion.get_id())
-                    valor = frecuencia.get_valor() if frecuencia else 0
-                    matriz_freq.set_valor(i, j, valor)
-                    j += 1
-                i += 1
-            
-            return matriz_freq
+            return self.crear_matriz_desde_sensores(
+                campo.obtener_estaciones(), campo.obtener_sensores_cultivo(),
+                campo.obtener_indice().obtener_mapa_estaciones()
+            )
             
         except Exception as e:
             print("Error creando matriz de frecuencias de cultivo: {}".format(str(e)))
             return None
 
+    def crear_mapa_estaciones(self, estaciones):
+        """
+        Crear tabla ID de estación -> número de fila
+
+        Args:
+            estaciones (Lista): Estaciones en el orden de las filas de la matriz
+
+        Returns:
+            TablaHash: Fila de cada ID de estación
+        """
+        mapa = TablaHash(estaciones.obtener_tamaño())
+        i = 0
+        iterador_estaciones = estaciones.crear_iterador()
+        while iterador_estaciones.hay_siguiente():
+            mapa.insertar(iterador_estaciones.siguiente().get_id(), i)
+            i += 1
+        return mapa
+
+    def crear_matriz_desde_sensores(self, estaciones, sensores, mapa_estaciones=None):
+        """
+        Crear matriz de frecuencias recorriendo una sola vez las frecuencias
+        de cada sensor. La fila de cada frecuencia se resuelve con el mapa de
+        estaciones y el valor se coloca directamente en su celda, así el costo
+        es O(estaciones + sensores + frecuencias) más el llenado de la matriz.
+        Las frecuencias hacia estaciones inexistentes se ignoran.
+
+        Args:
+            estaciones (Lista): Estaciones (filas)
+            sensores (Lista): Sensores de un mismo tipo (columnas)
+            mapa_estaciones (TablaHash): Fila de cada ID de estación, si ya se
+                                         tiene (ver IndiceCampo); None la arma
+
+        Returns:
+            Matriz: Matriz de frecuencias o None si no hay estaciones o sensores
+        """
+        n_estaciones = estaciones.obtener_tamaño()
+        m_sensores = sensores.obtener_tamaño()
+        
+        if n_estaciones == 0 or m_sensores == 0:
+            return None
+        
+        if mapa_estaciones is None:
+            mapa_estaciones = self.crear_mapa_estaciones(estaciones)
+        matriz, valores = self._reservar_celdas(n_estaciones, m_sensores)
+        
+        j = 0
+        iterador_sensores = sensores.crear_iterador()
+        while iterador_sensores.hay_siguiente():
+            sensor = iterador_sensores.siguiente()
+            
+            iterador_frecuencias = sensor.obtener_frecuencias().crear_iterador()
+            while iterador_frecuencias.hay_siguiente():
+                frecuencia = iterador_frecuencias.siguiente()
+                i = mapa_estaciones.obtener(frecuencia.get_id_estacion())
+                if i is not None:
+                    valores[i * m_sensores + j] = frecuencia.get_valor()
+            j += 1
+        
+        return self._crear_matriz(n_estaciones, m_sensores, matriz, valores)
+
+    def crear_matriz_desde_columnas(self, campo, columnas):
+        """
+        Crear matriz de frecuencias directamente desde las columnas del campo.
+        Cada frecuencia se coloca en su celda con una sola pasada, sin crear
+        objetos sensor ni Frecuencia. Las frecuencias que apuntan a estaciones
+        inexistentes se ignoran, igual que en la construcción por objetos.
+        """
+        n_estaciones = campo.obtener_cantidad_estaciones()
+        m_sensores = columnas.obtener_cantidad_sensores()
+        
+        if n_estaciones == 0 or m_sensores == 0:
+            return None
+        
+        filas_registro = campo.obtener_filas_registro()
+        matriz, valores = self._reservar_celdas(n_estaciones, m_sensores)
+        
+        columna_sensores = columnas.obtener_columna_sensores()
+        columna_estaciones = columnas.obtener_columna_estaciones()
+        columna_valores = columnas.obtener_columna_valores()
+        
+        k = 0
+        total = columnas.obtener_cantidad_frecuencias()
+        while k < total:
+            fila = filas_registro[columna_estaciones[k]]
+            if fila >= 0:
+                valores[fila * m_sensores + columna_sensores[k]] = columna_valores[k]
+            k += 1
+        
+        return self._crear_matriz(n_estaciones, m_sensores, matriz, valores)
+
+    def crear_mapa_sensores(self, campo, tipo):
+        """
+        Obtener la tabla ID de sensor -> número de columna del índice del
+        campo (ver CampoAgricola.obtener_indice), sin materializar los
+        sensores si las frecuencias siguen en columnas
+
+        Returns:
+            TablaHash: Columna de cada ID de sensor (de solo lectura)
+        """
+        return campo.obtener_indice().obtener_mapa_sensores(tipo)
+
+    def recorrer_frecuencias(self, campo, tipo, ventana=None):
+        """
+        Generador de las celdas no vacías de la matriz de frecuencias de un
+        tipo de sensor, sin construir la matriz. Cada celda sale una vez,
+        como (fila, columna, valor), en el orden en que están guardadas.
+
+        Args:
+            campo (CampoAgricola): Campo de donde leer
+            tipo (str): "suelo" o "cultivo"
+            ventana (VentanaTiempo): Si se da, cada celda es la agregación del
+                                     historial de mediciones en la ventana en
+                                     lugar del valor actual
+        """
+        if ventana is not None:
+            historial = campo.obtener_historial_suelo() if tipo == "suelo" else campo.obtener_historial_cultivo()
+            indice = campo.obtener_indice()
+            mapa_sensores = indice.obtener_mapa_sensores(tipo)
+            mapa_estaciones = indice.obtener_mapa_estaciones()
+            for id_sensor, id_estacion, valor in historial.recorrer_ventana(ventana):
+                j = mapa_sensores.obtener(id_sensor)
+                fila = mapa_estaciones.obtener(id_estacion)
+                # Mediciones de sensores o estaciones que ya no están en el campo se ignoran
+                if j is not None and fila is not None:
+                    yield fila, j, valor
+            return
+
+        columnas = campo.obtener_columnas_suelo() if tipo == "suelo" else campo.obtener_columnas_cultivo()
+
+        if columnas is not None:
+            filas_registro = campo.obtener_filas_registro()
+            columna_sensores = columnas.obtener_columna_sensores()
+            columna_estaciones = columnas.obtener_columna_estaciones()
+            columna_valores = columnas.obtener_columna_valores()
+
+            k = 0
+            total = columnas.obtener_cantidad_frecuencias()
+            while k < total:
+                fila = filas_registro[columna_estaciones[k]]
+                if fila >= 0:
+                    yield fila, columna_sensores[k], columna_valores[k]
+                k += 1
+            return
+
+        sensores = campo.obtener_sensores_suelo() if tipo == "suelo" else campo.obtener_sensores_cultivo()
+        mapa_estaciones = campo.obtener_indice().obtener_mapa_estaciones()
+        j = 0
+        iterador_sensores = sensores.crear_iterador()
+        while iterador_sensores.hay_siguiente():
+            iterador_frecuencias = iterador_sensores.siguiente().obtener_frecuencias().crear_iterador()
+            while iterador_frecuencias.hay_siguiente():
+                frecuencia = iterador_frecuencias.siguiente()
+                fila = mapa_estaciones.obtener(frecuencia.get_id_estacion())
+                if fila is not None:
+                    yield fila, j, frecuencia.get_valor()
+            j += 1
+
+    def generar_firmas_estaciones(self, campo, estaciones_por_bloque, presupuesto_memoria=None, directorio=None):
+        """
+        Generador de (fila, firma) de cada estación, en orden de fila, sin
+        construir matrices. La firma tiene el patrón de suelo en los bits
+        0..s-1 y el de cultivo a continuación (igual que combinar las firmas
+        de Matriz.obtener_firmas_filas), así que dos estaciones tienen la
+        misma firma si y solo si sus patrones combinados son idénticos.
+
+        Las frecuencias se recorren una sola vez: cada par (fila, bit) con
+        valor positivo pasa por un OrdenadorExterno ordenado por fila, y la
+        corrida ordenada se consume bloque a bloque. Solo se guardan en
+        memoria las firmas de un bloque de estaciones.
+
+        Args:
+            campo (CampoAgricola): Campo de donde leer
+            estaciones_por_bloque (int): Firmas que se arman a la vez
+            presupuesto_memoria (int): Bytes para el ordenamiento (None: según el bloque)
+            directorio (str): Dónde crear los archivos temporales (None: el del sistema)
+        """
+        n_estaciones = campo.obtener_cantidad_estaciones()
+        desplazamiento_cultivo = campo.obtener_cantidad_sensores_suelo()
+        bloque = max(1, estaciones_por_bloque)
+        if presupuesto_memoria is None:
+            presupuesto_memoria = bloque * (self.PAR_FIRMA.size + OrdenadorExterno.SOBRECARGA_REGISTRO)
+
+        with OrdenadorExterno(self.PAR_FIRMA.size, presupuesto_memoria, directorio) as ordenador:
+            for fila, j, valor in self.recorrer_frecuencias(campo, "suelo"):
+                if valor > 0:
+                    ordenador.agregar(self.PAR_FIRMA.pack(fila, j))
+            for fila, j, valor in self.recorrer_frecuencias(campo, "cultivo"):
+                if valor > 0:
+                    ordenador.agregar(self.PAR_FIRMA.pack(fila, desplazamiento_cultivo + j))
+
+            inicio = 0
+            fin = min(bloque, n_estaciones)
+            firmas_bloque = Arreglo(fin - inicio, 0)
+            for registro in ordenador.iterar_ordenado():
+                fila, bit = self.PAR_FIRMA.unpack(registro)
+                while fila >= fin:
+                    # La corrida ya pasó este bloque: entregarlo y armar el siguiente
+                    for resultado in self._entregar_bloque(firmas_bloque, inicio, fin):
+                        yield resultado
+                    inicio = fin
+                    fin = min(inicio + bloque, n_estaciones)
+                    firmas_bloque = Arreglo(fin - inicio, 0)
+                firmas_bloque.asignar(fila - inicio, firmas_bloque.obtener(fila - inicio) | (1 << bit))
+
+            while inicio < n_estaciones:
+                for resultado in self._entregar_bloque(firmas_bloque, inicio, fin):
+                    yield resultado
+                inicio = fin
+                fin = min(inicio + bloque, n_estaciones)
+                firmas_bloque = Arreglo(fin - inicio, 0)
+
+    def _entregar_bloque(self, firmas_bloque, inicio, fin):
+        """Generador de (fila, firma) de las estaciones de un bloque"""
+        fila = inicio
+        while fila < fin:
+            yield fila, firmas_bloque.obtener(fila - inicio)
+            fila += 1
+
+    def crear_celdas_frecuencias(self, campo, tipo, ventana=None):
+        """
+        Crear solo las celdas de la matriz de frecuencias de un tipo de
+        sensor: un array plano de enteros de 64 bits, fila por fila, sin
+        objetos Matriz ni Lista. Igual que en la matriz, si una celda recibe
+        varios valores queda el último.
+
+        Args:
+            campo (CampoAgricola): Campo de donde leer
+            tipo (str): "suelo" o "cultivo"
+            ventana (VentanaTiempo): Usar el historial en esa ventana (ver recorrer_frecuencias)
+
+        Returns:
+            array: Celdas (n_estaciones * m_sensores) o None si no hay estaciones o sensores
+        """
+        n_estaciones = campo.obtener_cantidad_estaciones()
+        if tipo == "suelo":
+            m_sensores = campo.obtener_cantidad_sensores_suelo()
+        else:
+            m_sensores = campo.obtener_cantidad_sensores_cultivo()
+
+        if n_estaciones == 0 or m_sensores == 0:
+            return None
+
+        valores = array('q', bytes(8 * n_estaciones * m_sensores))
+        for fila, j, valor in self.recorrer_frecuencias(campo, tipo, ventana):
+            valores[fila * m_sensores + j] = valor
+        return valores
+
+    def crear_matriz_desde_celdas(self, celdas, columnas):
+        """
+        Crear la matriz de frecuencias a partir de celdas planas ya leídas
+        (ver crear_celdas_frecuencias), sin volver a recorrer el campo
+
+        Returns:
+            Matriz: Matriz (o MatrizMapeada) de len(celdas) / columnas filas
+        """
+        n_filas = len(celdas) // columnas
+        matriz, valores = self._reservar_celdas(n_filas, columnas)
+        valores[:] = celdas
+        return self._crear_matriz(n_filas, columnas, matriz, valores)
+
+    def crear_matriz_frecuencias_ventana(self, campo, tipo, ventana):
+        """
+        Crear la matriz de frecuencias de un tipo de sensor con los valores
+        del historial agregados en una ventana de tiempo
+
+        Returns:
+            Matriz: Matriz (o MatrizMapeada) de estaciones x sensores, o None
+                    si no hay estaciones o sensores
+        """
+        n_estaciones = campo.obtener_cantidad_estaciones()
+        if tipo == "suelo":
+            m_sensores = campo.obtener_cantidad_sensores_suelo()
+        else:
+            m_sensores = campo.obtener_cantidad_sensores_cultivo()
+
+        if n_estaciones == 0 or m_sensores == 0:
+            return None
+
+        matriz, valores = self._reservar_celdas(n_estaciones, m_sensores)
+        for fila, j, valor in self.recorrer_frecuencias(campo, tipo, ventana):
+            valores[fila * m_sensores + j] = valor
+        return self._crear_matriz(n_estaciones, m_sensores, matriz, valores)
+
+    def calcular_firmas_celdas(self, celdas_suelo, columnas_suelo, celdas_cultivo, columnas_cultivo):
+        """
+        Firma combinada de cada estación a partir de las celdas planas: bit j
+        encendido si la frecuencia de suelo j es > 0 y bit columnas_suelo + j
+        si lo es la de cultivo j (igual que combinar obtener_firmas_filas de
+        las matrices de patrones).
+
+        Returns:
+            Arreglo: Firma (int) de cada estación
+        """
+        n_estaciones = len(celdas_suelo) // columnas_suelo
+        firmas = Arreglo(n_estaciones, 0)
+        i = 0
+        while i < n_estaciones:
+            firma = 0
+            bit = 1
+            for valor in celdas_suelo[i * columnas_suelo:(i + 1) * columnas_suelo]:
+                if valor > 0:
+                    firma |= bit
+                bit <<= 1
+            for valor in celdas_cultivo[i * columnas_cultivo:(i + 1) * columnas_cultivo]:
+                if valor > 0:
+                    firma |= bit
+                bit <<= 1
+            firmas.asignar(i, firma)
+            i += 1
+        return firmas
+
+    def reducir_celdas(self, celdas, columnas, grupos_estaciones):
+        """
+        Sumar las filas de cada grupo sobre celdas planas
+
+        Returns:
+            array: Celdas de la matriz reducida (un renglón por grupo, en orden)
+        """
+        reducidas = array('q', bytes(8 * grupos_estaciones.obtener_tamaño() * columnas))
+        base_destino = 0
+        iterador_grupos = grupos_estaciones.crear_iterador()
+        while iterador_grupos.hay_siguiente():
+            iterador_miembros = iterador_grupos.siguiente().crear_iterador()
+            while iterador_miembros.hay_siguiente():
+                base_origen = iterador_miembros.siguiente() * columnas
+                j = 0
+                while j < columnas:
+                    reducidas[base_destino + j] += celdas[base_origen + j]
+                    j += 1
+            base_destino += columnas
+        return reducidas
+
     def convertir_a_patrones(self, matriz_frecuencias):
         """Convertir matriz de frecuencias a matriz de patrones"""
         if not matriz_frecuencias:
@@ -101,7 +433,13 @@ class ProcesadorMatrices:
             return None
 
     def obtener_indice_estacion(self, lista_estaciones, id_estacion):
-        """Obtener índice de estación en la lista"""
+        """
+        Obtener índice de estación en la lista. Con un IndiceCampo (ver
+        CampoAgricola.obtener_indice) la búsqueda es O(1) en lugar de
+        recorrer la lista.
+        """
+        if isinstance(lista_estaciones, IndiceCampo):
+            return lista_estaciones.obtener_ordinal_estacion(id_estacion)
         iterador = lista_estaciones.crear_iterador()
         i = 0
         while iterador.hay_siguiente():
@@ -111,8 +449,13 @@ class ProcesadorMatrices:
             i += 1
         return -1
 
-    def obtener_indice_sensor(self, lista_sensores, id_sensor):
-        """Obtener índice de sensor en la lista"""
+    def obtener_indice_sensor(self, lista_sensores, id_sensor, tipo="suelo"):
+        """
+        Obtener índice de sensor en la lista. Con un IndiceCampo se busca en
+        O(1) entre los sensores del tipo indicado.
+        """
+        if isinstance(lista_sensores, IndiceCampo):
+            return lista_sensores.obtener_ordinal_sensor(tipo, id_sensor)
         iterador = lista_sensores.crear_iterador()
         i = 0
         while iterador.hay_siguiente():
@@ -258,43 +601,55 @@ class ProcesadorMatrices:
         return patron_suelo_identico and patron_cultivo_identico
 
     def obtener_estadisticas_matriz(self, matriz):
-        """Obtener estadísticas de la matriz"""
+        """
+        Obtener estadísticas de la matriz en una sola pasada (ver
+        AcumuladorEstadisticas). Las matrices sobre buffer se leen por vistas
+        de fila y las de Listas recorriendo cada fila una vez.
+        """
         if not matriz:
             return None
         
         try:
-            estadisticas = Diccionario()
-            estadisticas.insertar('filas', matriz.get_filas())
-            estadisticas.insertar('columnas', matriz.get_columnas())
-            estadisticas.insertar('total_elementos', matriz.get_filas() * matriz.get_columnas())
-            estadisticas.insertar('suma_total', 0)
-            estadisticas.insertar('valores_cero', 0)
-            estadisticas.insertar('valores_positivos', 0)
-            
-            indices_i = self.crear_rango(0, matriz.get_filas())
-            iterador_i = indices_i.crear_iterador()
-            while iterador_i.hay_siguiente():
-                i = iterador_i.siguiente()
-                
-                indices_j = self.crear_rango(0, matriz.get_columnas())
-                iterador_j = indices_j.crear_iterador()
-                while iterador_j.hay_siguiente():
-                    j = iterador_j.siguiente()
-                    
-                    valor = matriz.get_valor(i, j)
-                    
-                    suma_actual = estadisticas.obtener('suma_total')
-                    estadisticas.insertar('suma_total', suma_actual + valor)
-                    
-                    if valor == 0:
-                        ceros_actual = estadisticas.obtener('valores_cero')
-                        estadisticas.insertar('valores_cero', ceros_actual + 1)
-                    elif valor > 0:
-                        positivos_actual = estadisticas.obtener('valores_positivos')
-                        estadisticas.insertar('valores_positivos', positivos_actual + 1)
-            
-            return estadisticas
+            acumulador = AcumuladorEstadisticas(matriz.get_filas(), matriz.get_columnas())
+            if isinstance(matriz, MatrizBuffer):
+                i = 0
+                while i < matriz.get_filas():
+                    acumulador.agregar_fila(i, matriz.obtener_vista_fila(i))
+                    i += 1
+            else:
+                i = 0
+                iterador_filas = matriz.datos.crear_iterador()
+                while iterador_filas.hay_siguiente():
+                    acumulador.agregar_fila(i, iterador_filas.siguiente())
+                    i += 1
+            return acumulador.obtener_estadisticas()
             
         except Exception as e:
             print("Error calculando estadísticas: {}".format(str(e)))
-            return None
\ No newline at end of file
+            return None
+
+    def obtener_estadisticas_frecuencias(self, campo, tipo, ventana=None):
+        """
+        Estadísticas de la matriz de frecuencias de un tipo de sensor sin
+        construirla: las frecuencias se recorren como celdas dispersas y el
+        resto de la matriz cuenta como ceros.
+
+        Args:
+            campo (CampoAgricola): Campo de donde leer
+            tipo (str): "suelo" o "cultivo"
+            ventana (VentanaTiempo): Usar el historial en esa ventana (ver recorrer_frecuencias)
+
+        Returns:
+            Diccionario: Igual que obtener_estadisticas_matriz
+        """
+        try:
+            if tipo == "suelo":
+                columnas = campo.obtener_cantidad_sensores_suelo()
+            else:
+                columnas = campo.obtener_cantidad_sensores_cultivo()
+            acumulador = AcumuladorEstadisticas(campo.obtener_cantidad_estaciones(), columnas)
+            acumulador.agregar_celdas(self.recorrer_frecuencias(campo, tipo, ventana))
+            return acumulador.obtener_estadisticas()
+        except Exception as e:
+            print("Error calculando estadísticas: {}".format(str(e)))
+            return None
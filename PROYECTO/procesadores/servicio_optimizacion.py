@@ -0,0 +1,237 @@
+# procesadores/servicio_optimizacion.py
+# Lógica del servicio de optimización: cargas en memoria, optimización y consultas
+
+import time
+import threading
+from clases.lista import Lista
+from clases.diccionario import Diccionario
+from clases.tabla_hash import TablaHash
+from .xml_handler import XMLHandler
+from .optimizador import Optimizador
+
+class ServicioOptimizacion:
+    """
+    Mantiene en memoria los campos recibidos y sus resultados de optimización
+    para poder consultarlos o re-optimizarlos sin volver a parsear el XML.
+    Es independiente del transporte: servidor.py lo expone por HTTP.
+    Todos los métodos pueden llamarse desde varios hilos a la vez.
+    """
+
+    def __init__(self, max_cargas=32):
+        """
+        Inicializar servicio
+
+        Args:
+            max_cargas (int): Cargas que se conservan en memoria; al superarlo
+                              se descarta la más antigua
+        """
+        self.xml_handler = XMLHandler()
+        self.optimizador = Optimizador()
+        self.max_cargas = max_cargas
+        self.cargas = TablaHash()  # ID de carga -> Diccionario con su estado
+        self.siguiente_id = 1
+        self.candado = threading.Lock()
+
+    def _milisegundos(self, inicio, fin):
+        """Diferencia entre dos marcas de perf_counter en milisegundos"""
+        return round((fin - inicio) * 1000, 3)
+
+    def procesar_carga(self, contenido_xml, id_campo=None):
+        """
+        Parsear un XML camposAgricolas, optimizar sus campos y guardar todo en memoria
+
+        Args:
+            contenido_xml (bytes): Documento XML recibido
+            id_campo (str): Si se indica, solo se optimiza ese campo
+
+        Returns:
+            Diccionario: Estado de la carga (ver _resumen_carga) con el XML optimizado
+        """
+        inicio = time.perf_counter()
+        campos = self.xml_handler.cargar_contenido(contenido_xml)
+        fin_parseo = time.perf_counter()
+
+        if campos.esta_vacia():
+            raise ValueError("El XML no contiene campos válidos")
+
+        carga = Diccionario()
+        carga.insertar('campos', campos)
+        carga.insertar('resultados', TablaHash())
+        carga.insertar('tiempos_campos', TablaHash())
+        carga.insertar('candado', threading.Lock())
+
+        with self.candado:
+            id_carga = str(self.siguiente_id)
+            self.siguiente_id += 1
+        carga.insertar('id', id_carga)
+
+        self._optimizar_campos(carga, id_campo)
+        fin_optimizacion = time.perf_counter()
+
+        xml_salida = self._generar_xml(carga)
+        fin_escritura = time.perf_counter()
+
+        tiempos = Diccionario()
+        tiempos.insertar('parseo_ms', self._milisegundos(inicio, fin_parseo))
+        tiempos.insertar('optimizacion_ms', self._milisegundos(fin_parseo, fin_optimizacion))
+        tiempos.insertar('escritura_ms', self._milisegundos(fin_optimizacion, fin_escritura))
+        tiempos.insertar('total_ms', self._milisegundos(inicio, fin_escritura))
+        carga.insertar('tiempos', tiempos)
+        carga.insertar('xml', xml_salida)
+
+        self._guardar_carga(id_carga, carga)
+        return self._resumen_carga(carga)
+
+    def reoptimizar_campo(self, id_carga, id_campo):
+        """
+        Volver a optimizar un campo ya cargado, sin parsear de nuevo
+
+        Returns:
+            Diccionario: Resumen del campo, o None si la carga o el campo no existen
+        """
+        carga = self._buscar_carga(id_carga)
+        if carga is None:
+            return None
+        campo = carga.obtener('campos').buscar_por_id(id_campo)
+        if campo is None:
+            return None
+
+        self._optimizar_campo(carga, campo)
+        xml_salida = self._generar_xml(carga)
+        carga.insertar('xml', xml_salida)
+        return self._resumen_campo(carga, campo)
+
+    def _optimizar_campos(self, carga, id_campo):
+        """Optimizar todos los campos de la carga, o solo id_campo"""
+        iterador = carga.obtener('campos').crear_iterador()
+        while iterador.hay_siguiente():
+            campo = iterador.siguiente()
+            if id_campo is None or campo.get_id() == id_campo:
+                self._optimizar_campo(carga, campo)
+
+    def _optimizar_campo(self, carga, campo):
+        """Optimizar un campo y guardar resultado y tiempo en la carga"""
+        # Un candado por carga: dos pedidos sobre el mismo campo no se pisan,
+        # y pedidos sobre cargas distintas corren en paralelo
+        with carga.obtener('candado'):
+            inicio = time.perf_counter()
+            resultado = self.optimizador.optimizar_estaciones(campo)
+            fin = time.perf_counter()
+            if resultado is None:
+                raise ValueError("No se pudo optimizar el campo {}".format(campo.get_id()))
+            resultado.insertar('campo_original', campo)
+            carga.obtener('resultados').insertar(campo.get_id(), resultado)
+            carga.obtener('tiempos_campos').insertar(campo.get_id(), self._milisegundos(inicio, fin))
+
+    def _generar_xml(self, carga):
+        """Generar XML de salida con los campos optimizados de la carga, en orden de documento"""
+        campos_optimizados = Lista()
+        resultados = carga.obtener('resultados')
+        iterador = carga.obtener('campos').crear_iterador()
+        while iterador.hay_siguiente():
+            resultado = resultados.obtener(iterador.siguiente().get_id())
+            if resultado is not None:
+                campos_optimizados.insertar(resultado.obtener('campo_optimizado'))
+        return self.xml_handler.generar_contenido_salida(campos_optimizados)
+
+    def _guardar_carga(self, id_carga, carga):
+        """Guardar carga y descartar las más antiguas si se supera max_cargas"""
+        with self.candado:
+            self.cargas.insertar(id_carga, carga)
+            while self.cargas.obtener_tamaño() > self.max_cargas:
+                mas_antigua = self.cargas.obtener_claves().obtener_en_posicion(0)
+                self.cargas.eliminar(mas_antigua)
+
+    def _buscar_carga(self, id_carga):
+        """
+        Carga por ID, o None. Se lee con el candado: _guardar_carga puede
+        estar redimensionando la tabla y sin él una carga existente no se
+        encontraría.
+        """
+        with self.candado:
+            return self.cargas.obtener(id_carga)
+
+    def obtener_carga(self, id_carga):
+        """Resumen de una carga, o None si no existe"""
+        carga = self._buscar_carga(id_carga)
+        return self._resumen_carga(carga) if carga is not None else None
+
+    def obtener_xml(self, id_carga):
+        """XML optimizado (bytes) de una carga, o None si no existe"""
+        carga = self._buscar_carga(id_carga)
+        return carga.obtener('xml') if carga is not None else None
+
+    def obtener_campo(self, id_carga, id_campo):
+        """Resumen detallado de un campo de una carga, o None si no existe"""
+        carga = self._buscar_carga(id_carga)
+        if carga is None:
+            return None
+        campo = carga.obtener('campos').buscar_por_id(id_campo)
+        if campo is None:
+            return None
+        return self._resumen_campo(carga, campo, incluir_grupos=True)
+
+    def listar_cargas(self):
+        """Lista con el resumen (sin XML) de todas las cargas en memoria"""
+        cargas = Lista()
+        with self.candado:
+            valores = self.cargas.obtener_valores()
+        iterador = valores.crear_iterador()
+        while iterador.hay_siguiente():
+            resumen = self._resumen_carga(iterador.siguiente())
+            resumen.eliminar('xml')
+            cargas.insertar(resumen)
+        return cargas
+
+    def eliminar_carga(self, id_carga):
+        """Liberar una carga; retorna True si existía"""
+        with self.candado:
+            return self.cargas.eliminar(id_carga)
+
+    def _resumen_carga(self, carga):
+        """Diccionario con id, tiempos, resumen por campo y XML de una carga"""
+        resumen = Diccionario()
+        resumen.insertar('id_carga', carga.obtener('id'))
+        resumen.insertar('tiempos', carga.obtener('tiempos'))
+
+        campos = Lista()
+        iterador = carga.obtener('campos').crear_iterador()
+        while iterador.hay_siguiente():
+            campos.insertar(self._resumen_campo(carga, iterador.siguiente()))
+        resumen.insertar('campos', campos)
+        resumen.insertar('xml', carga.obtener('xml'))
+        return resumen
+
+    def _resumen_campo(self, carga, campo, incluir_grupos=False):
+        """Diccionario con datos del campo y, si fue optimizado, su resultado"""
+        resumen = Diccionario()
+        resumen.insertar('id', campo.get_id())
+        resumen.insertar('nombre', campo.get_nombre())
+        resumen.insertar('estaciones', campo.obtener_cantidad_estaciones())
+        resumen.insertar('sensores_suelo', campo.obtener_cantidad_sensores_suelo())
+        resumen.insertar('sensores_cultivo', campo.obtener_cantidad_sensores_cultivo())
+
+        resultado = carga.obtener('resultados').obtener(campo.get_id())
+        resumen.insertar('optimizado', resultado is not None)
+        if resultado is not None:
+            resumen.insertar('estaciones_optimizada', resultado.obtener('estaciones_optimizada'))
+            resumen.insertar('estaciones_excluidas', resultado.obtener('estaciones_excluidas'))
+            resumen.insertar('porcentaje_ahorro', resultado.obtener('porcentaje_ahorro'))
+            resumen.insertar('optimizacion_ms', carga.obtener('tiempos_campos').obtener(campo.get_id()))
+            if incluir_grupos:
+                resumen.insertar('grupos_estaciones', self._ids_grupos(campo, resultado))
+        return resumen
+
+    def _ids_grupos(self, campo, resultado):
+        """Convertir los grupos de índices de estación en grupos de IDs"""
+        estaciones = campo.obtener_estaciones()
+        grupos_ids = Lista()
+        iterador_grupos = resultado.obtener('grupos_estaciones').crear_iterador()
+        while iterador_grupos.hay_siguiente():
+            grupo = iterador_grupos.siguiente()
+            ids = Lista()
+            iterador = grupo.crear_iterador()
+            while iterador.hay_siguiente():
+                ids.insertar(estaciones.obtener_en_posicion(iterador.siguiente()).get_id())
+            grupos_ids.insertar(ids)
+        return grupos_ids
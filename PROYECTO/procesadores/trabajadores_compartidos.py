@@ -0,0 +1,188 @@
+# procesadores/trabajadores_compartidos.py
+# Agrupación, reducción y gráficas en procesos trabajadores sobre matrices compartidas
+
+from array import array
+from clases.lista import Lista
+from clases.matriz import Matriz
+from clases.diccionario import Diccionario
+from clases.tabla_hash import TablaHash
+from clases.arreglo import Arreglo
+from clases.matriz_compartida import MatrizCompartida, PublicadorMatrices
+
+# Funciones de trabajador: son de nivel de módulo para que el ejecutor de
+# procesos pueda enviarlas. Reciben descriptores, nunca matrices completas.
+
+def convertir_a_patrones_compartida(descriptor_frecuencias, descriptor_patrones):
+    """Escribir en la matriz de patrones compartida 1 donde la frecuencia es > 0"""
+    frecuencias = MatrizCompartida.adjuntar(descriptor_frecuencias)
+    patrones = MatrizCompartida.adjuntar(descriptor_patrones)
+    try:
+        origen = frecuencias.obtener_memoria()
+        destino = patrones.obtener_memoria()
+        posicion = 0
+        total = len(origen)
+        while posicion < total:
+            destino[posicion] = 1 if origen[posicion] > 0 else 0
+            posicion += 1
+    finally:
+        frecuencias.cerrar()
+        patrones.cerrar()
+
+def agrupar_compartida(descriptor_patrones_suelo, descriptor_patrones_cultivo):
+    """
+    Agrupar filas con patrones idénticos en suelo y cultivo
+
+    Returns:
+        array: Número de grupo de cada fila; los grupos se numeran por su
+               menor fila, igual que Optimizador.identificar_grupos_estaciones
+    """
+    suelo = MatrizCompartida.adjuntar(descriptor_patrones_suelo)
+    cultivo = MatrizCompartida.adjuntar(descriptor_patrones_cultivo)
+    try:
+        firmas_suelo = suelo.obtener_firmas_filas()
+        firmas_cultivo = cultivo.obtener_firmas_filas()
+        desplazamiento = suelo.get_columnas()
+
+        grupo_por_firma = TablaHash()
+        grupo_por_fila = array('l', bytes(array('l').itemsize * suelo.get_filas()))
+        i = 0
+        while i < suelo.get_filas():
+            firma = firmas_suelo.obtener(i) | (firmas_cultivo.obtener(i) << desplazamiento)
+            grupo = grupo_por_firma.obtener(firma)
+            if grupo is None:
+                grupo = grupo_por_firma.obtener_tamaño()
+                grupo_por_firma.insertar(firma, grupo)
+            grupo_por_fila[i] = grupo
+            i += 1
+        return grupo_por_fila
+    finally:
+        suelo.cerrar()
+        cultivo.cerrar()
+
+def reducir_compartida(descriptor_frecuencias, descriptor_reducida, grupo_por_fila, grupo_inicio, grupo_fin):
+    """
+    Sumar las filas de frecuencias en la fila reducida de su grupo, solo para
+    los grupos [grupo_inicio, grupo_fin): así varios trabajadores escriben la
+    misma matriz reducida sin pisarse.
+    """
+    frecuencias = MatrizCompartida.adjuntar(descriptor_frecuencias)
+    reducida = MatrizCompartida.adjuntar(descriptor_reducida)
+    try:
+        columnas = frecuencias.get_columnas()
+        origen = frecuencias.obtener_memoria()
+        destino = reducida.obtener_memoria()
+        fila = 0
+        for grupo in grupo_por_fila:
+            if grupo_inicio <= grupo < grupo_fin:
+                base_origen = fila * columnas
+                base_destino = grupo * columnas
+                j = 0
+                while j < columnas:
+                    destino[base_destino + j] += origen[base_origen + j]
+                    j += 1
+            fila += 1
+    finally:
+        frecuencias.cerrar()
+        reducida.cerrar()
+
+def graficar_compartida(descriptor, tipo_matriz, campo_nombre, nombre_archivo,
+                        etiquetas_filas=None, etiquetas_columnas=None):
+    """Generar la gráfica de una matriz compartida con GraphvizGenerator"""
+    from utils.graphviz_generator import GraphvizGenerator
+    matriz = MatrizCompartida.adjuntar(descriptor)
+    try:
+        return GraphvizGenerator().generar_grafica_matriz(
+            matriz, tipo_matriz, campo_nombre, nombre_archivo, etiquetas_filas, etiquetas_columnas
+        )
+    finally:
+        matriz.cerrar()
+
+
+class ProcesadorCompartido:
+    """
+    Reparte patrones, agrupación y reducción de un campo entre procesos.
+    Las matrices se publican una vez en memoria compartida y a los
+    trabajadores solo se les envían descriptores; los segmentos se borran al
+    terminar, también si algún trabajador falla.
+    """
+
+    def __init__(self, ejecutor, partes_reduccion=2):
+        """
+        Args:
+            ejecutor: concurrent.futures.ProcessPoolExecutor (o compatible)
+            partes_reduccion (int): En cuántos rangos de grupos se reparte cada reducción
+        """
+        self.ejecutor = ejecutor
+        self.partes_reduccion = partes_reduccion
+
+    def _copiar_a_matriz(self, compartida):
+        """Copiar una matriz compartida a una Matriz normal, que sobrevive al segmento"""
+        return Matriz(compartida.get_filas(), compartida.get_columnas(), compartida.obtener_memoria())
+
+    def agrupar_y_reducir(self, matriz_freq_suelo, matriz_freq_cultivo):
+        """
+        Calcular patrones, grupos y matrices reducidas en los trabajadores
+
+        Returns:
+            Diccionario: matriz_patron_suelo, matriz_patron_cultivo,
+                         grupos_estaciones y matrices_reducidas, con la misma
+                         forma que el resultado de Optimizador.optimizar_estaciones
+        """
+        with PublicadorMatrices() as publicador:
+            freq_suelo = publicador.publicar(matriz_freq_suelo)
+            freq_cultivo = publicador.publicar(matriz_freq_cultivo)
+            patron_suelo = publicador.reservar(matriz_freq_suelo.get_filas(), matriz_freq_suelo.get_columnas())
+            patron_cultivo = publicador.reservar(matriz_freq_cultivo.get_filas(), matriz_freq_cultivo.get_columnas())
+
+            tareas = Lista()
+            tareas.insertar(self.ejecutor.submit(convertir_a_patrones_compartida,
+                                                 freq_suelo, patron_suelo.obtener_descriptor()))
+            tareas.insertar(self.ejecutor.submit(convertir_a_patrones_compartida,
+                                                 freq_cultivo, patron_cultivo.obtener_descriptor()))
+            for tarea in tareas:
+                tarea.result()
+
+            grupo_por_fila = self.ejecutor.submit(
+                agrupar_compartida, patron_suelo.obtener_descriptor(), patron_cultivo.obtener_descriptor()
+            ).result()
+
+            # Los grupos se numeraron por primera aparición, o sea por su menor fila
+            cantidad_grupos = max(grupo_por_fila) + 1 if len(grupo_por_fila) > 0 else 0
+            grupos_por_numero = Arreglo(cantidad_grupos)
+            grupos = Lista()
+            g = 0
+            while g < cantidad_grupos:
+                grupo = Lista()
+                grupos_por_numero.asignar(g, grupo)
+                grupos.insertar(grupo)
+                g += 1
+            fila = 0
+            for grupo in grupo_por_fila:
+                grupos_por_numero.obtener(grupo).insertar(fila)
+                fila += 1
+
+            reducida_suelo = publicador.reservar(cantidad_grupos, matriz_freq_suelo.get_columnas())
+            reducida_cultivo = publicador.reservar(cantidad_grupos, matriz_freq_cultivo.get_columnas())
+            tareas = Lista()
+            paso = max(1, -(-cantidad_grupos // self.partes_reduccion))
+            inicio = 0
+            while inicio < cantidad_grupos:
+                fin = min(inicio + paso, cantidad_grupos)
+                tareas.insertar(self.ejecutor.submit(reducir_compartida, freq_suelo,
+                                                     reducida_suelo.obtener_descriptor(), grupo_por_fila, inicio, fin))
+                tareas.insertar(self.ejecutor.submit(reducir_compartida, freq_cultivo,
+                                                     reducida_cultivo.obtener_descriptor(), grupo_por_fila, inicio, fin))
+                inicio = fin
+            for tarea in tareas:
+                tarea.result()
+
+            matrices_reducidas = Diccionario()
+            matrices_reducidas.insertar('suelo', self._copiar_a_matriz(reducida_suelo))
+            matrices_reducidas.insertar('cultivo', self._copiar_a_matriz(reducida_cultivo))
+
+            resultado = Diccionario()
+            resultado.insertar('matriz_patron_suelo', self._copiar_a_matriz(patron_suelo))
+            resultado.insertar('matriz_patron_cultivo', self._copiar_a_matriz(patron_cultivo))
+            resultado.insertar('grupos_estaciones', grupos)
+            resultado.insertar('matrices_reducidas', matrices_reducidas)
+            return resultado
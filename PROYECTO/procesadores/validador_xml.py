@@ -0,0 +1,382 @@
+# procesadores/validador_xml.py
+# Validación del XML de entrada hecha en la misma pasada que la carga
+
+import os
+import xml.etree.ElementTree as ET
+from xml.parsers import expat
+from clases.lista import Lista
+from clases.tabla_hash import TablaHash
+
+class ErrorValidacion:
+    """Un problema encontrado en el XML, con su posición en el archivo"""
+
+    __slots__ = ('__severidad', '__linea', '__columna', '__mensaje', '__id_campo')
+
+    ERROR = 'error'
+    ADVERTENCIA = 'advertencia'
+
+    def __init__(self, severidad, linea, columna, mensaje, id_campo=None):
+        """
+        Args:
+            severidad (str): ErrorValidacion.ERROR o ErrorValidacion.ADVERTENCIA
+            linea (int): Línea (desde 1), o None si no aplica
+            columna (int): Columna (desde 1), o None si no aplica
+            mensaje (str): Descripción del problema
+            id_campo (str): Campo donde ocurrió, si corresponde
+        """
+        self.__severidad = severidad
+        self.__linea = linea
+        self.__columna = columna
+        self.__mensaje = mensaje
+        self.__id_campo = id_campo
+
+    def get_severidad(self):
+        return self.__severidad
+
+    def get_linea(self):
+        return self.__linea
+
+    def get_columna(self):
+        return self.__columna
+
+    def get_mensaje(self):
+        return self.__mensaje
+
+    def get_id_campo(self):
+        return self.__id_campo
+
+    def __str__(self):
+        if self.__linea is None:
+            return "[{}] {}".format(self.__severidad, self.__mensaje)
+        return "Línea {}, columna {} [{}]: {}".format(self.__linea, self.__columna,
+                                                     self.__severidad, self.__mensaje)
+
+
+class ReporteValidacion:
+    """
+    Errores y advertencias de un archivo XML. Los errores hacen inválido el
+    archivo; las advertencias (elementos desconocidos, que la carga ignora) no.
+    Se guardan como máximo limite_errores entradas, pero se cuentan todas.
+    """
+
+    def __init__(self, ruta_archivo, limite_errores=100):
+        self.__ruta = ruta_archivo
+        self.__limite = limite_errores
+        self.__entradas = Lista()
+        self.__cantidad_errores = 0
+        self.__cantidad_advertencias = 0
+        self.__campos_leidos = 0
+        self.__completo = True
+        self.__campos_con_errores = TablaHash()  # ID de campo -> True, aunque se supere el límite
+
+    def agregar_error(self, linea, columna, mensaje, id_campo=None):
+        """Registrar un error"""
+        self.__cantidad_errores += 1
+        if id_campo is not None:
+            self.__campos_con_errores.insertar(id_campo, True)
+        self.__agregar(ErrorValidacion(ErrorValidacion.ERROR, linea, columna, mensaje, id_campo))
+
+    def agregar_advertencia(self, linea, columna, mensaje, id_campo=None):
+        """Registrar una advertencia"""
+        self.__cantidad_advertencias += 1
+        self.__agregar(ErrorValidacion(ErrorValidacion.ADVERTENCIA, linea, columna, mensaje, id_campo))
+
+    def __agregar(self, entrada):
+        if self.__limite is None or self.__entradas.obtener_tamaño() < self.__limite:
+            self.__entradas.insertar(entrada)
+        else:
+            self.__completo = False
+
+    def registrar_campo_leido(self):
+        self.__campos_leidos += 1
+
+    def es_valido(self):
+        return self.__cantidad_errores == 0
+
+    def campo_tiene_errores(self, id_campo):
+        """True si se registró algún error dentro del campo con ese ID"""
+        return self.__campos_con_errores.contiene_clave(id_campo)
+
+    def get_ruta(self):
+        return self.__ruta
+
+    def obtener_entradas(self):
+        """Lista de ErrorValidacion en el orden en que se detectaron"""
+        return self.__entradas
+
+    def obtener_errores(self):
+        return self.__entradas.filtrar(lambda e: e.get_severidad() == ErrorValidacion.ERROR)
+
+    def obtener_advertencias(self):
+        return self.__entradas.filtrar(lambda e: e.get_severidad() == ErrorValidacion.ADVERTENCIA)
+
+    def obtener_cantidad_errores(self):
+        return self.__cantidad_errores
+
+    def obtener_cantidad_advertencias(self):
+        return self.__cantidad_advertencias
+
+    def obtener_campos_leidos(self):
+        return self.__campos_leidos
+
+    def esta_completo(self):
+        """False si se omitieron entradas por superar limite_errores"""
+        return self.__completo
+
+    def obtener_mensaje(self):
+        """Mensaje breve, como el que retorna XMLHandler.validar_xml()"""
+        if self.es_valido():
+            return "XML válido"
+        primero = self.obtener_errores().obtener_en_posicion(0)
+        return "{} ({} errores)".format(str(primero), self.__cantidad_errores)
+
+    def __str__(self):
+        resultado = "Validación de {}: {} errores, {} advertencias, {} campos".format(
+            self.__ruta, self.__cantidad_errores, self.__cantidad_advertencias, self.__campos_leidos)
+        for entrada in self.__entradas:
+            resultado += "\n   " + str(entrada)
+        if not self.__completo:
+            resultado += "\n   ... (se omitieron entradas; límite {})".format(self.__limite)
+        return resultado
+
+
+class ValidadorCargaXML:
+    """
+    Valida y carga un archivo de campos agrícolas recorriéndolo una sola vez
+    con expat. Cada <campo> hijo de la raíz se arma con un TreeBuilder y se
+    convierte con XMLHandler.procesar_campo(), así que los campos cargados
+    son los mismos que da XMLHandler.cargar_archivo(); mientras tanto se
+    revisan, con su línea y columna:
+
+    - estructura: raíz camposAgricolas, al menos un campo, y estacionesBase,
+      sensoresSuelo y sensoresCultivo en cada campo
+    - atributos obligatorios (id y nombre; idEstacion en las frecuencias)
+    - IDs repetidos de campos, y de estaciones y sensores dentro de un campo
+    - frecuencias que apuntan a estaciones que no existen en su campo
+    - valores de frecuencia que no son enteros
+    """
+
+    TAMAÑO_BLOQUE = 64 * 1024
+
+    # Hijo esperado de cada elemento (los hijos de campo se revisan aparte)
+    HIJOS = TablaHash()
+    HIJOS.insertar('camposAgricolas', 'campo')
+    HIJOS.insertar('estacionesBase', 'estacion')
+    HIJOS.insertar('sensoresSuelo', 'sensorS')
+    HIJOS.insertar('sensoresCultivo', 'sensorT')
+    HIJOS.insertar('sensorS', 'frecuencia')
+    HIJOS.insertar('sensorT', 'frecuencia')
+
+    SECCIONES_CAMPO = ('estacionesBase', 'sensoresSuelo', 'sensoresCultivo')
+
+    def __init__(self, xml_handler, limite_errores=100):
+        """
+        Args:
+            xml_handler (XMLHandler): Manejador que convierte cada campo
+            limite_errores (int): Máximo de entradas guardadas en el reporte (None: sin límite)
+        """
+        self.xml_handler = xml_handler
+        self.limite_errores = limite_errores
+
+    def validar_y_cargar(self, ruta_archivo):
+        """
+        Returns:
+            tuple: (Lista de CampoAgricola, ReporteValidacion). Si hay un error
+                   de sintaxis la lectura se detiene y la Lista tiene los
+                   campos leídos hasta ese punto.
+        """
+        reporte = ReporteValidacion(ruta_archivo, self.limite_errores)
+        campos = Lista()
+        if not os.path.exists(ruta_archivo):
+            reporte.agregar_error(None, None, "Archivo no encontrado")
+            return campos, reporte
+
+        parser = expat.ParserCreate()
+        pila = Lista()  # Nombres de los elementos abiertos; el primero es el más interno
+        ids_campos = TablaHash()  # ID -> línea de su primera aparición
+        campo = None  # _EstadoCampo del campo que se está leyendo
+        texto = None  # Texto de la frecuencia abierta
+
+        def posicion():
+            return parser.CurrentLineNumber, parser.CurrentColumnNumber + 1
+
+        def datos(contenido):
+            nonlocal texto
+            campo.constructor.data(contenido)
+            if texto is not None:
+                texto += contenido
+
+        def inicio_elemento(nombre, atributos):
+            nonlocal campo, texto
+            padre = pila.obtener_en_posicion(0) if not pila.esta_vacia() else None
+            pila.insertar_al_inicio(nombre)
+            profundidad = pila.obtener_tamaño()
+
+            if profundidad == 1:
+                if nombre != 'camposAgricolas':
+                    linea, columna = posicion()
+                    reporte.agregar_error(linea, columna, "Elemento raíz debe ser 'camposAgricolas', no '{}'".format(nombre))
+                return
+
+            if profundidad == 2 and nombre == 'campo':
+                campo = self.__iniciar_campo(atributos, posicion(), ids_campos, reporte)
+                parser.CharacterDataHandler = datos
+                campo.constructor.start(nombre, atributos)
+                return
+
+            if campo is None:
+                # Fuera de un campo: se avisa solo por el hijo directo de la raíz
+                if profundidad == 2:
+                    linea, columna = posicion()
+                    reporte.agregar_advertencia(linea, columna, "Elemento '{}' inesperado dentro de '{}' (se ignora)".format(nombre, padre))
+                return
+
+            campo.constructor.start(nombre, atributos)
+            if profundidad == 3:
+                if nombre in self.SECCIONES_CAMPO:
+                    if campo.secciones.contiene_clave(nombre):
+                        # La carga solo lee la primera sección de cada tipo
+                        campo.seccion_ignorada = True
+                        linea, columna = posicion()
+                        reporte.agregar_advertencia(linea, columna, "Sección {} repetida en el campo {}: solo se usa la primera".format(
+                            nombre, campo.id_campo), campo.id_campo)
+                    campo.secciones.insertar(nombre, True)
+                    return
+            elif campo.seccion_ignorada:
+                return
+            elif self.HIJOS.obtener(padre) == nombre:
+                if nombre == 'frecuencia':
+                    self.__revisar_frecuencia(atributos, posicion(), campo, reporte)
+                    texto = ''
+                else:
+                    self.__revisar_elemento(nombre, atributos, posicion(), campo, reporte)
+                return
+            linea, columna = posicion()
+            reporte.agregar_advertencia(linea, columna, "Elemento '{}' inesperado dentro de '{}' (se ignora)".format(nombre, padre),
+                                        campo.id_campo)
+
+        def fin_elemento(nombre):
+            nonlocal campo, texto
+            pila.eliminar_en_posicion(0)
+            if campo is None:
+                return
+            campo.constructor.end(nombre)
+            if texto is not None and nombre == 'frecuencia':
+                if not texto.strip():
+                    reporte.agregar_error(campo.linea_frecuencia, campo.columna_frecuencia,
+                                          "Frecuencia sin valor", campo.id_campo)
+                else:
+                    try:
+                        int(texto.strip())
+                    except ValueError:
+                        reporte.agregar_error(campo.linea_frecuencia, campo.columna_frecuencia,
+                                              "Valor de frecuencia no es entero: '{}'".format(texto.strip()), campo.id_campo)
+                texto = None
+            elif pila.obtener_tamaño() == 2:
+                campo.seccion_ignorada = False
+            elif pila.obtener_tamaño() == 1:
+                self.__cerrar_campo(campo, reporte)
+                resultado = self.xml_handler.procesar_campo(campo.constructor.close())
+                if resultado:
+                    campos.insertar(resultado)
+                campo = None
+                parser.CharacterDataHandler = None
+
+        parser.StartElementHandler = inicio_elemento
+        parser.EndElementHandler = fin_elemento
+
+        try:
+            with open(ruta_archivo, 'rb') as archivo:
+                while True:
+                    bloque = archivo.read(self.TAMAÑO_BLOQUE)
+                    parser.Parse(bloque, not bloque)
+                    if not bloque:
+                        break
+        except expat.ExpatError as e:
+            reporte.agregar_error(e.lineno, e.offset + 1, "Error de sintaxis XML: {}".format(
+                expat.ErrorString(e.code)), campo.id_campo if campo is not None else None)
+            return campos, reporte
+
+        if reporte.obtener_campos_leidos() == 0:
+            reporte.agregar_error(None, None, "Debe contener al menos un campo agrícola")
+        return campos, reporte
+
+    def __iniciar_campo(self, atributos, posicion, ids_campos, reporte):
+        """Revisar los atributos de un <campo> y preparar su estado"""
+        linea, columna = posicion
+        id_campo = atributos.get('id')
+        estado = _EstadoCampo(id_campo, linea, columna)
+        reporte.registrar_campo_leido()
+        if not id_campo or not atributos.get('nombre'):
+            reporte.agregar_error(linea, columna, "Cada campo debe tener id y nombre", id_campo)
+        if id_campo:
+            primera = ids_campos.obtener(id_campo)
+            if primera is not None:
+                reporte.agregar_error(linea, columna, "ID de campo repetido: {} (ya usado en la línea {})".format(
+                    id_campo, primera), id_campo)
+            else:
+                ids_campos.insertar(id_campo, linea)
+        return estado
+
+    def __revisar_elemento(self, nombre, atributos, posicion, campo, reporte):
+        """Revisar estaciones y sensores: id y nombre obligatorios, sin IDs repetidos"""
+        linea, columna = posicion
+        id_elemento = atributos.get('id')
+        if not id_elemento or not atributos.get('nombre'):
+            reporte.agregar_error(linea, columna, "'{}' debe tener id y nombre".format(nombre), campo.id_campo)
+        if not id_elemento:
+            return
+        ids = campo.estaciones if nombre == 'estacion' else (
+            campo.sensores_suelo if nombre == 'sensorS' else campo.sensores_cultivo)
+        primera = ids.obtener(id_elemento)
+        if primera is not None:
+            reporte.agregar_error(linea, columna, "ID de {} repetido en el campo: {} (ya usado en la línea {})".format(
+                nombre, id_elemento, primera), campo.id_campo)
+        else:
+            ids.insertar(id_elemento, linea)
+
+    def __revisar_frecuencia(self, atributos, posicion, campo, reporte):
+        """Revisar idEstacion de una frecuencia y anotar la referencia"""
+        linea, columna = posicion
+        campo.linea_frecuencia = linea
+        campo.columna_frecuencia = columna
+        id_estacion = atributos.get('idEstacion')
+        if not id_estacion:
+            reporte.agregar_error(linea, columna, "Frecuencia sin idEstacion", campo.id_campo)
+            return
+        if not campo.estaciones.contiene_clave(id_estacion):
+            # La estación puede declararse después: se resuelve al cerrar el campo
+            campo.referencias.insertar((id_estacion, linea, columna))
+
+    def __cerrar_campo(self, campo, reporte):
+        """Revisar secciones obligatorias y referencias a estaciones de un campo"""
+        for seccion in self.SECCIONES_CAMPO:
+            if not campo.secciones.contiene_clave(seccion):
+                reporte.agregar_error(campo.linea, campo.columna, "Campo {} no tiene {}".format(
+                    campo.id_campo, seccion), campo.id_campo)
+        for id_estacion, linea, columna in campo.referencias:
+            if not campo.estaciones.contiene_clave(id_estacion):
+                reporte.agregar_error(linea, columna, "Frecuencia apunta a la estación {}, que no existe en el campo {}".format(
+                    id_estacion, campo.id_campo), campo.id_campo)
+
+
+class _EstadoCampo:
+    """Datos del <campo> que se está validando"""
+
+    __slots__ = ('id_campo', 'linea', 'columna', 'constructor', 'secciones', 'estaciones',
+                 'sensores_suelo', 'sensores_cultivo', 'referencias',
+                 'seccion_ignorada', 'linea_frecuencia', 'columna_frecuencia')
+
+    def __init__(self, id_campo, linea, columna):
+        self.id_campo = id_campo
+        self.linea = linea
+        self.columna = columna
+        self.constructor = ET.TreeBuilder()
+        self.secciones = TablaHash()
+        self.estaciones = TablaHash()  # ID -> línea
+        self.sensores_suelo = TablaHash()
+        self.sensores_cultivo = TablaHash()
+        self.referencias = Lista()  # (idEstacion, línea, columna) aún sin estación
+        self.seccion_ignorada = False  # Dentro de una sección repetida
+        self.linea_frecuencia = None
+        self.columna_frecuencia = None
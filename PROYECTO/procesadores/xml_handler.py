@@ -1,13 +1,41 @@
 import xml.etree.ElementTree as ET
 import os
+from concurrent.futures import ProcessPoolExecutor
 from clases.lista import Lista
+from clases.tabla_hash import TablaHash
 from clases.campo_agricola import CampoAgricola
 from clases.estacion_base import EstacionBase
-from clases.sensor_suelo import SensorSuelo
-from clases.sensor_cultivo import SensorCultivo
-from clases.frecuencia import Frecuencia
+from xml.parsers import expat
+from xml.parsers.expat import ExpatError
+from .indice_xml import IndiceCamposXML
+from .validador_xml import ValidadorCargaXML
+
+def procesar_fragmentos(ruta_archivo, declaracion, rangos):
+    """
+    Parsear varios <campo> de un archivo a partir de sus posiciones. Es de
+    nivel de módulo para poder ejecutarse en procesos trabajadores, que
+    reciben solo la ruta y las posiciones, no el contenido.
+
+    Args:
+        ruta_archivo (str): Archivo XML
+        declaracion (bytes): IndiceCamposXML.declaracion_fragmento() del archivo
+        rangos (tuple): Pares (inicio, fin) en bytes
+
+    Returns:
+        tuple: CampoAgricola (o None si el campo no era válido) por rango, en orden
+    """
+    manejador = XMLHandler()
+    campos = []
+    with open(ruta_archivo, 'rb') as archivo:
+        for inicio, fin in rangos:
+            archivo.seek(inicio)
+            elemento = ET.fromstring(declaracion + archivo.read(fin - inicio))
+            campos.append(manejador.procesar_campo(elemento))
+    return tuple(campos)
 
 class XMLHandler:
+    TAMAÑO_BLOQUE = 64 * 1024  # Bytes leídos por vez al buscar campos por ID
+
     def __init__(self):
         """Inicializar manejador de XML"""
         self.lista_campos = Lista()
@@ -28,16 +56,7 @@ class XMLHandler:
             tree = ET.parse(ruta_archivo)
             root = tree.getroot()
             
-            self.lista_campos = Lista()
-            
-            elementos_campos = self._convertir_a_lista(root.findall('campo'))
-            iterador_campos = elementos_campos.crear_iterador()
-            while iterador_campos.hay_siguiente():
-                elemento_campo = iterador_campos.siguiente()
-                campo = self.procesar_campo(elemento_campo)
-                if campo:
-                    self.lista_campos.insertar(campo)
-            
+            self.lista_campos = self.procesar_raiz(root)
             return self.lista_campos
             
         except ET.ParseError as e:
@@ -45,6 +64,274 @@ class XMLHandler:
         except Exception as e:
             raise Exception("Error al cargar archivo XML: {}".format(str(e)))
 
+    def validar_y_cargar(self, ruta_archivo, limite_errores=100):
+        """
+        Validar y cargar el archivo en una sola lectura (ver ValidadorCargaXML).
+        Los campos cargados son los mismos que da cargar_archivo(); el reporte
+        indica línea y columna de cada problema encontrado.
+
+        Returns:
+            tuple: (Lista de CampoAgricola, ReporteValidacion)
+        """
+        validador = ValidadorCargaXML(self, limite_errores)
+        self.lista_campos, reporte = validador.validar_y_cargar(ruta_archivo)
+        return self.lista_campos, reporte
+
+    def obtener_indice(self, ruta_archivo, guardar=True):
+        """
+        Índice de posiciones de los campos del archivo: el guardado junto al
+        archivo si sigue vigente, o uno nuevo (ver IndiceCamposXML)
+        """
+        if not os.path.exists(ruta_archivo):
+            raise FileNotFoundError("El archivo XML no existe: {}".format(ruta_archivo))
+        try:
+            return IndiceCamposXML.obtener(ruta_archivo, guardar)
+        except ExpatError as e:
+            raise Exception("Error al parsear XML: {}".format(str(e)))
+
+    def cargar_archivo_paralelo(self, ruta_archivo, procesos=None, guardar_indice=True):
+        """
+        Cargar el archivo parseando sus campos en procesos trabajadores.
+        Primero se obtiene el índice de posiciones de cada <campo>; después
+        cada trabajador lee y parsea solo los bytes de sus campos. Los campos
+        se devuelven en el orden del documento, igual que cargar_archivo().
+
+        Args:
+            ruta_archivo (str): Archivo XML
+            procesos (int): Procesos trabajadores (None: uno por CPU)
+            guardar_indice (bool): Guardar el índice junto al archivo para próximas cargas
+        """
+        try:
+            indice = self.obtener_indice(ruta_archivo, guardar_indice)
+            cantidad = indice.obtener_cantidad_campos()
+            procesos = procesos or os.cpu_count() or 1
+
+            # Tandas contiguas de campos: pocas tareas por trabajador para
+            # no pagar el envío de procesos por cada campo
+            tandas = Lista()
+            tamaño_tanda = max(1, -(-cantidad // (procesos * 4)))
+            posicion = 0
+            while posicion < cantidad:
+                rangos = Lista()
+                fin_tanda = min(posicion + tamaño_tanda, cantidad)
+                while posicion < fin_tanda:
+                    entrada = indice.obtener_entrada(posicion)
+                    rangos.insertar((entrada[1], entrada[2]))
+                    posicion += 1
+                tandas.insertar(tuple(rangos))
+
+            declaracion = indice.declaracion_fragmento()
+            if procesos == 1 or tandas.obtener_tamaño() <= 1:
+                resultados = (procesar_fragmentos(ruta_archivo, declaracion, rangos) for rangos in tandas)
+                self.lista_campos = self.__reunir_campos(resultados)
+            else:
+                cantidad_tandas = tandas.obtener_tamaño()
+                with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                    # map entrega los resultados en el orden de las tandas
+                    resultados = ejecutor.map(procesar_fragmentos, [ruta_archivo] * cantidad_tandas,
+                                              [declaracion] * cantidad_tandas, tandas)
+                    self.lista_campos = self.__reunir_campos(resultados)
+            return self.lista_campos
+
+        except ET.ParseError as e:
+            raise Exception("Error al parsear XML: {}".format(str(e)))
+        except Exception as e:
+            raise Exception("Error al cargar archivo XML: {}".format(str(e)))
+
+    def cargar_campo_indexado(self, ruta_archivo, id_campo, guardar_indice=True):
+        """
+        Cargar un solo campo usando el índice de posiciones: solo se leen y
+        parsean los bytes de ese campo
+
+        Returns:
+            CampoAgricola: El campo, o None si no hay campo con ese ID
+        """
+        try:
+            indice = self.obtener_indice(ruta_archivo, guardar_indice)
+            entrada = indice.buscar(id_campo)
+            if entrada is None:
+                return None
+            return procesar_fragmentos(ruta_archivo, indice.declaracion_fragmento(),
+                                       ((entrada[1], entrada[2]),))[0]
+        except ET.ParseError as e:
+            raise Exception("Error al parsear XML: {}".format(str(e)))
+
+    def cargar_campo(self, ruta_archivo, id_campo, usar_indice=False):
+        """
+        Cargar solo el campo con un ID (si el ID se repite, su primera aparición)
+
+        Args:
+            ruta_archivo (str): Archivo XML
+            id_campo (str): ID del campo
+            usar_indice (bool): Leer el campo directamente desde su posición
+                                con el índice guardado (ver cargar_campo_indexado)
+
+        Returns:
+            CampoAgricola: El campo, o None si no hay campo válido con ese ID
+        """
+        if usar_indice:
+            return self.cargar_campo_indexado(ruta_archivo, id_campo)
+        campos = self.cargar_campos(ruta_archivo, (id_campo,))
+        return campos.obtener_en_posicion(0) if not campos.esta_vacia() else None
+
+    def cargar_campos(self, ruta_archivo, ids_campos, usar_indice=False):
+        """
+        Cargar solo los campos con los IDs indicados, en orden de documento.
+
+        Sin índice, el archivo se recorre con expat por bloques: de los campos
+        que no interesan solo se cuenta la profundidad (no se construyen
+        elementos ni objetos) y la lectura se detiene en cuanto se leyeron
+        todos los campos pedidos. Con índice se leen únicamente los bytes de
+        esos campos.
+
+        Args:
+            ruta_archivo (str): Archivo XML
+            ids_campos: Iterable con los IDs buscados
+            usar_indice (bool): Usar (y guardar) el índice de posiciones del archivo
+
+        Returns:
+            Lista: Los CampoAgricola encontrados; los IDs sin campo válido se omiten
+        """
+        if not os.path.exists(ruta_archivo):
+            raise FileNotFoundError("El archivo XML no existe: {}".format(ruta_archivo))
+
+        pendientes = TablaHash()
+        for id_campo in ids_campos:
+            pendientes.insertar(id_campo, True)
+        if pendientes.esta_vacio():
+            return Lista()
+
+        try:
+            if usar_indice:
+                return self.__cargar_campos_indexados(ruta_archivo, pendientes)
+            return self.__buscar_campos(ruta_archivo, pendientes)
+        except ExpatError as e:
+            raise Exception("Error al parsear XML: {}".format(str(e)))
+        except ET.ParseError as e:
+            raise Exception("Error al parsear XML: {}".format(str(e)))
+
+    def __cargar_campos_indexados(self, ruta_archivo, pendientes):
+        """Cargar con el índice de posiciones los campos cuyos IDs están en pendientes"""
+        indice = self.obtener_indice(ruta_archivo)
+        rangos = Lista()
+        for entrada in indice.obtener_entradas():
+            # Recorrer las entradas (no buscar por ID) mantiene el orden del documento
+            if pendientes.eliminar(entrada[0]):
+                rangos.insertar((entrada[1], entrada[2]))
+        campos = procesar_fragmentos(ruta_archivo, indice.declaracion_fragmento(), tuple(rangos))
+        return self.__reunir_campos((campos,))
+
+    def __buscar_campos(self, ruta_archivo, pendientes):
+        """
+        Recorrer el archivo con expat construyendo solo los <campo> de
+        profundidad 1 cuyos IDs están en pendientes
+        """
+        parser = expat.ParserCreate()
+        campos = Lista()
+        profundidad = 0
+        constructor = None  # TreeBuilder del campo que se está leyendo, si interesa
+
+        def inicio_elemento(nombre, atributos):
+            nonlocal profundidad, constructor
+            profundidad += 1
+            if constructor is not None:
+                constructor.start(nombre, atributos)
+            elif profundidad == 2 and nombre == 'campo' and pendientes.eliminar(atributos.get('id')):
+                constructor = ET.TreeBuilder()
+                constructor.start(nombre, atributos)
+                parser.CharacterDataHandler = constructor.data
+
+        def fin_elemento(nombre):
+            nonlocal profundidad, constructor
+            if constructor is not None:
+                constructor.end(nombre)
+                if profundidad == 2:
+                    campo = self.procesar_campo(constructor.close())
+                    if campo:
+                        campos.insertar(campo)
+                    constructor = None
+                    parser.CharacterDataHandler = None
+            profundidad -= 1
+
+        parser.StartElementHandler = inicio_elemento
+        parser.EndElementHandler = fin_elemento
+
+        with open(ruta_archivo, 'rb') as archivo:
+            while not pendientes.esta_vacio() or constructor is not None:
+                bloque = archivo.read(self.TAMAÑO_BLOQUE)
+                if not bloque:
+                    parser.Parse(b'', True)
+                    break
+                parser.Parse(bloque, False)
+        return campos
+
+    def __reunir_campos(self, resultados):
+        """Juntar en una Lista los campos válidos de cada tanda, en orden"""
+        lista_campos = Lista()
+        for campos in resultados:
+            for campo in campos:
+                if campo:
+                    lista_campos.insertar(campo)
+        return lista_campos
+
+    def cargar_contenido(self, contenido_xml):
+        """
+        Parsear XML recibido en memoria (str o bytes).
+        No modifica lista_campos, así que puede llamarse desde varios hilos.
+        """
+        try:
+            root = ET.fromstring(contenido_xml)
+            if root.tag != "camposAgricolas":
+                raise ValueError("Elemento raíz debe ser 'camposAgricolas'")
+            return self.procesar_raiz(root)
+            
+        except ET.ParseError as e:
+            raise Exception("Error al parsear XML: {}".format(str(e)))
+
+    def iterar_campos(self, ruta_archivo):
+        """
+        Generador que entrega cada CampoAgricola apenas se termina de leer su
+        elemento, sin construir el árbol completo del documento. Los elementos
+        ya procesados se descartan, así que la memoria no crece con el archivo.
+        """
+        if not os.path.exists(ruta_archivo):
+            raise FileNotFoundError("El archivo XML no existe: {}".format(ruta_archivo))
+        
+        raiz = None
+        profundidad = 0
+        try:
+            for evento, elemento in ET.iterparse(ruta_archivo, events=('start', 'end')):
+                if evento == 'start':
+                    if raiz is None:
+                        raiz = elemento
+                    profundidad += 1
+                    continue
+                
+                profundidad -= 1
+                # Solo los <campo> hijos directos de la raíz, igual que procesar_raiz()
+                if profundidad == 1 and elemento.tag == 'campo':
+                    campo = self.procesar_campo(elemento)
+                    raiz.clear()
+                    if campo:
+                        yield campo
+                        
+        except ET.ParseError as e:
+            raise Exception("Error al parsear XML: {}".format(str(e)))
+
+    def procesar_raiz(self, root):
+        """Procesar todos los elementos campo de la raíz y retornarlos en una Lista"""
+        lista_campos = Lista()
+        
+        elementos_campos = self._convertir_a_lista(root.findall('campo'))
+        iterador_campos = elementos_campos.crear_iterador()
+        while iterador_campos.hay_siguiente():
+            elemento_campo = iterador_campos.siguiente()
+            campo = self.procesar_campo(elemento_campo)
+            if campo:
+                lista_campos.insertar(campo)
+        
+        return lista_campos
+
     def procesar_campo(self, elemento_campo):
         """Procesar elemento campo del XML"""
         try:
@@ -97,7 +384,9 @@ class XMLHandler:
             nombre_sensor = elemento_sensor.get('nombre')
             
             if id_sensor and nombre_sensor:
-                sensor = SensorSuelo(id_sensor, nombre_sensor)
+                indice_sensor = campo.registrar_sensor_suelo(id_sensor, nombre_sensor)
+                if indice_sensor == -1:
+                    continue
                 
                 elementos_frecuencia = self._convertir_a_lista(elemento_sensor.findall('frecuencia'))
                 iterador_frecuencias = elementos_frecuencia.crear_iterador()
@@ -109,12 +398,9 @@ class XMLHandler:
                     if id_estacion and valor_frecuencia:
                         try:
                             valor = int(valor_frecuencia.strip())
-                            frecuencia = Frecuencia(id_estacion, valor)
-                            sensor.agregar_frecuencia(frecuencia)
+                            campo.registrar_frecuencia_suelo(indice_sensor, id_estacion, valor)
                         except ValueError:
                             print("Error: Valor de frecuencia inválido: {}".format(valor_frecuencia))
-                
-                campo.agregar_sensor_suelo(sensor)
 
     def procesar_sensores_cultivo(self, elemento_sensores, campo):
         """Procesar sensores de cultivo del XML"""
@@ -126,7 +412,9 @@ class XMLHandler:
             nombre_sensor = elemento_sensor.get('nombre')
             
             if id_sensor and nombre_sensor:
-                sensor = SensorCultivo(id_sensor, nombre_sensor)
+                indice_sensor = campo.registrar_sensor_cultivo(id_sensor, nombre_sensor)
+                if indice_sensor == -1:
+                    continue
                 
                 elementos_frecuencia = self._convertir_a_lista(elemento_sensor.findall('frecuencia'))
                 iterador_frecuencias = elementos_frecuencia.crear_iterador()
@@ -138,26 +426,14 @@ class XMLHandler:
                     if id_estacion and valor_frecuencia:
                         try:
                             valor = int(valor_frecuencia.strip())
-                            frecuencia = Frecuencia(id_estacion, valor)
-                            sensor.agregar_frecuencia(frecuencia)
+                            campo.registrar_frecuencia_cultivo(indice_sensor, id_estacion, valor)
                         except ValueError:
                             print("Error: Valor de frecuencia inválido: {}".format(valor_frecuencia))
-                
-                campo.agregar_sensor_cultivo(sensor)
 
     def escribir_archivo_salida(self, ruta_archivo, lista_campos_optimizados):
         """Escribir archivo XML de salida con resultados"""
         try:
-            root = ET.Element("camposAgricolas")
-            
-            iterador_campos = lista_campos_optimizados.crear_iterador()
-            while iterador_campos.hay_siguiente():
-                campo = iterador_campos.siguiente()
-                elemento_campo = self.crear_elemento_campo_optimizado(campo)
-                root.append(elemento_campo)
-            
-            tree = ET.ElementTree(root)
-            ET.indent(tree, space="    ")
+            tree = self.crear_arbol_salida(lista_campos_optimizados)
             
             directorio = os.path.dirname(ruta_archivo)
             if directorio and not os.path.exists(directorio):
@@ -170,6 +446,98 @@ class XMLHandler:
             print("Error escribiendo archivo XML: {}".format(str(e)))
             return False
 
+    def generar_contenido_salida(self, lista_campos_optimizados):
+        """Generar el XML de salida en memoria (bytes UTF-8) sin escribir archivo"""
+        tree = self.crear_arbol_salida(lista_campos_optimizados)
+        return ET.tostring(tree.getroot(), encoding='utf-8', xml_declaration=True)
+
+    def crear_arbol_salida(self, lista_campos_optimizados):
+        """Crear el ElementTree indentado con todos los campos optimizados"""
+        root = ET.Element("camposAgricolas")
+        
+        iterador_campos = lista_campos_optimizados.crear_iterador()
+        while iterador_campos.hay_siguiente():
+            campo = iterador_campos.siguiente()
+            elemento_campo = self.crear_elemento_campo_optimizado(campo)
+            root.append(elemento_campo)
+        
+        tree = ET.ElementTree(root)
+        ET.indent(tree, space="    ")
+        return tree
+
+    def crear_escritor_salida(self, ruta_archivo):
+        """Crear un EscritorSalidaXML para escribir campos optimizados uno por uno"""
+        return EscritorSalidaXML(self, ruta_archivo)
+
+    def aplicar_cambios_salida(self, ruta_archivo, conjuntos_cambios, ruta_destino=None):
+        """
+        Actualizar un XML de salida con conjuntos de cambios (ver
+        ComparadorResultados.crear_cambios). Solo se parsean y se vuelven a
+        escribir los <campo> que tienen cambios; el resto del archivo se
+        copia byte por byte usando las posiciones de IndiceCamposXML.
+
+        Args:
+            ruta_archivo (str): XML de salida anterior
+            conjuntos_cambios (Lista): ConjuntoCambios, a lo sumo uno por campo
+            ruta_destino (str): Dónde escribir el resultado (None: reemplazar ruta_archivo)
+
+        Returns:
+            int: Campos modificados, o None si hubo un error
+        """
+        temporal = None
+        try:
+            indice = IndiceCamposXML.obtener(ruta_archivo, guardar=False)
+            cambios_por_inicio = TablaHash()
+            for conjunto in conjuntos_cambios:
+                if conjunto.esta_vacio():
+                    continue
+                entrada = indice.buscar(conjunto.get_id_campo())
+                if entrada is None:
+                    raise ValueError("El XML no tiene el campo {}".format(conjunto.get_id_campo()))
+                cambios_por_inicio.insertar(entrada[1], conjunto)
+
+            destino = ruta_destino or ruta_archivo
+            if cambios_por_inicio.esta_vacio() and destino == ruta_archivo:
+                return 0
+
+            declaracion = indice.declaracion_fragmento()
+            codificacion = indice.get_codificacion() or 'utf-8'
+            temporal = destino + '.tmp'
+            modificados = 0
+            with open(ruta_archivo, 'rb') as origen, open(temporal, 'wb') as salida:
+                posicion = 0
+                for _, inicio, fin in indice.obtener_entradas():
+                    conjunto = cambios_por_inicio.obtener(inicio)
+                    if conjunto is None:
+                        continue
+                    self.__copiar_bytes(origen, salida, inicio - posicion)
+                    elemento = ET.fromstring(declaracion + origen.read(fin - inicio))
+                    conjunto.aplicar(elemento)
+                    # Misma indentación que EscritorSalidaXML.escribir_campo
+                    ET.indent(elemento, space="    ", level=1)
+                    salida.write(ET.tostring(elemento, encoding='unicode').encode(codificacion, 'xmlcharrefreplace'))
+                    posicion = fin
+                    modificados += 1
+                self.__copiar_bytes(origen, salida, None)
+            os.replace(temporal, destino)
+            return modificados
+
+        except Exception as e:
+            if temporal is not None and os.path.exists(temporal):
+                os.remove(temporal)
+            print("Error aplicando cambios al XML de salida: {}".format(str(e)))
+            return None
+
+    def __copiar_bytes(self, origen, salida, cantidad):
+        """Copiar cantidad bytes (None: hasta el final) de un archivo a otro en bloques"""
+        while cantidad is None or cantidad > 0:
+            bloque = origen.read(self.TAMAÑO_BLOQUE if cantidad is None else min(cantidad, self.TAMAÑO_BLOQUE))
+            if not bloque:
+                break
+            salida.write(bloque)
+            if cantidad is not None:
+                cantidad -= len(bloque)
+
     def crear_elemento_campo_optimizado(self, campo_optimizado):
         """Crear elemento XML para campo optimizado"""
         elemento_campo = ET.Element("campo")
@@ -264,4 +632,49 @@ class XMLHandler:
 
     def obtener_lista_campos(self):
         """Retornar lista de campos cargados"""
-        return self.lista_campos
\ No newline at end of file
+        return self.lista_campos
+
+
+class EscritorSalidaXML:
+    """
+    Escribe el XML de salida campo por campo, a medida que se optimizan.
+    El archivo resultante es idéntico al de XMLHandler.escribir_archivo_salida().
+    """
+
+    def __init__(self, xml_handler, ruta_archivo):
+        self.xml_handler = xml_handler
+        self.ruta_archivo = ruta_archivo
+        self.archivo = None
+        self.campos_escritos = 0
+
+    def abrir(self):
+        """Crear el archivo (y su directorio) y escribir la declaración XML"""
+        directorio = os.path.dirname(self.ruta_archivo)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+        
+        self.archivo = open(self.ruta_archivo, 'w', encoding='utf-8')
+        self.archivo.write("<?xml version='1.0' encoding='utf-8'?>\n<camposAgricolas")
+        self.campos_escritos = 0
+
+    def escribir_campo(self, campo_optimizado):
+        """Escribir un campo optimizado con la misma indentación que el árbol completo"""
+        elemento = self.xml_handler.crear_elemento_campo_optimizado(campo_optimizado)
+        ET.indent(elemento, space="    ", level=1)
+        
+        if self.campos_escritos == 0:
+            self.archivo.write(">")
+        self.archivo.write("\n    ")
+        self.archivo.write(ET.tostring(elemento, encoding='unicode'))
+        self.campos_escritos += 1
+
+    def cerrar(self):
+        """Cerrar la raíz y el archivo"""
+        if self.archivo is None:
+            return
+        if self.campos_escritos == 0:
+            self.archivo.write(" />")
+        else:
+            self.archivo.write("\n</camposAgricolas>")
+        self.archivo.close()
+        self.archivo = None
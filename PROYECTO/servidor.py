@@ -0,0 +1,208 @@
+"""
+Servicio HTTP local de optimización de estaciones base
+Proyecto 1 - IPC2
+
+Uso:  python servidor.py [puerto] [trabajadores]
+
+Rutas:
+  POST   /optimizaciones[?campo=ID][&formato=xml]  Cuerpo: XML camposAgricolas
+  GET    /cargas                                    Cargas en memoria
+  GET    /cargas/ID                                 Resumen y tiempos de una carga
+  GET    /cargas/ID/xml                             XML optimizado de la carga
+  GET    /cargas/ID/campos/CAMPO                    Resultado de un campo (con grupos)
+  POST   /cargas/ID/campos/CAMPO/optimizar          Re-optimizar sin volver a parsear
+  DELETE /cargas/ID                                 Liberar la carga
+  GET    /salud                                     Verificación de vida
+"""
+
+import sys
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from clases.lista import Lista
+from clases.diccionario import Diccionario
+from procesadores.servicio_optimizacion import ServicioOptimizacion
+
+class ServidorConPool(HTTPServer):
+    """HTTPServer que atiende cada conexión en un pool fijo de hilos trabajadores"""
+
+    def __init__(self, direccion, manejador, servicio, trabajadores=4):
+        super().__init__(direccion, manejador)
+        self.servicio = servicio
+        self.pool = ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix="optimizador")
+
+    def process_request(self, request, client_address):
+        """Entregar la conexión al pool en lugar de atenderla en el hilo que acepta"""
+        self.pool.submit(self._atender, request, client_address)
+
+    def _atender(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+class ManejadorOptimizacion(BaseHTTPRequestHandler):
+    """Traduce pedidos HTTP a llamadas de ServicioOptimizacion"""
+
+    # HTTP/1.0: la conexión se cierra después de cada respuesta. Con
+    # keep-alive cada cliente inactivo retendría un hilo del pool hasta
+    # desconectarse, y unos pocos clientes dejarían al servicio sin hilos
+    protocol_version = "HTTP/1.0"
+    # Segundos que se espera a un cliente que abre la conexión y no envía nada
+    timeout = 30
+
+    def _a_nativo(self, valor):
+        """Convertir Diccionario/Lista a estructuras que json pueda serializar"""
+        if isinstance(valor, Diccionario):
+            nativo = {}
+            for par in valor.obtener_pares():
+                nativo[str(par.get_clave())] = self._a_nativo(par.get_valor())
+            return nativo
+        if isinstance(valor, Lista):
+            return [self._a_nativo(elemento) for elemento in valor]
+        if isinstance(valor, bytes):
+            return valor.decode('utf-8')
+        return valor
+
+    def _responder(self, estado, cuerpo, tipo="application/json; charset=utf-8", encabezados=None):
+        if not isinstance(cuerpo, bytes):
+            cuerpo = json.dumps(self._a_nativo(cuerpo), ensure_ascii=False).encode('utf-8')
+        self.send_response(estado)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        if encabezados:
+            for par in encabezados.obtener_pares():
+                self.send_header(par.get_clave(), str(par.get_valor()))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _error(self, estado, mensaje):
+        error = Diccionario()
+        error.insertar('error', mensaje)
+        self._responder(estado, error)
+
+    def _partes_ruta(self):
+        """Separar la ruta en segmentos (Lista) y los parámetros de consulta"""
+        url = urlsplit(self.path)
+        partes = Lista()
+        for segmento in url.path.split('/'):
+            if segmento:
+                partes.insertar(unquote(segmento))
+        return partes, parse_qs(url.query)
+
+    def _leer_cuerpo(self):
+        longitud = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(longitud) if longitud > 0 else b""
+
+    def do_GET(self):
+        servicio = self.server.servicio
+        partes, _ = self._partes_ruta()
+        n = partes.obtener_tamaño()
+
+        if n == 1 and partes.obtener_en_posicion(0) == 'salud':
+            estado = Diccionario()
+            estado.insertar('estado', 'ok')
+            return self._responder(200, estado)
+
+        if n == 0 or partes.obtener_en_posicion(0) != 'cargas':
+            return self._error(404, "Ruta no encontrada")
+
+        if n == 1:
+            return self._responder(200, servicio.listar_cargas())
+
+        id_carga = partes.obtener_en_posicion(1)
+        if n == 2:
+            carga = servicio.obtener_carga(id_carga)
+            if carga is None:
+                return self._error(404, "Carga {} no encontrada".format(id_carga))
+            carga.eliminar('xml')
+            return self._responder(200, carga)
+
+        if n == 3 and partes.obtener_en_posicion(2) == 'xml':
+            xml_salida = servicio.obtener_xml(id_carga)
+            if xml_salida is None:
+                return self._error(404, "Carga {} no encontrada".format(id_carga))
+            return self._responder(200, xml_salida, "application/xml; charset=utf-8")
+
+        if n == 4 and partes.obtener_en_posicion(2) == 'campos':
+            campo = servicio.obtener_campo(id_carga, partes.obtener_en_posicion(3))
+            if campo is None:
+                return self._error(404, "Campo no encontrado")
+            return self._responder(200, campo)
+
+        return self._error(404, "Ruta no encontrada")
+
+    def do_POST(self):
+        servicio = self.server.servicio
+        partes, consulta = self._partes_ruta()
+        n = partes.obtener_tamaño()
+        cuerpo = self._leer_cuerpo()
+
+        try:
+            if n == 1 and partes.obtener_en_posicion(0) == 'optimizaciones':
+                if not cuerpo:
+                    return self._error(400, "Se esperaba un XML camposAgricolas en el cuerpo")
+                id_campo = consulta['campo'][0] if 'campo' in consulta else None
+                resultado = servicio.procesar_carga(cuerpo, id_campo)
+
+                if 'formato' in consulta and consulta['formato'][0] == 'xml':
+                    encabezados = Diccionario()
+                    encabezados.insertar('X-Id-Carga', resultado.obtener('id_carga'))
+                    encabezados.insertar('X-Tiempos', json.dumps(self._a_nativo(resultado.obtener('tiempos'))))
+                    return self._responder(201, resultado.obtener('xml'),
+                                           "application/xml; charset=utf-8", encabezados)
+                return self._responder(201, resultado)
+
+            if (n == 5 and partes.obtener_en_posicion(0) == 'cargas'
+                    and partes.obtener_en_posicion(2) == 'campos'
+                    and partes.obtener_en_posicion(4) == 'optimizar'):
+                campo = servicio.reoptimizar_campo(partes.obtener_en_posicion(1), partes.obtener_en_posicion(3))
+                if campo is None:
+                    return self._error(404, "Campo no encontrado")
+                return self._responder(200, campo)
+
+        except Exception as e:
+            return self._error(400, str(e))
+
+        return self._error(404, "Ruta no encontrada")
+
+    def do_DELETE(self):
+        partes, _ = self._partes_ruta()
+        if partes.obtener_tamaño() == 2 and partes.obtener_en_posicion(0) == 'cargas':
+            if self.server.servicio.eliminar_carga(partes.obtener_en_posicion(1)):
+                self.send_response(204)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            return self._error(404, "Carga no encontrada")
+        return self._error(404, "Ruta no encontrada")
+
+
+def crear_servidor(host="127.0.0.1", puerto=8080, trabajadores=4, max_cargas=32):
+    """Crear el servidor listo para serve_forever()"""
+    servicio = ServicioOptimizacion(max_cargas)
+    return ServidorConPool((host, puerto), ManejadorOptimizacion, servicio, trabajadores)
+
+
+if __name__ == "__main__":
+    puerto = int(sys.argv[1]) if len(sys.argv) > 1 else 8080
+    trabajadores = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    servidor = crear_servidor(puerto=puerto, trabajadores=trabajadores)
+    print("Servicio de optimización escuchando en http://127.0.0.1:{} ({} trabajadores)".format(
+        puerto, trabajadores))
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nDeteniendo servicio...")
+    finally:
+        servidor.server_close()
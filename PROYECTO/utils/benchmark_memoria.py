@@ -0,0 +1,120 @@
+# utils/benchmark_memoria.py
+# Medición de memoria por entidad con tracemalloc
+#
+# Uso (desde PROYECTO/):  python -m utils.benchmark_memoria [estaciones] [sensores] [frecuencias]
+
+import sys
+import gc
+import tracemalloc
+from clases.lista import Lista
+from clases.diccionario import Diccionario
+from clases.estacion_base import EstacionBase
+from clases.sensor_suelo import SensorSuelo
+from clases.sensor_cultivo import SensorCultivo
+from clases.frecuencia import Frecuencia
+from clases.contador import Contador
+from utils.generador_campos import GeneradorCampos
+
+class BenchmarkMemoria:
+    """Mide los bytes que ocupa cada tipo de entidad dentro de las estructuras del proyecto"""
+
+    def _medir(self, construir):
+        """
+        Medir la memoria retenida por el resultado de construir()
+
+        Returns:
+            int: Bytes retenidos al terminar la construcción
+        """
+        gc.collect()
+        tracemalloc.start()
+        inicio, _ = tracemalloc.get_traced_memory()
+        resultado = construir()
+        fin, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del resultado
+        return fin - inicio
+
+    def medir_estaciones(self, cantidad):
+        """Bytes por estación guardada en una Lista (incluye su nodo)"""
+        def construir():
+            estaciones = Lista()
+            contador = Contador(0, cantidad)
+            while contador.hay_siguiente():
+                i = contador.siguiente()
+                estaciones.insertar_al_inicio(EstacionBase("e{:06d}".format(i), "Estacion"))
+            return estaciones
+        return self._medir(construir) / cantidad
+
+    def medir_sensores(self, cantidad):
+        """Bytes por sensor (mitad suelo, mitad cultivo) sin frecuencias, incluye su nodo"""
+        def construir():
+            sensores = Lista()
+            contador = Contador(0, cantidad)
+            while contador.hay_siguiente():
+                i = contador.siguiente()
+                if i % 2 == 0:
+                    sensores.insertar_al_inicio(SensorSuelo("s{:06d}".format(i), "Sensor"))
+                else:
+                    sensores.insertar_al_inicio(SensorCultivo("t{:06d}".format(i), "Sensor"))
+            return sensores
+        return self._medir(construir) / cantidad
+
+    def medir_frecuencias(self, cantidad):
+        """Bytes por frecuencia guardada en la Lista de un sensor (incluye su nodo)"""
+        # Los IDs de estación ya existen en el campo, así que no se cuentan
+        ids = Lista()
+        contador = Contador(0, 1000)
+        while contador.hay_siguiente():
+            ids.insertar_al_inicio("e{:06d}".format(contador.siguiente()))
+
+        def construir():
+            frecuencias = Lista()
+            iterador = ids.crear_iterador()
+            contador = Contador(0, cantidad)
+            while contador.hay_siguiente():
+                i = contador.siguiente()
+                if not iterador.hay_siguiente():
+                    iterador = ids.crear_iterador()
+                frecuencias.insertar_al_inicio(Frecuencia(iterador.siguiente(), 1000 + i))
+            return frecuencias
+        return self._medir(construir) / cantidad
+
+    def medir_campo(self, n_estaciones, n_sensores):
+        """Bytes totales de un campo sintético completo y cantidad de frecuencias"""
+        generador = GeneradorCampos()
+        campo_total = Lista()
+
+        def construir():
+            campo = generador.generar_campo("bench", n_estaciones, n_sensores, n_sensores)
+            campo_total.insertar(campo.obtener_resumen())
+            return campo
+        bytes_campo = self._medir(construir)
+        resumen = campo_total.obtener_en_posicion(0)
+        frecuencias = (resumen.obtener('total_frecuencias_suelo') +
+                       resumen.obtener('total_frecuencias_cultivo'))
+        return bytes_campo, frecuencias
+
+    def ejecutar(self, n_estaciones=20000, n_sensores=2000, n_frecuencias=200000):
+        """Ejecutar todas las mediciones y retornarlas en un Diccionario"""
+        resultados = Diccionario()
+        resultados.insertar('bytes_por_estacion', self.medir_estaciones(n_estaciones))
+        resultados.insertar('bytes_por_sensor', self.medir_sensores(n_sensores))
+        resultados.insertar('bytes_por_frecuencia', self.medir_frecuencias(n_frecuencias))
+        bytes_campo, frecuencias = self.medir_campo(max(n_estaciones // 20, 1), max(n_sensores // 20, 1))
+        resultados.insertar('bytes_campo_sintetico', bytes_campo)
+        resultados.insertar('frecuencias_campo_sintetico', frecuencias)
+        return resultados
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    n_estaciones = int(argumentos[0]) if len(argumentos) > 0 else 20000
+    n_sensores = int(argumentos[1]) if len(argumentos) > 1 else 2000
+    n_frecuencias = int(argumentos[2]) if len(argumentos) > 2 else 200000
+
+    resultados = BenchmarkMemoria().ejecutar(n_estaciones, n_sensores, n_frecuencias)
+    print("Bytes por estación:   {:.1f}".format(resultados.obtener('bytes_por_estacion')))
+    print("Bytes por sensor:     {:.1f}".format(resultados.obtener('bytes_por_sensor')))
+    print("Bytes por frecuencia: {:.1f}".format(resultados.obtener('bytes_por_frecuencia')))
+    print("Campo sintético:      {} bytes, {} frecuencias".format(
+        resultados.obtener('bytes_campo_sintetico'), resultados.obtener('frecuencias_campo_sintetico')))
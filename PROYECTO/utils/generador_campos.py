@@ -0,0 +1,126 @@
+# utils/generador_campos.py
+# Generador de campos agrícolas sintéticos para pruebas de rendimiento
+
+import random
+from clases.lista import Lista
+from clases.campo_agricola import CampoAgricola
+from clases.estacion_base import EstacionBase
+from clases.sensor_suelo import SensorSuelo
+from clases.sensor_cultivo import SensorCultivo
+from clases.frecuencia import Frecuencia
+from clases.contador import Contador
+
+class GeneradorCampos:
+    """
+    Genera campos agrícolas sintéticos de tamaño arbitrario.
+    Cada estación recibe un perfil al azar; las estaciones con el mismo perfil
+    reciben señal de los mismos sensores, de modo que el optimizador tenga
+    grupos que encontrar.
+    """
+
+    def __init__(self, semilla=2019):
+        """
+        Inicializar generador
+
+        Args:
+            semilla (int): Semilla para que los campos sean reproducibles
+        """
+        self.semilla = semilla
+
+    def _crear_perfiles(self, aleatorio, n_perfiles, n_sensores, sensores_por_perfil):
+        """Crear, para cada perfil, la Lista de índices de sensores que le transmiten"""
+        perfiles = Lista()
+        contador = Contador(0, n_perfiles)
+        while contador.hay_siguiente():
+            contador.siguiente()
+            indices = Lista()
+            for indice in sorted(aleatorio.sample(range(n_sensores), min(sensores_por_perfil, n_sensores))):
+                indices.insertar(indice)
+            perfiles.insertar(indices)
+        return perfiles
+
+    def recorrer_frecuencias(self, n_estaciones, n_sensores_suelo, n_sensores_cultivo,
+                             n_perfiles=16, sensores_por_perfil=4):
+        """
+        Generar las frecuencias del campo sintético sin construir objetos.
+
+        Yields:
+            tuple: (tipo, indice_sensor, indice_estacion, valor) con tipo 'suelo' o 'cultivo',
+                   en orden de sensor y luego de estación
+        """
+        aleatorio = random.Random(self.semilla)
+        perfiles_suelo = self._crear_perfiles(aleatorio, n_perfiles, n_sensores_suelo, sensores_por_perfil)
+        perfiles_cultivo = self._crear_perfiles(aleatorio, n_perfiles, n_sensores_cultivo, sensores_por_perfil)
+
+        # Perfil asignado a cada estación
+        perfil_estacion = [aleatorio.randrange(n_perfiles) for _ in range(n_estaciones)]
+
+        for tipo, perfiles, n_sensores in (('suelo', perfiles_suelo, n_sensores_suelo),
+                                           ('cultivo', perfiles_cultivo, n_sensores_cultivo)):
+            # Para cada sensor, marcar qué perfiles le corresponden
+            perfiles_por_sensor = [set() for _ in range(n_sensores)]
+            p = 0
+            for indices in perfiles:
+                for indice in indices:
+                    perfiles_por_sensor[indice].add(p)
+                p += 1
+
+            for j in range(n_sensores):
+                for i in range(n_estaciones):
+                    if perfil_estacion[i] in perfiles_por_sensor[j]:
+                        yield tipo, j, i, aleatorio.randint(1, 10000)
+
+    def generar_campo(self, id_campo, n_estaciones, n_sensores_suelo, n_sensores_cultivo,
+                      n_perfiles=16, sensores_por_perfil=4):
+        """
+        Generar un CampoAgricola sintético
+
+        Args:
+            id_campo (str): ID del campo generado
+            n_estaciones (int): Cantidad de estaciones base
+            n_sensores_suelo (int): Cantidad de sensores de suelo
+            n_sensores_cultivo (int): Cantidad de sensores de cultivo
+            n_perfiles (int): Cantidad de patrones distintos de estaciones
+            sensores_por_perfil (int): Sensores de cada tipo que transmiten a un perfil
+
+        Returns:
+            CampoAgricola: Campo generado
+        """
+        campo = CampoAgricola(id_campo, "Campo sintético {}".format(id_campo))
+
+        contador = Contador(0, n_estaciones)
+        while contador.hay_siguiente():
+            i = contador.siguiente()
+            campo.agregar_estacion(EstacionBase("e{:06d}".format(i + 1), "Estacion {}".format(i + 1)))
+
+        sensores_suelo = Lista()
+        contador = Contador(0, n_sensores_suelo)
+        while contador.hay_siguiente():
+            j = contador.siguiente()
+            sensores_suelo.insertar(SensorSuelo("s{:05d}".format(j + 1), "Sensor S{}".format(j + 1)))
+
+        sensores_cultivo = Lista()
+        contador = Contador(0, n_sensores_cultivo)
+        while contador.hay_siguiente():
+            j = contador.siguiente()
+            sensores_cultivo.insertar(SensorCultivo("t{:05d}".format(j + 1), "Sensor T{}".format(j + 1)))
+
+        # Las frecuencias llegan agrupadas por sensor, así que basta con seguir al actual
+        sensor_actual = None
+        tipo_actual = None
+        j_actual = -1
+        for tipo, j, i, valor in self.recorrer_frecuencias(
+                n_estaciones, n_sensores_suelo, n_sensores_cultivo, n_perfiles, sensores_por_perfil):
+            if tipo != tipo_actual or j != j_actual:
+                sensores = sensores_suelo if tipo == 'suelo' else sensores_cultivo
+                sensor_actual = sensores.obtener_en_posicion(j)
+                tipo_actual = tipo
+                j_actual = j
+            sensor_actual.agregar_frecuencia(Frecuencia("e{:06d}".format(i + 1), valor))
+
+        for sensor in sensores_suelo:
+            campo.agregar_sensor_suelo(sensor)
+        for sensor in sensores_cultivo:
+            campo.agregar_sensor_cultivo(sensor)
+
+        return campo
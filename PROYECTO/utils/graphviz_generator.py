@@ -2,6 +2,7 @@
 import os
 import subprocess
 from clases.lista import Lista
+from clases.arreglo import Arreglo
 from clases.diccionario import Diccionario
 from clases.contador import Contador 
 
@@ -263,9 +264,15 @@ class GraphvizGenerator:
             campo_nombre = campo_original.get_nombre() if campo_original else "Campo Desconocido"
             exito_total = True
             
-            etiquetas_estaciones = campo_original.obtener_estaciones() if campo_original else Lista()
-            etiquetas_suelo = campo_original.obtener_sensores_suelo() if campo_original else Lista()
-            etiquetas_cultivo = campo_original.obtener_sensores_cultivo() if campo_original else Lista()
+            # IDs en orden de fila y columna del índice del campo, sin
+            # materializar sensores y con acceso O(1) por posición
+            if campo_original:
+                indice = campo_original.obtener_indice()
+                etiquetas_estaciones = indice.obtener_etiquetas_estaciones()
+                etiquetas_suelo = indice.obtener_etiquetas_sensores("suelo")
+                etiquetas_cultivo = indice.obtener_etiquetas_sensores("cultivo")
+            else:
+                etiquetas_estaciones = etiquetas_suelo = etiquetas_cultivo = Lista()
             
             nombre_base = campo_nombre.replace(" ", "_").lower()
             
@@ -320,14 +327,13 @@ class GraphvizGenerator:
             
             matrices_reducidas = resultado_optimizacion.obtener('matrices_reducidas')
             if matrices_reducidas:
-                etiquetas_grupos = Lista()
+                etiquetas_grupos = Arreglo(0)
                 grupos = resultado_optimizacion.obtener('grupos_estaciones')
                 if grupos:
-                    i = 1
-                    iterador_grupos = grupos.crear_iterador()
-                    while iterador_grupos.hay_siguiente():
-                        grupo = iterador_grupos.siguiente()
-                        etiquetas_grupos.insertar(f"Grupo_{i}")
+                    etiquetas_grupos = Arreglo(grupos.obtener_tamaño())
+                    i = 0
+                    while i < etiquetas_grupos.obtener_tamaño():
+                        etiquetas_grupos.asignar(i, f"Grupo_{i + 1}")
                         i += 1
                 
                 matriz_reducida_suelo = matrices_reducidas.obtener('suelo')
@@ -230,11 +230,14 @@ class MenuHelper:
         estaciones_original = resultado_optimizacion.obtener('estaciones_original')
         estaciones_optimizada = resultado_optimizacion.obtener('estaciones_optimizada')
         porcentaje_ahorro = resultado_optimizacion.obtener('porcentaje_ahorro')
+        estaciones_excluidas = resultado_optimizacion.obtener('estaciones_excluidas') or 0
         
         print("\nEstadísticas de Estaciones:")
         print("   Estaciones originales: {}".format(estaciones_original))
         print("   Estaciones optimizadas: {}".format(estaciones_optimizada))
-        print("   Estaciones eliminadas: {}".format(estaciones_original - estaciones_optimizada))
+        print("   Estaciones eliminadas: {}".format(estaciones_original - estaciones_excluidas - estaciones_optimizada))
+        if estaciones_excluidas > 0:
+            print("   Estaciones excluidas (inactivas): {}".format(estaciones_excluidas))
         print("   Ahorro logrado: {:.2f}%".format(porcentaje_ahorro))
         
         # Información de grupos